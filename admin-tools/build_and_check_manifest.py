@@ -2,14 +2,16 @@
 
 import sys
 
+from mathics import settings
 from mathics.core.builtin import Builtin
 from mathics.core.load_builtin import (
     import_and_load_builtins,
     mathics3_builtins_modules,
     name_is_builtin_symbol,
+    write_builtin_modules_manifest,
 )
 
-import_and_load_builtins()
+import_and_load_builtins(lazy=False)
 
 
 def generate_available_builtins_names():
@@ -85,6 +87,12 @@ if __name__ == "__main__":
     if len(sys.argv) == 2:
         if sys.argv[1] == "--rebuild":
             build_builtin_manifest()
+        elif sys.argv[1] == "--lazy-builtins":
+            # Manifest used when MATHICS3_LAZY_BUILTINS is set.
+            write_builtin_modules_manifest(settings.LAZY_BUILTINS_MANIFEST)
+            print(
+                f"Builtin modules manifest written to {settings.LAZY_BUILTINS_MANIFEST}"
+            )
     elif len(sys.argv) == 1:
         check_manifest()
         print("The manifest is consistent with the implemented builtins.")
@@ -5,33 +5,24 @@
 Begin["System`Convert`TableDump`"]
 
 
-Options[ImportCSV] = {
-    "CharacterEncoding" :> $CharacterEncoding,
-    "FieldSeparators" -> ","
-};
-
-ImportCSV[stream_InputStream, OptionsPattern[]]:=
-    Module[{data, grid, sep = OptionValue["FieldSeparators"]},
-        data = StringSplit[#, sep]& /@ ReadList[stream, String];
-        grid = Grid[data];
-        {
-            "Data" -> data,
-            "Grid" -> grid
-        }
-]
+(* ImportCSV is a builtin function: the file is read, and the fields
+   converted to numbers, in Python. *)
 
 ImportExport`RegisterImport[
     "CSV",
     System`Convert`TableDump`ImportCSV,
     {}, (* post evaluation *)
     (* Sources -> ImportExport`DefaultSources["Table"], *)
-    FunctionChannels -> {"Streams"},
+    FunctionChannels -> {"FileNames"},
     AvailableElements -> {"Data", "Grid"},
     DefaultElement -> "Data",
     BinaryFormat -> False,
     Options -> {
         "CharacterEncoding",
-        "FieldSeparators"
+        "FieldSeparators",
+        "HeaderLines",
+        "Numeric",
+        "SkippedLines"
     }
 ]
 
@@ -0,0 +1,30 @@
+(* ::Package:: *)
+
+(* TSV Importer *)
+
+Begin["System`Convert`TableDump`"]
+
+
+(* ImportTSV is a builtin function: the file is read, and the fields
+   converted to numbers, in Python. *)
+
+ImportExport`RegisterImport[
+    "TSV",
+    System`Convert`TableDump`ImportTSV,
+    {}, (* post evaluation *)
+    (* Sources -> ImportExport`DefaultSources["Table"], *)
+    FunctionChannels -> {"FileNames"},
+    AvailableElements -> {"Data", "Grid"},
+    DefaultElement -> "Data",
+    BinaryFormat -> False,
+    Options -> {
+        "CharacterEncoding",
+        "FieldSeparators",
+        "HeaderLines",
+        "Numeric",
+        "SkippedLines"
+    }
+]
+
+
+End[]
@@ -0,0 +1,20 @@
+(* ::Package:: *)
+
+(* WXF Exporter *)
+
+Begin["System`Convert`WXFDump`"]
+
+
+(* ExportWXF is a builtin function: the expression is serialized
+   in Python. *)
+
+ImportExport`RegisterExport[
+    "WXF",
+    System`Convert`WXFDump`ExportWXF,
+    FunctionChannels -> {"FileNames"},
+    Options -> {"PerformanceGoal"},
+    BinaryFormat -> True
+]
+
+
+End[]
@@ -0,0 +1,22 @@
+(* ::Package:: *)
+
+(* WXF Importer *)
+
+Begin["System`Convert`WXFDump`"]
+
+
+(* ImportWXF is a builtin function: the expression is deserialized
+   in Python. *)
+
+ImportExport`RegisterImport[
+    "WXF",
+    System`Convert`WXFDump`ImportWXF,
+    {}, (* post evaluation *)
+    FunctionChannels -> {"FileNames"},
+    AvailableElements -> {"Expression"},
+    DefaultElement -> "Expression",
+    BinaryFormat -> True
+]
+
+
+End[]
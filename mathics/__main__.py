@@ -17,7 +17,7 @@ from typing import Optional
 import mathics.session
 from mathics import __version__, license_string, settings, version_string
 from mathics.builtin.tuning_debug.trace import TraceBuiltins, traced_apply_function
-from mathics.core.definitions import Definitions
+from mathics.core.definitions import Definitions, load_builtin_definitions
 from mathics.core.evaluation import Evaluation
 from mathics.core.load_builtin import import_and_load_builtins
 from mathics.core.parser import MathicsFileLineFeeder
@@ -25,6 +25,7 @@ from mathics.core.rules import FunctionApplyRule
 from mathics.core.symbols import SymbolNull
 from mathics.core.systemsymbols import SymbolAborted, SymbolOverflow
 from mathics.eval.files_io.files import set_input_var
+from mathics.eval.profiling import SamplingProfiler, TracingProfiler
 from mathics.repl import TerminalOutput, TerminalShell, eval_loop, interactive_eval_loop
 from mathics.settings import DATA_DIR, USER_PACKAGE_DIR, ensure_directory
 from mathics.timing import show_lru_cache_statistics
@@ -135,6 +136,28 @@ Please contribute to Mathics!""",
         action="store_true",
     )
 
+    argparser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sampling",
+        choices=("sampling", "trace"),
+        metavar="METHOD",
+        help=(
+            "profile the evaluation of Mathics3 functions and rules, by sampling "
+            "(the default) or tracing evaluation, and print the functions that "
+            "took the most time on exit"
+        ),
+    )
+
+    argparser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help=(
+            "write the stacks profiled with --profile to FILE, in the collapsed "
+            "format of flamegraph tools"
+        ),
+    )
+
     argparser.add_argument(
         "--colors",
         nargs="?",
@@ -181,6 +204,25 @@ Please contribute to Mathics!""",
         help="print cache statistics",
     )
 
+    argparser.add_argument(
+        "--definitions-cache",
+        metavar="FILE",
+        help=(
+            "load builtin definitions from the snapshot in FILE, creating or "
+            "updating it when needed. "
+            "Environment variable MATHICS3_BUILTIN_DEFINITIONS_CACHE sets the default"
+        ),
+    )
+
+    argparser.add_argument(
+        "--build-definitions-cache",
+        action="store_true",
+        help=(
+            "build the snapshot of builtin definitions given in --definitions-cache "
+            f"(default: {settings.DEFAULT_BUILTIN_DEFINITIONS_CACHE}) and exit"
+        ),
+    )
+
     args, _ = argparser.parse_known_args()
 
     quit_command = "CTRL-BREAK" if sys.platform in ("win32", "nt") else "CONTROL-D"
@@ -202,11 +244,40 @@ Please contribute to Mathics!""",
 
         atexit.register(dump_tracing_stats)
 
+    if args.profile:
+        profiler = TracingProfiler() if args.profile == "trace" else SamplingProfiler()
+
+        def dump_profile():
+            profiler.stop()
+            print(profiler.summary())
+            if args.profile_output:
+                with open(args.profile_output, "w") as output:
+                    output.write(profiler.flame_graph())
+
+        profiler.start()
+        atexit.register(dump_profile)
+
     if args.show_statistics:
         atexit.register(show_lru_cache_statistics)
 
+    builtin_filename = args.definitions_cache or settings.BUILTIN_DEFINITIONS_CACHE
+    if args.build_definitions_cache:
+        builtin_filename = (
+            builtin_filename or settings.DEFAULT_BUILTIN_DEFINITIONS_CACHE
+        )
+        load_builtin_definitions(
+            Definitions(),
+            builtin_filename,
+            tuple(extension_modules),
+            rebuild=True,
+        )
+        print(f"Builtin definitions snapshot written to {builtin_filename}")
+        return exit_rc
+
     definitions = Definitions(
-        add_builtin=True, extension_modules=tuple(extension_modules)
+        add_builtin=True,
+        builtin_filename=builtin_filename,
+        extension_modules=tuple(extension_modules),
     )
     definitions.set_line_no(1)
 
@@ -17,13 +17,18 @@ except ImportError:
 
 
 import mathics
+import mathics.core.convert.sympy as sympy_conversion
 from mathics.core.definitions import Definitions
 from mathics.core.evaluation import Evaluation
+from mathics.core.load_builtin import import_and_load_builtins
 from mathics.core.parser import MathicsMultiLineFeeder, MathicsSingleLineFeeder, parse
 
 # Default number of times to repeat each benchmark. None -> Automatic
 TESTS_PER_BENCHMARK = None
 
+# Whether to report how many expressions are converted to and from SymPy
+COUNT_SYMPY_CONVERSIONS = False
+
 
 # Mathics3 expressions to benchmark
 BENCHMARKS = {
@@ -95,6 +100,24 @@ BENCHMARKS = {
         "RandomInteger[{0,1}, {10,10}] . RandomInteger[{0,1}, {10,10}]",
         "RandomInteger[{0,10}, {10,10}] + RandomInteger[{0,10}, {10,10}]",
     ],
+    # Iterators with machine-number bounds.
+    "Iteration": [
+        "Table[i^2, {i, 10^5}]",
+        "Table[i, {i, 0., 1., 10.^-5}]",
+        "Do[x = i^2, {i, 10^5}]",
+        "Sum[i^2, {i, 1, 10^5, 2}]",
+    ],
+    # Patterns for sums and products of many terms.
+    "OrderlessPatterns": [
+        f"MatchQ[{head} @@ Array[x, {n}], {pattern}]"
+        for n in (10, 100, 1000)
+        for head, pattern in (
+            ("Plus", "a_Integer + b_ + rest___"),
+            ("Plus", "x[a_] + x[b_] + c_Integer"),
+            ("Times", "c_?NumberQ * rest___"),
+            ("Times", "x[a_]^2 * rest___"),
+        )
+    ],
 }
 
 DEPTH = 300
@@ -110,6 +133,7 @@ PARSING_BENCHMARKS = [
     "Sin[" * DEPTH + "0.5" + "]" * DEPTH,
 ]
 
+import_and_load_builtins()
 definitions = Definitions(add_builtin=True)
 evaluation = Evaluation(definitions=definitions, catch_interrupt=False)
 
@@ -170,7 +194,11 @@ def truncate_line(string):
 
 def benchmark_parse(expression_string):
     print("  '{0}'".format(truncate_line(expression_string)))
-    timeit(lambda: parse(definitions, MathicsSingleLineFeeder(expression_string)))
+    timeit(
+        lambda: parse(
+            definitions, MathicsSingleLineFeeder(expression_string, "<benchmark>")
+        )
+    )
 
 
 def benchmark_parse_file(fname):
@@ -184,7 +212,7 @@ def benchmark_parse_file(fname):
         code = f.read().decode("utf-8")
 
     def do_parse():
-        feeder = MathicsMultiLineFeeder(code)
+        feeder = MathicsMultiLineFeeder(code, fname)
         while not feeder.empty():
             parse(definitions, feeder)
 
@@ -202,13 +230,49 @@ def benchmark_parser():
 
 def benchmark_format(expression_string):
     print("  '{0}'".format(expression_string))
-    expr = parse(definitions, MathicsSingleLineFeeder(expression_string))
+    expr = parse(definitions, MathicsSingleLineFeeder(expression_string, "<benchmark>"))
     timeit(lambda: expr.default_format(evaluation, "FullForm"))
 
 
+def count_sympy_conversions(func):
+    """
+    Return how many expressions are converted to SymPy, and how many
+    SymPy expressions are converted back, when calling `func`.
+    Conversions found in a cache are not counted.
+    """
+    counts = [0, 0]
+    to_sympy = sympy_conversion.expression_to_sympy
+    from_sympy = sympy_conversion.from_sympy_uncached
+
+    def counted_to_sympy(*args, **kwargs):
+        counts[0] += 1
+        return to_sympy(*args, **kwargs)
+
+    def counted_from_sympy(*args, **kwargs):
+        counts[1] += 1
+        return from_sympy(*args, **kwargs)
+
+    sympy_conversion.expression_to_sympy = counted_to_sympy
+    sympy_conversion.from_sympy_uncached = counted_from_sympy
+    try:
+        func()
+    finally:
+        sympy_conversion.expression_to_sympy = to_sympy
+        sympy_conversion.from_sympy_uncached = from_sympy
+    return counts
+
+
 def benchmark_expression(expression_string):
     print("  '{0}'".format(expression_string))
-    expr = parse(definitions, MathicsSingleLineFeeder(expression_string))
+    expr = parse(definitions, MathicsSingleLineFeeder(expression_string, "<benchmark>"))
+    if COUNT_SYMPY_CONVERSIONS:
+        first = count_sympy_conversions(lambda: expr.evaluate(evaluation))
+        again = count_sympy_conversions(lambda: expr.evaluate(evaluation))
+        print(
+            "    SymPy conversions (to, from): {0} first, {1} when evaluated again".format(
+                tuple(first), tuple(again)
+            )
+        )
     timeit(lambda: expr.evaluate(evaluation))
 
 
@@ -226,7 +290,7 @@ def benchmark_all_sections():
 
 
 def main():
-    global evaluation, TESTS_PER_BENCHMARK
+    global evaluation, TESTS_PER_BENCHMARK, COUNT_SYMPY_CONVERSIONS
     parser = ArgumentParser(description="Mathics3 benchmark suite.", add_help=False)
 
     parser.add_argument(
@@ -243,6 +307,13 @@ def main():
 
     parser.add_argument("-p", "--parser", action="store_true", help="only test parser")
 
+    parser.add_argument(
+        "--sympy-conversions",
+        "-c",
+        action="store_true",
+        help="report how many expressions are converted to and from SymPy",
+    )
+
     parser.add_argument(
         "--expression",
         "-e",
@@ -263,6 +334,7 @@ def main():
 
     if args.repeat is not None:
         TESTS_PER_BENCHMARK = int(args.repeat)
+    COUNT_SYMPY_CONVERSIONS = args.sympy_conversions
 
     if args.expression:
         benchmark_expression(args.expression)
@@ -12,7 +12,6 @@ from typing import Optional
 import sympy
 
 from mathics.builtin.numeric import Abs
-from mathics.builtin.scoping import dynamic_scoping
 from mathics.core.atoms import (
     MATHICS3_COMPLEX_I,
     MATHICS3_COMPLEX_I_NEG,
@@ -77,6 +76,7 @@ from mathics.eval.arithmetic import eval_RealValuedNumberQ
 from mathics.eval.inference import get_assumptions_list
 from mathics.eval.nevaluator import eval_N
 from mathics.eval.numeric import eval_Sign
+from mathics.eval.scoping import dynamic_scoping
 
 # This tells documentation how to sort this module
 sort_order = "mathics.builtin.mathematical-functions"
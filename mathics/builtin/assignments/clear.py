@@ -127,6 +127,7 @@ class Clear(Builtin):
                 evaluation.definitions.clear_cache(name)
                 definition = evaluation.definitions.get_user_definition(name)
                 self.do_clear(definition)
+                evaluation.definitions.mark_changed(definition)
 
         return SymbolNull
 
@@ -431,6 +431,10 @@ class BinaryRead(Builtin):
             evaluation.message(self.__class__.__name__, "bfmt", channel)
             return False, expr, None, python_kinds, []
 
+        # Bytes read ahead by Read[] are left for BinaryRead[].
+        if stream.reader is not None:
+            stream.reader.sync()
+
         if not all(t in self.readers for t in python_kinds):
             evaluation.message("BinaryRead", "format", kind)
             return (
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Binary Serialization
+
+Expressions can be converted to a sequence of bytes and back, in the \
+Wolfram Exchange Format (WXF). Integers, reals, strings and symbols \
+are stored in binary form, and lists of machine numbers as arrays, so \
+this is much faster than formatting and parsing the text of the \
+expression.
+"""
+
+from mathics.core.atoms import ByteArray, String
+from mathics.core.attributes import A_PROTECTED, A_READ_PROTECTED
+from mathics.core.builtin import Builtin
+from mathics.core.convert.wxf import WXFError, from_wxf, to_wxf
+from mathics.core.evaluation import Evaluation
+from mathics.core.expression import Expression
+from mathics.core.systemsymbols import SymbolFailed
+
+
+class BinaryDeserialize(Builtin):
+    """
+    <url>
+    :WMA link:
+    https://reference.wolfram.com/language/ref/BinaryDeserialize.html</url>
+
+    <dl>
+      <dt>'BinaryDeserialize'[$bytes$]
+      <dd>recovers an expression from the 'ByteArray' $bytes$ given by \
+          'BinarySerialize'.
+
+      <dt>'BinaryDeserialize'[$bytes$, $h$]
+      <dd>wraps the expression in $h$ before evaluating it.
+    </dl>
+
+    >> BinaryDeserialize[BinarySerialize[f[x, 1.5, "text"]]]
+     = f[x, 1.5, text]
+
+    >> BinaryDeserialize[BinarySerialize[Hold[1 + 1]], HoldComplete]
+     = HoldComplete[Hold[1 + 1]]
+
+    >> BinaryDeserialize[ByteArray[{1, 2, 3}]]
+     : The byte array ByteArray[<3>] is not a valid serialized expression.
+     = $Failed
+    """
+
+    attributes = A_PROTECTED | A_READ_PROTECTED
+    messages = {
+        "corrupt": "The byte array `1` is not a valid serialized expression.",
+    }
+    summary_text = "recover an expression from its binary serialization"
+
+    def eval(self, data: ByteArray, evaluation: Evaluation):
+        "BinaryDeserialize[data_ByteArray]"
+        try:
+            return from_wxf(bytes(data.value))
+        except WXFError:
+            evaluation.message("BinaryDeserialize", "corrupt", data)
+            return SymbolFailed
+
+    def eval_with_head(self, data: ByteArray, head, evaluation: Evaluation):
+        "BinaryDeserialize[data_ByteArray, head_]"
+        try:
+            return Expression(head, from_wxf(bytes(data.value)))
+        except WXFError:
+            evaluation.message("BinaryDeserialize", "corrupt", data)
+            return SymbolFailed
+
+
+class BinarySerialize(Builtin):
+    """
+    <url>
+    :WMA link:
+    https://reference.wolfram.com/language/ref/BinarySerialize.html</url>
+
+    <dl>
+      <dt>'BinarySerialize'[$expr$]
+      <dd>gives a 'ByteArray' with the binary representation of $expr$.
+    </dl>
+
+    >> bytes = BinarySerialize[{x, 1, 2.5}]
+     = ByteArray[<31>]
+    >> Normal[bytes][[;; 2]]
+     = {56, 58}
+    >> BinaryDeserialize[bytes]
+     = {x, 1, 2.5}
+
+    Lists of machine numbers are stored as arrays:
+    >> Length[Normal[BinarySerialize[Range[1000]]]]
+     = 8007
+
+    With 'PerformanceGoal -> "Size"', the data is compressed:
+    >> Length[Normal[BinarySerialize[Range[1000], PerformanceGoal -> "Size"]]] < 8007
+     = True
+    """
+
+    attributes = A_PROTECTED | A_READ_PROTECTED
+    messages = {
+        "nser": "`1` can not be serialized.",
+    }
+    options = {
+        "PerformanceGoal": "Automatic",
+    }
+    summary_text = "give the binary serialization of an expression"
+
+    def eval(self, expr, evaluation: Evaluation, options: dict):
+        "BinarySerialize[expr_, OptionsPattern[BinarySerialize]]"
+        goal = self.get_option(options, "PerformanceGoal", evaluation)
+        compress = isinstance(goal, String) and goal.value == "Size"
+        try:
+            return ByteArray(to_wxf(expr, compress=compress))
+        except WXFError:
+            evaluation.message("BinarySerialize", "nser", expr)
+            return SymbolFailed
@@ -10,7 +10,10 @@ produces LLVM code.
 import ctypes
 from types import FunctionType
 
+import numpy
+
 from mathics.builtin.box.compilation import CompiledCodeBox
+from mathics.compile.base import CompiledRuntimeError
 from mathics.core.atoms import Complex, Integer, Rational, Real, String
 from mathics.core.attributes import A_HOLD_ALL, A_PROTECTED
 from mathics.core.builtin import Builtin
@@ -26,8 +29,9 @@ from mathics.core.element import ImmutableValueMixin
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
 from mathics.core.keycomparable import LITERAL_EXPRESSION_ELT_ORDER
+from mathics.core.list import ListExpression, pack_elements
 from mathics.core.symbols import Atom, Symbol, SymbolFalse, SymbolTrue
-from mathics.core.systemsymbols import SymbolCompiledFunction
+from mathics.core.systemsymbols import SymbolCompiledFunction, SymbolFunction
 
 # This tells documentation how to sort this module
 sort_order = "mathics.builtin.code-compilation"
@@ -51,6 +55,10 @@ class Compile(Builtin):
 
       <dt>'Compile'[{{$x_1$, $t_1$} {$x_2$, $t_1$} ...}, $expr$]
       <dd>Compiles assuming each $x_i$ matches type $t_i$.
+
+      <dt>'Compile'[{{$x_1$, $t_1$, $n_1$} {$x_2$, $t_1$, $n_2$} ...}, $expr$]
+      <dd>Compiles assuming each $x_i$ is a rank $n_i$ array of elements \
+          of type $t_i$, either '_Integer' or '_Real'.
     </dl>
 
     Compilation is performed using llvmlite , or Python's builtin
@@ -73,9 +81,17 @@ class Compile(Builtin):
     >> cf[3.5, 2]
      = 2.18888
 
-    Loops and variable assignments are supported usinv Python builtin "compile" function:
+    Local variables, loops and arrays are compiled too:
+    >> cf = Compile[{{x, _Real, 1}}, Module[{s = 0.}, Do[s += x[[i]] ^ 2, {i, Length[x]}]; s]];
+    >> cf[{1, 2, 3.5}]
+     = 17.25
+    >> cf = Compile[{{n, _Integer}}, Table[i + j / 2, {i, n}, {j, 2}]];
+    >> cf[2]
+     = {{1.5, 2.}, {2.5, 3.}}
+
+    Other loops and variable assignments are supported using Python builtin "compile" function:
     >> Compile[{{a, _Integer}, {b, _Integer}}, While[b != 0, {a, b} = {b, Mod[a, b]}]; a]       (* GCD of a, b *)
-     =  CompiledFunction[{a, b}, a, -PythonizedCode-]
+     = CompiledFunction[{a, b}, ..., -PythonizedCode-]
     """
 
     attributes = A_HOLD_ALL | A_PROTECTED
@@ -198,7 +214,7 @@ class CompiledFunction(Builtin):
     </dl>
 
     >> sqr = Compile[{x}, x x]
-     = CompiledFunction[{x}, x ^ 2, ...]
+     = CompiledFunction[{x}, x x, ...]
     >> Head[sqr]
      = CompiledFunction
     >> sqr[2]
@@ -206,8 +222,12 @@ class CompiledFunction(Builtin):
 
     """
 
+    # The expression is kept as it was compiled; it is evaluated only
+    # when the compiled code fails.
+    attributes = A_HOLD_ALL | A_PROTECTED
     messages = {
         "argerr": "Invalid argument `1` should be Integer, Real, Complex or boolean.",
+        "cfex": "Could not complete external evaluation; proceeding with uncompiled evaluation.",
         "cfsa": "Argument `1` at position `2` should be a `3`.",
     }
     summary_text = "A CompiledFunction object."
@@ -234,7 +254,9 @@ class CompiledFunction(Builtin):
             # If not, show a message.
             try:
                 spec_type = spec.type
-                if spec_type is float:
+                if spec.rank:
+                    val = tensor_argument(arg, spec)
+                elif spec_type is float:
                     if isinstance(arg, (Integer, Rational, Real)):
                         val = spec_type(arg.value)
                     else:
@@ -277,7 +299,7 @@ class CompiledFunction(Builtin):
                     "cfsa",
                     arg,
                     Integer(pos + 1),
-                    NAME_OF_TYPE[spec.type],
+                    type_name(spec),
                 )
                 return
             py_args.append(val)
@@ -286,6 +308,38 @@ class CompiledFunction(Builtin):
         except (TypeError, ctypes.ArgumentError):
             evaluation.message("CompiledFunction", "argerr", args)
             return
+        except CompiledRuntimeError:
+            evaluation.message("CompiledFunction", "cfex")
+            return Expression(Expression(SymbolFunction, argnames, expr), *argseq)
         except Exception:
             return
+        if isinstance(result, numpy.ndarray) and result.size > 0:
+            return ListExpression(packed=result)
+        if isinstance(result, numpy.ndarray):
+            return from_python(result.tolist())
         return from_python(result)
+
+
+def tensor_argument(arg, spec) -> numpy.ndarray:
+    """
+    Convert `arg` into an array for the tensor argument `spec`. Raise
+    TypeError if it is not a tensor of the rank and type of `spec`.
+    """
+    if not isinstance(arg, ListExpression):
+        raise TypeError
+    array = arg.packed if arg.packed is not None else pack_elements(arg.elements)
+    if array is None:
+        if spec.type is not float:
+            raise TypeError
+        # e.g. a mix of integers and reals
+        array = numpy.array(arg.to_python(), dtype=float)
+    if array.ndim != spec.rank or (spec.type is int and array.dtype.kind != "i"):
+        raise TypeError
+    return array
+
+
+def type_name(spec) -> String:
+    """The name of the type of an argument, used in messages."""
+    if spec.rank:
+        return String(f"rank {spec.rank} tensor of {NAME_OF_TYPE[spec.type].value}s")
+    return NAME_OF_TYPE[spec.type]
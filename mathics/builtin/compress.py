@@ -4,11 +4,18 @@ Compress Functions
 """
 
 import base64
+import binascii
 import zlib
 
 from mathics.core.atoms import String
 from mathics.core.builtin import Builtin
+from mathics.core.convert.wxf import WXFError, from_wxf, to_wxf
 from mathics.core.evaluation import Evaluation
+from mathics.core.systemsymbols import SymbolAutomatic, SymbolFailed
+
+# Compressed strings holding the binary serialization of an expression
+# start with this prefix. Others hold the compressed FullForm text.
+WXF_PREFIX = "1:"
 
 
 class Compress(Builtin):
@@ -25,15 +32,42 @@ class Compress(Builtin):
     >> Compress[N[Pi, 10]]
      = ...
 
+    The expression is stored in the binary form given by 'BinarySerialize'. \
+    With 'Method -> "FullForm"', its 'FullForm' text is stored instead, \
+    as is done by default for expressions that can not be serialized:
+    >> Uncompress[Compress[f[x, 2.5], Method -> "FullForm"]]
+     = f[x, 2.5]
     """
 
+    messages = {
+        "mthd": 'Value of option Method -> `1` should be Automatic, "WXF" or "FullForm".',
+        "nser": "`1` can not be serialized.",
+    }
     options = {
-        "Method": "{}",
+        "Method": "Automatic",
     }
     summary_text = "compress an expression"
 
     def eval(self, expr, evaluation: Evaluation, options: dict):
         "Compress[expr_, OptionsPattern[Compress]]"
+        method = self.get_option(options, "Method", evaluation)
+        if method is SymbolAutomatic or isinstance(method, String):
+            method_name = "Automatic" if method is SymbolAutomatic else method.value
+        else:
+            method_name = None
+        if method_name not in ("Automatic", "WXF", "FullForm"):
+            evaluation.message("Compress", "mthd", method)
+            return SymbolFailed
+
+        if method_name != "FullForm":
+            try:
+                data = to_wxf(expr, compress=True)
+                return String(WXF_PREFIX + base64.b64encode(data).decode("ascii"))
+            except WXFError:
+                if method_name == "WXF":
+                    evaluation.message("Compress", "nser", expr)
+                    return SymbolFailed
+
         if isinstance(expr, String):
             string = '"' + expr.value + '"'
         else:
@@ -41,8 +75,6 @@ class Compress(Builtin):
             string = string.to_text(evaluation=evaluation, show_string_characters=True)
         string = string.encode("utf-8")
 
-        # TODO Implement other Methods
-        # Shouldn't be this a ByteArray?
         result = zlib.compress(string)
         result = base64.b64encode(result).decode("utf8")
         return String(result)
@@ -70,12 +102,20 @@ class Uncompress(Builtin):
      = x ^ 2 + y Sin[x] + 10 Log[15]
     """
 
+    messages = {
+        "string": "`1` is not a compressed expression.",
+    }
     summary_text = "recover a compressed expression"
 
     def eval(self, string, evaluation):
         "Uncompress[string_String]"
         string = string.get_string_value()  # .encode("utf-8")
-        string = base64.b64decode(string)
-        tmp = zlib.decompress(string)
-        tmp = tmp.decode("utf-8")
+        try:
+            if string.startswith(WXF_PREFIX):
+                return from_wxf(base64.b64decode(string[len(WXF_PREFIX) :]))
+            tmp = zlib.decompress(base64.b64decode(string))
+            tmp = tmp.decode("utf-8")
+        except (binascii.Error, zlib.error, UnicodeDecodeError, WXFError):
+            evaluation.message("Uncompress", "string", String(string))
+            return SymbolFailed
         return evaluation.parse(tmp)
@@ -3,6 +3,7 @@ Cluster Analysis
 """
 
 import heapq
+from typing import Optional
 
 from mathics.algorithm.clusters import (
     AutomaticMergeCriterion,
@@ -14,13 +15,22 @@ from mathics.algorithm.clusters import (
     optimize,
 )
 from mathics.builtin.options import options_to_rules
-from mathics.core.atoms import FP_MANTISA_BINARY_DIGITS, Integer, Real, String, min_prec
+from mathics.core.atoms import (
+    FP_MANTISA_BINARY_DIGITS,
+    Integer,
+    Integer1,
+    Real,
+    String,
+    min_prec,
+)
 from mathics.core.builtin import Builtin
 from mathics.core.convert.expression import to_mathics_list
+from mathics.core.element import ImmutableValueMixin
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
+from mathics.core.keycomparable import LITERAL_EXPRESSION_ELT_ORDER
 from mathics.core.list import ListExpression
-from mathics.core.symbols import Symbol, strip_context
+from mathics.core.symbols import Atom, Symbol, strip_context
 from mathics.core.systemsymbols import (
     SymbolClusteringComponents,
     SymbolFailed,
@@ -32,11 +42,12 @@ from mathics.eval.distance.clusters import (
     IllegalDataPoint,
     IllegalDistance,
     dist_repr,
+    to_exact_distance,
     to_real_distance,
 )
+from mathics.eval.distance.nearest import KDTreeIndex, build_kdtree_index, numeric_point
 from mathics.eval.nevaluator import eval_N
 from mathics.eval.parts import walk_levels
-from mathics.eval.stackframe import get_eval_Expression
 from mathics.eval.tensors import get_default_distance
 
 
@@ -389,6 +400,10 @@ class Nearest(Builtin):
 
       <dt>'Nearest'[{$p_1$, $p_2$, ...} -> {$q_1$, $q_2$, ...}, $x$]
       <dd>returns $q_1$, $q_2$, ... but measures the distances using $p_1$, $p_2$, ...
+
+      <dt>'Nearest'[$list$]
+      <dd>returns a 'NearestFunction' that finds the items of $list$ \
+          nearest to a point.
     </dl>
 
     >> Nearest[{5, 2.5, 10, 11, 15, 8.5, 14}, 12]
@@ -404,6 +419,22 @@ class Nearest(Builtin):
 
     >> Nearest[{{0, 1}, {1, 2}, {2, 3}} -> {a, b, c}, {1.1, 2}]
      = {b}
+
+    With 'Method -> "KDTree"', the nearest items are found with a k-d \
+    tree built over the data points. This needs points given by machine \
+    real numbers, and 'EuclideanDistance', 'SquaredEuclideanDistance', \
+    'ManhattanDistance' or 'ChessboardDistance' as distance function. \
+    Otherwise, and with 'Method -> "Scan"', the distance to each point \
+    is computed. The default, 'Method -> Automatic', uses a k-d tree \
+    when it can:
+
+    >> Nearest[{{0., 0.}, {1., 1.}, {2., 2.}, {3., 3.}}, {1.2, 1.4}, 2, DistanceFunction -> ManhattanDistance, Method -> "KDTree"]
+     = {{1., 1.}, {2., 2.}}
+
+    Exact points are compared exactly; points at the same distance \
+    come in the order of the list:
+    >> Nearest[{1/3, 2/3}, 1/2]
+     = {1 / 3}
     """
 
     messages = {
@@ -413,36 +444,128 @@ class Nearest(Builtin):
 
     options = {
         "DistanceFunction": "Automatic",
-        "Method": '"Scan"',
+        "Method": "Automatic",
     }
 
-    rules = {
-        "Nearest[list_, pattern_]": "Nearest[list, pattern, 1]",
-        "Nearest[pattern_][list_]": "Nearest[list, pattern]",
-    }
     summary_text = "the nearest element from a list"
 
+    def eval_function(self, expression, items, evaluation: Evaluation, options: dict):
+        "expression: Nearest[items_, OptionsPattern[%(name)s]]"
+        return self.nearest_function(expression, items, evaluation, options)
+
+    def eval_one(self, expression, items, pivot, evaluation: Evaluation, options: dict):
+        "expression: Nearest[items_, pivot_?NotOptionQ, OptionsPattern[%(name)s]]"
+        function = self.nearest_function(expression, items, evaluation, options)
+        if function is not None:
+            return function.find(pivot, Integer1, evaluation)
+
     def eval(
         self, expression, items, pivot, limit, evaluation: Evaluation, options: dict
     ):
-        "expression: Nearest[items_, pivot_, limit_, OptionsPattern[%(name)s]]"
-
-        method = self.get_option(options, "Method", evaluation)
-        if not isinstance(method, String) or method.get_string_value() != "Scan":
-            evaluation("Nearest", "nimp", method)
-            return
+        "expression: Nearest[items_, pivot_?NotOptionQ, limit_?NotOptionQ, OptionsPattern[%(name)s]]"
+        function = self.nearest_function(expression, items, evaluation, options)
+        if function is not None:
+            return function.find(pivot, limit, evaluation)
+
+    def nearest_function(
+        self, expression, items, evaluation: Evaluation, options: dict
+    ) -> Optional["NearestFunction"]:
+        method_name, method = self.get_option_string(options, "Method", evaluation)
+        if method_name not in ("Automatic", "KDTree", "Scan"):
+            evaluation.message("Nearest", "nimp", method)
+            return None
 
         dist_p, repr_p = dist_repr(items)
 
         if dist_p is None or len(dist_p) != len(repr_p):
             evaluation.message(self.get_name(), "list", expression)
-            return
+            return None
+
+        distance_function_string, distance_function = self.get_option_string(
+            options, "DistanceFunction", evaluation
+        )
+        is_automatic = distance_function_string == "Automatic"
+        if is_automatic and dist_p:
+            distance_function = get_default_distance(dist_p)
+            if distance_function is None:
+                evaluation.message(self.get_name(), "amtd", "Nearest", items)
+                return None
+
+        index = None
+        if method_name != "Scan" and dist_p:
+            index = build_kdtree_index(dist_p, distance_function)
+        return NearestFunction(dist_p, repr_p, distance_function, is_automatic, index)
+
+
+class NearestFunction(Atom, ImmutableValueMixin):
+    """
+    The data points of 'Nearest', what it returns for each of them, and
+    the distance function used. A k-d tree over the points is kept,
+    when there is one, so that each lookup does not build it again.
+    """
+
+    class_head_name = "System`NearestFunction"
+
+    def __init__(
+        self,
+        dist_p,
+        repr_p,
+        distance_function,
+        is_automatic: bool,
+        index: Optional[KDTreeIndex],
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.dist_p = dist_p
+        self.repr_p = repr_p
+        self.distance_function = distance_function
+        self.is_automatic = is_automatic
+        self.index = index
+
+    def __hash__(self):
+        return hash(("NearestFunction", id(self)))
+
+    def __str__(self):
+        return f"NearestFunction[<{len(self.dist_p)}>]"
+
+    def atom_to_boxes(self, f, evaluation: Evaluation):
+        return String(str(self))
+
+    def default_format(self, evaluation, form):
+        return str(self)
+
+    def do_copy(self):
+        return NearestFunction(
+            self.dist_p,
+            self.repr_p,
+            self.distance_function,
+            self.is_automatic,
+            self.index,
+        )
+
+    @property
+    def element_order(self) -> tuple:
+        return (LITERAL_EXPRESSION_ELT_ORDER, hex(id(self)))
+
+    def equal2(self, rhs):
+        return self is rhs
+
+    def sameQ(self, rhs) -> bool:
+        """Mathics3 SameQ"""
+        return self is rhs
+
+    def to_python(self, *args, **kwargs):
+        return None
+
+    def find(self, pivot, limit, evaluation: Evaluation):
+        """Return the items nearest to `pivot`, as many as `limit` says."""
+        dist_p, repr_p = self.dist_p, self.repr_p
 
         if limit.has_form("List", 2):
-            up_to = limit.elements[0]
-            py_r = limit.elements[1].to_mpmath()
+            up_to, r = limit.elements
+            py_r = r.to_mpmath()
         else:
-            up_to = limit
+            up_to, r = limit, None
             py_r = None
 
         if isinstance(up_to, Integer):
@@ -456,36 +579,33 @@ class Nearest(Builtin):
             return ListExpression()
 
         multiple_x = False
+        if self.is_automatic and pivot.get_head_name() == "System`List":
+            _, depth_x = walk_levels(pivot)
+            _, depth_items = walk_levels(dist_p[0])
 
-        distance_function_string, distance_function = self.get_option_string(
-            options, "DistanceFunction", evaluation
-        )
-        if distance_function_string == "Automatic":
-            distance_function = get_default_distance(dist_p)
-            if distance_function is None:
-                evaluation.message(self.get_name(), "amtd", get_eval_Expression())
-                return
-
-            if pivot.get_head_name() == "System`List":
-                _, depth_x = walk_levels(pivot)
-                _, depth_items = walk_levels(dist_p[0])
+            if depth_x > depth_items:
+                multiple_x = True
 
-                if depth_x > depth_items:
-                    multiple_x = True
-
-        def nearest(x) -> ListExpression:
-            calls = [Expression(distance_function, x, y) for y in dist_p]
+        def nearest_scan(x) -> ListExpression:
+            calls = [Expression(self.distance_function, x, y) for y in dist_p]
             distances = ListExpression(*calls).evaluate(evaluation)
 
             if not distances.has_form("List", len(dist_p)):
                 raise ValueError()
 
-            py_distances = [
-                (to_real_distance(d), i) for i, d in enumerate(distances.elements)
-            ]
+            # Exact distances, and an exact radius, are compared exactly,
+            # so that ties between them are found.
+            exact_distances = [to_exact_distance(d) for d in distances.elements]
+            exact_r = None if r is None else to_exact_distance(r)
+            if None not in exact_distances and (r is None or exact_r is not None):
+                keys, key_r = exact_distances, exact_r
+            else:
+                keys = [to_real_distance(d) for d in distances.elements]
+                key_r = py_r
+            py_distances = [(d, i) for i, d in enumerate(keys)]
 
-            if py_r is not None:
-                py_distances = [(d, i) for d, i in py_distances if d <= py_r]
+            if key_r is not None:
+                py_distances = [(d, i) for d, i in py_distances if d <= key_r]
 
             def pick():
                 if py_n is None:
@@ -498,6 +618,15 @@ class Nearest(Builtin):
 
             return ListExpression(*list(pick()))
 
+        def nearest(x) -> ListExpression:
+            if self.index is not None:
+                point = numeric_point(x)
+                if point is not None and point.shape == self.index.points.shape[1:]:
+                    radius = None if py_r is None else float(py_r)
+                    indices = self.index.nearest(point, py_n, radius)
+                    return ListExpression(*(repr_p[i] for i in indices))
+            return nearest_scan(x)
+
         try:
             if not multiple_x:
                 return nearest(pivot)
@@ -507,3 +636,47 @@ class Nearest(Builtin):
             return SymbolFailed
         except ValueError:
             return SymbolFailed
+
+
+class NearestFunction_(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/NearestFunction.html</url>
+
+    <dl>
+      <dt>'NearestFunction'[...]
+      <dd>is returned by 'Nearest'[$list$], and finds the items of $list$ \
+          nearest to a point.
+
+      <dt>$nf$[$x$]
+      <dd>returns the item nearest to $x$.
+
+      <dt>$nf$[$x$, $n$]
+      <dd>returns the $n$ nearest items.
+
+      <dt>$nf$[$x$, {$n$, $r$}]
+      <dd>returns up to $n$ nearest items that are not farther from $x$ than $r$.
+    </dl>
+
+    The data points are indexed once, so that finding the items nearest \
+    to many points does not go through all the data each time:
+    >> nf = Nearest[{{0, 0}, {1, 1}, {2, 2}, {3, 3}, {4, 4}}]
+     = NearestFunction[<5>]
+    >> nf[{1.9, 2.3}]
+     = {{2, 2}}
+    >> nf[{2.2, 2.1}, 2]
+     = {{2, 2}, {3, 3}}
+    >> nf /@ {{0.4, 0}, {3.8, 4.1}}
+     = {{{0, 0}}, {{4, 4}}}
+    #> Clear[nf]
+    """
+
+    name = "NearestFunction"
+    summary_text = "function that finds nearest elements"
+
+    def eval(self, function, x, evaluation: Evaluation):
+        "function_NearestFunction[x_]"
+        return function.find(x, Integer1, evaluation)
+
+    def eval_limit(self, function, x, limit, evaluation: Evaluation):
+        "function_NearestFunction[x_, limit_]"
+        return function.find(x, limit, evaluation)
@@ -0,0 +1,88 @@
+"""
+CSV and TSV File Formats
+
+Importers of comma-separated and tab-separated values (via Python's "csv" module).
+"""
+
+from mathics.core.atoms import String
+from mathics.core.builtin import Builtin
+from mathics.core.evaluation import Evaluation
+from mathics.eval.fileformats.csvformat import eval_ImportTable
+
+
+class _ImportTable(Builtin):
+    context = "System`Convert`TableDump`"
+    messages = {
+        "fldsep": "Value of option FieldSeparators -> `1` should be a string.",
+        "hdrlns": (
+            "Value of option HeaderLines -> `1` should be a non-negative "
+            "integer or a pair of non-negative integers."
+        ),
+        "skplns": (
+            "Value of option SkippedLines -> `1` should be a non-negative "
+            "integer, a list of positive integers or a span."
+        ),
+    }
+    options = {
+        "CharacterEncoding": "$CharacterEncoding",
+        "HeaderLines": "0",
+        "Numeric": "True",
+        "SkippedLines": "0",
+    }
+
+    def eval(self, path: String, evaluation: Evaluation, options: dict):
+        "%(name)s[path_String, OptionsPattern[]]"
+        return eval_ImportTable(self.get_name(), path, (), options, evaluation)
+
+    def eval_data(self, path: String, parts, evaluation: Evaluation, options: dict):
+        '%(name)s[path_String, "Data", parts___?NotOptionQ, OptionsPattern[]]'
+        return eval_ImportTable(
+            self.get_name(), path, parts.get_sequence(), options, evaluation
+        )
+
+
+class ImportCSV(_ImportTable):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/format/CSV.html</url>
+
+    <dl>
+      <dt>'System`Convert`TableDump`ImportCSV'[$path$]
+      <dd>reads the comma-separated values in the file $path$.
+    </dl>
+
+    Fields holding numbers are imported as numbers:
+    >> Import["ExampleData/numberdata.csv"]
+     = {{0.88, 0.6, 0.94}, {0.76, 0.19, 0.51}, {0.97, 0.04, 0.26}, {0.33, 0.74, 0.79}, {0.42, 0.64, 0.56}}
+
+    Only the lines of the file needed for the rows asked for are read:
+    >> Import["ExampleData/numberdata.csv", {"Data", 2 ;; 3}]
+     = {{0.76, 0.19, 0.51}, {0.97, 0.04, 0.26}}
+
+    Columns can be selected too:
+    >> Import["ExampleData/numberdata.csv", {"Data", All, 2}]
+     = {0.6, 0.19, 0.04, 0.74, 0.64}
+
+    Header lines are left out of the data:
+    >> ImportString["x,y\\n1,2\\n3,4", "CSV", "HeaderLines" -> 1]
+     = {{1, 2}, {3, 4}}
+    """
+
+    options = _ImportTable.options | {"FieldSeparators": '","'}
+    summary_text = "import a CSV file"
+
+
+class ImportTSV(_ImportTable):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/format/TSV.html</url>
+
+    <dl>
+      <dt>'System`Convert`TableDump`ImportTSV'[$path$]
+      <dd>reads the tab-separated values in the file $path$.
+    </dl>
+
+    >> ImportString["a\\tb\\n1\\t2.5", "TSV"]
+     = {{a, b}, {1, 2.5}}
+    """
+
+    options = _ImportTable.options | {"FieldSeparators": '"\\t"'}
+    summary_text = "import a TSV file"
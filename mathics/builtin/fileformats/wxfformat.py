@@ -0,0 +1,73 @@
+"""
+WXF File Format
+
+Importer and exporter of expressions serialized in the Wolfram Exchange Format, \
+as by 'BinarySerialize'.
+"""
+
+from mathics.core.atoms import String
+from mathics.core.builtin import Builtin
+from mathics.core.evaluation import Evaluation
+from mathics.eval.fileformats.wxfformat import eval_ExportWXF, eval_ImportWXF
+
+
+class ExportWXF(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/format/WXF.html</url>
+
+    <dl>
+      <dt>'System`Convert`WXFDump`ExportWXF'[$path$, $expr$]
+      <dd>writes the binary serialization of $expr$ to the file $path$.
+    </dl>
+
+    >> ExportString[{1, x}, "WXF"]
+     = ByteArray[<22>]
+    """
+
+    context = "System`Convert`WXFDump`"
+    messages = {
+        "nser": "`1` can not be serialized.",
+    }
+    options = {
+        "PerformanceGoal": "Automatic",
+    }
+    summary_text = "export an expression to a WXF file"
+
+    def eval(self, path: String, expr, evaluation: Evaluation, options: dict):
+        "%(name)s[path_String, expr_, OptionsPattern[]]"
+        goal = self.get_option(options, "PerformanceGoal", evaluation)
+        compress = isinstance(goal, String) and goal.value == "Size"
+        return eval_ExportWXF(self.get_name(), path, expr, compress, evaluation)
+
+
+class ImportWXF(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/format/WXF.html</url>
+
+    <dl>
+      <dt>'System`Convert`WXFDump`ImportWXF'[$path$]
+      <dd>reads the expression serialized in the file $path$.
+    </dl>
+
+    >> file = FileNameJoin[{$TemporaryDirectory, "data.wxf"}];
+    >> Export[file, f[x, 2.5]];
+    >> Import[file]
+     = f[x, 2.5]
+
+    Numeric lists are read as packed lists:
+    >> data = Import[Export[file, RandomReal[1, {1000, 3}]]];
+    >> {Dimensions[data], Developer`PackedArrayQ[data]}
+     = {{1000, 3}, True}
+
+    #> DeleteFile[file]; Clear[file, data];
+    """
+
+    context = "System`Convert`WXFDump`"
+    messages = {
+        "corrupt": "The file `1` does not hold a serialized expression.",
+    }
+    summary_text = "import an expression from a WXF file"
+
+    def eval(self, path: String, evaluation: Evaluation):
+        "%(name)s[path_String, OptionsPattern[]]"
+        return eval_ImportWXF(self.get_name(), path, evaluation)
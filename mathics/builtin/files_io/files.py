@@ -14,7 +14,7 @@ import mathics.eval.files_io.files as io_files
 # We use the below import for access to variables that may change
 # at runtime.
 from mathics.core.atoms import Integer, String
-from mathics.core.attributes import A_PROTECTED, A_READ_PROTECTED
+from mathics.core.attributes import A_HOLD_REST, A_PROTECTED, A_READ_PROTECTED
 from mathics.core.builtin import (
     Builtin,
     InfixOperator,
@@ -28,7 +28,13 @@ from mathics.core.evaluation import Evaluation
 from mathics.core.expression import BoxError, Expression
 from mathics.core.list import ListExpression
 from mathics.core.streams import Stream, path_search, stream_manager
-from mathics.core.symbols import Symbol, SymbolFullForm, SymbolNull, SymbolTrue
+from mathics.core.symbols import (
+    Symbol,
+    SymbolFullForm,
+    SymbolNull,
+    SymbolTrue,
+    valid_context_name,
+)
 from mathics.core.systemsymbols import (
     SymbolEndOfFile,
     SymbolExpression,
@@ -48,7 +54,14 @@ from mathics.eval.encoding import (
     get_encoding_table,
     load_encoding_table,
 )
-from mathics.eval.files_io.files import eval_Close, eval_Get, eval_Open, eval_Read
+from mathics.eval.files_io.files import (
+    eval_Close,
+    eval_DumpSave,
+    eval_Get,
+    eval_Open,
+    eval_Read,
+    eval_ReadList_numbers,
+)
 from mathics.eval.files_io.read import (
     Mathics3Open,
     channel_to_stream,
@@ -228,6 +241,72 @@ class Close(Builtin):
         return eval_Close(obj, evaluation)
 
 
+class DumpSave(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/DumpSave.html</url>
+
+    <dl>
+      <dt>'DumpSave'["$file$.mx", $symbol$]
+      <dd>writes the definitions of $symbol$ to $file$ in a binary form.
+
+      <dt>'DumpSave'["$file$.mx", "$context$`"]
+      <dd>writes the definitions of all the symbols in $context$, and in \
+          its subcontexts.
+
+      <dt>'DumpSave'["$file$.mx", {$object_1$, $object_2$, ...}]
+      <dd>writes the definitions of several symbols and contexts.
+    </dl>
+
+    The definitions are read back with 'Get', without parsing or \
+    evaluating anything:
+    >> f[x_] := x ^ 2; f[0] = 1;
+    >> file = FileNameJoin[{$TemporaryDirectory, "example.mx"}];
+    >> DumpSave[file, f]
+     = {f}
+    >> Clear[f]; Get[file]; {f[0], f[3]}
+     = {1, 9}
+
+    'Get' and 'Needs' prefer an image beside the package source, as \
+    long as the image is not older than the source. So, after
+
+    'DumpSave["MyPackage.mx", "MyPackage`"]'
+
+    in the directory of "MyPackage.m", 'Needs["MyPackage`"]' loads the \
+    definitions from "MyPackage.mx", and puts '"MyPackage`"' on \
+    '$ContextPath'.
+
+    #> DeleteFile[file]; Clear[f, file]
+    """
+
+    attributes = A_HOLD_REST | A_PROTECTED
+    messages = {
+        "bsnosym": "`1` is not a symbol or a valid context name.",
+        "nopick": "The definitions of `1` can not be saved.",
+    }
+    summary_text = "write definitions of symbols or contexts in a binary form"
+
+    def eval(self, path: String, objects, evaluation: Evaluation):
+        "DumpSave[path_String, objects_]"
+        if objects.has_form("List", None):
+            specs = objects.elements
+        else:
+            specs = (objects,)
+        names = []
+        contexts = []
+        for spec in specs:
+            if isinstance(spec, Symbol):
+                names.append(spec.get_name())
+            elif isinstance(spec, String) and valid_context_name(spec.value):
+                contexts.append(spec.value)
+            else:
+                evaluation.message("DumpSave", "bsnosym", spec)
+                return SymbolFailed
+
+        if eval_DumpSave(path.value, names, contexts, evaluation) is None:
+            return SymbolFailed
+        return ListExpression(*specs)
+
+
 class EndOfFile(Builtin):
     """
     <url>:WMA link:
@@ -410,6 +489,7 @@ class Get(PrefixOperator):
     eval_error = Builtin.generic_argument_error
     expected_args = range(1, 4)
     messages = {
+        "noload": "`1` is not a definitions image that can be read by this version of Mathics3.",
         "path": "`1` in $Path is not a string",
     }
     options = {
@@ -1161,6 +1241,10 @@ class ReadList(Read):
         elif name == SymbolFailed:
             return SymbolFailed
 
+        numbers = eval_ReadList_numbers(checked_types, stream, evaluation, options)
+        if numbers is not None:
+            return numbers
+
         while True:
             next_elt = eval_Read(
                 "ReadList", n, checked_types, stream, evaluation, options
@@ -1245,6 +1329,8 @@ class StreamPosition(Builtin):
             evaluation.message("General", "openx", name)
             return
 
+        if stream.reader is not None:
+            stream.reader.sync()
         return Integer(stream.io.tell())
 
     def eval_output(self, name, n, evaluation):
@@ -1314,6 +1400,8 @@ class SetStreamPosition(Builtin):
             )
             return
 
+        # What Read[] has read ahead of the new position is discarded.
+        stream.reader = None
         try:
             if seekpos == float("inf"):
                 stream.io.seek(0, 2)
@@ -23,6 +23,8 @@ FILE_EXTENSION_MAP: dict[str, str] = {
     "tif": "TIFF",
     "txt": "Text",
     "csv": "CSV",
+    "tsv": "TSV",
+    "wxf": "WXF",
     "svg": "SVG",
     "asy": "asy",
 }
@@ -53,7 +53,6 @@ from mathics.core.list import ListExpression
 from mathics.core.streams import stream_manager
 from mathics.core.symbols import Symbol, SymbolNull, SymbolTrue
 from mathics.core.systemsymbols import (
-    SymbolByteArray,
     SymbolFailed,
     SymbolOpenWrite,
     SymbolOutputStream,
@@ -433,6 +432,9 @@ class Import(Builtin):
       <dt>'Import'["$source$", {"$fmt$", $elements$}]
       <dd>imports the specified elements from a file assuming the specified file format.
 
+      <dt>'Import'["$source$", {"$element$", $part_1$, ...}]
+      <dd>imports the parts of $element$ given by $part_1$, ..., as in 'Part'.
+
       <dt>'Import'["http://$url$", ...] and 'Import'["ftp://$url$", ...]
       <dd>imports from a URL.
     </dl>
@@ -925,7 +927,7 @@ class ExportString(Builtin):
                     evaluation.predetermined_out = current_predetermined_out
                     return SymbolFailed
                 if is_binary:
-                    res = Expression(SymbolByteArray, ByteArray(res))
+                    res = ByteArray(res)
                 else:
                     res = String(str(res))
         elif function_channels == ListExpression(String("Streams")):
@@ -950,7 +952,7 @@ class ExportString(Builtin):
             res = exporter_function.evaluate(evaluation)
             if res is SymbolNull:
                 if is_binary:
-                    res = Expression(SymbolByteArray, ByteArray(pystream.getvalue()))
+                    res = ByteArray(pystream.getvalue())
                 else:
                     res = String(str(pystream.getvalue()))
             else:
@@ -12,7 +12,15 @@ import typing
 from itertools import permutations
 from typing import Optional, Tuple
 
-from mathics.core.atoms import ByteArray, Integer, Integer1, is_integer_rational_or_real
+import numpy
+
+from mathics.core.atoms import (
+    ByteArray,
+    Integer,
+    Integer1,
+    MachineReal,
+    is_integer_rational_or_real,
+)
 from mathics.core.attributes import A_HOLD_FIRST, A_LISTABLE, A_LOCKED, A_PROTECTED
 from mathics.core.builtin import BasePattern, Builtin, IterationFunction
 from mathics.core.convert.expression import to_expression
@@ -20,9 +28,9 @@ from mathics.core.convert.sympy import from_sympy
 from mathics.core.element import ElementsProperties
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression, structure
-from mathics.core.list import ListExpression
+from mathics.core.list import PACKED_ARRAY_MIN_LENGTH, ListExpression, pack_elements
 from mathics.core.symbols import Atom, Symbol
-from mathics.core.systemsymbols import SymbolNormal, SymbolTuples
+from mathics.core.systemsymbols import SymbolNormal, SymbolTable, SymbolTuples
 from mathics.eval.lists import get_tuples
 
 
@@ -124,6 +132,10 @@ class ConstantArray(Builtin):
      = {a, a, a}
     >> ConstantArray[a, {2, 3}]
      = {{a, a, a}, {a, a, a}}
+
+    Arrays of machine numbers are packed:
+    >> Developer`PackedArrayQ[ConstantArray[1.5, {2, 3}]]
+     = True
     """
 
     summary_text = "form a constant array"
@@ -132,6 +144,22 @@ class ConstantArray(Builtin):
         "ConstantArray[c_, n_Integer]": "ConstantArray[c, {n}]",
     }
 
+    def eval_packed(self, c, dims, evaluation: Evaluation):
+        "ConstantArray[c_Integer|c_Real, dims:{__Integer}]"
+        shape = [dim.value for dim in dims.elements]
+        packed = None
+        if all(dim > 0 for dim in shape):
+            try:
+                if type(c) is Integer:
+                    packed = numpy.full(shape, c.value, dtype=numpy.int64)
+                elif type(c) is MachineReal:
+                    packed = numpy.full(shape, c.value, dtype=numpy.float64)
+            except OverflowError:
+                pass
+        if packed is None:
+            return Expression(SymbolTable, c, *(ListExpression(dim) for dim in dims))
+        return ListExpression(packed=packed)
+
 
 class List(Builtin):
     """
@@ -206,6 +234,10 @@ range_list_elements_properties = ElementsProperties(
     elements_fully_evaluated=True, is_flat=True, is_ordered=True
 )
 
+# Integer ranges are packed when their bounds and step are smaller
+# than this, so that no machine integer in numpy.arange() overflows.
+MAX_PACKED_RANGE_BOUND = 2**62
+
 
 class Range(Builtin):
     """
@@ -274,6 +306,17 @@ class Range(Builtin):
             and isinstance(di, Integer)
         ):
             pm = 1 if di.value >= 0 else -1
+            if di.value != 0 and all(
+                abs(arg.value) < MAX_PACKED_RANGE_BOUND for arg in (imin, imax, di)
+            ):
+                packed = numpy.arange(
+                    imin.value, imax.value + pm, di.value, dtype=numpy.int64
+                )
+                if len(packed) > 0:
+                    return ListExpression(
+                        packed=packed,
+                        elements_properties=range_list_elements_properties,
+                    )
             return ListExpression(
                 *[Integer(i) for i in range(imin.value, imax.value + pm, di.value)],
                 elements_properties=range_list_elements_properties,
@@ -560,6 +603,10 @@ class Table(IterationFunction):
     summary_text = "make a table of values of an expression"
 
     def get_result(self, elements, is_uniform=False) -> ListExpression:
+        if len(elements) >= PACKED_ARRAY_MIN_LENGTH:
+            packed = pack_elements(elements)
+            if packed is not None:
+                return ListExpression(packed=packed)
         return ListExpression(
             *elements,
             elements_properties=ElementsProperties(
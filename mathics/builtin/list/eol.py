@@ -1042,6 +1042,8 @@ class Length(Builtin):
 
         if isinstance(expr, Atom):
             return Integer0
+        elif isinstance(expr, ListExpression) and expr.packed is not None:
+            return Integer(len(expr.packed))
         else:
             return Integer(len(expr.elements))
 
@@ -0,0 +1,133 @@
+"""
+Packed Arrays
+
+Lists of machine-sized integers or machine-precision reals, like the \
+ones built by 'Range', 'Table', 'RandomInteger' or 'RandomReal', can be \
+stored as packed arrays. A packed array holds its numbers in a compact \
+array, and only builds its elements when they are needed. Apart from \
+being faster and smaller, packed arrays behave as ordinary lists.
+"""
+
+from mathics.core.atoms import Integer
+from mathics.core.builtin import Builtin
+from mathics.core.element import BaseElement
+from mathics.core.evaluation import Evaluation
+from mathics.core.list import ListExpression, from_packed_list, to_packed_list
+from mathics.core.symbols import SymbolFalse, SymbolTrue
+
+
+class FromPackedArray(Builtin):
+    """
+    <url>
+    :WMA link:
+    https://reference.wolfram.com/language/Developer/ref/FromPackedArray.html</url>
+
+    <dl>
+      <dt>'Developer`FromPackedArray'[$expr$]
+      <dd>unpacks $expr$, if it is a packed array.
+    </dl>
+
+    >> Developer`PackedArrayQ[Developer`FromPackedArray[Range[10]]]
+     = False
+    >> Developer`FromPackedArray[Range[10]] == Range[10]
+     = True
+    """
+
+    context = "Developer`"
+    summary_text = "unpack a packed array"
+
+    def eval(self, expr, evaluation: Evaluation):
+        "Developer`FromPackedArray[expr_]"
+        return from_packed_list(expr)
+
+
+class PackedArrayQ(Builtin):
+    """
+    <url>
+    :WMA link:
+    https://reference.wolfram.com/language/Developer/ref/PackedArrayQ.html</url>
+
+    <dl>
+      <dt>'Developer`PackedArrayQ'[$expr$]
+      <dd>returns 'True' if $expr$ is a packed array, and 'False' otherwise.
+
+      <dt>'Developer`PackedArrayQ'[$expr$, $type$]
+      <dd>returns 'True' if $expr$ is a packed array of elements of type \
+          $type$, either 'Integer' or 'Real'.
+
+      <dt>'Developer`PackedArrayQ'[$expr$, $type$, $rank$]
+      <dd>returns 'True' if $expr$ is a packed array of type $type$ and \
+          rank $rank$.
+    </dl>
+
+    >> Developer`PackedArrayQ[Range[10]]
+     = True
+    >> Developer`PackedArrayQ[{1, 2, 3}]
+     = False
+    >> Developer`PackedArrayQ[RandomReal[1, {2, 3}], Real, 2]
+     = True
+    >> Developer`PackedArrayQ[Range[10], Real]
+     = False
+    """
+
+    context = "Developer`"
+    rules = {
+        "Developer`PackedArrayQ[expr_]": "Developer`PackedArrayQ[expr, _, _]",
+        "Developer`PackedArrayQ[expr_, type_]": "Developer`PackedArrayQ[expr, type, _]",
+    }
+    summary_text = "test whether an expression is a packed array"
+
+    def eval(self, expr, head, rank, evaluation: Evaluation):
+        "Developer`PackedArrayQ[expr_, head_, rank_]"
+        if not isinstance(expr, ListExpression) or expr.packed is None:
+            return SymbolFalse
+        packed = expr.packed
+        element_head = "System`Real" if packed.dtype.kind == "f" else "System`Integer"
+        if not match_any(head, element_head) or not match_any(
+            rank, Integer(packed.ndim)
+        ):
+            return SymbolFalse
+        return SymbolTrue
+
+
+class ToPackedArray(Builtin):
+    """
+    <url>
+    :WMA link:
+    https://reference.wolfram.com/language/Developer/ref/ToPackedArray.html</url>
+
+    <dl>
+      <dt>'Developer`ToPackedArray'[$expr$]
+      <dd>packs $expr$, if it is a rectangular array of machine-sized \
+          integers or of machine-precision reals. Otherwise, $expr$ is \
+          returned unchanged.
+    </dl>
+
+    >> Developer`PackedArrayQ[Developer`ToPackedArray[{{1, 2}, {3, 4}}]]
+     = True
+
+    Lists with elements of different types are not packed:
+    >> Developer`PackedArrayQ[Developer`ToPackedArray[{1, 2.5}]]
+     = False
+    >> Developer`ToPackedArray[{a, b}]
+     = {a, b}
+    """
+
+    context = "Developer`"
+    summary_text = "pack an array of machine numbers"
+
+    def eval(self, expr, evaluation: Evaluation):
+        "Developer`ToPackedArray[expr_]"
+        return to_packed_list(expr)
+
+
+def match_any(spec: BaseElement, value) -> bool:
+    """
+    Check the type or rank `value` of a packed array against `spec`,
+    which can be a blank that matches anything.
+    """
+    if spec.has_form("Blank", 0):
+        return True
+    if isinstance(value, str):
+        return spec.get_name() == value
+    return spec == value
@@ -19,7 +19,6 @@ import sympy
 
 import mathics.eval.tracing as tracing
 from mathics.builtin.options import options_to_rules
-from mathics.builtin.scoping import dynamic_scoping
 from mathics.core.atoms import Integer, Integer0, Integer1, Number
 from mathics.core.attributes import A_LISTABLE, A_PROTECTED
 from mathics.core.builtin import Builtin
@@ -66,6 +65,7 @@ from mathics.eval.numbers.algebra.polynomial import (
 )
 from mathics.eval.numbers.algebra.simplify import eval_Simplify
 from mathics.eval.numbers.numbers import cancel, sympy_factor
+from mathics.eval.scoping import dynamic_scoping
 
 
 class _Algebraic(Builtin):
@@ -357,6 +357,8 @@ class CoefficientArrays(Builtin):
                 if dim1 == 1 and order == 0:
                     arrays[0] = coeff
                 else:
+                    # The parts are set in a copy: the evaluated table can be shared.
+                    curr_array = curr_array.shallow_copy()
                     eval_Part([curr_array], arrayidx, evaluation, coeff)
                     arrays[order] = curr_array
         return ListExpression(*arrays)
@@ -640,6 +642,7 @@ class Denominator(_Algebraic):
 # TODO: Phase this out and replace with _Algebraic
 class _Expand(Builtin):
 
+    cacheable = True
     messages = {
         "modn": "Value of option `1` -> `2` should be an integer.",
     }
@@ -993,6 +996,7 @@ class Factor(Builtin):
     """
 
     attributes = A_LISTABLE | A_PROTECTED
+    cacheable = True
     summary_text = "factor sums into product and powers"
 
     def eval(self, expr, evaluation):
@@ -1169,6 +1173,7 @@ class Simplify(Builtin):
      = Log[1048576]
     """
 
+    cacheable = True
     options = {
         "Assumptions": "$Assumptions",
         "ComplexityFunction": "Automatic",
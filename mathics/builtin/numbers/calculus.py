@@ -15,7 +15,6 @@ import numpy as np
 import sympy
 
 import mathics.eval.tracing as tracing
-from mathics.builtin.scoping import dynamic_scoping
 from mathics.core.atoms import (
     Integer,
     Integer0,
@@ -90,6 +89,7 @@ from mathics.eval.numbers.calculus.series import (
     series_plus_series,
     series_times_series,
 )
+from mathics.eval.scoping import dynamic_scoping
 from mathics.format.form_rule.calculus import format_series
 
 # These should be used in lower-level formatting
@@ -180,6 +180,7 @@ class D(SympyFunction):
     >> D[2x, 2x]
      = 0
     """
+    cacheable = True
     messages = {
         "dvar": (
             "Multiple derivative specifier `1` does not have the form "
@@ -1038,6 +1039,7 @@ class Integrate(SympyFunction):
     # >> Assuming[Abs[Arg[t]] < Pi / 2, Integrate[x/Exp[x^2/t], {x, 0, Infinity}]]
     # = t / 2
     attributes = A_PROTECTED | A_READ_PROTECTED
+    cacheable = True
 
     options = {
         "Assumptions": "$Assumptions",
@@ -1830,6 +1832,7 @@ class Series(Builtin):
 
     """
 
+    cacheable = True
     messages = {
         "icm": "Series in `1` to be combined have unequal expansion points `2` and `3`.",
         "serlim": "Series order specification `1` is not a machine-sized integer.",
@@ -514,7 +514,10 @@ class RandomInteger(Builtin):
         result = ns.to_python()
 
         with RandomEnv(evaluation) as rand:
-            return instantiate_elements(rand.randint(rmin, rmax, result), Integer)
+            values = rand.randint(rmin, rmax, result)
+            if values.ndim > 0 and values.size > 0:
+                return ListExpression(packed=values)
+            return instantiate_elements(values, Integer)
 
 
 class RandomReal(Builtin):
@@ -600,9 +603,10 @@ class RandomReal(Builtin):
         assert all(isinstance(i, int) for i in result)
 
         with RandomEnv(evaluation) as rand:
-            return instantiate_elements(
-                rand.randreal(min_value, max_value, result), Real
-            )
+            values = rand.randreal(min_value, max_value, result)
+            if values.ndim > 0 and values.size > 0:
+                return ListExpression(packed=values)
+            return instantiate_elements(values, Real)
 
 
 class RandomState(Builtin):
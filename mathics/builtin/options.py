@@ -583,6 +583,13 @@ class SetOptions(Builtin):
                 return None
             options_dict[option_symbol.name] = option_value
 
+        # Results computed with the former options, like those in the
+        # result cache, must not be used anymore.
+        definitions = evaluation.definitions
+        definitions.mark_changed(
+            definitions.get_definition(definitions.lookup_name(symbol.name))
+        )
+
         # Create and return a List with all of the options including
         # the new updated ones.
         options_list = options_to_rules(options_dict)
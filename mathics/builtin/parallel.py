@@ -0,0 +1,559 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel Computing
+
+Parallel functions evaluate parts of a computation at the same time on \
+subkernels: separate Mathics3 processes, each with its own definitions.
+
+Subkernels are launched the first time a parallel function is used, if \
+'LaunchKernels' was not called before. Definitions made in the master \
+kernel are sent to the subkernels before each parallel evaluation.
+"""
+
+from typing import Callable, List, Optional
+
+from mathics.core.atoms import Integer, String
+from mathics.core.attributes import A_FLAT, A_HOLD_ALL, A_HOLD_FIRST, A_PROTECTED
+from mathics.core.builtin import Builtin, Predefined
+from mathics.core.element import BaseElement
+from mathics.core.evaluation import Evaluation
+from mathics.core.expression import Expression
+from mathics.core.list import ListExpression
+from mathics.core.symbols import Atom, Symbol, SymbolNull, SymbolPlus
+from mathics.core.systemsymbols import (
+    SymbolAborted,
+    SymbolAssociation,
+    SymbolDo,
+    SymbolFailed,
+    SymbolJoin,
+    SymbolMap,
+    SymbolSum,
+    SymbolTable,
+)
+from mathics.eval import parallel
+from mathics.eval.parallel import (
+    SubKernel,
+    SubKernelError,
+    iterator_values,
+    kernel_pool,
+    split_evenly,
+    split_iterator,
+)
+
+sort_order = "mathics.builtin.parallel-computing"
+
+# Each computation is split into this many parts per subkernel, so that
+# subkernels done with their part first take more of the work.
+PARTS_PER_KERNEL = 4
+
+SymbolKernelObject = Symbol("System`KernelObject")
+
+
+def kernel_object(kernel: SubKernel) -> Expression:
+    return Expression(SymbolKernelObject, Integer(kernel.id), String("local"))
+
+
+def join_lists(results: List[BaseElement]) -> Optional[list]:
+    """
+    Return the elements of the lists in `results`, or None if some
+    part of the computation was aborted.
+    """
+    elements = []
+    for result in results:
+        if not isinstance(result, ListExpression):
+            return None
+        elements.extend(result.elements)
+    return elements
+
+
+class _ParallelBuiltin(Builtin):
+    messages = {
+        "subkernel": "Parallel evaluation failed: `1`. Evaluating sequentially.",
+    }
+
+    def parallel_evaluate(
+        self, make_jobs: Callable[[int], Optional[list]], evaluation: Evaluation
+    ) -> Optional[List[BaseElement]]:
+        """
+        Evaluate in parallel the expressions `make_jobs` gives when
+        called with the number of parts the computation must be split
+        into. Return their results, or None if the computation must be
+        done sequentially.
+        """
+        try:
+            kernel_pool.ensure_kernels()
+            jobs = make_jobs(PARTS_PER_KERNEL * len(kernel_pool.kernels))
+            if jobs is None:
+                return None
+            return kernel_pool.evaluate(jobs, evaluation)
+        except SubKernelError as exc:
+            evaluation.message(self.get_name(), "subkernel", str(exc))
+            return None
+
+
+class _ParallelIteration(_ParallelBuiltin):
+    attributes = A_HOLD_ALL | A_PROTECTED
+    # The function each subkernel evaluates over a part of the values of
+    # the first iterator.
+    function: Symbol
+    # Whether the function can be evaluated when the values of the first
+    # iterator can not be found, like Sum with symbolic bounds.
+    symbolic_bounds = False
+
+    def combine(self, results: List[BaseElement]) -> BaseElement:
+        """
+        Combine the results of the parts of the computation. By default,
+        the parts give lists, which are joined.
+        """
+        elements = join_lists(results)
+        if elements is None:
+            return SymbolAborted
+        return ListExpression(*elements)
+
+    def eval(self, expr, first, rest, evaluation: Evaluation):
+        "%(name)s[expr_, first_, rest___]"
+        rest = rest.get_sequence()
+        values = iterator_values(first, evaluation)
+        if values is None:
+            if self.symbolic_bounds:
+                return Expression(self.function, expr, first, *rest)
+            evaluation.message(self.get_name(), "iterb")
+            return None
+
+        def make_jobs(parts: int) -> list:
+            return [
+                Expression(self.function, expr, iterator, *rest)
+                for iterator in split_iterator(*values, parts)
+            ]
+
+        results = self.parallel_evaluate(make_jobs, evaluation)
+        if results is None:
+            return Expression(self.function, expr, first, *rest)
+        return self.combine(results)
+
+
+class CloseKernels(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/CloseKernels.html</url>
+
+    <dl>
+      <dt>'CloseKernels'[]
+      <dd>stops all the running subkernels.
+    </dl>
+
+    >> CloseKernels[];
+    >> LaunchKernels[2];
+    >> CloseKernels[]
+     = {KernelObject[1, local], KernelObject[2, local]}
+    >> $KernelCount
+     = 0
+    """
+
+    summary_text = "stop parallel subkernels"
+
+    def eval(self, evaluation: Evaluation) -> ListExpression:
+        "CloseKernels[]"
+        kernels = list(kernel_pool.kernels)
+        kernel_pool.close()
+        return ListExpression(*(kernel_object(kernel) for kernel in kernels))
+
+
+class DistributeDefinitions(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/DistributeDefinitions.html</url>
+
+    <dl>
+      <dt>'DistributeDefinitions'[$s_1$, $s_2$, ...]
+      <dd>sends the definitions of the symbols $s_i$ to all the subkernels.
+    </dl>
+
+    Parallel functions send the definitions that changed to the \
+    subkernels before evaluating anything, so 'DistributeDefinitions' \
+    is only needed before 'ParallelEvaluate' when using definitions \
+    made in the master kernel.
+
+    #> If[$KernelCount == 0, LaunchKernels[2]];
+    >> f[x_] := x ^ 2
+    >> DistributeDefinitions[f]
+     = {f}
+    >> ParallelEvaluate[f[3]] // Union
+     = {9}
+    #> Clear[f]
+    """
+
+    attributes = A_HOLD_ALL | A_PROTECTED
+    messages = {
+        "subkernel": "Parallel evaluation failed: `1`.",
+    }
+    summary_text = "send definitions to parallel subkernels"
+
+    def eval(self, symbols, evaluation: Evaluation):
+        "DistributeDefinitions[symbols___]"
+        definitions = evaluation.definitions
+        symbols = symbols.get_sequence()
+        names = []
+        for symbol in symbols:
+            if isinstance(symbol, String):
+                symbol = Symbol(definitions.lookup_name(symbol.value))
+            elif not isinstance(symbol, Symbol):
+                evaluation.message("DistributeDefinitions", "sym", symbol, 1)
+                return
+            names.append(symbol.get_name())
+        try:
+            kernel_pool.ensure_kernels()
+            kernel_pool.distribute_definitions(definitions, names)
+        except SubKernelError as exc:
+            evaluation.message("DistributeDefinitions", "subkernel", str(exc))
+            return SymbolFailed
+        return ListExpression(*(Symbol(name) for name in names))
+
+
+class KernelCount(Predefined):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/$KernelCount.html</url>
+
+    <dl>
+      <dt>'$KernelCount'
+      <dd>gives the number of running subkernels.
+    </dl>
+
+    >> CloseKernels[];
+    >> $KernelCount
+     = 0
+    >> LaunchKernels[2];
+    >> $KernelCount
+     = 2
+    """
+
+    name = "$KernelCount"
+    summary_text = "number of running parallel subkernels"
+
+    def evaluate(self, evaluation: Evaluation) -> Integer:
+        return Integer(len(kernel_pool.kernels))
+
+
+class KernelID(Predefined):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/$KernelID.html</url>
+
+    <dl>
+      <dt>'$KernelID'
+      <dd>gives the number of the kernel in which it is evaluated: 0 in \
+          the master kernel, and 1, 2, ... in subkernels.
+    </dl>
+
+    >> $KernelID
+     = 0
+    """
+
+    name = "$KernelID"
+    summary_text = "number of the current kernel"
+
+    def evaluate(self, evaluation: Evaluation) -> Integer:
+        return Integer(parallel.kernel_id)
+
+
+class KernelObject(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/KernelObject.html</url>
+
+    <dl>
+      <dt>'KernelObject'[$n$, $name$]
+      <dd>represents the subkernel with number $n$.
+    </dl>
+
+    >> CloseKernels[];
+    >> LaunchKernels[1]
+     = {KernelObject[1, local]}
+    """
+
+    summary_text = "parallel subkernel"
+
+
+class Kernels(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/Kernels.html</url>
+
+    <dl>
+      <dt>'Kernels'[]
+      <dd>gives the list of the running subkernels.
+    </dl>
+
+    >> CloseKernels[];
+    >> LaunchKernels[2];
+    >> Kernels[]
+     = {KernelObject[1, local], KernelObject[2, local]}
+    """
+
+    summary_text = "list running parallel subkernels"
+
+    def eval(self, evaluation: Evaluation) -> ListExpression:
+        "Kernels[]"
+        return ListExpression(
+            *(kernel_object(kernel) for kernel in kernel_pool.kernels)
+        )
+
+
+class LaunchKernels(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/LaunchKernels.html</url>
+
+    <dl>
+      <dt>'LaunchKernels'[]
+      <dd>starts a subkernel for each CPU of the computer, or as many as \
+          set in the 'MATHICS3_PARALLEL_KERNELS' environment variable.
+
+      <dt>'LaunchKernels'[$n$]
+      <dd>starts $n$ subkernels.
+    </dl>
+
+    >> CloseKernels[];
+    >> LaunchKernels[2]
+     = {KernelObject[1, local], KernelObject[2, local]}
+    >> LaunchKernels[1]
+     = {KernelObject[3, local]}
+    >> CloseKernels[];
+    """
+
+    messages = {
+        "nolaunch": "Subkernels could not be launched: `1`.",
+    }
+    summary_text = "start parallel subkernels"
+
+    def eval(self, evaluation: Evaluation):
+        "LaunchKernels[]"
+        return self.launch(None, evaluation)
+
+    def eval_count(self, count: Integer, evaluation: Evaluation):
+        "LaunchKernels[count_Integer?Positive]"
+        return self.launch(count.value, evaluation)
+
+    def launch(self, count: Optional[int], evaluation: Evaluation):
+        try:
+            kernels = kernel_pool.launch(count)
+        except SubKernelError as exc:
+            evaluation.message("LaunchKernels", "nolaunch", str(exc))
+            return SymbolFailed
+        return ListExpression(*(kernel_object(kernel) for kernel in kernels))
+
+
+class ParallelCombine(_ParallelBuiltin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/ParallelCombine.html</url>
+
+    <dl>
+      <dt>'ParallelCombine'[$f$, $h$[$e_1$, $e_2$, ...], $comb$]
+      <dd>evaluates $f$[$h$[$e_1$, $e_2$, ...]] by evaluating $f$ on \
+          parts $h$[$e_i$, ...] in parallel, and combining the results \
+          with $comb$.
+
+      <dt>'ParallelCombine'[$f$, $h$[$e_1$, $e_2$, ...]]
+      <dd>combines the results with $h$ if $h$ is 'Flat', and with \
+          'Join' otherwise.
+    </dl>
+
+    #> If[$KernelCount == 0, LaunchKernels[2]];
+    >> ParallelCombine[Map[#^2 &, #] &, {1, 2, 3, 4, 5}]
+     = {1, 4, 9, 16, 25}
+    >> ParallelCombine[Apply[Times, #] &, Range[10], Times]
+     = 3628800
+    >> ParallelCombine[Identity, a + b + c + d]
+     = a + b + c + d
+    """
+
+    summary_text = "evaluate a function on parts of an expression in parallel"
+
+    def eval(self, f, expr, evaluation: Evaluation):
+        "ParallelCombine[f_, expr_]"
+        if isinstance(expr, Atom):
+            return
+        head = expr.get_head()
+        if (
+            isinstance(head, Symbol)
+            and head.get_attributes(evaluation.definitions) & A_FLAT
+        ):
+            return self.eval_combine(f, expr, head, evaluation)
+        return self.eval_combine(f, expr, SymbolJoin, evaluation)
+
+    def eval_combine(self, f, expr, comb, evaluation: Evaluation):
+        "ParallelCombine[f_, expr_, comb_]"
+        if isinstance(expr, Atom):
+            return
+        head = expr.get_head()
+
+        def make_jobs(parts: int) -> list:
+            return [
+                Expression(f, Expression(head, *elements))
+                for elements in split_evenly(expr.elements, parts)
+            ]
+
+        results = self.parallel_evaluate(make_jobs, evaluation)
+        if results is None:
+            return Expression(f, expr)
+        return Expression(comb, *results)
+
+
+class ParallelDo(_ParallelIteration):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/ParallelDo.html</url>
+
+    <dl>
+      <dt>'ParallelDo'[$expr$, $iter_1$, $iter_2$, ...]
+      <dd>evaluates $expr$ like 'Do', evaluating parts of the range of \
+          $iter_1$ in parallel.
+    </dl>
+
+    #> If[$KernelCount == 0, LaunchKernels[2]];
+    Output is shown after the whole computation ends, in the order of \
+    the iteration:
+    >> ParallelDo[Print[i], {i, 3}]
+     | 1
+     | 2
+     | 3
+    """
+
+    function = SymbolDo
+    summary_text = "evaluate an expression over a range of values in parallel"
+
+    def combine(self, results: List[BaseElement]) -> BaseElement:
+        return SymbolNull
+
+
+class ParallelEvaluate(_ParallelBuiltin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/ParallelEvaluate.html</url>
+
+    <dl>
+      <dt>'ParallelEvaluate'[$expr$]
+      <dd>evaluates $expr$ on each subkernel, and gives the list of the \
+          results.
+    </dl>
+
+    >> CloseKernels[];
+    >> LaunchKernels[2];
+    >> ParallelEvaluate[$KernelID]
+     = {1, 2}
+
+    Definitions made on subkernels are not seen by the master kernel:
+    >> ParallelEvaluate[y = $KernelID ^ 2]
+     = {1, 4}
+    >> {y, ParallelEvaluate[y]}
+     = {y, {1, 4}}
+    >> CloseKernels[];
+    """
+
+    attributes = A_HOLD_FIRST | A_PROTECTED
+    messages = {
+        "subkernel": "Parallel evaluation failed: `1`.",
+    }
+    summary_text = "evaluate an expression on all subkernels"
+
+    def eval(self, expr, evaluation: Evaluation):
+        "ParallelEvaluate[expr_]"
+        try:
+            return ListExpression(*kernel_pool.evaluate_everywhere(expr, evaluation))
+        except SubKernelError as exc:
+            evaluation.message("ParallelEvaluate", "subkernel", str(exc))
+            return SymbolFailed
+
+
+class ParallelMap(_ParallelBuiltin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/ParallelMap.html</url>
+
+    <dl>
+      <dt>'ParallelMap'[$f$, $expr$]
+      <dd>applies $f$ to each element of $expr$ like 'Map', evaluating \
+          parts of $expr$ in parallel.
+    </dl>
+
+    #> If[$KernelCount == 0, LaunchKernels[2]];
+    >> ParallelMap[#^2 &, {1, 2, 3, 4}]
+     = {1, 4, 9, 16}
+    >> ParallelMap[f, a + b + c]
+     = f[a] + f[b] + f[c]
+
+    Functions defined in the master kernel are used on subkernels:
+    >> g[x_] := x + 1
+    >> ParallelMap[g, Range[5]]
+     = {2, 3, 4, 5, 6}
+    #> Clear[g]
+    """
+
+    summary_text = "apply a function to the elements of an expression in parallel"
+
+    def eval(self, f, expr, evaluation: Evaluation):
+        "ParallelMap[f_, expr_]"
+        if isinstance(expr, Atom) or expr.get_head() is SymbolAssociation:
+            return Expression(SymbolMap, f, expr)
+
+        def make_jobs(parts: int) -> list:
+            return [
+                Expression(SymbolMap, f, ListExpression(*elements))
+                for elements in split_evenly(expr.elements, parts)
+            ]
+
+        results = self.parallel_evaluate(make_jobs, evaluation)
+        if results is None:
+            return Expression(SymbolMap, f, expr)
+        elements = join_lists(results)
+        if elements is None:
+            return SymbolAborted
+        return Expression(expr.get_head(), *elements)
+
+
+class ParallelSum(_ParallelIteration):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/ParallelSum.html</url>
+
+    <dl>
+      <dt>'ParallelSum'[$expr$, $iter_1$, $iter_2$, ...]
+      <dd>evaluates the sum like 'Sum', adding parts of the range of \
+          $iter_1$ in parallel.
+    </dl>
+
+    #> If[$KernelCount == 0, LaunchKernels[2]];
+    >> ParallelSum[i ^ 2, {i, 100}]
+     = 338350
+    >> ParallelSum[x ^ i, {i, 0, 4}]
+     = 1 + x + x ^ 2 + x ^ 3 + x ^ 4
+
+    Sums whose range is not given by numbers are evaluated sequentially:
+    >> ParallelSum[i, {i, 1, n}]
+     = n (1 + n) / 2
+    """
+
+    function = SymbolSum
+    symbolic_bounds = True
+    summary_text = "evaluate a sum in parallel"
+
+    def combine(self, results: List[BaseElement]) -> BaseElement:
+        return Expression(SymbolPlus, *results)
+
+
+class ParallelTable(_ParallelIteration):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/ParallelTable.html</url>
+
+    <dl>
+      <dt>'ParallelTable'[$expr$, $iter_1$, $iter_2$, ...]
+      <dd>makes a table like 'Table', evaluating parts of the range of \
+          $iter_1$ in parallel.
+    </dl>
+
+    #> If[$KernelCount == 0, LaunchKernels[2]];
+    >> ParallelTable[i ^ 2, {i, 10}]
+     = {1, 4, 9, 16, 25, 36, 49, 64, 81, 100}
+    >> ParallelTable[{i, j}, {i, {a, b}}, {j, 2}]
+     = {{{a, 1}, {a, 2}}, {{b, 1}, {b, 2}}}
+    >> ParallelTable[x, 3]
+     = {x, x, x}
+
+    The range of the first iterator must be known:
+    >> ParallelTable[i, {i, n}]
+     : Iterator does not have appropriate bounds.
+     = ParallelTable[i, {i, n}]
+    """
+
+    function = SymbolTable
+    summary_text = "make a table of values in parallel"
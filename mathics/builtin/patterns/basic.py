@@ -5,8 +5,9 @@ Basic Pattern Objects
 """
 
 from abc import ABC
-from typing import Optional as OptionalType
+from typing import Optional as OptionalType, Tuple
 
+from mathics.core.attributes import A_FLAT, A_ORDERLESS
 from mathics.core.builtin import PatternObject
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
@@ -58,6 +59,32 @@ class _Blank(PatternObject, ABC):
             # So is this really the best thing to do here?
             self.target_head = None
 
+    def get_match_candidates(
+        self, elements: Tuple[BaseElement], pattern_context: dict
+    ) -> tuple:
+        """
+        Return the sub-tuple of elements that match with the pattern.
+
+        In an Orderless expression, these are the elements with the
+        target head, unless the expression is also Flat and has the
+        target head, as then elements can be matched together with
+        the head around them.
+        """
+        target_head = self.target_head
+        attributes = pattern_context.get("attributes", 0)
+        if target_head is None or not A_ORDERLESS & attributes:
+            return elements
+        expression = pattern_context.get("expression", None)
+        if (
+            A_FLAT & attributes
+            and expression is not None
+            and expression.get_head() is target_head
+        ):
+            return elements
+        return tuple(
+            element for element in elements if element.get_head() is target_head
+        )
+
 
 class Blank(_Blank):
     """
@@ -110,6 +137,19 @@ class Blank(_Blank):
         yield_func = pattern_context["yield_func"]
         yield_func(vars_dict, None)
 
+    def can_match_single(self, evaluation: Evaluation) -> bool:
+        return True
+
+    def match_single(
+        self, expression: BaseElement, vars_dict: dict, evaluation: Evaluation
+    ) -> OptionalType[dict]:
+        if expression.has_form("Sequence", 0):
+            return None
+        target_head = self.target_head
+        if target_head is not None and expression.get_head() is not target_head:
+            return None
+        return vars_dict
+
     @property
     def element_order(self):
         """
@@ -209,6 +209,14 @@ class HoldPattern(PatternObject):
         #     yield new_vars_dict, rest
         self.pattern.match(expression, pattern_context)
 
+    def can_match_single(self, evaluation: Evaluation) -> bool:
+        return self.pattern.can_match_single(evaluation)
+
+    def match_single(
+        self, expression: BaseElement, vars_dict: dict, evaluation: Evaluation
+    ) -> OptionalType[dict]:
+        return self.pattern.match_single(expression, vars_dict, evaluation)
+
     @property
     def element_precedence(self) -> tuple:
         """
@@ -502,6 +510,20 @@ class Pattern(PatternObject):
             if existing.sameQ(expression):
                 yield_func(vars_dict, None)
 
+    def can_match_single(self, evaluation: Evaluation) -> bool:
+        return self.pattern.can_match_single(evaluation)
+
+    def match_single(
+        self, expression: BaseElement, vars_dict: dict, evaluation: Evaluation
+    ) -> OptionalType[dict]:
+        """Match with a (named) pattern, binding the name"""
+        existing = vars_dict.get(self.varname, None)
+        if existing is None:
+            new_vars_dict = vars_dict.copy()
+            new_vars_dict[self.varname] = expression
+            return self.pattern.match_single(expression, new_vars_dict, evaluation)
+        return vars_dict if existing.sameQ(expression) else None
+
     def get_match_candidates(self, elements: tuple, pattern_context: dict) -> tuple:
         """
         Return a sub-tuple of elements that match with
@@ -735,6 +757,14 @@ class Verbatim(PatternObject):
         if self.content.sameQ(expression):
             yield_func(vars_dict, None)
 
+    def can_match_single(self, evaluation: Evaluation) -> bool:
+        return True
+
+    def match_single(
+        self, expression: BaseElement, vars_dict: dict, evaluation: Evaluation
+    ) -> OptionalType[dict]:
+        return vars_dict if self.content.sameQ(expression) else None
+
     @property
     def element_precedence(self) -> tuple:
         """
@@ -4,10 +4,11 @@ Restrictions on Patterns
 
 
 """
+
 from typing import Optional as OptionalType, Tuple
 
 from mathics.core.atoms import Integer, Number, Rational, Real, String
-from mathics.core.attributes import A_HOLD_REST, A_PROTECTED
+from mathics.core.attributes import A_HOLD_REST, A_ORDERLESS, A_PROTECTED
 from mathics.core.builtin import InfixOperator, PatternObject, Test
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
@@ -16,7 +17,7 @@ from mathics.core.keycomparable import (
     PATTERN_SORT_KEY_PATTERNTEST,
 )
 from mathics.core.pattern import BasePattern
-from mathics.core.symbols import Atom, SymbolTrue
+from mathics.core.symbols import Atom, BaseElement, SymbolTrue
 
 # This tells documentation how to sort this module
 sort_order = "mathics.builtin.rules-and-patterns.restrictions"
@@ -144,172 +145,106 @@ class PatternTest(InfixOperator, PatternObject):
         # singletonizing the Symbol class and accessing this dictionary
         # using an id() instead a string...
 
-        match_functions = {
-            "System`AtomQ": self.match_atom,
-            "System`StringQ": self.match_string,
-            "System`NumericQ": self.match_numericq,
-            "System`NumberQ": self.match_numberq,
-            "System`RealValuedNumberQ": self.match_real_numberq,
-            "Internal`RealValuedNumberQ": self.match_real_numberq,
-            "System`Posive": self.match_positive,
-            "System`Negative": self.match_negative,
-            "System`NonPositive": self.match_nonpositive,
-            "System`NonNegative": self.match_nonnegative,
+        quick_tests = {
+            "System`AtomQ": self.quick_test_atom,
+            "System`StringQ": self.quick_test_string,
+            "System`NumericQ": self.quick_test_numericq,
+            "System`NumberQ": self.quick_test_numberq,
+            "System`RealValuedNumberQ": self.quick_test_real_numberq,
+            "Internal`RealValuedNumberQ": self.quick_test_real_numberq,
+            "System`Posive": self.quick_test_positive,
+            "System`Negative": self.quick_test_negative,
+            "System`NonPositive": self.quick_test_nonpositive,
+            "System`NonNegative": self.quick_test_nonnegative,
         }
 
         self.pattern = BasePattern.create(expr.elements[0], evaluation=evaluation)
         self.test = expr.elements[1]
         testname = self.test.get_name()
         self.test_name = testname
-        match_function = match_functions.get(testname, None)
-        if match_function:
-            self.match = match_function
-
-    def match_atom(self, expression: Expression, pattern_context: dict):
-        """Match function for AtomQ"""
-        yield_func = pattern_context["yield_func"]
-
-        def yield_match(vars_2, rest):
-            items = expression.get_sequence()
-            # Here we use a `for` loop instead an all over iterator
-            # because in Cython this is faster, since it avoids a function
-            # call. For pure Python, it is the opposite.
-            for item in items:
-                if not isinstance(item, Atom):
-                    break
-            else:
-                yield_func(vars_2, None)
-
-        # TODO: clarify why we need to use copy here.
-        pattern_context = pattern_context.copy()
-        pattern_context["yield_func"] = yield_match
-        self.pattern.match(expression, pattern_context)
-
-    def match_string(self, expression: Expression, pattern_context: dict):
-        """Match function for StringQ"""
-        yield_func = pattern_context["yield_func"]
-
-        def yield_match(vars_2, rest):
-            items = expression.get_sequence()
-            for item in items:
-                if not isinstance(item, String):
-                    break
-            else:
-                yield_func(vars_2, None)
-
-        pattern_context = pattern_context.copy()
-        pattern_context["yield_func"] = yield_match
-        self.pattern.match(expression, pattern_context)
+        quick_test = quick_tests.get(testname, None)
+        if quick_test:
+            self.items_test = quick_test
+            self.match = self.match_quick
+        else:
+            self.items_test = self.full_test
+
+    def quick_test_atom(self, items, evaluation: Evaluation) -> bool:
+        """Test function for AtomQ"""
+        # Here we use a `for` loop instead an all over iterator
+        # because in Cython this is faster, since it avoids a function
+        # call. For pure Python, it is the opposite.
+        for item in items:
+            if not isinstance(item, Atom):
+                return False
+        return True
+
+    def quick_test_string(self, items, evaluation: Evaluation) -> bool:
+        """Test function for StringQ"""
+        for item in items:
+            if not isinstance(item, String):
+                return False
+        return True
+
+    def quick_test_numberq(self, items, evaluation: Evaluation) -> bool:
+        """Test function for NumberQ"""
+        for item in items:
+            if not isinstance(item, Number):
+                return False
+        return True
+
+    def quick_test_numericq(self, items, evaluation: Evaluation) -> bool:
+        """Test function for NumericQ"""
+        for item in items:
+            if not (isinstance(item, Number) or item.is_numeric(evaluation)):
+                return False
+        return True
+
+    def quick_test_real_numberq(self, items, evaluation: Evaluation) -> bool:
+        """Test function for RealValuedNumberQ"""
+        for item in items:
+            if not isinstance(item, (Integer, Rational, Real)):
+                return False
+        return True
+
+    def quick_test_positive(self, items, evaluation: Evaluation) -> bool:
+        """Test function for PositiveQ"""
+        return all(
+            isinstance(item, (Integer, Rational, Real)) and item.value > 0
+            for item in items
+        )
 
-    def match_numberq(self, expression: Expression, pattern_context: dict):
-        """Match function for NumberQ"""
-        yield_func = pattern_context["yield_func"]
+    def quick_test_negative(self, items, evaluation: Evaluation) -> bool:
+        """Test function for NegativeQ"""
+        return all(
+            isinstance(item, (Integer, Rational, Real)) and item.value < 0
+            for item in items
+        )
 
-        def yield_match(vars_2, rest):
-            items = expression.get_sequence()
-            for item in items:
-                if not isinstance(item, Number):
-                    break
-            else:
-                yield_func(vars_2, None)
+    def quick_test_nonpositive(self, items, evaluation: Evaluation) -> bool:
+        """Test function for NonPositiveQ"""
+        return all(
+            isinstance(item, (Integer, Rational, Real)) and item.value <= 0
+            for item in items
+        )
 
-        pattern_context = pattern_context.copy()
-        pattern_context["yield_func"] = yield_match
-        self.pattern.match(expression, pattern_context)
+    def quick_test_nonnegative(self, items, evaluation: Evaluation) -> bool:
+        """Test function for NonNegativeQ"""
+        return all(
+            isinstance(item, (Integer, Rational, Real)) and item.value >= 0
+            for item in items
+        )
 
-    def match_numericq(self, expression: Expression, pattern_context: dict):
-        """Match function for NumericQ"""
+    def match_quick(self, expression: Expression, pattern_context: dict):
+        """Match function for the tests that are done without evaluation"""
         yield_func = pattern_context["yield_func"]
         evaluation = pattern_context["evaluation"]
 
         def yield_match(vars_2, rest):
-            items = expression.get_sequence()
-            for item in items:
-                if not (isinstance(item, Number) or item.is_numeric(evaluation)):
-                    break
-            else:
-                yield_func(vars_2, None)
-
-        pattern_context = pattern_context.copy()
-        pattern_context["yield_func"] = yield_match
-        self.pattern.match(expression, pattern_context)
-
-    def match_real_numberq(self, expression: Expression, pattern_context: dict):
-        """Match function for RealValuedNumberQ"""
-        yield_func = pattern_context["yield_func"]
-
-        def yield_match(vars_2, rest):
-            items = expression.get_sequence()
-            for item in items:
-                if not isinstance(item, (Integer, Rational, Real)):
-                    break
-            else:
-                yield_func(vars_2, None)
-
-        pattern_context = pattern_context.copy()
-        pattern_context["yield_func"] = yield_match
-        self.pattern.match(expression, pattern_context)
-
-    def match_positive(self, expression: Expression, pattern_context: dict):
-        """Match function for PositiveQ"""
-        yield_func = pattern_context["yield_func"]
-
-        def yield_match(vars_2, rest):
-            items = expression.get_sequence()
-            if all(
-                isinstance(item, (Integer, Rational, Real)) and item.value > 0
-                for item in items
-            ):
-                yield_func(vars_2, None)
-
-        pattern_context = pattern_context.copy()
-        pattern_context["yield_func"] = yield_match
-        self.pattern.match(expression, pattern_context)
-
-    def match_negative(self, expression: Expression, pattern_context: dict):
-        """Match function for NegativeQ"""
-        yield_func = pattern_context["yield_func"]
-
-        def yield_match(vars_2, rest):
-            items = expression.get_sequence()
-            if all(
-                isinstance(item, (Integer, Rational, Real)) and item.value < 0
-                for item in items
-            ):
-                yield_func(vars_2, None)
-
-        pattern_context = pattern_context.copy()
-        pattern_context["yield_func"] = yield_match
-        self.pattern.match(expression, pattern_context)
-
-    def match_nonpositive(self, expression: Expression, pattern_context: dict):
-        """Match function for NonPositiveQ"""
-        yield_func = pattern_context["yield_func"]
-
-        def yield_match(vars_2, rest):
-            items = expression.get_sequence()
-            if all(
-                isinstance(item, (Integer, Rational, Real)) and item.value <= 0
-                for item in items
-            ):
-                yield_func(vars_2, None)
-
-        pattern_context = pattern_context.copy()
-        pattern_context["yield_func"] = yield_match
-        self.pattern.match(expression, pattern_context)
-
-    def match_nonnegative(self, expression: Expression, pattern_context: dict):
-        """Match function for NonNegativeQ"""
-        yield_func = pattern_context["yield_func"]
-
-        def yield_match(vars_2, rest):
-            items = expression.get_sequence()
-            if all(
-                isinstance(item, (Integer, Rational, Real)) and item.value >= 0
-                for item in items
-            ):
+            if self.items_test(expression.get_sequence(), evaluation):
                 yield_func(vars_2, None)
 
+        # TODO: clarify why we need to use copy here.
         pattern_context = pattern_context.copy()
         pattern_context["yield_func"] = yield_match
         self.pattern.match(expression, pattern_context)
@@ -338,6 +273,22 @@ class PatternTest(InfixOperator, PatternObject):
             return builtin.test(candidate)
         return None
 
+    def full_test(self, items, evaluation: Evaluation) -> bool:
+        """Test function evaluating the test on each item"""
+        testname = self.test_name
+        for item in items:
+            item = item.evaluate(evaluation)
+            quick_test = self.quick_pattern_test(item, testname, evaluation)
+            if quick_test is False:
+                return False
+            if quick_test is True:
+                continue
+            test_expr = Expression(self.test, item)
+            test_value = test_expr.evaluate(evaluation)
+            if test_value is not SymbolTrue:
+                return False
+        return True
+
     def match(self, expression: Expression, pattern_context: dict):
         """Match expression with PatternTest"""
         evaluation = pattern_context["evaluation"]
@@ -347,25 +298,9 @@ class PatternTest(InfixOperator, PatternObject):
         # def match(self, yield_func, expression, vars_dict, evaluation, **kwargs):
         # for vars_2, rest in self.pattern.match(expression, vars_dict, evaluation):
         def yield_match(vars_2, rest):
-            testname = self.test_name
-            items = expression.get_sequence()
-            for item in items:
-                item = item.evaluate(evaluation)
-                quick_test = self.quick_pattern_test(item, testname, evaluation)
-                if quick_test is False:
-                    break
-                if quick_test is True:
-                    continue
-                    # raise StopGenerator
-                test_expr = Expression(self.test, item)
-                test_value = test_expr.evaluate(evaluation)
-                if test_value is not SymbolTrue:
-                    break
-                    # raise StopGenerator
-            else:
+            if self.full_test(expression.get_sequence(), evaluation):
                 yield_func(vars_2, None)
 
-        # try:
         self.pattern.match(
             expression,
             {
@@ -374,12 +309,45 @@ class PatternTest(InfixOperator, PatternObject):
                 "evaluation": evaluation,
             },
         )
-        # except StopGenerator:
-        #    pass
+
+    def can_match_single(self, evaluation: Evaluation) -> bool:
+        return self.pattern.can_match_single(evaluation)
+
+    def match_single(
+        self, expression: BaseElement, vars_dict: dict, evaluation: Evaluation
+    ) -> OptionalType[dict]:
+        vars_dict = self.pattern.match_single(expression, vars_dict, evaluation)
+        if vars_dict is None or not self.items_test(
+            expression.get_sequence(), evaluation
+        ):
+            return None
+        return vars_dict
 
     def get_match_count(self, vars_dict: OptionalType[dict] = None) -> Tuple[int, int]:
         return self.pattern.get_match_count(vars_dict)
 
+    def get_match_candidates(
+        self, elements: Tuple[BaseElement], pattern_context: dict
+    ) -> tuple:
+        """
+        Return the sub-tuple of elements that match with the pattern.
+
+        In an Orderless expression, tests that are done without
+        evaluation are also applied, as they only hold for single
+        elements.
+        """
+        candidates = self.pattern.get_match_candidates(elements, pattern_context)
+        if self.items_test == self.full_test or not (
+            A_ORDERLESS & pattern_context.get("attributes", 0)
+        ):
+            return candidates
+        evaluation = pattern_context["evaluation"]
+        return tuple(
+            candidate
+            for candidate in candidates
+            if self.items_test((candidate,), evaluation)
+        )
+
     @property
     def element_order(self) -> tuple:
         """
@@ -9,11 +9,14 @@ from mathics.core.assignment import get_symbol_list
 from mathics.core.atoms import Integer, String
 from mathics.core.attributes import A_HOLD_ALL, A_PROTECTED, attribute_string_to_number
 from mathics.core.builtin import Builtin, Predefined
-from mathics.core.element import fully_qualified_symbol_name
 from mathics.core.evaluation import Evaluation
 from mathics.core.list import ListExpression
 from mathics.core.symbols import Symbol
-from mathics.eval.scoping import eval_contexts, eval_contexts_with_string
+from mathics.eval.scoping import (
+    dynamic_scoping,
+    eval_contexts,
+    eval_contexts_with_string,
+)
 
 
 def get_scoping_vars(var_list, msg_symbol="", evaluation=None):
@@ -47,29 +50,6 @@ def get_scoping_vars(var_list, msg_symbol="", evaluation=None):
             yield var_name, new_def
 
 
-def dynamic_scoping(func, vars, evaluation: Evaluation):
-    """
-    Changes temporarily the value of a set of symbols listed in vars,
-    and evaluates func(evaluation)
-    """
-    original_definitions = {}
-    for var_name, new_def in vars.items():
-        assert fully_qualified_symbol_name(var_name)
-        original_definitions[var_name] = evaluation.definitions.get_user_definition(
-            var_name
-        )
-        evaluation.definitions.reset_user_definition(var_name)
-        if new_def is not None:
-            new_def = new_def.evaluate(evaluation)
-            evaluation.definitions.set_ownvalue(var_name, new_def)
-    try:
-        result = func(evaluation)
-    finally:
-        for name, definition in original_definitions.items():
-            evaluation.definitions.add_user_definition(name, definition)
-    return result
-
-
 class Begin(Builtin):
     """
     <url>
@@ -4,7 +4,6 @@
 Sparse Array Functions
 """
 
-
 from mathics.core.atoms import Integer, Integer0
 from mathics.core.builtin import Builtin
 from mathics.core.evaluation import Evaluation
@@ -130,7 +129,8 @@ class SparseArray(Builtin):
         """System`Normal[System`SparseArray[System`Automatic, dims_List, default_, data_List]]"""
         its = [ListExpression(n) for n in dims.elements]
         table = Expression(SymbolTable, default, *its)
-        table = table.evaluate(evaluation)
+        # The parts are set in a copy: the evaluated table can be shared.
+        table = table.evaluate(evaluation).shallow_copy()
         # Now, apply the rules...
         for item in data.elements:
             pos, val = item.elements
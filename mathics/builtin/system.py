@@ -17,9 +17,10 @@ from pympler.asizeof import asizeof
 
 from mathics import settings, version_string
 from mathics.core.atoms import Integer, Integer0, IntegerM1, Real, String
-from mathics.core.attributes import A_CONSTANT
+from mathics.core.attributes import A_CONSTANT, A_HOLD_FIRST, A_PROTECTED
 from mathics.core.builtin import Builtin, Predefined
 from mathics.core.convert.expression import to_mathics_list
+from mathics.core.convert.python import from_python
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
 from mathics.core.list import ListExpression
@@ -30,6 +31,11 @@ from mathics.core.systemsymbols import (
     SymbolRule,
     SymbolSequence,
 )
+from mathics.eval.system import (
+    eval_ClearSystemCache,
+    eval_Share,
+    eval_SystemCacheStatistics,
+)
 from mathics.version import __version__
 
 try:
@@ -117,6 +123,68 @@ class Breakpoint(Builtin):
         breakpoint()
 
 
+class ClearSystemCache(Builtin):
+    """
+    <url>:WMA link:https://reference.wolfram.com/language/ref/ClearSystemCache.html</url>
+
+    <dl>
+      <dt>'ClearSystemCache[]'
+      <dd>clears the internal caches of results that may be used again, \
+          and releases the memory they use.
+      <dt>'ClearSystemCache["Numeric"]'
+      <dd>clears only the caches of numbers and numeric conversions.
+      <dt>'ClearSystemCache["Symbolic"]'
+      <dd>clears only the caches of symbolic results.
+    </dl>
+
+    It gives the number of entries removed from each cache:
+
+    >> ClearSystemCache[]
+     = {Numbers ⇾ ..., MPMath ⇾ ..., SymPy ⇾ ..., SymPyConversions ⇾ ..., Operators ⇾ ..., Definitions ⇾ ..., Results ⇾ ...}
+
+    Numbers are stored once, and shared by all the expressions that contain \
+    them. Numbers that are not used anymore are released, except the most \
+    recently created ones, which are kept in case they show up again. \
+    'ClearSystemCache["Numeric"]' releases these too:
+
+    >> ClearSystemCache["Numeric"]
+     = {Numbers ⇾ ..., MPMath ⇾ ...}
+
+    The results of functions like 'Expand' and 'Simplify', kept so that they \
+    are not computed again for the same arguments, are symbolic results:
+
+    >> Expand[(a + b) ^ 5];
+    >> "Results" /. ClearSystemCache["Symbolic"]
+     = 1
+
+    >> SystemCacheStatistics[]["Size"]
+     = 0
+    """
+
+    messages = {
+        "type": "`1` is not a valid cache type. Valid types are Numeric and Symbolic."
+    }
+    summary_text = "clear internal caches of intermediate results"
+
+    def eval(self, evaluation: Evaluation):
+        """ClearSystemCache[]"""
+        return from_python(eval_ClearSystemCache(evaluation))
+
+    def eval_type(self, kind, evaluation: Evaluation):
+        """ClearSystemCache[kind_String]"""
+        cache_type = kind.value
+        if cache_type not in ("Numeric", "Symbolic"):
+            evaluation.message("ClearSystemCache", "type", kind)
+            return None
+        return from_python(
+            eval_ClearSystemCache(
+                evaluation,
+                numeric=cache_type == "Numeric",
+                symbolic=cache_type == "Symbolic",
+            )
+        )
+
+
 class CommandLine(Predefined):
     """
     <url>:WMA link:https://reference.wolfram.com/language/ref/\\$CommandLine.html</url>
@@ -780,50 +848,77 @@ class Share(Builtin):
 
     <dl>
       <dt>'Share[]'
-      <dd>release memory forcing Python to do garbage collection. If Python package \
-          'psutil' installed is the amount of released memoryis returned. Otherwise \
-          returns $0$. This function differs from WMA which tries to reduce the amount \
-          of memory required to store definitions, by reducing duplicated definitions.
-      <dt>'Share[Symbol]'
-      <dd>Does the same thing as 'Share[]'; Note: this function differs from WMA which \
-          tries to reduce the amount of memory required to store definitions associated \
-          to $Symbol$.
-
+      <dd>stores the equal subexpressions of the values of all the symbols as \
+          one object, and returns the number of bytes of memory saved.
+      <dt>'Share[$symbol$]'
+      <dd>does the same for the values of $symbol$.
     </dl>
 
-    >> Share[]
-     = ...
+    The values include the definitions made with 'Set' and 'SetDelayed', \
+    and the input and output history kept in 'In' and 'Out'. \
+    Subexpressions holding arbitrary-precision numbers or packed arrays \
+    are not shared.
+
+    >> data = Table[{Mod[i, 3], x + y}, {i, 1000}];
+    >> Share[data] > 0
+     = True
+
+    The values do not change:
+    >> Union[data]
+     = {{0, x + y}, {1, x + y}, {2, x + y}}
+
+    Nothing is left to share afterwards:
+    >> Share[data]
+     = 0
     """
 
-    summary_text = "force Python garbage collection"
+    attributes = A_HOLD_FIRST | A_PROTECTED
+    summary_text = "share the memory of equal subexpressions in the definitions"
 
     def eval(self, evaluation: Evaluation) -> Integer:
         """Share[]"""
-        # TODO: implement a routine that swap all the definitions,
-        # collecting repeated symbols and expressions, and then
-        # replace them by references.
-        # Return the amount of memory recovered.
-        if have_psutil:
-            totalmem = psutil.virtual_memory().available
-            gc.collect()
-            return Integer(totalmem - psutil.virtual_memory().available)
-        else:
-            gc.collect()
-            return Integer0
+        return Integer(eval_Share(evaluation))
 
     def eval_with_symbol(self, symbol, evaluation: Evaluation) -> Integer:
         """Share[symbol_Symbol]"""
-        # TODO: implement a routine that swap all the definitions,
-        # collecting repeated symbols and expressions, and then
-        # replace them by references.
-        # Return the amount of memory recovered.
-        if have_psutil:
-            totalmem = psutil.virtual_memory().available
-            gc.collect()
-            return Integer(totalmem - psutil.virtual_memory().available)
-        else:
-            gc.collect()
-            return Integer0
+        return Integer(eval_Share(evaluation, (symbol.get_name(),)))
+
+
+class SystemCacheStatistics(Builtin):
+    """
+    <dl>
+      <dt>'SystemCacheStatistics[]'
+      <dd>gives an association with statistics about the cache of results of \
+          functions like 'Expand', 'Factor', 'Simplify', 'Integrate', 'D' \
+          and 'Series'.
+    </dl>
+
+    When one of these functions is evaluated again with the same arguments, \
+    its result is taken from the cache instead of being computed again, as \
+    long as the definitions of the symbols in the arguments, and \
+    '$Assumptions', were not changed since. The size of the cache is given by \
+    the environment variable 'MATHICS3_RESULT_CACHE_SIZE'.
+
+    >> ClearSystemCache[];
+    >> Expand[(x + y) ^ 3]
+     = x ^ 3 + 3 x ^ 2 y + 3 x y ^ 2 + y ^ 3
+    >> Expand[(x + y) ^ 3]
+     = x ^ 3 + 3 x ^ 2 y + 3 x y ^ 2 + y ^ 3
+
+    The second result was found in the cache:
+    >> SystemCacheStatistics[]["Builtins"]["Expand"]
+     = <|Hits ⇾ 1, Misses ⇾ 1|>
+
+    'ClearSystemCache' empties the cache:
+    >> ClearSystemCache[]; SystemCacheStatistics[]
+     = <|Hits ⇾ 0, Misses ⇾ 0, Size ⇾ 0, MaxSize ⇾ ..., Builtins ⇾ <||>|>
+    """
+
+    summary_text = "get statistics about the cache of results of builtin functions"
+
+    def eval(self, evaluation: Evaluation):
+        """SystemCacheStatistics[]"""
+        return eval_SystemCacheStatistics(evaluation)
 
 
 class SystemID(Predefined):
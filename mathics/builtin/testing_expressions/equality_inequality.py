@@ -33,6 +33,7 @@ from mathics.core.systemsymbols import (
 )
 from mathics.eval.nevaluator import eval_N
 from mathics.eval.numerify import numerify
+from mathics.eval.packed import eval_packed_min_max
 from mathics.eval.testing_expressions import do_cmp, do_cplx_equal, is_number
 
 operators = {
@@ -284,6 +285,9 @@ class _MinMax(SympyFunction):
 
     def eval(self, items, evaluation: Evaluation):
         "%(name)s[items___]"
+        result = eval_packed_min_max(items.get_sequence(), self.sense)
+        if result is not None:
+            return result
         if hasattr(items, "flatten_with_respect_to_head"):
             items = items.flatten_with_respect_to_head(SymbolList)
         items = items.get_sequence()
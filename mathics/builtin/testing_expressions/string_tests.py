@@ -280,8 +280,9 @@ class StringMatchQ(Builtin):
                     return
 
         else:
+            elements = strings.elements
             strings = []
-            for string in strings.elements:
+            for string in elements:
                 py_string = string.get_string_value()
                 if py_string is None:
                     evaluation.message(
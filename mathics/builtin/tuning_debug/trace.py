@@ -9,11 +9,11 @@ With this, it may be possible for both users and implementers to follow \
 how Mathics3 arrives at its results, or guide how to speed up expression \
 evaluation.
 
-Python <url>:CProfile:https://docs.python.org/3/library/profile.html</url> \
+'EvaluationProfile' reports the time spent in each Mathics3 function and \
+rule, and Python <url>:CProfile:https://docs.python.org/3/library/profile.html</url> \
 profiling is available via 'PythonCProfileEvaluation'.
 """
 
-
 import cProfile
 import pstats
 import sys
@@ -40,6 +40,7 @@ from mathics.core.symbols import (
     SymbolTrue,
     strip_context,
 )
+from mathics.eval.profiling import Profiler, SamplingProfiler, TracingProfiler
 
 SymbolTableForm = Symbol("System`TableForm")
 
@@ -531,6 +532,97 @@ class TraceEvaluationVariable(Builtin):
         return value
 
 
+class EvaluationProfile(Builtin):
+    """
+    ## <url>:trace native symbol:</url>
+
+    <dl>
+      <dt>'EvaluationProfile'[$expr$]
+      <dd>evaluate $expr$, and return an association with its result and \
+          the time spent in evaluating each function and applying each rule.
+    </dl>
+
+    Time is attributed to the stack of functions being evaluated, named \
+    by the head of each expression. For each function, the "InclusiveTime" \
+    includes the time spent in the functions it calls, while the \
+    "ExclusiveTime" does not. For each rule, the number of attempts to \
+    match its pattern, and of matches, are given. The "FlameGraph" element \
+    holds the stacks in the "collapsed" text format read by flamegraph \
+    tools, with times in microseconds.
+
+    Options:
+    <dl>
+      <dt>'Method'
+      <dd>"Trace" (the default) times each evaluation, and counts calls and \
+          pattern-match attempts; "Sampling" instead samples the stack \
+          being evaluated at regular intervals, which hardly slows down \
+          evaluation, but gives estimated times and no pattern-match counts.
+      <dt>'SamplingInterval'
+      <dd>the time in seconds between samples, for "Sampling".
+    </dl>
+
+    >> fib[0] = 0; fib[1] = 1; fib[n_] := fib[n - 1] + fib[n - 2];
+    >> profile = EvaluationProfile[fib[12]];
+    >> profile["Result"]
+     = 144
+    >> profile["Functions"]["fib"]["Calls"]
+     = 465
+
+    The rules for 'fib[0]' and 'fib[1]' are tried before the one for 'fib[n_]':
+    >> {profile["Rules"][HoldPattern[fib[0]]]["Attempts"], profile["Rules"][HoldPattern[fib[n_]]]["Matches"]}
+     = {321, 232}
+
+    The time spent in the builtin 'Plus' is shown below each call of 'fib':
+    >> StringContainsQ[profile["FlameGraph"], "\nfib;fib;Plus "]
+     = True
+
+    Profiles can be nested. The evaluation profiled inside is also part \
+    of the outer profile:
+    >> outer = EvaluationProfile[EvaluationProfile[fib[5]]["Result"]];
+    >> {outer["Result"], outer["Functions"]["fib"]["Calls"]}
+     = {5, 15}
+
+    >> EvaluationProfile[x, Method -> "Fast"]
+     : Method -> Fast should be "Trace" or "Sampling".
+     = EvaluationProfile[x, Method -> Fast]
+    #> Clear[fib, profile, outer]
+    """
+
+    attributes = A_HOLD_ALL | A_PROTECTED
+    messages = {
+        "bdmtd": 'Method -> `1` should be "Trace" or "Sampling".',
+        "intv": "Value of option SamplingInterval -> `1` should be a positive number.",
+    }
+    options = {
+        "Method": '"Trace"',
+        "SamplingInterval": "0.001",
+    }
+    summary_text = "profile the evaluation of functions and rules in an expression"
+
+    def eval(self, expr, evaluation: Evaluation, options: dict):
+        "EvaluationProfile[expr_, OptionsPattern[]]"
+        method = options["System`Method"].evaluate(evaluation)
+        if method.get_string_value() == "Trace":
+            profiler: Profiler = TracingProfiler()
+        elif method.get_string_value() == "Sampling":
+            interval = options["System`SamplingInterval"].evaluate(evaluation)
+            value = interval.round_to_float()
+            if value is None or value <= 0:
+                evaluation.message("EvaluationProfile", "intv", interval)
+                return None
+            profiler = SamplingProfiler(value)
+        else:
+            evaluation.message("EvaluationProfile", "bdmtd", method)
+            return None
+
+        profiler.start()
+        try:
+            result = expr.evaluate(evaluation)
+        finally:
+            profiler.stop()
+        return profiler.to_association(result)
+
+
 class PythonCProfileEvaluation(Builtin):
     """
     <url>:Python:https://docs.python.org/3/library/profile.html</url>
@@ -6,10 +6,20 @@ class CompileError(Exception):
     pass
 
 
+class CompiledRuntimeError(Exception):
+    """Compiled code failed while it ran, e.g. on a Part out of range."""
+
+    pass
+
+
 class CompileArg:
-    def __init__(self, name, type):
+    def __init__(self, name, type, rank=0):
         self.name = name
         self.type = type
+        # For tensor arguments, the number of dimensions.
+        self.rank = rank
 
     def __repr__(self):
+        if self.rank:
+            return f"{self.name}:{self.type}:{self.rank}"
         return f"{self.name}:{self.type}"
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache of compiled functions.
+
+Generating LLVM IR for an expression and turning it into machine code
+takes much longer than running the result on a few thousand points, and
+functions like ``Plot`` compile the same expression each time they are
+evaluated. Compiled functions are then kept in a cache, keyed on the
+structure of the expression and on the names and types of its
+arguments.
+
+The cache keeps the functions used most recently. The machine code of a
+function dropped from the cache is removed from the execution engine
+once nothing calls it anymore.
+
+If a cache directory is given, the machine code of each compiled
+function is also saved there, together with what is needed to call
+it, so that later sessions use it without generating code again.
+"""
+
+import hashlib
+import json
+import os
+import os.path as osp
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+import llvmlite
+import llvmlite.binding as llvm
+
+from mathics.compile.types import (
+    TensorType,
+    bool_type,
+    int_type,
+    null_type,
+    real_type,
+    void_type,
+)
+from mathics.core.atoms import String
+from mathics.core.expression import Expression
+from mathics.core.symbols import Atom, Symbol
+from mathics.version import __version__
+
+# Change this when the files in the cache directory change format, or
+# when the code generated for the same expression changes.
+CACHE_FORMAT = 2
+
+# Compiled modules, and the function each defines, are named after their
+# key with this prefix.
+MODULE_PREFIX = "mathics_"
+
+_TYPES_BY_NAME = {
+    str(type_): type_
+    for type_ in (int_type, real_type, bool_type, void_type, null_type)
+}
+
+
+def _host_key() -> str:
+    """
+    Describe what machine code depends on, apart from the expression:
+    the versions of Mathics3 and LLVM, and the host CPU.
+    """
+    return "|".join(
+        (
+            str(CACHE_FORMAT),
+            __version__,
+            llvmlite.__version__,
+            llvm.get_process_triple(),
+            llvm.get_host_cpu_name(),
+            llvm.get_host_cpu_features().flatten(),
+        )
+    )
+
+
+HOST_KEY = _host_key()
+
+
+def structural_key(expr) -> str:
+    """
+    Return a string that is the same for two expressions only if they
+    have the same heads and atoms in the same places.
+    """
+    if isinstance(expr, Symbol):
+        return expr.get_name()
+    if isinstance(expr, String):
+        return repr(expr.value)
+    if isinstance(expr, Atom):
+        return f"{type(expr).__name__}({expr.value!r})"
+    if isinstance(expr, Expression):
+        elements = ",".join(structural_key(element) for element in expr.elements)
+        return f"{structural_key(expr.head)}[{elements}]"
+    return f"{type(expr).__name__}({expr!r})"
+
+
+def type_to_str(type_) -> str:
+    if isinstance(type_, TensorType):
+        return f"tensor {type_.element_type} {type_.rank}"
+    return str(type_)
+
+
+def str_to_type(name: str):
+    if name.startswith("tensor "):
+        _, element_type, rank = name.split(" ")
+        return TensorType(_TYPES_BY_NAME[element_type], int(rank))
+    return _TYPES_BY_NAME[name]
+
+
+def compile_key(expr, args) -> str:
+    """
+    Return the key under which the function that computes `expr` from
+    the arguments `args` is cached.
+    """
+    arg_keys = (f"{arg.name}:{type_to_str(arg.type)}" for arg in args)
+    key = "|".join((HOST_KEY, structural_key(expr), *arg_keys))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def _remove_module(engine, module) -> None:
+    engine.remove_module(module)
+
+
+class CompiledModule:
+    """
+    The machine code of a compiled function, and what is needed to call
+    it. The machine code stays in the execution engine while this
+    object is alive.
+    """
+
+    def __init__(self, engine, module, func_name: str, ret_type, uses_runtime: bool):
+        self.func_name = func_name
+        self.func_ptr = engine.get_function_address(func_name)
+        self.ret_type = ret_type
+        self.uses_runtime = uses_runtime
+        finalizer = weakref.finalize(self, _remove_module, engine, module)
+        finalizer.atexit = False
+
+
+class CompiledFunctionCache:
+    """
+    The most recently used compiled functions of an execution engine,
+    by their keys. See ``compile_key()``.
+    """
+
+    def __init__(self, engine, size: int, directory: Optional[str] = None):
+        self.engine = engine
+        self.size = size
+        self.directory = directory
+        self.modules: OrderedDict = OrderedDict()
+        # Functions dropped from the cache, but still used somewhere.
+        self.live_modules = weakref.WeakValueDictionary()
+        if directory is not None:
+            engine.set_object_cache(self._save_object, self._load_object)
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def get(self, key: str) -> Optional[CompiledModule]:
+        compiled = self.modules.get(key)
+        if compiled is not None:
+            self.modules.move_to_end(key)
+            return compiled
+        compiled = self.live_modules.get(key)
+        if compiled is None and self.directory is not None:
+            compiled = self._load(key)
+        if compiled is not None:
+            self._add(key, compiled)
+        return compiled
+
+    def add(self, key: str, compiled: CompiledModule) -> None:
+        self._add(key, compiled)
+        if self.directory is not None:
+            self._save(key, compiled)
+
+    def clear(self) -> None:
+        self.modules.clear()
+
+    def _add(self, key: str, compiled: CompiledModule) -> None:
+        self.modules[key] = compiled
+        self.live_modules[key] = compiled
+        while len(self.modules) > self.size:
+            self.modules.popitem(last=False)
+
+    def _path(self, key: str, extension: str) -> str:
+        return osp.join(self.directory, MODULE_PREFIX + key + extension)
+
+    def _write(self, path: str, data: bytes) -> None:
+        # Write to a temporary file first, so that other sessions never
+        # read a file that is only partly written.
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as cache_file:
+                cache_file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+    def _save_object(self, module, buffer: bytes) -> None:
+        if module.name.startswith(MODULE_PREFIX):
+            key = module.name[len(MODULE_PREFIX) :]
+            self._write(self._path(key, ".o"), buffer)
+
+    def _load_object(self, module) -> Optional[bytes]:
+        if not module.name.startswith(MODULE_PREFIX):
+            return None
+        key = module.name[len(MODULE_PREFIX) :]
+        try:
+            with open(self._path(key, ".o"), "rb") as cache_file:
+                return cache_file.read()
+        except OSError:
+            return None
+
+    def _save(self, key: str, compiled: CompiledModule) -> None:
+        description = {
+            "ret_type": type_to_str(compiled.ret_type),
+            "uses_runtime": compiled.uses_runtime,
+        }
+        self._write(self._path(key, ".json"), json.dumps(description).encode("utf-8"))
+
+    def _load(self, key: str) -> Optional[CompiledModule]:
+        """
+        Add the machine code saved for `key` to the execution engine.
+        The module added is empty: the engine gets its machine code
+        from the cache directory instead of generating it.
+        """
+        if not osp.exists(self._path(key, ".o")):
+            return None
+        try:
+            with open(self._path(key, ".json"), "r") as description_file:
+                description = json.load(description_file)
+            ret_type = str_to_type(description["ret_type"])
+        except (OSError, ValueError, KeyError):
+            return None
+        module = llvm.parse_assembly("")
+        module.name = MODULE_PREFIX + key
+        self.engine.add_module(module)
+        self.engine.finalize_object()
+        compiled = CompiledModule(
+            self.engine,
+            module,
+            MODULE_PREFIX + key,
+            ret_type,
+            description["uses_runtime"],
+        )
+        if not compiled.func_ptr:
+            return None
+        return compiled
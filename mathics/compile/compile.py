@@ -2,13 +2,26 @@ from ctypes import CFUNCTYPE
 
 import llvmlite.binding as llvm
 
+from mathics.compile.cache import (
+    MODULE_PREFIX,
+    CompiledFunctionCache,
+    CompiledModule,
+    compile_key,
+)
 from mathics.compile.ir import IRGenerator
+from mathics.compile.runtime import RUNTIME_SYMBOLS, CompiledTensorFunction
+from mathics.compile.types import TensorType
 from mathics.compile.utils import llvm_to_ctype
+from mathics.settings import COMPILE_CACHE_DIR, COMPILE_CACHE_SIZE
 
 # setup llvm for code generation
 llvm.initialize_native_target()
 llvm.initialize_native_asmprinter()  # yes, even this one
 
+# compiled code calls back the runtime through these symbols
+for name, address in RUNTIME_SYMBOLS.items():
+    llvm.add_symbol(name, address)
+
 
 def create_execution_engine():
     """
@@ -22,36 +35,73 @@ def create_execution_engine():
     # And an execution engine with an empty backing module
     backing_mod = llvm.parse_assembly("")
     engine = llvm.create_mcjit_compiler(backing_mod, target_machine)
-    return engine
+    return engine, target_machine
+
+
+def optimize_module(mod):
+    """
+    Optimize the LLVM module `mod`, which turns the local variables of
+    loops into registers. Older versions of llvmlite, without the new
+    pass manager, leave the module as it is.
+    """
+    if not hasattr(llvm, "create_pass_builder"):
+        return
+    pass_builder = llvm.create_pass_builder(
+        target_machine, llvm.create_pipeline_tuning_options(speed_level=2)
+    )
+    pass_builder.getModulePassManager().run(mod, pass_builder)
 
 
-def compile_ir(engine, llvm_ir):
+def compile_ir(engine, llvm_ir, name=""):
     """
     Compile the LLVM IR string with the given engine.
     The compiled module object is returned.
     """
     # Create a LLVM module object from the IR
     mod = llvm.parse_assembly(llvm_ir)
+    # the object cache saves the machine code of the module under this name
+    mod.name = name
     mod.verify()
+    optimize_module(mod)
     # Now add the module and make sure it is ready for execution
     engine.add_module(mod)
     engine.finalize_object()
     return mod
 
 
-engine = create_execution_engine()
+engine, target_machine = create_execution_engine()
 
 
-def _compile(expr, args):
-    ir_gen = IRGenerator(expr, args, "mathics")
-    llvm_ir, ret_type = ir_gen.generate_ir()
-    compile_ir(engine, llvm_ir)
+compiled_functions = CompiledFunctionCache(
+    engine, COMPILE_CACHE_SIZE, COMPILE_CACHE_DIR
+)
 
-    # lookup function pointer
-    func_ptr = engine.get_function_address("mathics")
 
-    # run function via ctypes
-    cfunc = CFUNCTYPE(
-        llvm_to_ctype(ret_type), *(llvm_to_ctype(arg.type) for arg in args)
-    )(func_ptr)
+def _compile(expr, args):
+    key = compile_key(expr, args)
+    compiled = compiled_functions.get(key)
+    if compiled is None:
+        # each function gets its own name in the engine
+        func_name = MODULE_PREFIX + key
+        ir_gen = IRGenerator(expr, args, func_name)
+        llvm_ir, ret_type = ir_gen.generate_ir()
+        mod = compile_ir(engine, llvm_ir, func_name)
+        compiled = CompiledModule(engine, mod, func_name, ret_type, ir_gen.uses_runtime)
+        compiled_functions.add(key, compiled)
+    ret_type = compiled.ret_type
+
+    # functions on tensors go through the runtime
+    if (
+        compiled.uses_runtime
+        or isinstance(ret_type, TensorType)
+        or any(isinstance(arg.type, TensorType) for arg in args)
+    ):
+        cfunc = CompiledTensorFunction(compiled.func_ptr, args, ret_type)
+    else:
+        # run function via ctypes
+        cfunc = CFUNCTYPE(
+            llvm_to_ctype(ret_type), *(llvm_to_ctype(arg.type) for arg in args)
+        )(compiled.func_ptr)
+    # the machine code is kept while the function can be called
+    cfunc.compiled_module = compiled
     return cfunc
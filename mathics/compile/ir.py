@@ -5,12 +5,34 @@ from functools import reduce
 from llvmlite import ir
 
 from mathics.compile.base import CompileError
-from mathics.compile.types import bool_type, int_type, real_type, void_type
+from mathics.compile.runtime import RUNTIME_ALLOCATE, RUNTIME_FAIL
+from mathics.compile.types import (
+    TensorType,
+    bool_type,
+    int_type,
+    null_type,
+    real_type,
+    void_type,
+)
 from mathics.compile.utils import llvm_to_ctype, pairwise
-from mathics.core.atoms import Integer, Real
+from mathics.core.atoms import Integer, Integer1, IntegerM1, Real
 from mathics.core.expression import Expression
-from mathics.core.symbols import Symbol
-from mathics.core.systemsymbols import SymbolE
+from mathics.core.symbols import Symbol, SymbolFalse, SymbolNull, SymbolTrue
+from mathics.core.systemsymbols import (
+    SymbolE,
+    SymbolPlus,
+    SymbolPower,
+    SymbolSet,
+    SymbolTimes,
+)
+
+# The value of expressions that have no value, like loops.
+null_value = ir.Constant(null_type, [])
+
+# How many times the IR is generated again, at most, when the types
+# assumed for the result of the function, for local variables or for
+# sums turn out to be wrong.
+MAX_GENERATIONS = 16
 
 
 def single_real_arg(f):
@@ -28,6 +50,8 @@ def single_real_arg(f):
             return arg
         elif arg.type == int_type:
             arg = self.int_to_real(arg)
+        elif arg.type != real_type:
+            raise CompileError()
         return f(self, [arg])
 
     return wrapped_f
@@ -108,6 +132,60 @@ def bool_args(f):
     return wrapped_f
 
 
+def unify_types(types):
+    """
+    The type of a value that can have any of `types`, where integers
+    are converted to reals if needed.
+    """
+    result = types[0]
+    for typ in types[1:]:
+        if typ == result:
+            continue
+        if (typ == real_type and result == int_type) or (
+            typ == int_type and result == real_type
+        ):
+            result = real_type
+        else:
+            raise CompileError()
+    return result
+
+
+class Tensor:
+    """
+    A tensor value: a pointer to its elements, stored in row-major
+    order, and its dimensions. `owned` is True if the elements were
+    just allocated, and nothing else refers to them.
+    """
+
+    def __init__(self, ptr, dims, element_type, owned=False):
+        self.ptr = ptr
+        self.dims = dims
+        self.element_type = element_type
+        self.owned = owned
+        self.type = TensorType(element_type, len(dims))
+
+
+class LocalVariable:
+    """
+    A variable of a Module, Block or iterator, stored on the stack.
+    Its type is that of the first value assigned to it, unless it was
+    found in a previous generation of the IR (see ``key``).
+    """
+
+    def __init__(self, key):
+        # identifies the variable across generations of the IR
+        self.key = key
+        self.type = None
+        self.ptr = None
+        self.dims = None
+
+
+class Regenerate(Exception):
+    """A type was assumed incorrectly; the IR has to be generated again."""
+
+    pass
+
+
 class IRGenerator:
     def __init__(self, expr, args, func_name):
         self.expr = expr
@@ -115,59 +193,231 @@ class IRGenerator:
         self.func_name = func_name  # function name of entry point
         self.builder = None
         self._known_ret_type = None
-        self._returned_type = None
+        self._returned_types = []
+        self._local_types = {}
+        self._n_locals = 0
         self.lookup_args = None
+        self.ret_type = None
+        self.scopes = []
+        self.loops = []
+        self.uses_runtime = False
 
     def generate_ir(self):
         """
         generates LLVM IR for a given expression
         """
+        for _ in range(MAX_GENERATIONS):
+            try:
+                return self._generate_ir()
+            except Regenerate:
+                pass
+        raise CompileError()
+
+    def _generate_ir(self):
         # assume that the function returns a real. Note that this is verified by
         # looking at the type of the head of the converted expression.
         ret_type = real_type if self._known_ret_type is None else self._known_ret_type
+        self.ret_type = ret_type
+        self._returned_types = []
+        self._n_locals = 0
+        self.scopes = []
+        self.loops = []
+        self.uses_runtime = False
 
         # create an empty module
         module = ir.Module(name=__file__)
 
-        func_type = ir.FunctionType(ret_type, tuple(arg.type for arg in self.args))
+        # Tensors are passed as a pointer to their elements followed by
+        # their dimensions, and returned through pointer arguments.
+        param_types = []
+        for arg in self.args:
+            if isinstance(arg.type, TensorType):
+                param_types.append(self.check_element_type(arg.type).as_pointer())
+                param_types.extend([int_type] * arg.type.rank)
+            else:
+                param_types.append(arg.type)
+        if isinstance(ret_type, TensorType):
+            param_types.append(ret_type.element_type.as_pointer().as_pointer())
+            param_types.append(int_type.as_pointer())
+            func_type = ir.FunctionType(void_type, param_types)
+        else:
+            func_type = ir.FunctionType(ret_type, param_types)
 
         # declare a function inside the module
         func = ir.Function(module, func_type, name=self.func_name)
 
         # implement the function
         block = func.append_basic_block(name="entry")
+        self.entry_block = block
         self.builder = ir.IRBuilder(block)
 
-        self.lookup_args = {
-            arg.name: func_arg for arg, func_arg in zip(self.args, func.args)
-        }
+        self.lookup_args = {}
+        func_args = iter(func.args)
+        for arg in self.args:
+            if isinstance(arg.type, TensorType):
+                ptr = next(func_args)
+                dims = [next(func_args) for _ in range(arg.type.rank)]
+                self.lookup_args[arg.name] = Tensor(ptr, dims, arg.type.element_type)
+            else:
+                self.lookup_args[arg.name] = next(func_args)
+        if isinstance(ret_type, TensorType):
+            self.out_ptr = next(func_args)
+            self.out_dims = next(func_args)
 
         ir_code = self._gen_ir(self.expr)
+        if ir_code.type == null_type:
+            raise CompileError()
 
         # if the return type isn't correct then try again
-        if self._known_ret_type is None:
-            # determine the type returned
-            if ir_code.type == void_type:
-                if self._returned_type is not None:
-                    # we returned something so use that type
-                    self._known_ret_type = self._returned_type
-                    # force generation again in case multiple returns of different types
-                    return self.generate_ir()
-                else:
-                    # actually returned void e.g. Print[]
-                    pass
-
-            if ir_code.type != ret_type:
-                # guessed incorrectly - try again
-                self._known_ret_type = ir_code.type
-                return self.generate_ir()
+        returned_types = list(self._returned_types)
+        if ir_code.type != void_type:
+            returned_types.append(ir_code.type)
+        # if nothing was returned, the function actually returns void e.g. Print[]
+        result_type = unify_types(returned_types) if returned_types else void_type
+        if result_type != ret_type:
+            self._known_ret_type = result_type
+            raise Regenerate()
 
         # void handles its own returns
         if ir_code.type != void_type:
-            self.builder.ret(ir_code)
+            self.gen_ret(ir_code)
 
         return str(module), ret_type
 
+    def gen_ret(self, value):
+        """
+        return `value` from the function
+        """
+        builder = self.builder
+        ret_type = self.ret_type
+        self._returned_types.append(value.type)
+        if isinstance(ret_type, TensorType) and value.type == ret_type:
+            builder.store(value.ptr, self.out_ptr)
+            for i, dim in enumerate(value.dims):
+                builder.store(dim, builder.gep(self.out_dims, [int_type(i)]))
+            return builder.ret_void()
+        if value.type == int_type and ret_type == real_type:
+            value = self.int_to_real(value)
+        if value.type != ret_type:
+            # the return type was guessed incorrectly, and the IR will
+            # be generated again.
+            return builder.unreachable()
+        return builder.ret(value)
+
+    def gen_fail(self):
+        """
+        report an error to the runtime and leave the function
+        """
+        builder = self.builder
+        self.call_runtime(RUNTIME_FAIL, void_type, [])
+        ret_type = self.ret_type
+        if isinstance(ret_type, TensorType) or ret_type == void_type:
+            return builder.ret_void()
+        return builder.ret(ret_type(0))
+
+    def gen_check(self, cond):
+        """
+        fail unless the boolean `cond` is true
+        """
+        builder = self.builder
+        ok_block = builder.append_basic_block("ok")
+        fail_block = builder.append_basic_block("fail")
+        builder.cbranch(cond, ok_block, fail_block)
+        builder.position_at_end(fail_block)
+        self.gen_fail()
+        builder.position_at_end(ok_block)
+
+    def call_runtime(self, name, ret_type, args):
+        """
+        call a function of mathics.compile.runtime
+        """
+        self.uses_runtime = True
+        module = self.builder.module
+        func = module.globals.get(name)
+        if func is None:
+            fnty = ir.FunctionType(ret_type, [arg.type for arg in args])
+            func = ir.Function(module, fnty, name=name)
+        return self.builder.call(func, args)
+
+    def check_element_type(self, tensor_type):
+        if tensor_type.element_type not in (int_type, real_type):
+            raise CompileError()
+        return tensor_type.element_type
+
+    def alloca(self, typ):
+        """
+        allocate stack memory in the entry block, so that it is not
+        allocated again in loops
+        """
+        with self.builder.goto_block(self.entry_block):
+            return self.builder.alloca(typ)
+
+    def allocate_tensor(self, element_type, dims):
+        """
+        allocate a tensor with dimensions `dims`
+        """
+        builder = self.builder
+        size = reduce(self.checked_mul, dims, int_type(1))
+        nbytes = self.checked_mul(size, int_type(8))
+        address = self.call_runtime(RUNTIME_ALLOCATE, int_type, [nbytes])
+        # the runtime gives a null address if the memory can not be allocated
+        self.gen_check(builder.icmp_signed("!=", address, int_type(0)))
+        ptr = builder.inttoptr(address, element_type.as_pointer())
+        return Tensor(ptr, dims, element_type, owned=True)
+
+    def tensor_size(self, dims):
+        return reduce(self.builder.mul, dims, int_type(1))
+
+    def copy_elements(self, dest, src, count):
+        """
+        copy `count` elements from the pointer `src` to the pointer `dest`
+        """
+        builder = self.builder
+
+        def copy(k):
+            builder.store(builder.load(builder.gep(src, [k])), builder.gep(dest, [k]))
+
+        self.gen_loop(count, copy)
+
+    def copy_tensor(self, tensor):
+        result = self.allocate_tensor(tensor.element_type, tensor.dims)
+        self.copy_elements(result.ptr, tensor.ptr, self.tensor_size(tensor.dims))
+        return result
+
+    def gen_loop(self, count, body):
+        """
+        generate a loop that calls `body(k)` for k from 0 to `count` - 1.
+        Break[] and Continue[] in the body go to the end of the loop and
+        to the next iteration.
+        """
+        builder = self.builder
+        counter = self.alloca(int_type)
+        builder.store(int_type(0), counter)
+        cond_block = builder.append_basic_block("loop.cond")
+        body_block = builder.append_basic_block("loop.body")
+        next_block = builder.append_basic_block("loop.next")
+        end_block = builder.append_basic_block("loop.end")
+        builder.branch(cond_block)
+
+        builder.position_at_end(cond_block)
+        k = builder.load(counter)
+        builder.cbranch(builder.icmp_signed("<", k, count), body_block, end_block)
+
+        builder.position_at_end(body_block)
+        self.loops.append((next_block, end_block))
+        try:
+            body(k)
+        finally:
+            self.loops.pop()
+        if not builder.block.is_terminated:
+            builder.branch(next_block)
+
+        builder.position_at_end(next_block)
+        builder.store(builder.add(k, int_type(1)), counter)
+        builder.branch(cond_block)
+
+        builder.position_at_end(end_block)
+
     def call_fp_intr(self, name, args, ret_type=real_type):
         """
         call a LLVM intrinsic floating-point operation
@@ -179,6 +429,25 @@ class IRGenerator:
         intr = mod.declare_intrinsic(fullname, fnty=fnty)
         return self.builder.call(intr, args)
 
+    def checked_int_op(self, op, lhs, rhs):
+        """
+        apply the integer operation with overflow `op` of the builder,
+        and fail if the result overflows
+        """
+        builder = self.builder
+        result = op(lhs, rhs)
+        self.gen_check(builder.not_(builder.extract_value(result, 1)))
+        return builder.extract_value(result, 0)
+
+    def checked_add(self, lhs, rhs):
+        return self.checked_int_op(self.builder.sadd_with_overflow, lhs, rhs)
+
+    def checked_sub(self, lhs, rhs):
+        return self.checked_int_op(self.builder.ssub_with_overflow, lhs, rhs)
+
+    def checked_mul(self, lhs, rhs):
+        return self.checked_int_op(self.builder.smul_with_overflow, lhs, rhs)
+
     def int_to_real(self, arg):
         assert arg.type == int_type
         return self.builder.sitofp(arg, real_type)
@@ -218,9 +487,19 @@ class IRGenerator:
         walks an expression tree and constructs the ir block
         """
         if isinstance(expr, Symbol):
+            name = expr.get_name()
+            var = self.lookup_local(name)
+            if var is not None:
+                return self.load_local(var)
             try:
-                arg = self.lookup_args[expr.get_name()]
+                arg = self.lookup_args[name]
             except KeyError:
+                if expr is SymbolTrue:
+                    return bool_type(1)
+                elif expr is SymbolFalse:
+                    return bool_type(0)
+                elif expr is SymbolNull:
+                    return null_value
                 raise CompileError()
             return arg
         elif isinstance(expr, Integer):
@@ -243,14 +522,16 @@ class IRGenerator:
         return method(expr)
 
     def _gen_If(self, expr):
-        if not expr.has_form("If", 3):
+        elements = expr.elements
+        if len(elements) not in (2, 3):
             raise CompileError()
 
         builder = self.builder
-        args = expr.elements
 
         # condition
-        cond = self._gen_ir(args[0])
+        cond = self._gen_ir(elements[0])
+        if cond.type == void_type:
+            return cond
         if cond.type == int_type:
             cond = self.int_to_bool(cond)
         if cond.type != bool_type:
@@ -263,47 +544,54 @@ class IRGenerator:
         # branch to then or else block
         builder.cbranch(cond, then_block, else_block)
 
-        # results for both block
-        with builder.goto_block(then_block):
-            then_result = self._gen_ir(args[1])
-        with builder.goto_block(else_block):
-            else_result = self._gen_ir(args[2])
-
-        # type check both blocks - determine resulting type
-        if then_result.type == void_type and else_result.type == void_type:
+        # results for both block, and the blocks where they end
+        builder.position_at_end(then_block)
+        then_result = self._gen_ir(elements[1])
+        then_end = builder.block
+        builder.position_at_end(else_block)
+        else_result = self._gen_ir(elements[2]) if len(elements) == 3 else null_value
+        else_end = builder.block
+
+        branches = [
+            (result, end)
+            for result, end in ((then_result, then_end), (else_result, else_end))
+            if result.type != void_type
+        ]
+        if not branches:
             # both blocks terminate so no continuation block
             return then_result
-        elif then_result.type == else_result.type:
-            ret_type = then_result.type
-        elif then_result.type == int_type and else_result.type == real_type:
-            builder.position_at_end(then_block)
-            then_result = self.int_to_real(then_result)
-            ret_type = real_type
-        elif then_result.type == real_type and else_result.type == int_type:
-            builder.position_at_end(else_block)
-            else_result = self.int_to_real(else_result)
-            ret_type = real_type
-        elif then_result.type == void_type and else_result.type != void_type:
-            ret_type = else_result.type
-        elif then_result.type != void_type and else_result.type == void_type:
-            ret_type = then_result.type
-        else:
-            raise CompileError()
+
+        # type check both blocks - determine resulting type. If the types
+        # do not match, the value of the If can not be used.
+        try:
+            ret_type = unify_types([result.type for result, _ in branches])
+        except CompileError:
+            ret_type = null_type
 
         # continuation block
         cont_block = builder.append_basic_block()
-        builder.position_at_start(cont_block)
+        incoming = []
+        for result, end in branches:
+            builder.position_at_end(end)
+            if ret_type == real_type and result.type == int_type:
+                result = self.int_to_real(result)
+            builder.branch(cont_block)
+            incoming.append((result, end))
+
+        builder.position_at_end(cont_block)
+        if ret_type == null_type:
+            return null_value
+        if isinstance(ret_type, TensorType):
+            ptr = builder.phi(ret_type.element_type.as_pointer())
+            dims = [builder.phi(int_type) for _ in range(ret_type.rank)]
+            for result, end in incoming:
+                ptr.add_incoming(result.ptr, end)
+                for dim, result_dim in zip(dims, result.dims):
+                    dim.add_incoming(result_dim, end)
+            return Tensor(ptr, dims, ret_type.element_type)
         result = builder.phi(ret_type)
-
-        # both blocks branch to continuation block (unless they terminate)
-        if then_result.type != void_type:
-            with builder.goto_block(then_block):
-                builder.branch(cont_block)
-            result.add_incoming(then_result, then_block)
-        if else_result.type != void_type:
-            with builder.goto_block(else_block):
-                builder.branch(cont_block)
-            result.add_incoming(else_result, else_block)
+        for value, end in incoming:
+            result.add_incoming(value, end)
         return result
 
     def _gen_Return(self, expr):
@@ -314,36 +602,23 @@ class IRGenerator:
         arg = self._gen_ir(elements[0])
         if arg.type == void_type:
             return arg
-
-        if self._returned_type == arg.type:
-            pass
-        elif self._returned_type is None:
-            self._returned_type = arg.type
-        elif self._returned_type == real_type and arg.type == int_type:
-            arg = self.int_to_real(arg)
-        elif self._returned_type == int_type and arg.type == real_type:
-            self._returned_type = arg.type
-        else:
-            raise CompileError(
-                "Conflicting return types {} and {}.".format(
-                    self._returned_type, arg.type
-                )
-            )
-        return self.builder.ret(arg)
+        if arg.type == null_type:
+            raise CompileError()
+        return self.gen_ret(arg)
 
     @int_real_args(1)
     def _gen_Plus(self, args, ret_type):
         if ret_type == real_type:
             return reduce(self.builder.fadd, args)
         elif ret_type == int_type:
-            return reduce(self.builder.add, args)
+            return reduce(self.checked_add, args)
 
     @int_real_args(1)
     def _gen_Times(self, args, ret_type):
         if ret_type == real_type:
             return reduce(self.builder.fmul, args)
         elif ret_type == int_type:
-            return reduce(self.builder.mul, args)
+            return reduce(self.checked_mul, args)
 
     def _gen_Power(self, expr):
         # TODO (int_type, int_type) power
@@ -428,7 +703,7 @@ class IRGenerator:
         arg = args[0]
         if ret_type == int_type:
             # FIXME better way to do this?
-            neg_arg = self.builder.mul(arg, int_type(-1))
+            neg_arg = self.checked_sub(int_type(0), arg)
             cond = self.builder.icmp_signed("<", arg, int_type(0))
             return self.builder.select(cond, neg_arg, arg)
         elif ret_type == real_type:
@@ -627,3 +902,626 @@ class IRGenerator:
     @int_args
     def _gen_BitNot(self, args):
         return self.builder.not_(args[0])
+
+    def lookup_local(self, name):
+        for scope in reversed(self.scopes):
+            var = scope.get(name)
+            if var is not None:
+                return var
+        return None
+
+    def new_local(self):
+        """
+        create a local variable, with the type found for it in previous
+        generations of the IR, if any
+        """
+        var = LocalVariable(self._n_locals)
+        self._n_locals += 1
+        typ = self._local_types.get(var.key)
+        if typ is not None:
+            self.allocate_local(var, typ)
+        return var
+
+    def allocate_local(self, var, typ):
+        builder = self.builder
+        var.type = typ
+        # variables start as zero, or as an empty tensor
+        with builder.goto_block(self.entry_block):
+            if isinstance(typ, TensorType):
+                ptr_type = typ.element_type.as_pointer()
+                var.ptr = builder.alloca(ptr_type)
+                builder.store(ptr_type(None), var.ptr)
+                var.dims = [builder.alloca(int_type) for _ in range(typ.rank)]
+                for dim in var.dims:
+                    builder.store(int_type(0), dim)
+            else:
+                var.ptr = builder.alloca(typ)
+                builder.store(typ(0), var.ptr)
+
+    def load_local(self, var):
+        if var.type is None:
+            # the variable is used before anything is assigned to it
+            raise CompileError()
+        builder = self.builder
+        if isinstance(var.type, TensorType):
+            dims = [builder.load(dim) for dim in var.dims]
+            return Tensor(builder.load(var.ptr), dims, var.type.element_type)
+        return builder.load(var.ptr)
+
+    def store_local(self, var, value, copy=True):
+        """
+        assign `value` to the local variable `var`. Tensors are copied,
+        unless they are owned by nobody else or `copy` is False.
+        """
+        if not isinstance(value, Tensor) and value.type not in (
+            int_type,
+            real_type,
+            bool_type,
+        ):
+            raise CompileError()
+        if var.type is None:
+            self.allocate_local(var, value.type)
+        if value.type != var.type:
+            if var.type == real_type and value.type == int_type:
+                value = self.int_to_real(value)
+            elif var.type == int_type and value.type == real_type:
+                # the variable has to hold reals
+                self._local_types[var.key] = real_type
+                raise Regenerate()
+            else:
+                raise CompileError()
+
+        builder = self.builder
+        if isinstance(value, Tensor):
+            if copy and not value.owned:
+                value = self.copy_tensor(value)
+            builder.store(value.ptr, var.ptr)
+            for dim, value_dim in zip(var.dims, value.dims):
+                builder.store(value_dim, dim)
+            return Tensor(value.ptr, value.dims, value.element_type)
+        builder.store(value, var.ptr)
+        return value
+
+    def gen_condition(self, expr):
+        cond = self._gen_ir(expr)
+        if cond.type == int_type:
+            cond = self.int_to_bool(cond)
+        if cond.type != bool_type:
+            raise CompileError()
+        return cond
+
+    def gen_index(self, expr, dim):
+        """
+        the zero-based position of the part `expr` in a dimension of
+        size `dim`; fails if it is out of range
+        """
+        index = self._gen_ir(expr)
+        if index.type != int_type:
+            raise CompileError()
+        builder = self.builder
+        # negative indices count from the end
+        index = builder.select(
+            builder.icmp_signed("<", index, int_type(0)),
+            builder.add(index, dim),
+            builder.sub(index, int_type(1)),
+        )
+        self.gen_check(builder.icmp_unsigned("<", index, dim))
+        return index
+
+    def element_pointer(self, tensor, indices):
+        """
+        pointer to the part of `tensor` at `indices`, which can be less
+        than the rank of the tensor
+        """
+        builder = self.builder
+        offset = int_type(0)
+        for index, dim in zip(indices, tensor.dims):
+            offset = builder.add(builder.mul(offset, dim), self.gen_index(index, dim))
+        for dim in tensor.dims[len(indices) :]:
+            offset = builder.mul(offset, dim)
+        return builder.gep(tensor.ptr, [offset])
+
+    def gen_iterator(self, spec):
+        """
+        Generate the number of steps of the iterator `spec`. Return the
+        name of the iteration variable (None if there is none), the
+        number of steps, and a function that generates the value of the
+        variable at a step.
+        """
+        if not spec.has_form("List", None):
+            name, bounds = None, [spec]
+        elif len(spec.elements) == 1:
+            name, bounds = None, spec.elements
+        elif len(spec.elements) <= 4 and isinstance(spec.elements[0], Symbol):
+            name, bounds = spec.elements[0].get_name(), spec.elements[1:]
+        else:
+            raise CompileError()
+
+        builder = self.builder
+        values = [self._gen_ir(bound) for bound in bounds]
+        if len(values) == 1 and name is not None and isinstance(values[0], Tensor):
+            # {i, list}
+            tensor = values[0]
+            inner_dims = tensor.dims[1:]
+            inner_size = self.tensor_size(inner_dims)
+
+            def tensor_value(k):
+                ptr = builder.gep(tensor.ptr, [builder.mul(k, inner_size)])
+                if inner_dims:
+                    return Tensor(ptr, inner_dims, tensor.element_type)
+                return builder.load(ptr)
+
+            return name, tensor.dims[0], tensor_value
+
+        if any(value.type not in (int_type, real_type) for value in values):
+            raise CompileError()
+        if len(values) == 1:
+            start, stop, step = int_type(1), values[0], int_type(1)
+        elif len(values) == 2:
+            (start, stop), step = values, int_type(1)
+        else:
+            start, stop, step = values
+
+        if isinstance(step, ir.Constant):
+            if step.constant == 0:
+                raise CompileError()
+        elif step.type == int_type:
+            self.gen_check(builder.icmp_signed("!=", step, int_type(0)))
+        else:
+            self.gen_check(builder.fcmp_ordered("!=", step, real_type(0.0)))
+
+        if all(value.type == int_type for value in (start, stop, step)):
+            diff = self.checked_sub(stop, start)
+            # the division of the smallest integer by -1 overflows
+            self.gen_check(builder.icmp_signed("!=", diff, int_type(-(2**63))))
+            # no steps if the bounds are in the wrong order. Otherwise,
+            # the division, which truncates, rounds down.
+            wrong_order = builder.and_(
+                builder.icmp_signed("!=", diff, int_type(0)),
+                builder.xor(
+                    builder.icmp_signed("<", diff, int_type(0)),
+                    builder.icmp_signed("<", step, int_type(0)),
+                ),
+            )
+            count = builder.select(
+                wrong_order,
+                int_type(0),
+                self.checked_add(builder.sdiv(diff, step), int_type(1)),
+            )
+        else:
+            real_start, real_stop, real_step = (
+                self.int_to_real(value) if value.type == int_type else value
+                for value in (start, stop, step)
+            )
+            steps = self.call_fp_intr(
+                "llvm.floor",
+                [builder.fdiv(builder.fsub(real_stop, real_start), real_step)],
+            )
+            real_count = builder.fadd(steps, real_type(1.0))
+            self.gen_check(builder.fcmp_ordered("<", real_count, real_type(2.0**62)))
+            count = builder.select(
+                builder.fcmp_ordered(">", real_count, real_type(0.0)),
+                builder.fptosi(real_count, int_type),
+                int_type(0),
+            )
+
+        if start.type == int_type and step.type == int_type:
+
+            def range_value(k):
+                return builder.add(start, builder.mul(k, step))
+
+        else:
+
+            def range_value(k):
+                return builder.fadd(
+                    real_start, builder.fmul(self.int_to_real(k), real_step)
+                )
+
+        return name, count, range_value
+
+    def gen_iterations(self, iterator, body, breakable=True):
+        """
+        generate a loop over `iterator`, that calls `body(k)` at each
+        step k with the iteration variable set
+        """
+        name, count, value_at = iterator
+        scope = {}
+        if name is not None:
+            scope[name] = self.new_local()
+
+        def step(k):
+            if name is not None:
+                self.store_local(scope[name], value_at(k), copy=False)
+            self.scopes.append(scope)
+            if not breakable:
+                self.loops.append(None)
+            try:
+                body(k)
+            finally:
+                self.scopes.pop()
+                if not breakable:
+                    self.loops.pop()
+
+        self.gen_loop(count, step)
+
+    def nested_iterations(self, expr):
+        """
+        F[body, spec1, spec2, ...] is F[F[body, spec2, ...], spec1]
+        for Do, Sum and Table
+        """
+        elements = expr.elements
+        if len(elements) < 2:
+            raise CompileError()
+        body = elements[0]
+        if len(elements) > 2:
+            body = Expression(expr.head, body, *elements[2:])
+        return body, elements[1]
+
+    def _gen_Module(self, expr):
+        elements = expr.elements
+        if len(elements) != 2 or not elements[0].has_form("List", None):
+            raise CompileError()
+        scope = {}
+        for spec in elements[0].elements:
+            if isinstance(spec, Symbol):
+                scope[spec.get_name()] = self.new_local()
+            elif spec.has_form("Set", 2) and isinstance(spec.elements[0], Symbol):
+                # initial values are computed outside of the scope
+                value = self._gen_ir(spec.elements[1])
+                if value.type == void_type:
+                    return value
+                var = self.new_local()
+                self.store_local(var, value)
+                scope[spec.elements[0].get_name()] = var
+            else:
+                raise CompileError()
+        self.scopes.append(scope)
+        try:
+            return self._gen_ir(elements[1])
+        finally:
+            self.scopes.pop()
+
+    # Compiled code does not call other functions, so the variables of
+    # Block and With behave as those of Module.
+    _gen_Block = _gen_Module
+    _gen_With = _gen_Module
+
+    def _gen_CompoundExpression(self, expr):
+        result = null_value
+        for element in expr.elements:
+            result = self._gen_ir(element)
+            if result.type == void_type:
+                # the rest is never reached
+                break
+        return result
+
+    def _gen_Set(self, expr):
+        elements = expr.elements
+        if len(elements) != 2:
+            raise CompileError()
+        lhs, rhs = elements
+        if lhs.has_form("Part", 2, None):
+            return self.gen_set_part(lhs, rhs)
+
+        # only local variables can be assigned
+        var = self.lookup_local(lhs.get_name()) if isinstance(lhs, Symbol) else None
+        if var is None:
+            raise CompileError()
+        value = self._gen_ir(rhs)
+        if value.type == void_type:
+            return value
+        return self.store_local(var, value)
+
+    def gen_set_part(self, lhs, rhs):
+        target, *indices = lhs.elements
+        if not isinstance(target, Symbol):
+            raise CompileError()
+        value = self._gen_ir(rhs)
+        if value.type == void_type:
+            return value
+        tensor = self._gen_ir(target)
+        if not isinstance(tensor, Tensor) or len(indices) != len(tensor.dims):
+            raise CompileError()
+        if value.type == int_type and tensor.element_type == real_type:
+            value = self.int_to_real(value)
+        elif value.type != tensor.element_type:
+            raise CompileError()
+        self.builder.store(value, self.element_pointer(tensor, indices))
+        return value
+
+    def gen_update(self, expr, update):
+        """
+        x op= y is x = update(x, y)
+        """
+        if len(expr.elements) != 2:
+            raise CompileError()
+        lhs, rhs = expr.elements
+        return self._gen_ir(Expression(SymbolSet, lhs, update(lhs, rhs)))
+
+    def _gen_AddTo(self, expr):
+        return self.gen_update(expr, lambda x, y: Expression(SymbolPlus, x, y))
+
+    def _gen_SubtractFrom(self, expr):
+        return self.gen_update(
+            expr,
+            lambda x, y: Expression(
+                SymbolPlus, x, Expression(SymbolTimes, IntegerM1, y)
+            ),
+        )
+
+    def _gen_TimesBy(self, expr):
+        return self.gen_update(expr, lambda x, y: Expression(SymbolTimes, x, y))
+
+    def _gen_DivideBy(self, expr):
+        return self.gen_update(
+            expr,
+            lambda x, y: Expression(
+                SymbolTimes, x, Expression(SymbolPower, y, IntegerM1)
+            ),
+        )
+
+    def gen_increment(self, expr, delta, pre):
+        """
+        ++x (`pre` is True) or x++, and the decrements, that add `delta` to x
+        """
+        if len(expr.elements) != 1:
+            raise CompileError()
+        lhs = expr.elements[0]
+        old = None
+        if not pre:
+            # x++ gives the value before the increment
+            old = self._gen_ir(lhs)
+            if old.type == void_type:
+                return old
+        result = self._gen_ir(
+            Expression(SymbolSet, lhs, Expression(SymbolPlus, lhs, delta))
+        )
+        if old is None or result.type == void_type:
+            return result
+        return old
+
+    def _gen_PreIncrement(self, expr):
+        return self.gen_increment(expr, Integer1, True)
+
+    def _gen_PreDecrement(self, expr):
+        return self.gen_increment(expr, IntegerM1, True)
+
+    def _gen_Increment(self, expr):
+        return self.gen_increment(expr, Integer1, False)
+
+    def _gen_Decrement(self, expr):
+        return self.gen_increment(expr, IntegerM1, False)
+
+    def _gen_Do(self, expr):
+        body, spec = self.nested_iterations(expr)
+        self.gen_iterations(self.gen_iterator(spec), lambda k: self._gen_ir(body))
+        return null_value
+
+    def _gen_While(self, expr):
+        elements = expr.elements
+        if len(elements) not in (1, 2):
+            raise CompileError()
+        builder = self.builder
+        cond_block = builder.append_basic_block("while.cond")
+        body_block = builder.append_basic_block("while.body")
+        end_block = builder.append_basic_block("while.end")
+        builder.branch(cond_block)
+
+        builder.position_at_end(cond_block)
+        builder.cbranch(self.gen_condition(elements[0]), body_block, end_block)
+
+        builder.position_at_end(body_block)
+        if len(elements) == 2:
+            self.loops.append((cond_block, end_block))
+            try:
+                self._gen_ir(elements[1])
+            finally:
+                self.loops.pop()
+        if not builder.block.is_terminated:
+            builder.branch(cond_block)
+
+        builder.position_at_end(end_block)
+        return null_value
+
+    def _gen_For(self, expr):
+        elements = expr.elements
+        if len(elements) not in (3, 4):
+            raise CompileError()
+        builder = self.builder
+        start = self._gen_ir(elements[0])
+        if start.type == void_type:
+            return start
+        cond_block = builder.append_basic_block("for.cond")
+        body_block = builder.append_basic_block("for.body")
+        incr_block = builder.append_basic_block("for.incr")
+        end_block = builder.append_basic_block("for.end")
+        builder.branch(cond_block)
+
+        builder.position_at_end(cond_block)
+        builder.cbranch(self.gen_condition(elements[1]), body_block, end_block)
+
+        builder.position_at_end(body_block)
+        if len(elements) == 4:
+            self.loops.append((incr_block, end_block))
+            try:
+                self._gen_ir(elements[3])
+            finally:
+                self.loops.pop()
+        if not builder.block.is_terminated:
+            builder.branch(incr_block)
+
+        builder.position_at_end(incr_block)
+        self._gen_ir(elements[2])
+        if not builder.block.is_terminated:
+            builder.branch(cond_block)
+
+        builder.position_at_end(end_block)
+        return null_value
+
+    def _gen_Break(self, expr):
+        # Break[] can not leave a Table or a Sum.
+        if expr.elements or not self.loops or self.loops[-1] is None:
+            raise CompileError()
+        return self.builder.branch(self.loops[-1][1])
+
+    def _gen_Continue(self, expr):
+        if expr.elements or not self.loops or self.loops[-1] is None:
+            raise CompileError()
+        return self.builder.branch(self.loops[-1][0])
+
+    def _gen_Table(self, expr):
+        body, spec = self.nested_iterations(expr)
+        builder = self.builder
+        _, count, _ = iterator = self.gen_iterator(spec)
+        preheader = builder.block
+        result = {}
+
+        def step(k):
+            value = self._gen_ir(body)
+            if isinstance(value, Tensor):
+                element_type, inner_dims = value.element_type, value.dims
+            elif value.type in (int_type, real_type):
+                element_type, inner_dims = value.type, []
+            else:
+                raise CompileError()
+
+            # The result is allocated at the first step, when the dimensions
+            # of its elements are known. Until then, it is empty.
+            ptr_var = self.alloca(element_type.as_pointer())
+            dim_vars = [self.alloca(int_type) for _ in inner_dims]
+            with builder.goto_block(preheader):
+                builder.store(element_type.as_pointer()(None), ptr_var)
+                for dim_var in dim_vars:
+                    builder.store(int_type(0), dim_var)
+            result.update(element_type=element_type, ptr=ptr_var, dims=dim_vars)
+
+            with builder.if_else(builder.icmp_signed("==", k, int_type(0))) as (
+                first,
+                other,
+            ):
+                with first:
+                    tensor = self.allocate_tensor(element_type, [count] + inner_dims)
+                    builder.store(tensor.ptr, ptr_var)
+                    for dim_var, dim in zip(dim_vars, inner_dims):
+                        builder.store(dim, dim_var)
+                with other:
+                    # all the elements must have the same dimensions
+                    if inner_dims:
+                        self.gen_check(
+                            reduce(
+                                builder.and_,
+                                (
+                                    builder.icmp_signed(
+                                        "==", builder.load(dim_var), dim
+                                    )
+                                    for dim_var, dim in zip(dim_vars, inner_dims)
+                                ),
+                            )
+                        )
+
+            ptr = builder.load(ptr_var)
+            if inner_dims:
+                inner_size = self.tensor_size(inner_dims)
+                self.copy_elements(
+                    builder.gep(ptr, [builder.mul(k, inner_size)]),
+                    value.ptr,
+                    inner_size,
+                )
+            else:
+                builder.store(value, builder.gep(ptr, [k]))
+
+        self.gen_iterations(iterator, step, breakable=False)
+        dims = [count] + [builder.load(dim_var) for dim_var in result["dims"]]
+        return Tensor(
+            builder.load(result["ptr"]), dims, result["element_type"], owned=True
+        )
+
+    def _gen_Sum(self, expr):
+        body, spec = self.nested_iterations(expr)
+        builder = self.builder
+        iterator = self.gen_iterator(spec)
+        preheader = builder.block
+        result = {}
+
+        def step(k):
+            value = self._gen_ir(body)
+            if isinstance(value, Tensor) or value.type not in (int_type, real_type):
+                raise CompileError()
+            total = self.alloca(value.type)
+            with builder.goto_block(preheader):
+                builder.store(value.type(0), total)
+            if value.type == real_type:
+                builder.store(builder.fadd(builder.load(total), value), total)
+            else:
+                builder.store(self.checked_add(builder.load(total), value), total)
+            result["total"] = total
+
+        self.gen_iterations(iterator, step, breakable=False)
+        return builder.load(result["total"])
+
+    def _gen_Part(self, expr):
+        elements = expr.elements
+        if len(elements) < 2:
+            raise CompileError()
+        tensor = self._gen_ir(elements[0])
+        indices = elements[1:]
+        if not isinstance(tensor, Tensor) or len(indices) > len(tensor.dims):
+            raise CompileError()
+        ptr = self.element_pointer(tensor, indices)
+        if len(indices) == len(tensor.dims):
+            return self.builder.load(ptr)
+        return Tensor(ptr, tensor.dims[len(indices) :], tensor.element_type)
+
+    def _gen_Length(self, expr):
+        if len(expr.elements) != 1:
+            raise CompileError()
+        arg = self._gen_ir(expr.elements[0])
+        if isinstance(arg, Tensor):
+            return arg.dims[0]
+        elif arg.type in (int_type, real_type, bool_type):
+            return int_type(0)
+        raise CompileError()
+
+    def _gen_List(self, expr):
+        builder = self.builder
+        values = [self._gen_ir(element) for element in expr.elements]
+        if not values:
+            raise CompileError()
+        for value in values:
+            if value.type == void_type:
+                return value
+
+        if all(isinstance(value, Tensor) for value in values):
+            # a tensor of higher rank: the elements must have the same
+            # dimensions
+            first = values[0]
+            if any(value.type != first.type for value in values):
+                raise CompileError()
+            for value in values[1:]:
+                self.gen_check(
+                    reduce(
+                        builder.and_,
+                        (
+                            builder.icmp_signed("==", dim, first_dim)
+                            for dim, first_dim in zip(value.dims, first.dims)
+                        ),
+                    )
+                )
+            result = self.allocate_tensor(
+                first.element_type, [int_type(len(values))] + first.dims
+            )
+            inner_size = self.tensor_size(first.dims)
+            for i, value in enumerate(values):
+                dest = builder.gep(result.ptr, [builder.mul(int_type(i), inner_size)])
+                self.copy_elements(dest, value.ptr, inner_size)
+            return result
+
+        if any(value.type not in (int_type, real_type) for value in values):
+            raise CompileError()
+        element_type = unify_types([value.type for value in values])
+        result = self.allocate_tensor(element_type, [int_type(len(values))])
+        for i, value in enumerate(values):
+            if value.type != element_type:
+                value = self.int_to_real(value)
+            builder.store(value, builder.gep(result.ptr, [int_type(i)]))
+        return result
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Runtime support for compiled code.
+
+Compiled code that builds tensors, or that can fail while it runs (for
+example, because a ``Part`` is out of range), calls back the functions
+defined here. ``CompiledTensorFunction`` wraps such compiled code: it
+passes tensor arguments as pointers to NumPy buffers, collects the
+memory allocated during the call, and converts a tensor result back
+into a NumPy array.
+"""
+
+import ctypes
+import threading
+from typing import List, Optional
+
+import numpy
+
+from mathics.compile.base import CompiledRuntimeError
+from mathics.compile.types import TensorType, real_type
+from mathics.compile.utils import llvm_to_ctype
+
+# Names of the functions compiled code calls back.
+RUNTIME_ALLOCATE = "mathics_runtime_allocate"
+RUNTIME_FAIL = "mathics_runtime_fail"
+
+
+class RuntimeState:
+    """The memory allocated and the errors found during one call."""
+
+    def __init__(self):
+        self.arrays: List[numpy.ndarray] = []
+        self.failed = False
+
+
+_local = threading.local()
+
+
+def _allocate(nbytes: int) -> int:
+    # An exception can not cross the ctypes callback, so a failure is
+    # reported to compiled code as a null address.
+    try:
+        array = numpy.empty(max(nbytes, 1), dtype=numpy.uint8)
+    except (MemoryError, ValueError):
+        _local.state.failed = True
+        return 0
+    _local.state.arrays.append(array)
+    return array.ctypes.data
+
+
+def _fail() -> None:
+    _local.state.failed = True
+
+
+# The ctypes callbacks must be kept alive while compiled code can call them.
+_allocate_callback = ctypes.CFUNCTYPE(ctypes.c_int64, ctypes.c_int64)(_allocate)
+_fail_callback = ctypes.CFUNCTYPE(None)(_fail)
+
+RUNTIME_SYMBOLS = {
+    RUNTIME_ALLOCATE: ctypes.cast(_allocate_callback, ctypes.c_void_p).value,
+    RUNTIME_FAIL: ctypes.cast(_fail_callback, ctypes.c_void_p).value,
+}
+
+
+def element_dtype(tensor_type: TensorType):
+    return numpy.float64 if tensor_type.element_type == real_type else numpy.int64
+
+
+class CompiledTensorFunction:
+    """
+    A compiled function that takes or returns tensors, or that needs
+    the runtime support of this module.
+
+    Tensor arguments are NumPy arrays, or anything that can be
+    converted into one, like nested lists. Each is passed to compiled
+    code as a pointer to a copy of its elements, followed by its
+    dimensions. A tensor result is returned through two extra pointer
+    arguments, one for the address of its elements and one for its
+    dimensions.
+    """
+
+    def __init__(self, func_ptr: int, args: list, ret_type):
+        self.args = args
+        self.ret_type = ret_type
+        arg_ctypes = []
+        for arg in args:
+            if isinstance(arg.type, TensorType):
+                arg_ctypes.append(ctypes.c_void_p)
+                arg_ctypes.extend([ctypes.c_int64] * arg.type.rank)
+            else:
+                arg_ctypes.append(llvm_to_ctype(arg.type))
+        if isinstance(ret_type, TensorType):
+            arg_ctypes.append(ctypes.POINTER(ctypes.c_void_p))
+            arg_ctypes.append(ctypes.POINTER(ctypes.c_int64))
+            c_ret_type = None
+        else:
+            c_ret_type = llvm_to_ctype(ret_type)
+        self.cfunc = ctypes.CFUNCTYPE(c_ret_type, *arg_ctypes)(func_ptr)
+
+    def __call__(self, *values):
+        if len(values) != len(self.args):
+            raise TypeError(f"expected {len(self.args)} arguments")
+        c_args = []
+        arrays = []
+        for arg, value in zip(self.args, values):
+            if isinstance(arg.type, TensorType):
+                array = numpy.array(value, dtype=element_dtype(arg.type), order="C")
+                if array.ndim != arg.type.rank:
+                    raise TypeError(f"expected a tensor of rank {arg.type.rank}")
+                arrays.append(array)
+                c_args.append(array.ctypes.data)
+                c_args.extend(array.shape)
+            else:
+                c_args.append(value)
+
+        ret_type = self.ret_type
+        if isinstance(ret_type, TensorType):
+            out_ptr = ctypes.c_void_p()
+            out_dims = (ctypes.c_int64 * ret_type.rank)()
+            c_args.append(ctypes.byref(out_ptr))
+            c_args.append(out_dims)
+
+        state = RuntimeState()
+        previous_state: Optional[RuntimeState] = getattr(_local, "state", None)
+        _local.state = state
+        try:
+            result = self.cfunc(*c_args)
+            if state.failed:
+                raise CompiledRuntimeError()
+            if isinstance(ret_type, TensorType):
+                result = tensor_result(out_ptr.value, tuple(out_dims), ret_type)
+        finally:
+            _local.state = previous_state
+        return result
+
+
+def tensor_result(address: Optional[int], shape: tuple, ret_type: TensorType):
+    """Copy the elements of a tensor built by compiled code into an array."""
+    dtype = element_dtype(ret_type)
+    size = int(numpy.prod(shape))
+    if size == 0:
+        return numpy.empty(shape, dtype=dtype)
+    c_type = ctypes.c_double if dtype is numpy.float64 else ctypes.c_int64
+    buffer = (c_type * size).from_address(address)
+    return numpy.frombuffer(buffer, dtype=dtype).reshape(shape).copy()
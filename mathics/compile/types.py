@@ -8,6 +8,8 @@ try:
     real_type = ir.DoubleType()
     bool_type = ir.IntType(1)
     void_type = ir.VoidType()
+    # The type of expressions that have no value, like loops.
+    null_type = ir.LiteralStructType([])
 except (
     ImportError,
     ModuleNotFoundError,
@@ -16,3 +18,28 @@ except (
     real_type = float
     bool_type = bool
     void_type = type(None)
+    null_type = tuple
+
+
+class TensorType:
+    """
+    The type of a rectangular array of machine integers or reals with
+    a given rank.
+    """
+
+    def __init__(self, element_type, rank: int):
+        self.element_type = element_type
+        self.rank = rank
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, TensorType)
+            and self.element_type == other.element_type
+            and self.rank == other.rank
+        )
+
+    def __hash__(self):
+        return hash(("TensorType", str(self.element_type), self.rank))
+
+    def __repr__(self):
+        return f"TensorType({self.element_type}, {self.rank})"
@@ -50,7 +50,7 @@ class ByteArray(Atom, ImmutableValueMixin):
         else:
             raise TypeError("value does not belongs to a valid type")
 
-        self.hash = hash(("ByteArray", str(self.value)))
+        self.hash = hash(("ByteArray", bytes(self._value)))
         return self
 
     def __getitem__(self, index: int) -> int:
@@ -0,0 +1,92 @@
+"""
+Intern tables for atoms.
+
+Numbers are interned: creating a number equal to one that already exists
+returns the existing object. The tables that do this only hold weak
+references, so a number is dropped from its table once nothing else
+refers to it, and the tables do not grow with the number of distinct
+values created during a session.
+
+So that values which are created over and over again, like the
+loop counter in a ``Do[]``, are not rebuilt each time, each table
+also keeps alive the last ``RECENT_ATOMS_SIZE`` atoms added to it.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+from weakref import ref
+
+# The number of recently created atoms each table keeps alive.
+# This is read here rather than in mathics.settings, which imports
+# this module indirectly.
+RECENT_ATOMS_SIZE = int(os.environ.get("MATHICS3_RECENT_ATOMS_SIZE", "1024"))
+
+# Dead entries are removed when the table grows past this size,
+# or twice the number of live entries found in the last sweep.
+MIN_SWEEP_SIZE = 4096
+
+# All the intern tables, by name. See ``intern_tables_statistics()``.
+INTERN_TABLES: Dict[str, "InternTable"] = {}
+
+
+class InternTable:
+    """
+    A table of atoms keyed by value, holding weak references to them.
+    """
+
+    __slots__ = ("name", "data", "recent", "recent_index", "sweep_size")
+
+    def __init__(self, name: str, recent_size: int = RECENT_ATOMS_SIZE):
+        self.name = name
+        self.data: Dict[Any, ref] = {}
+        self.recent: List[Any] = [None] * recent_size
+        self.recent_index = 0
+        self.sweep_size = MIN_SWEEP_SIZE
+        INTERN_TABLES[name] = self
+
+    def __len__(self) -> int:
+        self.sweep()
+        return len(self.data)
+
+    def get(self, key) -> Optional[Any]:
+        """Return the atom stored for `key`, or None if there is none."""
+        atom_ref = self.data.get(key)
+        return None if atom_ref is None else atom_ref()
+
+    def add(self, key, atom) -> None:
+        """Store `atom` under `key`."""
+        data = self.data
+        data[key] = ref(atom)
+        recent = self.recent
+        if recent:
+            index = self.recent_index
+            recent[index] = atom
+            self.recent_index = (index + 1) % len(recent)
+        if len(data) > self.sweep_size:
+            self.sweep()
+
+    def clear_recent(self) -> None:
+        """Stop keeping alive the atoms that were added recently."""
+        self.recent = [None] * len(self.recent)
+        self.recent_index = 0
+
+    def sweep(self) -> None:
+        """Remove the entries of the atoms that no longer exist."""
+        data = self.data
+        for key in [key for key, atom_ref in data.items() if atom_ref() is None]:
+            del data[key]
+        self.sweep_size = max(2 * len(data), MIN_SWEEP_SIZE)
+
+
+def clear_recent_atoms() -> None:
+    """
+    Stop keeping alive the atoms that were created recently, so that
+    the memory of those not used anymore can be reclaimed.
+    """
+    for table in INTERN_TABLES.values():
+        table.clear_recent()
+
+
+def intern_tables_statistics() -> Dict[str, int]:
+    """Return the number of atoms in each intern table."""
+    return {name: len(table) for name, table in INTERN_TABLES.items()}
@@ -6,14 +6,14 @@ Numeric types: Number, Integer Real, MachineReal, PrecisionReal, Complex, Ration
 
 import math
 import re
-from functools import cache
-from typing import Any, Dict, Generic, Optional, Tuple, TypeVar, Union
+from typing import Any, Generic, Optional, Tuple, TypeVar, Union
 
 import mpmath
 import sympy
 from sympy import Float as sympy_Float
 from sympy.core import numbers as sympy_numbers
 
+from mathics.core.atoms.intern import InternTable
 from mathics.core.atoms.strings import String
 from mathics.core.element import ImmutableValueMixin
 from mathics.core.keycomparable import BASIC_ATOM_NUMBER_ELT_ORDER
@@ -196,30 +196,28 @@ _number_form_options = {
 class Integer(Number[int]):
     class_head_name = "System`Integer"
 
-    # Dictionary of Integer constant values defined so far.
+    # Table of the Integer values that are alive.
     # We use this for object uniqueness.
     # The key is the Integer's Python `int` value, and the
-    # dictionary's value is the corresponding Mathics3 Integer object.
-    _integers: Dict[Any, "Integer"] = {}
+    # table's value is the corresponding Mathics3 Integer object.
+    _integers = InternTable("Integer")
     _value: int
 
-    _sympy: sympy_numbers.Integer
+    _sympy: Optional[sympy_numbers.Integer]
 
     # We use __new__ here to ensure that two Integer's that have the same value
     # return the same object, and to set an object hash value.
-    # Consider also @lru_cache, and mechanisms for limiting and
-    # clearing the cache and the object store which might be useful in implementing
-    # Builtin Share[].
     def __new__(cls, value) -> "Integer":
         n = int(value)
-        self = cls._integers.get(value)
+        self = cls._integers.get(n)
         if self is None:
             self = super().__new__(cls)
             self._value = n
 
             # Cache object so we don't allocate again.
-            self._integers[value] = self
-            self._sympy = sympy_numbers.Integer(value)
+            self._integers.add(n, self)
+            # We will set the sympy value lazily.
+            self._sympy = None
 
             # Set a value for self.__hash__() once so that every time
             # it is used this is fast. Note that in contrast to the
@@ -340,6 +338,8 @@ class Integer(Number[int]):
 
     @property
     def sympy(self) -> sympy_numbers.Integer:
+        if self._sympy is None:
+            self._sympy = sympy_numbers.Integer(self._value)
         return self._sympy
 
     def to_sympy(self, **_) -> sympy_numbers.Integer:
@@ -448,11 +448,11 @@ class MachineReal(Real[float]):
     Precision for these numbers is `MachinePrecision`.
     """
 
-    # Dictionary of MachineReal constant values defined so far.
+    # Table of the MachineReal values that are alive.
     # We use this for object uniqueness.
     # The key is the MachineReal's Python `float` value, and the
-    # dictionary's value is the corresponding Mathics3 MachineReal object.
-    _machine_reals: Dict[Any, "MachineReal"] = {}
+    # table's value is the corresponding Mathics3 MachineReal object.
+    _machine_reals = InternTable("MachineReal")
     _value: Union[float, mpmath.mpf]
 
     def __new__(cls, value) -> "MachineReal":
@@ -479,7 +479,7 @@ class MachineReal(Real[float]):
             self._value = n
 
             # Cache object so we don't allocate again.
-            self._machine_reals[n] = self
+            self._machine_reals.add(n, self)
 
             # Set a value for self.__hash__() once so that every time
             # it is used this is fast. Note that in contrast to the
@@ -597,11 +597,11 @@ class PrecisionReal(Real[sympy_Float]):
     Note: Plays nicely with the mpmath.mpf (float) type.
     """
 
-    # Dictionary of PrecisionReal constant values defined so far.
+    # Table of the PrecisionReal values that are alive.
     # We use this for object uniqueness.
     # The key is the PrecisionReal's sympy.Float, and the
-    # dictionary's value is the corresponding Mathics3 PrecisionReal object.
-    _precision_reals: Dict[Any, "PrecisionReal"] = {}
+    # table's value is the corresponding Mathics3 PrecisionReal object.
+    _precision_reals = InternTable("PrecisionReal")
 
     # Note: We have no _value attribute or value property .
     # value attribute comes from Number.value
@@ -614,7 +614,7 @@ class PrecisionReal(Real[sympy_Float]):
             self._value = n
 
             # Cache object so we don't allocate again.
-            self._precision_reals[n] = self
+            self._precision_reals.add(n, self)
 
             # Set a value for self.__hash__() once so that every time
             # it is used this is fast. Note that in contrast to the
@@ -724,11 +724,11 @@ class Complex(Number[Tuple[Number[T], Number[T], Optional[int]]]):
     imag: Number[T]
     precision: Optional[int]
 
-    # Dictionary of Complex constant values defined so far.
+    # Table of the Complex values that are alive.
     # We use this for object uniqueness.
     # The key is the Complex value's real and imaginary parts as a tuple,
-    # dictionary's value is the corresponding Mathics3 Complex object.
-    _complex_numbers: Dict[Any, "Complex"] = {}
+    # table's value is the corresponding Mathics3 Complex object.
+    _complex_numbers = InternTable("Complex")
 
     # The precise value: a real number, an imaginary number, and a
     # precision value.
@@ -741,9 +741,7 @@ class Complex(Number[Tuple[Number[T], Number[T], Optional[int]]]):
     # We use __new__ here to ensure that two Complex number that have
     # down to the type on the imaginary and real parts and precision of those --
     # the same value return the same object, and to set an object hash
-    # value.  Consider also @lru_cache, and mechanisms for limiting
-    # and clearing the cache and the object store which might be
-    # useful in implementing Builtin Share[].
+    # value.
     def __new__(cls, real, imag):
         if not isinstance(real, (Integer, Real, Rational)):
             raise ValueError(
@@ -789,7 +787,7 @@ class Complex(Number[Tuple[Number[T], Number[T], Optional[int]]]):
             self._value = complex(real.value, imag.value)
 
             # Cache object so we don't allocate again.
-            self._complex_numbers[exact_value] = self
+            self._complex_numbers.add(exact_value, self)
 
             # Set a value for self.__hash__() once so that every time
             # it is used this is fast. Note that in contrast to the
@@ -834,7 +832,6 @@ class Complex(Number[Tuple[Number[T], Number[T], Optional[int]]]):
     def is_zero(self) -> bool:
         return self.real.is_zero and self.imag.is_zero
 
-    @cache
     def __neg__(self):
         return Complex(-self.real, -self.imag)
 
@@ -943,17 +940,14 @@ class Complex(Number[Tuple[Number[T], Number[T], Optional[int]]]):
 class Rational(Number[sympy.Rational]):
     class_head_name = "System`Rational"
 
-    # Collection of integers defined so far.
-    _rationals: Dict[Any, "Rational"] = {}
+    # Table of the Rational values that are alive.
+    _rationals = InternTable("Rational")
     _value: Union[
         sympy.Rational, sympy.core.numbers.NaN, sympy.core.numbers.ComplexInfinity
     ]
 
     # We use __new__ here to ensure that two Rationals's that have the same value
     # return the same object, and to set an object hash value.
-    # Consider also @lru_cache, and mechanisms for limiting and
-    # clearing the cache and the object store which might be useful in implementing
-    # Builtin Share[].
     def __new__(cls, numerator, denominator=1) -> "Rational":
         value = sympy.Rational(numerator, denominator)
         key = (cls, value)
@@ -964,7 +958,7 @@ class Rational(Number[sympy.Rational]):
             self._value = value
 
             # Cache object so we don't allocate again.
-            self._rationals[key] = self
+            self._rationals.add(key, self)
 
             # Set a value for self.__hash__() once so that every time
             # it is used this is fast.
@@ -1020,11 +1014,9 @@ class Rational(Number[sympy.Rational]):
         """Mathics3 SameQ"""
         return isinstance(rhs, Rational) and self.value == rhs.value
 
-    @cache
     def numerator(self) -> "Integer":
         return Integer(self.value.as_numer_denom()[0])
 
-    @cache
     def denominator(self) -> "Integer":
         return Integer(self.value.as_numer_denom()[1])
 
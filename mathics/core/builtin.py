@@ -8,13 +8,25 @@ SympyFunction, MPMathFunction, etc.
 
 import importlib
 import importlib.util
+import math
 import re
 import sys
 from abc import ABC
 from functools import total_ordering
 from itertools import chain
 from types import ModuleType
-from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
 import mpmath
 import sympy
@@ -37,6 +49,7 @@ from mathics.core.atoms import (
     MachineReal,
     Number,
     PrecisionReal,
+    Rational,
     String,
 )
 from mathics.core.attributes import (
@@ -193,6 +206,12 @@ class Builtin:
 
     _is_numeric: bool = False
     attributes: int = A_PROTECTED
+
+    # Set to True when the result of the eval methods depends only on
+    # their arguments, options and $Assumptions, so that results can
+    # be kept in the result cache. See mathics.core.result_cache.
+    cacheable: bool = False
+
     context: str = ""
     defaults: dict[Optional[int], str] = {}
 
@@ -300,6 +319,7 @@ class Builtin:
                     function,
                     check_options,
                     attributes=pat_attr,
+                    cacheable=self.cacheable and pat_attr is not None,
                 )
             )
         for pattern_str, replace_str in self.rules.items():
@@ -1197,7 +1217,6 @@ class IterationFunction(Builtin, ABC):
                 return result
             return
 
-        index = Integer0
         imin = imin.evaluate(evaluation)
         imax = imax.evaluate(evaluation)
         di = di.evaluate(evaluation)
@@ -1212,35 +1231,22 @@ class IterationFunction(Builtin, ABC):
             ),
         ).evaluate(evaluation)
 
+        values = native_iteration_values(imin, di, normalised_range, evaluation)
+        if values is None:
+            values = symbolic_iteration_values(imin, di, normalised_range, evaluation)
+
         result = []
         last_head = None
         is_uniform = True
-        while True:
-            cont = Expression(SymbolLessEqual, index, normalised_range).evaluate(
-                evaluation
-            )
-            if cont is SymbolFalse:
-                break
-            if cont is not SymbolTrue:
+        for value in values:
+            if value is None:
                 if self.throw_iterb:
                     evaluation.message(self.get_name(), "iterb")
                 return
 
             evaluation.check_stopped()
             try:
-                item = dynamic_scoping(
-                    expr.evaluate,
-                    {
-                        i.name: (
-                            Expression(
-                                SymbolPlus, imin, Expression(SymbolTimes, di, index)
-                            ).evaluate(evaluation)
-                            if index.value > 0
-                            else imin
-                        )
-                    },
-                    evaluation,
-                )
+                item = dynamic_scoping(expr.evaluate, {i.name: value}, evaluation)
                 result.append(item)
                 if last_head is None:
                     last_head = item.get_head()
@@ -1261,7 +1267,6 @@ class IterationFunction(Builtin, ABC):
                     return e.expr
                 else:
                     raise
-            index = Expression(SymbolPlus, index, Integer1).evaluate(evaluation)
         return self.get_result(result, is_uniform=is_uniform)
 
     def eval_list(self, expr, i, items, evaluation):
@@ -1299,6 +1304,89 @@ class IterationFunction(Builtin, ABC):
         return to_expression(name, to_expression(name, expr, *sequ), first)
 
 
+def native_iteration_values(
+    imin: BaseElement,
+    di: BaseElement,
+    normalised_range: BaseElement,
+    evaluation: Evaluation,
+) -> Optional[Iterator[BaseElement]]:
+    """
+    Return the values of an iterator variable going from `imin` in steps
+    of `di`, for the indices from 0 up to `normalised_range`, which is
+    (imax - imin) / di. The values are computed with Python numbers.
+
+    None is returned unless `imin` and `di` are machine integers or
+    reals, and `normalised_range` is a real number.
+    """
+    if not (
+        isinstance(imin, (Integer, MachineReal))
+        and isinstance(di, (Integer, MachineReal))
+    ):
+        return None
+    if isinstance(normalised_range, (Integer, Rational)):
+        count = int(math.floor(normalised_range.value)) + 1
+    elif isinstance(normalised_range, MachineReal) and math.isfinite(
+        normalised_range.value
+    ):
+        count = math.floor(normalised_range.value) + 1
+        # LessEqual compares machine reals with a tolerance, so that
+        # the index after the last one below the range can still be in it.
+        while (
+            Expression(SymbolLessEqual, Integer(count), normalised_range).evaluate(
+                evaluation
+            )
+            is SymbolTrue
+        ):
+            count += 1
+    else:
+        return None
+    if count <= 0:
+        return iter(())
+
+    start, step = imin.value, di.value
+    if isinstance(imin, Integer) and isinstance(di, Integer):
+        return (Integer(value) for value in range(start, start + step * count, step))
+
+    def machine_values():
+        # As Plus[imin, Times[di, index]], which leaves imin unchanged
+        # for index 0.
+        yield imin
+        for index in range(1, count):
+            yield MachineReal(start + step * index)
+
+    return machine_values()
+
+
+def symbolic_iteration_values(
+    imin: BaseElement,
+    di: BaseElement,
+    normalised_range: BaseElement,
+    evaluation: Evaluation,
+) -> Iterator[Optional[BaseElement]]:
+    """
+    Yield the values of an iterator variable going from `imin` in steps
+    of `di`, for the indices from 0 up to `normalised_range`, evaluating
+    the comparisons and the values. None is yielded, and the iteration
+    stops, if an index can not be compared with `normalised_range`.
+    """
+    index = Integer0
+    while True:
+        cont = Expression(SymbolLessEqual, index, normalised_range).evaluate(evaluation)
+        if cont is SymbolFalse:
+            return
+        if cont is not SymbolTrue:
+            yield None
+            return
+        yield (
+            Expression(SymbolPlus, imin, Expression(SymbolTimes, di, index)).evaluate(
+                evaluation
+            )
+            if index.value > 0
+            else imin
+        )
+        index = Expression(SymbolPlus, index, Integer1).evaluate(evaluation)
+
+
 class Operator(Builtin):
     """
     Base Class for operators: binary, unary, nullary, prefix postfix, ...
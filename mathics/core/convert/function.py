@@ -9,6 +9,7 @@ from mathics.core.convert.lambdify import (
 )
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression, from_python
+from mathics.core.list import ListExpression
 from mathics.core.symbols import Symbol, SymbolFalse, SymbolTrue
 from mathics.core.systemsymbols import (
     SymbolAlternatives,
@@ -27,10 +28,16 @@ PERMITTED_TYPES = {
     Expression(SymbolAlternatives, SymbolFalse, SymbolTrue): bool,
 }
 
+# The types of the elements of tensor arguments.
+TENSOR_ELEMENT_TYPES = (
+    Expression(SymbolBlank, SymbolInteger),
+    Expression(SymbolBlank, SymbolReal),
+)
+
 
 try:
     from mathics.compile import CompileArg, CompileError, _compile
-    from mathics.compile.types import bool_type, int_type, real_type
+    from mathics.compile.types import TensorType, bool_type, int_type, real_type
 
     USE_LLVM = True
     # _Complex not implemented
@@ -84,7 +91,10 @@ def expression_to_python_function(
 
     def _pythonized_mathics_expr(*x):
         inner_evaluation = Evaluation(definitions=evaluation.definitions)
-        x_mathics = (from_python(u) for u in x[: len(args)])
+        x_mathics = (
+            ListExpression(packed=u) if isinstance(u, numpy.ndarray) else from_python(u)
+            for u in x[: len(args)]
+        )
         vars = dict(list(zip([a.name for a in args], x_mathics)))
         pyexpr = expr.replace_vars(vars)
         pyexpr = eval_N(pyexpr, inner_evaluation)
@@ -107,17 +117,22 @@ def collect_args(vars) -> Optional[List[CompileArg]]:
         for var in vars:
             name: str
             t_typ: type
+            rank = 0
             if isinstance(var, Symbol):
                 symb = var
                 name = symb.get_name()
                 t_typ = float
-            elif var.has_form("List", 2):
-                symb, typ = var.elements
+            elif var.has_form("List", 2, 3):
+                symb, typ = var.elements[:2]
+                if len(var.elements) == 3:
+                    # {x, type, rank} is a tensor of numbers of the given type
+                    rank = var.elements[2].get_int_value()
+                    if rank is None or rank < 0 or typ not in TENSOR_ELEMENT_TYPES:
+                        raise CompileWrongArgType(var)
                 if isinstance(symb, Symbol) and typ in PERMITTED_TYPES:
                     name = symb.get_name()
                     t_typ = PERMITTED_TYPES[typ]
                 else:
-                    print(symb, typ, var)
                     raise CompileWrongArgType(var)
             else:
                 raise CompileWrongArgType(var)
@@ -125,7 +140,7 @@ def collect_args(vars) -> Optional[List[CompileArg]]:
             if name in names:
                 raise CompileDuplicateArgName(symb)
             names.append(name)
-            args.append(CompileArg(name, t_typ))
+            args.append(CompileArg(name, t_typ, rank))
     return args
 
 
@@ -164,7 +179,15 @@ def expression_to_callable_and_args(
                 if args is None
                 else [
                     CompileArg(
-                        compile_arg.name, LLVM_TYPE_TRANSLATION[compile_arg.type]
+                        compile_arg.name,
+                        (
+                            TensorType(
+                                LLVM_TYPE_TRANSLATION[compile_arg.type],
+                                compile_arg.rank,
+                            )
+                            if compile_arg.rank
+                            else LLVM_TYPE_TRANSLATION[compile_arg.type]
+                        ),
                     )
                     for compile_arg in args
                 ]
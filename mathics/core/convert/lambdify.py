@@ -43,8 +43,13 @@ class CompileError(Exception):
     pass
 
 
-def lambdify_compile(evaluation, expr, names, debug=0):
-    """Compile the specified expression as a function of the given names"""
+def lambdify_compile(evaluation, expr, names, debug=0, evaluate=True):
+    """
+    Compile the specified expression as a function of the given names.
+
+    If `evaluate` is False, `expr` is converted as it is, without
+    evaluating it first.
+    """
 
     if debug >= 2:
         print("=== compiling expr")
@@ -72,12 +77,13 @@ def lambdify_compile(evaluation, expr, names, debug=0):
     # expressions, which avoid rules like the one associated to `Do`
     # or `*Set*`.
     #
-    try:
-        new_expr = expr.evaluate(evaluation)
-        if new_expr:
-            expr = new_expr
-    except Exception:
-        pass
+    if evaluate:
+        try:
+            new_expr = expr.evaluate(evaluation)
+            if new_expr:
+                expr = new_expr
+        except Exception:
+            pass
     if debug >= 2:
         print("post-eval", expr)
 
@@ -27,17 +27,23 @@ def to_sympy_array(m) -> Optional[Array]:
     """
     if not m.has_form("List", None):
         return None
-    if all(element.has_form("List", None) for element in m.elements):
-        if m.is_literal and m.value is not None:
-            return Array(m.value)
-        result = [[item.to_sympy() for item in row.elements] for row in m.elements]
-        if not any(None in row for row in result):
-            return Array(result)
-    elif not any(element.has_form("List", None) for element in m.elements):
-        result = [item.to_sympy() for item in m.elements]
-        if None not in result:
-            return Array(result)
-    return None
+    if m.is_literal and m.value is not None:
+        return Array(m.value)
+
+    def nested_data(element):
+        # The SymPy form of element, as nested Python lists of any depth.
+        if not element.has_form("List", None):
+            return element.to_sympy()
+        data = [nested_data(item) for item in element.elements]
+        return None if None in data else data
+
+    result = nested_data(m)
+    if result is None:
+        return None
+    try:
+        return Array(result)
+    except ValueError:
+        return None
 
 
 def to_sympy_matrix(m) -> Optional[Matrix]:
@@ -3,7 +3,16 @@
 """
 Converts expressions from SymPy to Mathics3 expressions.
 Conversion to SymPy is handled directly in BaseElement descendants.
+
+Expressions keep their SymPy form in their ``ExpressionCache``, so that
+converting the same expression again does not build a new SymPy tree.
+SymPy objects can not be weakly referenced, so the conversions of
+compound SymPy expressions back to Mathics3 are kept in a cache of the
+``FROM_SYMPY_CACHE_SIZE`` most recently converted ones.
 """
+
+import os
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union, cast
 
 import sympy
@@ -92,6 +101,51 @@ SymbolRootSum = Symbol("RootSum")
 mathics_to_sympy: Dict[str, "SympyObject"] = {}  # here we have: name -> sympy object
 sympy_to_mathics: Dict[str, "SympyObject"] = {}
 
+# When builtins are loaded lazily, the names of the Builtins, and of the
+# sympy functions, defined in builtin modules that were not imported yet,
+# mapped to the name of their module. See mathics.core.load_builtin.
+lazy_mathics_to_sympy_modules: Dict[str, str] = {}
+lazy_sympy_to_mathics_modules: Dict[str, str] = {}
+
+FROM_SYMPY_CACHE_SIZE = int(os.environ.get("MATHICS3_FROM_SYMPY_CACHE_SIZE", "4096"))
+
+# Maps compound SymPy expressions to their Mathics3 form. See from_sympy().
+from_sympy_cache: "OrderedDict[sympy.Basic, BaseElement]" = OrderedDict()
+
+
+def _load_lazy_builtin_module(lazy_modules: Dict[str, str], name: str) -> bool:
+    """
+    Import the builtin module associated to `name` in `lazy_modules`,
+    if there is one. Return True if a module was imported.
+    """
+    module_name = lazy_modules.pop(name, None)
+    if module_name is None:
+        return False
+    from mathics.core.load_builtin import load_builtin_module
+
+    load_builtin_module(module_name)
+    return True
+
+
+def get_mathics_to_sympy(name: str) -> Optional["SympyObject"]:
+    """Return the SympyObject registered for the Mathics3 symbol `name`"""
+    builtin = mathics_to_sympy.get(name)
+    if builtin is None and _load_lazy_builtin_module(
+        lazy_mathics_to_sympy_modules, name
+    ):
+        builtin = mathics_to_sympy.get(name)
+    return builtin
+
+
+def get_sympy_to_mathics(name: str) -> Optional["SympyObject"]:
+    """Return the SympyObject registered for the sympy name `name`"""
+    builtin = sympy_to_mathics.get(name)
+    if builtin is None and _load_lazy_builtin_module(
+        lazy_sympy_to_mathics_modules, name
+    ):
+        builtin = sympy_to_mathics.get(name)
+    return builtin
+
 
 sympy_singleton_to_mathics = {
     None: SymbolNull,
@@ -264,7 +318,7 @@ def expression_to_sympy(expr: Expression, **kwargs):
             return expr._as_sympy_function(**kwargs)
 
     lookup_name = expr.get_lookup_name()
-    builtin = mathics_to_sympy.get(lookup_name)
+    builtin = get_mathics_to_sympy(lookup_name)
 
     if builtin is not None:
         sympy_expr = builtin.to_sympy(expr, **kwargs)
@@ -284,7 +338,7 @@ def symbol_to_sympy(symbol: Symbol, **kwargs) -> Sympy_Symbol:
     if result is not None:
         return result
 
-    builtin = mathics_to_sympy.get(symbol.name)
+    builtin = get_mathics_to_sympy(symbol.name)
     if builtin is None or not builtin.sympy_name or not builtin.is_constant():  # nopep8
         if symbol in kwargs.get("dummies", {}):
             return Sympy_Dummy(sympy_name(symbol))
@@ -363,6 +417,29 @@ sympy_conversion_by_type = {
 def from_sympy(sympy_expr) -> BaseElement:
     """
     converts a SymPy object to a Mathics3 element.
+
+    SymPy expressions with arguments are looked up first in
+    ``from_sympy_cache``. SymPy compares them by structure, and
+    numbers of different precision are different.
+    """
+    if not isinstance(sympy_expr, sympy.Basic) or not sympy_expr.args:
+        return from_sympy_uncached(sympy_expr)
+    result = from_sympy_cache.get(sympy_expr)
+    if result is not None:
+        from_sympy_cache.move_to_end(sympy_expr)
+        return result
+    result = from_sympy_uncached(sympy_expr)
+    from_sympy_cache[sympy_expr] = result
+    if len(from_sympy_cache) > FROM_SYMPY_CACHE_SIZE:
+        from_sympy_cache.popitem(last=False)
+    return result
+
+
+def from_sympy_uncached(sympy_expr) -> BaseElement:
+    """
+    converts a SymPy object to a Mathics3 element, without looking
+    it up in ``from_sympy_cache``. Its elements are converted with
+    ``from_sympy()``.
     """
     if isinstance(sympy_expr, (tuple, list)):
         return to_mathics_list(*sympy_expr, elements_conversion_fn=from_sympy)
@@ -411,7 +488,7 @@ def from_sympy(sympy_expr) -> BaseElement:
         elif sympy_expr.is_NumberSymbol:
             name = str(sympy_expr)
         if name is not None:
-            builtin = sympy_to_mathics.get(name)
+            builtin = get_sympy_to_mathics(name)
             if builtin is not None:
                 name = builtin.get_name()
             return Symbol(name)
@@ -556,7 +633,7 @@ def from_sympy(sympy_expr) -> BaseElement:
                         margs.append(from_sympy(arg))
                 else:
                     margs.append(from_sympy(arg))
-            builtin = sympy_to_mathics.get(name)
+            builtin = get_sympy_to_mathics(name)
             assert builtin is not None
             return builtin.from_sympy(tuple(margs))
 
@@ -572,7 +649,7 @@ def from_sympy(sympy_expr) -> BaseElement:
                 )
             name = sympy_decode_mathics_symbol_name(name)
         args = [from_sympy(arg) for arg in sympy_expr.args]
-        builtin = sympy_to_mathics.get(name)
+        builtin = get_sympy_to_mathics(name)
         if builtin is not None:
             return builtin.from_sympy(tuple(args))
         return Expression(Symbol(name), *args)
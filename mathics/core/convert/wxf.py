@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+Conversion between expressions and their binary serialization.
+
+Expressions are serialized in the Wolfram Exchange Format (WXF), as
+``BinarySerialize`` does in WMA. Integers, machine reals, strings and
+symbols are written in fixed binary forms, and packed lists, numeric
+arrays and byte arrays as their raw data, so that serializing and
+deserializing them does not format or parse their elements.
+
+The serialized data starts with the header ``8:``, or ``8C:`` if the
+rest is compressed with zlib. Then comes the expression, written as
+one of these tokens:
+
+- ``f`` followed by the number of elements, the head and the
+  elements, for a compound expression,
+- ``s`` or ``S`` followed by the length and the UTF-8 encoding of the
+  name of a symbol or of a string. Names of symbols in the ``System```
+  context are written without the context,
+- ``C``, ``j``, ``i`` and ``L`` followed by an integer of 8, 16, 32 or
+  64 bits, and ``I`` followed by the length and the digits of a larger
+  integer,
+- ``r`` followed by a machine real, and ``R`` followed by the length
+  and the digits of an arbitrary-precision real, with its precision,
+- ``B`` followed by the length and the bytes of a ``ByteArray``,
+- ``A`` followed by the number of rules, and each rule as ``-`` or
+  ``:``, for ``Rule`` or ``RuleDelayed``, the key and the value, for an
+  association,
+- ``\\xc1`` and ``\\xc2`` followed by the type of the numbers, the rank,
+  the dimensions and the numbers, for a packed list and for a
+  ``NumericArray``.
+
+All numbers are little-endian, and lengths are written as varints:
+7 bits per byte, with the high bit set in all bytes but the last.
+"""
+
+import math
+import struct
+import zlib
+from typing import List
+
+import mpmath
+import numpy
+import sympy
+
+from mathics.core.atoms import (
+    ByteArray,
+    Complex,
+    Integer,
+    MachineReal,
+    NumericArray,
+    PrecisionReal,
+    Rational,
+    String,
+)
+from mathics.core.atoms.associations import Association
+from mathics.core.element import BaseElement
+from mathics.core.expression import Expression
+from mathics.core.list import PACKED_ARRAY_MIN_LENGTH, ListExpression, pack_elements
+from mathics.core.symbols import Symbol, SymbolList
+from mathics.core.systemsymbols import (
+    SymbolAssociation,
+    SymbolComplex,
+    SymbolRational,
+    SymbolRule,
+    SymbolRuleDelayed,
+)
+
+HEADER = b"8:"
+COMPRESSED_HEADER = b"8C:"
+
+TOKEN_FUNCTION = ord("f")
+TOKEN_SYMBOL = ord("s")
+TOKEN_STRING = ord("S")
+TOKEN_BINARY_STRING = ord("B")
+TOKEN_INTEGER8 = ord("C")
+TOKEN_INTEGER16 = ord("j")
+TOKEN_INTEGER32 = ord("i")
+TOKEN_INTEGER64 = ord("L")
+TOKEN_BIG_INTEGER = ord("I")
+TOKEN_REAL64 = ord("r")
+TOKEN_BIG_REAL = ord("R")
+TOKEN_ASSOCIATION = ord("A")
+TOKEN_RULE = ord("-")
+TOKEN_RULE_DELAYED = ord(":")
+TOKEN_PACKED_ARRAY = 0xC1
+TOKEN_NUMERIC_ARRAY = 0xC2
+
+# The fixed-size integer tokens, from the smallest.
+INTEGER_TOKENS = (
+    (TOKEN_INTEGER8, struct.Struct("<b")),
+    (TOKEN_INTEGER16, struct.Struct("<h")),
+    (TOKEN_INTEGER32, struct.Struct("<i")),
+    (TOKEN_INTEGER64, struct.Struct("<q")),
+)
+INTEGER_STRUCTS = dict(INTEGER_TOKENS)
+REAL64_STRUCT = struct.Struct("<d")
+
+# Types of the numbers of packed lists and numeric arrays.
+ARRAY_TYPES = {
+    0x00: numpy.dtype("<i1"),
+    0x01: numpy.dtype("<i2"),
+    0x02: numpy.dtype("<i4"),
+    0x03: numpy.dtype("<i8"),
+    0x10: numpy.dtype("<u1"),
+    0x11: numpy.dtype("<u2"),
+    0x12: numpy.dtype("<u4"),
+    0x13: numpy.dtype("<u8"),
+    0x22: numpy.dtype("<f4"),
+    0x23: numpy.dtype("<f8"),
+    0x33: numpy.dtype("<c8"),
+    0x34: numpy.dtype("<c16"),
+}
+ARRAY_TYPE_CODES = {dtype: code for code, dtype in ARRAY_TYPES.items()}
+
+LOG10_2 = math.log10(2)
+
+
+class WXFError(ValueError):
+    """An expression can not be serialized, or data can not be deserialized."""
+
+
+def _write_varint(n: int, out: bytearray) -> None:
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _write_bytes(token: int, data: bytes, out: bytearray) -> None:
+    out.append(token)
+    _write_varint(len(data), out)
+    out += data
+
+
+def _write_symbol(name: str, out: bytearray) -> None:
+    if name.startswith("System`") and name.count("`") == 1:
+        name = name[7:]
+    _write_bytes(TOKEN_SYMBOL, name.encode("utf-8"), out)
+
+
+def _write_integer(value: int, out: bytearray) -> None:
+    for token, integer_struct in INTEGER_TOKENS:
+        bits = integer_struct.size * 8 - 1
+        if -(1 << bits) <= value < (1 << bits):
+            out.append(token)
+            out += integer_struct.pack(value)
+            return
+    _write_bytes(TOKEN_BIG_INTEGER, str(value).encode("ascii"), out)
+
+
+def _write_array(token: int, array: numpy.ndarray, out: bytearray) -> None:
+    array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+    code = ARRAY_TYPE_CODES.get(array.dtype)
+    if code is None:
+        raise WXFError(f"arrays of {array.dtype} can not be serialized")
+    out.append(token)
+    out.append(code)
+    _write_varint(array.ndim, out)
+    for dimension in array.shape:
+        _write_varint(dimension, out)
+    out += numpy.ascontiguousarray(array).tobytes()
+
+
+def _write_function(head: Symbol, elements: tuple, out: bytearray) -> None:
+    out.append(TOKEN_FUNCTION)
+    _write_varint(len(elements), out)
+    _write_symbol(head.get_name(), out)
+    for element in elements:
+        _write(element, out)
+
+
+def _write(element: BaseElement, out: bytearray) -> None:
+    """Append the serialization of `element` to `out`."""
+    element_type = type(element)
+    if element_type is Integer:
+        _write_integer(element.value, out)
+    elif element_type is MachineReal:
+        out.append(TOKEN_REAL64)
+        out += REAL64_STRUCT.pack(element.value)
+    elif element_type is String:
+        _write_bytes(TOKEN_STRING, element.value.encode("utf-8"), out)
+    elif isinstance(element, Symbol):
+        _write_symbol(element.get_name(), out)
+    elif isinstance(element, Expression):
+        packed = getattr(element, "packed", None)
+        if packed is None and (
+            element_type is ListExpression
+            and len(element.elements) >= PACKED_ARRAY_MIN_LENGTH
+        ):
+            packed = pack_elements(element.elements)
+        if packed is not None:
+            _write_array(TOKEN_PACKED_ARRAY, packed, out)
+            return
+        out.append(TOKEN_FUNCTION)
+        _write_varint(len(element.elements), out)
+        _write(element.head, out)
+        for item in element.elements:
+            _write(item, out)
+    elif element_type is PrecisionReal:
+        value = element.value
+        digits = mpmath.libmp.to_str(
+            value._mpf_, mpmath.libmp.repr_dps(value._prec), strip_zeros=False
+        )
+        text = f"{digits.replace('e', '*^')}`{value._prec * LOG10_2!r}"
+        _write_bytes(TOKEN_BIG_REAL, text.encode("ascii"), out)
+    elif element_type is Rational:
+        numerator, denominator = element.value.as_numer_denom()
+        _write_function(SymbolRational, (Integer(numerator), Integer(denominator)), out)
+    elif element_type is Complex:
+        _write_function(SymbolComplex, (element.real, element.imag), out)
+    elif element_type is ByteArray:
+        _write_bytes(TOKEN_BINARY_STRING, bytes(element.value), out)
+    elif element_type is NumericArray:
+        _write_array(TOKEN_NUMERIC_ARRAY, element.value, out)
+    elif element_type is Association:
+        rules = element.expr.elements
+        out.append(TOKEN_ASSOCIATION)
+        _write_varint(len(rules), out)
+        for rule in rules:
+            out.append(
+                TOKEN_RULE_DELAYED if rule.head is SymbolRuleDelayed else TOKEN_RULE
+            )
+            _write(rule.elements[0], out)
+            _write(rule.elements[1], out)
+    else:
+        raise WXFError(f"{element} can not be serialized")
+
+
+def to_wxf(expr: BaseElement, compress: bool = False) -> bytes:
+    """
+    Return the serialization of `expr`, compressed with zlib if
+    `compress` is True.
+
+    WXFError is raised if `expr` holds atoms that can not be
+    serialized, such as images or compiled functions.
+    """
+    out = bytearray()
+    try:
+        _write(expr, out)
+    except RecursionError:
+        raise WXFError("the expression is nested too deeply to be serialized")
+    if compress:
+        return COMPRESSED_HEADER + zlib.compress(bytes(out))
+    return HEADER + bytes(out)
+
+
+class _Reader:
+    """Reads the expression serialized in `data`, starting at `position`."""
+
+    def __init__(self, data: bytes, position: int):
+        self.data = memoryview(data)
+        self.position = position
+
+    def read_bytes(self, length: int) -> bytes:
+        start = self.position
+        end = start + length
+        if end > len(self.data):
+            raise WXFError("the data ends before the expression")
+        self.position = end
+        return self.data[start:end].tobytes()
+
+    def read_byte(self) -> int:
+        try:
+            byte = self.data[self.position]
+        except IndexError:
+            raise WXFError("the data ends before the expression")
+        self.position += 1
+        return byte
+
+    def read_varint(self) -> int:
+        n = shift = 0
+        while True:
+            byte = self.read_byte()
+            n |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return n
+            shift += 7
+
+    def read_string(self) -> str:
+        return self.read_bytes(self.read_varint()).decode("utf-8")
+
+    def read_array(self) -> numpy.ndarray:
+        """Read the type, the dimensions and the numbers of an array."""
+        dtype = ARRAY_TYPES.get(self.read_byte())
+        if dtype is None:
+            raise WXFError("unknown type of array")
+        rank = self.read_varint()
+        if rank == 0:
+            raise WXFError("arrays must have a positive rank")
+        shape = tuple(self.read_varint() for _ in range(rank))
+        size = math.prod(shape)
+        data = self.read_bytes(size * dtype.itemsize)
+        return numpy.frombuffer(data, dtype=dtype).reshape(shape)
+
+    def read(self) -> BaseElement:
+        token = self.read_byte()
+        integer_struct = INTEGER_STRUCTS.get(token)
+        if integer_struct is not None:
+            return Integer(
+                integer_struct.unpack(self.read_bytes(integer_struct.size))[0]
+            )
+        if token == TOKEN_FUNCTION:
+            length = self.read_varint()
+            head = self.read()
+            elements = [self.read() for _ in range(length)]
+            return _make_expression(head, elements)
+        if token == TOKEN_SYMBOL:
+            name = self.read_string()
+            return Symbol(name if "`" in name else "System`" + name)
+        if token == TOKEN_STRING:
+            return String(self.read_string())
+        if token == TOKEN_REAL64:
+            return MachineReal(REAL64_STRUCT.unpack(self.read_bytes(8))[0])
+        if token == TOKEN_BIG_INTEGER:
+            return Integer(int(self.read_string()))
+        if token == TOKEN_BIG_REAL:
+            return _parse_big_real(self.read_string())
+        if token == TOKEN_BINARY_STRING:
+            return ByteArray(self.read_bytes(self.read_varint()))
+        if token == TOKEN_ASSOCIATION:
+            rules = []
+            for _ in range(self.read_varint()):
+                rule_token = self.read_byte()
+                if rule_token not in (TOKEN_RULE, TOKEN_RULE_DELAYED):
+                    raise WXFError("associations must hold rules")
+                key, value = self.read(), self.read()
+                head = (
+                    SymbolRuleDelayed
+                    if rule_token == TOKEN_RULE_DELAYED
+                    else SymbolRule
+                )
+                rules.append(Expression(head, key, value))
+            return Association(rules, expr=Expression(SymbolAssociation, *rules))
+        if token == TOKEN_PACKED_ARRAY:
+            return _make_packed_list(self.read_array())
+        if token == TOKEN_NUMERIC_ARRAY:
+            return NumericArray(self.read_array().copy())
+        raise WXFError(f"unknown token {chr(token)!r}")
+
+
+def _make_expression(head: BaseElement, elements: List[BaseElement]) -> BaseElement:
+    """Build the expression, or the number, `head`[`elements`]."""
+    if head is SymbolList:
+        return ListExpression(*elements)
+    if len(elements) == 2:
+        if head is SymbolRational and all(type(e) is Integer for e in elements):
+            return Rational(elements[0].value, elements[1].value)
+        if head is SymbolComplex and all(
+            isinstance(e, (Integer, MachineReal, PrecisionReal, Rational))
+            for e in elements
+        ):
+            return Complex(*elements)
+    return Expression(head, *elements)
+
+
+def _parse_big_real(text: str) -> PrecisionReal:
+    digits, _, precision = text.partition("`")
+    bits = int(round(float(precision) / LOG10_2)) if precision else 53
+    return PrecisionReal(sympy.Float(digits.replace("*^", "e"), precision=bits))
+
+
+def _make_packed_list(array: numpy.ndarray) -> ListExpression:
+    """Build the list of the numbers in `array`."""
+    kind = array.dtype.kind
+    if kind in "iu":
+        if kind == "u" and array.dtype.itemsize == 8 and array.size:
+            if int(array.max()) >= 1 << 63:
+                return _make_list(array)
+        array = array.astype(numpy.int64)
+    elif kind == "f":
+        array = array.astype(numpy.float64)
+    else:
+        return _make_list(array)
+    if array.size == 0:
+        return _make_list(array)
+    return ListExpression(packed=array)
+
+
+def _make_list(array: numpy.ndarray) -> ListExpression:
+    """Build the list of the numbers in `array`, without packing it."""
+    if array.ndim > 1:
+        return ListExpression(*(_make_list(row) for row in array))
+    kind = array.dtype.kind
+    if kind == "c":
+        return ListExpression(
+            *(Complex(MachineReal(x.real), MachineReal(x.imag)) for x in array.tolist())
+        )
+    if kind == "f":
+        return ListExpression(*(MachineReal(x) for x in array.tolist()))
+    return ListExpression(*(Integer(x) for x in array.tolist()))
+
+
+def from_wxf(data: bytes) -> BaseElement:
+    """
+    Return the expression serialized in `data`.
+
+    WXFError is raised if `data` is not a serialized expression.
+    """
+    if data.startswith(COMPRESSED_HEADER):
+        try:
+            data = HEADER + zlib.decompress(data[len(COMPRESSED_HEADER) :])
+        except zlib.error:
+            raise WXFError("the compressed data is not valid")
+    elif not data.startswith(HEADER):
+        raise WXFError("the data does not start with a WXF header")
+    reader = _Reader(data, len(HEADER))
+    try:
+        expr = reader.read()
+    except WXFError:
+        raise
+    except (RecursionError, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise WXFError(f"the data is not valid: {exc}")
+    if reader.position != len(data):
+        raise WXFError("there is data after the expression")
+    return expr
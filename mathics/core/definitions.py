@@ -6,23 +6,32 @@ groups of `Definitions`.
 
 import base64
 import bisect
+import os
 import os.path as osp
 import pickle
 import re
+import sys
+import tempfile
 from collections import defaultdict
-from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
 from mathics_scanner.tokeniser import full_names_pattern
 
+from mathics import settings
 from mathics.core.atoms import Integer, String
 from mathics.core.attributes import A_NO_ATTRIBUTES
 from mathics.core.convert.expression import to_mathics_list
 from mathics.core.element import BaseElement, fully_qualified_symbol_name
+from mathics.core.result_cache import ResultCache
+from mathics.core.rule_index import RULE_INDEX_MIN_RULES, RuleDispatchIndex
 from mathics.core.rules import BaseRule, RewriteRule
 from mathics.core.symbols import Atom, Symbol, strip_context
 from mathics.core.util import canonic_filename
 from mathics.settings import ROOT_DIR
 
+# Bump this when the layout of the builtin definitions snapshot changes.
+BUILTIN_SNAPSHOT_FORMAT = 1
+
 # Collections of format symbols. Here we load some basic cases.
 # More symbols are populated from FormMeta classes (see `mathics.builtin.forms.base`)
 
@@ -72,6 +81,9 @@ class Definition:
         self.attributes = attributes
         self.builtin = builtin
         self.changed = 0
+        # Dispatch indices over the rule lists, built on demand.
+        # See ``get_rule_candidates()``.
+        self.rule_indices: Dict[str, RuleDispatchIndex] = {}
         for rule in rules:
             if not self.add_rule(rule):
                 print(f"{rule.pattern.expr} could not be associated with {self.name}")
@@ -85,6 +97,42 @@ class Definition:
         """Set one of the value lists"""
         assert pos.isalpha()
         setattr(self, pos, rules)
+        self.invalidate_rule_index(pos)
+
+    def invalidate_rule_index(self, position: str) -> None:
+        """
+        Mark the dispatch index of the rules in `position` as out of date.
+        The index is kept, so that the signatures of the rules that
+        did not change can be reused when it is rebuilt.
+        """
+        index = self.rule_indices.get(position)
+        if index is not None:
+            index.stale = True
+
+    def get_rule_candidates(
+        self,
+        position: str,
+        expression: BaseElement,
+        attributes_of: Callable[[str], int],
+    ) -> List[BaseRule]:
+        """
+        Return the rules in `position` that may match `expression`,
+        in order of precedence.
+
+        For long lists of rules, a ``RuleDispatchIndex`` is used to
+        discard the rules that cannot match because of the number of
+        arguments, literal arguments or argument heads.
+        `attributes_of` gives the attributes of a symbol by name,
+        and is used for analyzing the patterns of the rules.
+        """
+        values = self.get_values_list(position)
+        if len(values) < RULE_INDEX_MIN_RULES:
+            return values
+        index = self.rule_indices.get(position)
+        if index is None or not index.is_valid_for(values, self.attributes):
+            index = RuleDispatchIndex(values, self.attributes, attributes_of, index)
+            self.rule_indices[position] = index
+        return index.candidates(expression)
 
     def add_rule_at(self, rule: BaseRule, position: str) -> bool:
         """
@@ -92,6 +140,7 @@ class Definition:
         """
         values = self.get_values_list(position)
         insert_rule(values, rule)
+        self.invalidate_rule_index(position)
         return True
 
     def add_rule(self, rule: BaseRule) -> bool:
@@ -109,9 +158,20 @@ class Definition:
             for index, existing in enumerate(values):
                 if existing.pattern.expr.sameQ(lhs):
                     del values[index]
+                    self.invalidate_rule_index(position)
                     return True
         return False
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # Dispatch indices are rebuilt on demand.
+        state.pop("rule_indices", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.rule_indices = {}
+
     def __repr__(self) -> str:
         repr_str = (
             "<Definition: name: {},"
@@ -129,6 +189,36 @@ class Definition:
         return repr_str
 
 
+class Binding:
+    """
+    A temporary value of the Symbol `name`, set by ``Definitions.push_binding()``
+    while the body of a dynamic scoping construct, like ``Block`` or
+    ``Table``, is evaluated.
+
+    The definition of the symbol is left in place: ``Symbol.evaluate()``
+    looks at the binding first, and behaves as if the definition of the
+    symbol was replaced by one holding just the ownvalue `value`, or no
+    value at all if `value` is None.
+
+    Anything that reads or changes the definition itself, like an
+    assignment to the symbol, materializes the binding: the definition
+    is then replaced for real, and restored when the binding is popped.
+    """
+
+    __slots__ = ("name", "value", "previous", "original", "materialized")
+
+    def __init__(
+        self, name: str, value: Optional[BaseElement], previous: Optional["Binding"]
+    ) -> None:
+        self.name = name
+        self.value = value
+        # The binding of the same symbol that this one hides, if any.
+        self.previous = previous
+        # The user definition replaced when the binding was materialized.
+        self.original: Optional[Definition] = None
+        self.materialized = False
+
+
 class Definitions:
     """The state of one instance of the Mathics3 interpreter is stored in this object.
 
@@ -161,7 +251,20 @@ class Definitions:
         self.definitions_cache: Dict[str, Definition] = {}
         self.lookup_cache: Dict[str, str] = {}
         self.proxy: Dict[str, Set[str]] = defaultdict(set)
+        # When builtins are loaded lazily, the names of the builtin symbols
+        # whose definitions were not added yet, mapped to the name of the
+        # module that defines them. See ``load_lazy_builtin_module()``.
+        self.lazy_builtin_modules: Dict[str, str] = {}
         self.now = 0  # increments whenever something is updated
+        # The value of ``now`` when the definition of each symbol last
+        # changed, by symbol name. Symbols that are not here did not
+        # change since the definitions were created.
+        self.changed_at: Dict[str, int] = {}
+        # The innermost binding of the symbols temporarily bound by
+        # dynamic scoping constructs, by symbol name. See ``Binding``.
+        self.bindings: Dict[str, Binding] = {}
+        # Results of cacheable builtins. See mathics.core.result_cache.
+        self.result_cache = ResultCache()
         self._packages: List[str] = []
         self.current_context = "Global`"
         self.context_path: Tuple[str, ...] = (
@@ -242,17 +345,18 @@ class Definitions:
         evaluation started. If a symbol has a time greater than
         that, then things have changed since the evaluation started
         and evaluation may lead to a different result.
+
+        Only the change times of `symbols` are looked at, so changes
+        to the definitions of other symbols do not make the value
+        uncertain.
         """
+        if last_evaluated_time >= self.now:
+            # Nothing changed since.
+            return False
+        changed_at = self.changed_at
         for name in symbols:
-            try:
-                symbol = self.get_definition(name, only_if_exists=True)
-            except KeyError:
-                # "symbol" doesn't exist, so it was never changed.
-                continue
-            # Get timestamp for the most-recently changed part of the given expression.
-            if symbol.changed > last_evaluated_time:
+            if changed_at.get(name, 0) > last_evaluated_time:
                 return True
-
         return False
 
     def get_current_context(self) -> str:
@@ -291,10 +395,11 @@ class Definitions:
 
     def get_builtin_names(self) -> set:
         """Return a set of builtin symbol names"""
-        return set(self.builtin)
+        return set(self.builtin) | set(self.lazy_builtin_modules)
 
     def get_user_names(self) -> set:
         """Return a set of user symbol names"""
+        self.materialize_bindings()
         return set(self.user)
 
     def get_pymathics_names(self) -> set:
@@ -445,6 +550,8 @@ class Definitions:
 
     def have_definition(self, name: str) -> bool:
         """Check if the Symbol `name` has an associated definition."""
+        if name in self.bindings:
+            return True
         try:
             self.get_definition(name, only_if_exists=True)
         except KeyError:
@@ -480,6 +587,8 @@ class Definitions:
             A definition for the requested Symbol name.
 
         """
+        if self.bindings:
+            self.materialize_binding(name)
         try:
             return self.definitions_cache[name]
         except KeyError:
@@ -487,6 +596,8 @@ class Definitions:
 
         original_name = name
         name = self.lookup_name(name)
+        if name in self.lazy_builtin_modules:
+            self.load_lazy_builtin_module(self.lazy_builtin_modules[name])
         user = self.user.get(name, None)
         pymathics = self.pymathics.get(name, None)
         builtin = self.builtin.get(name, None)
@@ -519,6 +630,23 @@ class Definitions:
 
         return definition
 
+    def load_lazy_builtin_module(self, module_name: str) -> None:
+        """
+        Add the definitions of the Builtins in the builtin module
+        `module_name`, importing the module if needed.
+        """
+        from mathics.core.load_builtin import lazy_module_symbols, load_builtin_module
+
+        names = lazy_module_symbols.get(module_name, [])
+        for name in names:
+            self.lazy_builtin_modules.pop(name, None)
+        for builtin in load_builtin_module(module_name):
+            builtin.contribute(self)
+        # Lookups made before the module was loaded may have
+        # resolved names of its symbols to other contexts.
+        for name in names:
+            self.clear_cache(name)
+
     def get_attributes(self, name: str) -> int:
         """
         Return the integer representing the
@@ -543,6 +671,29 @@ class Definitions:
         """Return the list of upvalues"""
         return self.get_definition(name).upvalues
 
+    def get_rule_candidates(
+        self, name: str, position: str, expression: BaseElement
+    ) -> List[BaseRule]:
+        """
+        Return the rules of the list `position` ("downvalues",
+        "upvalues", ...) of the Symbol `name` which may match
+        `expression`, in order of precedence.
+        """
+        return self.get_definition(name).get_rule_candidates(
+            position, expression, self.get_existing_attributes
+        )
+
+    def get_existing_attributes(self, name: str) -> int:
+        """
+        Return the attributes of the Symbol `name`. Unlike
+        ``get_attributes()``, no definition is created if the symbol
+        was not defined before.
+        """
+        try:
+            return self.get_definition(name, only_if_exists=True).attributes
+        except KeyError:
+            return A_NO_ATTRIBUTES
+
     def get_formats(self, name: str, format_name="") -> List[BaseRule]:
         """
         Return a list of format rules associated with `name`.
@@ -604,12 +755,19 @@ class Definitions:
 
         assert not isinstance(name, Symbol)
 
+        if self.bindings:
+            self.materialize_binding(name)
         existing = self.user.get(name)
         if existing:
             return existing
 
         if not create:
             raise KeyError(name)
+        # The user definition starts with the attributes of the builtin
+        # one, so the module that defines it must be loaded, even if
+        # the rule or message added comes from another module or file.
+        if name in self.lazy_builtin_modules:
+            self.load_lazy_builtin_module(self.lazy_builtin_modules[name])
         builtin = self.builtin.get(name)
         if builtin:
             attributes = builtin.attributes
@@ -629,24 +787,100 @@ class Definitions:
         """Mark a definition change"""
         self.now += 1
         definition.changed = self.now
+        self.changed_at[definition.name] = self.now
+
+    def mark_names_changed(self, names: Iterable[str]) -> None:
+        """
+        Mark a change of the definitions of the symbols in `names`,
+        as when they are removed or replaced as a whole.
+        """
+        self.now += 1
+        for name in names:
+            self.changed_at[name] = self.now
 
     def reset_user_definition(self, name: str) -> None:
         """Remove the user definition associated with the Symbol `name`"""
         assert not isinstance(name, Symbol)
         fullname = self.lookup_name(name)
+        if self.bindings:
+            self.materialize_binding(fullname)
         if fullname in self.user:
             del self.user[fullname]
+            self.mark_names_changed((fullname,))
         self.clear_cache(fullname)
-        # TODO fix changed
 
     def add_user_definition(self, name: str, definition: Definition) -> None:
         """Assign a definition to a symbol of name `name`"""
         assert not isinstance(name, Symbol)
         self.mark_changed(definition)
         fullname = self.lookup_name(name)
+        if self.bindings:
+            self.materialize_binding(fullname)
         self.user[fullname] = definition
         self.clear_cache(fullname)
 
+    def push_binding(self, name: str, value: Optional[BaseElement] = None) -> Binding:
+        """
+        Bind temporarily the Symbol `name` to `value`, or leave it
+        without a value if `value` is None, until the binding returned
+        is passed to ``pop_binding()``. Bindings must be popped in the
+        reverse order in which they were pushed.
+        """
+        binding = Binding(name, value, self.bindings.get(name))
+        self.bindings[name] = binding
+        self.mark_names_changed((name,))
+        return binding
+
+    def set_binding_value(self, binding: Binding, value: BaseElement) -> None:
+        """Change the value of the Symbol bound by `binding`"""
+        if binding.materialized:
+            self.set_ownvalue(binding.name, value)
+            return
+        binding.value = value
+        self.mark_names_changed((binding.name,))
+
+    def pop_binding(self, binding: Binding) -> None:
+        """
+        Remove `binding`, restoring the definition of its symbol if the
+        binding was materialized.
+        """
+        name = binding.name
+        if binding.materialized:
+            self.add_user_definition(name, binding.original)
+        else:
+            self.mark_names_changed((name,))
+        if binding.previous is None:
+            self.bindings.pop(name, None)
+        else:
+            self.bindings[name] = binding.previous
+
+    def materialize_binding(self, name: str) -> None:
+        """
+        If the Symbol `name` is bound by ``push_binding()``, replace its
+        user definition by one holding the value of the binding, so
+        that the definition can be read and changed as usual.
+        """
+        bindings = self.bindings
+        binding = bindings.get(name)
+        if binding is None:
+            if fully_qualified_symbol_name(name):
+                return
+            binding = bindings.get(self.lookup_name(name))
+            if binding is None:
+                return
+        name = binding.name
+        del bindings[name]
+        binding.original = self.get_user_definition(name)
+        self.reset_user_definition(name)
+        if binding.value is not None:
+            self.set_ownvalue(name, binding.value)
+        binding.materialized = True
+
+    def materialize_bindings(self) -> None:
+        """Materialize the bindings of all the symbols"""
+        for name in list(self.bindings):
+            self.materialize_binding(name)
+
     def set_attribute(self, name: str, attribute: int) -> None:
         """Set an attribute to the Symbol `name`"""
         definition = self.get_user_definition(self.lookup_name(name))
@@ -737,20 +971,55 @@ class Definitions:
 
     def reset_user_definitions(self) -> None:
         """Remove all the user definitions"""
+        self.materialize_bindings()
+        self.mark_names_changed(self.user)
         self.user = {}
         self.clear_cache()
-        # TODO changed
 
-    def get_user_definitions(self) -> str:
-        """Return a string encoding all the user definitions"""
-        return base64.encodebytes(pickle.dumps(self.user, protocol=2)).decode("ascii")
+    def get_user_definitions(self, names: Optional[Iterable[str]] = None) -> str:
+        """
+        Return a string encoding all the user definitions, or only
+        those of the symbols in `names`
+        """
+        self.materialize_bindings()
+        if names is None:
+            user = self.user
+        else:
+            user = {name: self.user[name] for name in names if name in self.user}
+        return base64.encodebytes(pickle.dumps(user, protocol=2)).decode("ascii")
 
     def set_user_definitions(self, definitions: str) -> None:
         """Set the user definitions encoded in a string"""
+        self.materialize_bindings()
+        former_names = set(self.user)
         if definitions:
             self.user = pickle.loads(base64.decodebytes(definitions.encode("ascii")))
         else:
             self.user = {}
+        self.mark_names_changed(former_names.union(self.user))
+        self.clear_cache()
+
+    def update_user_definitions(self, definitions: str) -> None:
+        """
+        Add the user definitions encoded in a string, replacing the
+        user definitions of the same symbols
+        """
+        if not definitions:
+            return
+        self.add_user_definitions(
+            pickle.loads(base64.decodebytes(definitions.encode("ascii")))
+        )
+
+    def add_user_definitions(self, user: Dict[str, Definition]) -> None:
+        """
+        Add the user definitions in `user`, replacing the user
+        definitions of the same symbols
+        """
+        self.materialize_bindings()
+        for name, definition in user.items():
+            # Results cached before the update must not be reused.
+            self.mark_changed(definition)
+            self.user[name] = definition
         self.clear_cache()
 
     def get_ownvalue(self, name: str) -> BaseElement:
@@ -1082,49 +1351,192 @@ def merge_definitions(candidates: List[Definition]) -> Definition:
         options.update(candidate.options)
 
     # Now, build the new definition and return it.
-    return Definition(
+    definition = Definition(
         name=name,
         rules_dict=rules,
         attributes=attributes,
         builtin=builtin_instance,
         is_numeric=is_numeric,
     )
+    # The merged definition changed when any of its parts did.
+    definition.changed = max(candidate.changed for candidate in candidates)
+    return definition
+
+
+def builtin_definitions_snapshot_key(extension_modules: tuple = ()) -> dict:
+    """
+    Return the key that identifies a snapshot of the builtin definitions.
+
+    A snapshot can only be reused if it was built by the same version of
+    Mathics3, running on the same Python implementation and version,
+    with the same extension modules, and if none of the files the
+    definitions are built from changed since.
+    """
+    import importlib
+
+    from mathics import __version__
+    from mathics.core.load_builtin import mathics3_builtins_modules
+
+    modules = []
+    for module_name in sorted(extension_modules):
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            version = None
+        else:
+            version = getattr(module, "__version__", None)
+        modules.append((module_name, version))
+
+    source_files = [
+        module.__file__
+        for module in mathics3_builtins_modules
+        if getattr(module, "__file__", None)
+    ]
+    for autoload_dir in (
+        osp.join(ROOT_DIR, "Autoload"),
+        osp.join(ROOT_DIR, "SystemFiles", "Formats"),
+    ):
+        for root, _, files in os.walk(autoload_dir):
+            source_files.extend(osp.join(root, f) for f in files)
+
+    sources_time = 0.0
+    for source_file in source_files:
+        try:
+            sources_time = max(sources_time, os.stat(source_file).st_mtime)
+        except OSError:
+            pass
+
+    return {
+        "format": BUILTIN_SNAPSHOT_FORMAT,
+        "mathics": __version__,
+        "python": (sys.implementation.name, tuple(sys.version_info)),
+        "extension_modules": tuple(modules),
+        "sources_time": sources_time,
+    }
+
+
+def dump_builtin_definitions(
+    definitions: Definitions, builtin_filename: str, key: dict
+) -> None:
+    """
+    Write a snapshot of the builtin definitions in `definitions`, and of
+    the registered Import and Export formats, to `builtin_filename`.
+
+    The file is written under a temporary name and then moved into
+    place, so concurrent processes never see a partially written
+    snapshot.
+    """
+    from mathics.builtin.import_export.importexport import EXPORTERS
+    from mathics.eval.import_export.importexport import IMPORTERS
+
+    snapshot = {
+        "builtin": definitions.builtin,
+        "pymathics": definitions.pymathics,
+        "now": definitions.now,
+        "importers": IMPORTERS,
+        "exporters": EXPORTERS,
+    }
+    directory = osp.dirname(osp.abspath(builtin_filename))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_filename = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as builtin_file:
+            # The key goes first, so that it can be checked
+            # without reading the whole snapshot.
+            pickle.dump(key, builtin_file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(snapshot, builtin_file, pickle.HIGHEST_PROTOCOL)
+        os.chmod(tmp_filename, 0o644)
+        os.replace(tmp_filename, builtin_filename)
+    except BaseException:
+        if osp.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+
+def load_builtin_definitions_snapshot(
+    definitions: Definitions, builtin_filename: str, key: dict
+) -> bool:
+    """
+    Restore the builtin definitions, and the registered Import and Export
+    formats, from the snapshot stored in `builtin_filename`.
+
+    Return False, leaving `definitions` untouched, if the file does not
+    exist, can not be read, or was built for a different `key`.
+    """
+    from mathics.builtin.import_export.importexport import EXPORTERS
+    from mathics.eval.import_export.importexport import IMPORTERS
+
+    try:
+        with open(builtin_filename, "rb") as builtin_file:
+            if pickle.load(builtin_file) != key:
+                return False
+            snapshot = pickle.load(builtin_file)
+    except Exception:
+        # A missing, truncated or otherwise unreadable snapshot
+        # is just rebuilt.
+        return False
+
+    definitions.builtin = snapshot["builtin"]
+    definitions.pymathics = snapshot["pymathics"]
+    definitions.now = snapshot["now"]
+    # Other modules keep references to these dictionaries,
+    # so they are updated in place.
+    IMPORTERS.update(snapshot["importers"])
+    EXPORTERS.update(snapshot["exporters"])
+    definitions.clear_cache()
+    return True
 
 
 def load_builtin_definitions(
     self: Definitions,
     builtin_filename: Optional[str] = None,
     extension_modules: tuple = tuple(),
+    rebuild: bool = False,
 ):
     """
     Load definitions from Builtin classes, autoload files and extension modules.
+
+    If `builtin_filename` is given (or ``settings.BUILTIN_DEFINITIONS_CACHE``
+    is set), the definitions are restored from the snapshot stored in that
+    file, if it is up to date. Otherwise, they are built and the snapshot
+    is (re)written. `rebuild` forces the snapshot to be rebuilt.
+
+    The snapshot is not used when builtins are loaded lazily, since
+    the definitions of most builtins are only added when needed.
     """
-    from mathics.core.load_builtin import (
-        definition_contribute,
-        mathics3_builtins_modules,
-    )
-    from mathics.eval.files_io.files import get_file_time
+    from mathics.core.load_builtin import definition_contribute, lazy_builtin_modules
     from mathics.eval.pymathics import load_pymathics_module
     from mathics.session import autoload_files
 
-    loaded = False
+    if builtin_filename is None:
+        builtin_filename = settings.BUILTIN_DEFINITIONS_CACHE
+    if lazy_builtin_modules:
+        builtin_filename = None
+
+    key = None
     if builtin_filename is not None:
-        builtin_dates = [
-            get_file_time(module.__file__) for module in mathics3_builtins_modules
-        ]
-        builtin_time = max(builtin_dates)
-        if get_file_time(builtin_filename) > builtin_time:
-            with open(builtin_filename, "rb") as builtin_file:
-                self.builtin = pickle.load(builtin_file)
-            loaded = True
-    if not loaded:
-        definition_contribute(self)
-        for module in extension_modules:
-            load_pymathics_module(self, module)
-
-        if builtin_filename is not None:
-            with open(builtin_filename, "wb") as builtin_file:
-                pickle.dump(self.builtin, builtin_file, -1)
+        key = builtin_definitions_snapshot_key(extension_modules)
+        if not rebuild and load_builtin_definitions_snapshot(
+            self, builtin_filename, key
+        ):
+            # The definitions contributed by extension modules are in
+            # the snapshot, but the modules still have to be imported
+            # and registered.
+            for module in extension_modules:
+                load_pymathics_module(self, module)
+            return
+
+    definition_contribute(self)
+    for module in extension_modules:
+        load_pymathics_module(self, module)
 
     autoload_files(self, ROOT_DIR, "Autoload")
     autoload_files(self, osp.join(ROOT_DIR, "SystemFiles"), "Formats")
+
+    if builtin_filename is not None:
+        try:
+            dump_builtin_definitions(self, builtin_filename, key)
+        except OSError:
+            # Not being able to write the snapshot is not fatal:
+            # it just means the next start will be slow, too.
+            pass
@@ -138,6 +138,8 @@ class Evaluation:
         self.last_eval = None
 
         self.listeners: Dict[str, List[Callable]] = {}
+        # Number of messages issued, including those that were quiet.
+        self.message_count = 0
         self.options: Optional[Dict[str, Any]] = None
         self.out: List[_Out] = []
         self.output = output if output else Output()
@@ -464,6 +466,7 @@ class Evaluation:
         """
         from mathics.core.expression import Expression
 
+        self.message_count += 1
         # Allow evaluation.message('MyBuiltin', ...) (assume
         # System`MyBuiltin)
         symbol = ensure_context(symbol_name)
@@ -5,11 +5,13 @@ import math
 from bisect import bisect_left
 from itertools import chain
 from types import MethodType
-from typing import Any, Callable, Iterable, Optional, Sequence, Union
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple, Union
+from weakref import ref
 
 import sympy
 from mathics_scanner.location import SourceRange, SourceRange2
 
+from mathics import settings
 from mathics.core.atoms import String
 from mathics.core.attributes import (
     A_FLAT,
@@ -140,6 +142,9 @@ def eval_SameQ(self, other):
                 return False
             current = next_elem()
         elif all(isinstance(elem, Expression) for elem in current):
+            if current[0].hash_consed and current[1].hash_consed:
+                # Hash-consed nodes with the same structure are the same node.
+                return False
             len_elements = len(current[0]._elements)
             if len_elements != len(current[1]._elements):
                 return False
@@ -161,7 +166,8 @@ class BoxError(Exception):
 
 # ExpressionCache keeps track of the following attributes for one Expression instance:
 
-# time: (1) the last time (in terms of Definitions.now) this expression was evaluated
+# time: (1) the last time (in terms of Definitions.now) this expression was evaluated,
+#   or found to need no further evaluation because none of its symbols changed since,
 #   or (2) None, if the current expression has not yet been evaluated (i.e. is new or
 #   changed).
 # symbols: (1) a set of symbols occurring in this expression's head, its elements'
@@ -171,20 +177,27 @@ class BoxError(Exception):
 # sequences: (1) a list of element indices that indicate the position of all Sequence
 #   heads that are either in the element's head or any of the indicated element's sub
 #   expressions' heads, or (2) None, if no information is available.
+# sympy: (1) the SymPy form of this expression, as given by to_sympy() without
+#   arguments, or (2) None, if it was not computed yet. It does not depend on
+#   definitions, and is only dropped when the elements change.
 
 
 class ExpressionCache:
-    def __init__(self, time=None, symbols=None, sequences=None, copy=None):
+    def __init__(self, time=None, symbols=None, sequences=None, copy=None, sympy=None):
         if copy is not None:
             time = time or copy.time
             symbols = symbols or copy.symbols
             sequences = sequences or copy.sequences
+            sympy = sympy or copy.sympy
         self.time = time
         self.symbols = symbols
         self.sequences = sequences
+        self.sympy = sympy
 
     def copy(self):
-        return ExpressionCache(self.time, self.symbols, self.sequences)
+        return ExpressionCache(
+            self.time, self.symbols, self.sequences, sympy=self.sympy
+        )
 
     def sliced(self, lower, upper):
         # indicates that the Expression's elements have been sliced with
@@ -263,6 +276,17 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
     options: Optional[dict[str, Any]]
     pattern_sequence: bool
     location: Optional[Union[SourceRange, SourceRange2, MethodType]]
+    # The NumPy array holding the elements of a packed list.
+    # See mathics.core.list.ListExpression.
+    packed: Any = None
+    # Whether this is the node shared by all the evaluated expressions
+    # with the same structure, and its hash. See mathics.core.hashcons.
+    hash_consed: bool = False
+    _hash: int
+    # The cache of a hash-consed node only holds what depends on its
+    # structure, since the node is shared by all the definitions. This
+    # holds the definitions it was last found final with, and when.
+    final_in: Optional[Tuple[ref, int]] = None
 
     def __init__(
         self,
@@ -296,7 +320,17 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
     def __getnewargs__(self):
         return (self._head, self._elements)
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # A hash-consed node is unpickled as an ordinary expression,
+        # since it is not in the intern table of the new process.
+        for name in ("hash_consed", "_hash", "final_in"):
+            state.pop(name, None)
+        return state
+
     def __hash__(self):
+        if self.hash_consed:
+            return self._hash
         return hash(("Expression", self._head) + tuple(self._elements))
 
     def __repr__(self) -> str:
@@ -452,11 +486,15 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
             elif isinstance(element, Symbol):
                 sym.add(element.get_name())
 
-        cache = ExpressionCache(time, sym, seq)
+        cache = ExpressionCache(time, sym, seq, sympy=cache and cache.sympy)
         self._cache = cache
         return cache
 
     def _timestamp_cache(self, evaluation):
+        if self.hash_consed:
+            definitions = evaluation.definitions
+            self.final_in = (ref(definitions), definitions.now)
+            return
         self._cache = ExpressionCache(evaluation.definitions.now, copy=self._cache)
 
     def clear_cache(self):
@@ -491,6 +529,11 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
         self._elements = tuple(values)
         # Set to build self.elements_properties on next evaluation()
         self.elements_properties = None
+        cache = self._cache
+        if cache is not None and cache.sympy is not None:
+            # The SymPy form of the former elements is not valid anymore.
+            # The cache may be shared with copies of this expression.
+            self._cache = ExpressionCache(cache.time, cache.symbols, cache.sequences)
 
     def equal2(self, rhs: Any) -> Optional[bool]:
         """Mathics3 two-argument Equal (==)
@@ -606,6 +649,10 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
             evaluation.options = old_options
             evaluation.dec_recursion_depth()
 
+        if settings.HASH_CONSING and isinstance(expr, Expression):
+            from mathics.core.hashcons import hash_cons
+
+            expr = hash_cons(expr, definitions)
         return expr
 
     def evaluate_elements(self, evaluation) -> "Expression":
@@ -984,6 +1031,16 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
         if not hasattr(self, "_cache"):
             return False
 
+        if self.hash_consed:
+            final_in = self.final_in
+            if final_in is None or final_in[0]() is not definitions:
+                return True
+            cache = self._rebuild_cache()
+            if definitions.is_uncertain_final_value(final_in[1], cache.symbols):
+                return True
+            self.final_in = (final_in[0], definitions.now)
+            return False
+
         cache = self._cache
 
         # FIXME: why do we return True when no cache is found? Explain.
@@ -999,7 +1056,13 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
             cache = self._rebuild_cache()
             assert cache is not None
 
-        return definitions.is_uncertain_final_value(time, cache.symbols)
+        if definitions.is_uncertain_final_value(time, cache.symbols):
+            return True
+        # Only definitions of other symbols changed since `time`, so the
+        # expression is still final now, and the next check only needs
+        # to look at the changes made after this one.
+        cache.time = definitions.now
+        return False
 
     def has_form(
         self, heads: Union[Sequence[str], str], *element_counts: Optional[int]
@@ -1294,6 +1357,18 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
         # threading.  Still, we need to perform this rewrite to
         # maintain correct semantic behavior.
         if A_LISTABLE & attributes:
+            # Numeric functions on packed lists are computed on the whole
+            # arrays at once, if possible.
+            if any(
+                isinstance(element, Expression) and element.packed is not None
+                for element in new._elements
+            ):
+                from mathics.eval.packed import eval_packed_listable
+
+                result = eval_packed_listable(new, attributes)
+                if result is not None:
+                    return result, False
+
             done, threaded = new.thread(evaluation)
             if done:
                 if threaded.sameQ(new):
@@ -1351,11 +1426,15 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
                     name = element.get_lookup_name()
                     if name and name not in rules_names:
                         rules_names.add(name)
-                        for rule in evaluation.definitions.get_upvalues(name):
+                        for rule in evaluation.definitions.get_rule_candidates(
+                            name, "upvalues", new
+                        ):
                             yield rule
             lookup_name = new.get_lookup_name()
             if lookup_name == new.get_head_name():
-                for rule in evaluation.definitions.get_downvalues(lookup_name):
+                for rule in evaluation.definitions.get_rule_candidates(
+                    lookup_name, "downvalues", new
+                ):
                     yield rule
             else:
                 # Subvalues applies for expressions of the form `D[1][f][x]`
@@ -1449,6 +1528,8 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
             return other.sameQ(self)
         if self is other:
             return True
+        if self.hash_consed and other.hash_consed:
+            return False
 
         # All this stuff maybe should be in mathics.eval.expression
         return eval_SameQ(self, other)
@@ -1469,6 +1550,8 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
         """
         if head is SymbolList:
             raise TypeError("Attempt to turn an Expression into a ListExpression")
+        if self.hash_consed:
+            raise TypeError("Attempt to modify a hash-consed Expression")
         self._head = head
         self._cache = None
 
@@ -1476,6 +1559,8 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
         """
         Update element[i] with value
         """
+        if self.hash_consed:
+            raise TypeError("Attempt to modify a hash-consed Expression")
         elements = list(self._elements)
         elements[index] = value
         self.elements = tuple(elements)
@@ -1571,7 +1656,20 @@ class Expression(BaseElement, NumericOperators, EvalMixin):
     def to_sympy(self, **kwargs):
         from mathics.core.convert.sympy import expression_to_sympy
 
-        return expression_to_sympy(self, **kwargs)
+        if kwargs:
+            return expression_to_sympy(self, **kwargs)
+        # Without options, the conversion depends only on the expression,
+        # and it is kept in the expression cache.
+        cache = self._cache
+        if cache is not None and cache.sympy is not None:
+            return cache.sympy
+        sympy_expr = expression_to_sympy(self)
+        if sympy_expr is not None:
+            if cache is None:
+                self._cache = ExpressionCache(sympy=sympy_expr)
+            else:
+                cache.sympy = sympy_expr
+        return sympy_expr
 
     def process_style_box(self, options):
         from mathics.core.rules import RewriteRule
@@ -0,0 +1,175 @@
+"""
+Hash consing of evaluated expressions.
+
+When ``settings.HASH_CONSING`` is True, the result of evaluating an
+expression is replaced by the one node kept for all the expressions
+with the same structure. Structurally identical subexpressions, like
+the entries of a symbolic matrix that repeat, are then stored once, and
+their hash and the properties of their elements are computed once.
+
+Two hash-consed nodes are ``SameQ`` only if they are the same object,
+so ``SameQ``, and the functions that compare elements with it or put
+them in dictionaries, like ``Union``, ``Tally``, ``DeleteDuplicates``
+and association lookups, no longer traverse them.
+
+For this to hold, only expressions whose atoms are ``SameQ`` exactly
+when they are equal are hash-consed: symbols, strings, integers,
+rationals and machine reals. Expressions holding other atoms, such as
+arbitrary-precision reals, which are ``SameQ`` up to their precision,
+are left as they are. So are packed lists, and expressions with
+options or that are pattern sequences.
+
+Hash-consed nodes must not be changed: ``set_element()`` and
+``set_head()`` raise a TypeError on them. Code that changes parts of an
+evaluated expression in place has to work on a copy.
+
+The nodes are shared by all the ``Definitions`` objects of the process,
+whose clocks are not related. So the cache of a node only keeps what
+depends on its structure, the symbols and sequences in it. The time
+the node was last found to be fully evaluated is kept apart, in
+``Expression.final_in``, together with the definitions it holds for;
+with other definitions, the node is evaluated again.
+
+``Share[]`` uses ``hash_cons()`` to share the subexpressions of the
+values stored in the definitions, whether ``settings.HASH_CONSING`` is
+set or not.
+
+The nodes are kept in an intern table holding weak references, which
+is listed by ``mathics.core.atoms.intern.intern_tables_statistics()``.
+"""
+
+from typing import Optional
+from weakref import ref
+
+from mathics.core.atoms import Integer, MachineReal, Rational, String
+from mathics.core.atoms.intern import InternTable
+from mathics.core.definitions import Definitions
+from mathics.core.element import BaseElement
+from mathics.core.expression import Expression, ExpressionCache
+from mathics.core.list import ListExpression
+from mathics.core.symbols import Symbol
+
+# Maps (type, head, *elements) -> the hash-consed node. Symbols, numbers
+# and hash-consed nodes are represented by their id, which is valid as
+# long as the node that refers to them exists.
+EXPRESSIONS = InternTable("Expression")
+
+# Atoms that are SameQ only if they are the same object.
+INTERNED_ATOMS = (Symbol, Integer, Rational, MachineReal)
+
+
+def _component(
+    element: BaseElement, new_elements: list, definitions: Optional[Definitions]
+) -> Optional[object]:
+    """
+    Append the hash-consed form of `element` to `new_elements`, and
+    return its part of the key of the node holding it, or None if
+    `element` can not be hash-consed.
+    """
+    if isinstance(element, INTERNED_ATOMS):
+        new_elements.append(element)
+        return id(element)
+    if type(element) is String:
+        new_elements.append(element)
+        return ("String", element.value)
+    if isinstance(element, Expression):
+        element = hash_cons(element, definitions)
+        if not element.hash_consed:
+            return None
+        new_elements.append(element)
+        return id(element)
+    return None
+
+
+def _structural_cache(cache: Optional[ExpressionCache]) -> Optional[ExpressionCache]:
+    """
+    Return the part of `cache` that does not depend on the definitions
+    `expr` was evaluated with.
+    """
+    if cache is None:
+        return None
+    return ExpressionCache(None, cache.symbols, cache.sequences)
+
+
+def _keep_final_time(
+    node: Expression,
+    cache: Optional[ExpressionCache],
+    definitions: Optional[Definitions],
+) -> None:
+    """
+    Record in `node` that it is fully evaluated with `definitions`,
+    if `cache`, the cache of an expression evaluated with them, says so.
+    """
+    if definitions is None or cache is None or cache.time is None:
+        return
+    final_in = node.final_in
+    if final_in is None or final_in[0]() is not definitions or final_in[1] < cache.time:
+        node.final_in = (ref(definitions), cache.time)
+
+
+def hash_cons(
+    expr: Expression, definitions: Optional[Definitions] = None
+) -> Expression:
+    """
+    Return the hash-consed node with the same structure as `expr`, or
+    `expr` itself if it can not be hash-consed.
+
+    `definitions`, when given, are the definitions `expr` was evaluated
+    with, so that the node is not evaluated again with them.
+    """
+    if expr.hash_consed:
+        return expr
+    expr_type = type(expr)
+    if (
+        (expr_type is not Expression and expr_type is not ListExpression)
+        or expr.packed is not None
+        or expr.options
+        or expr.pattern_sequence
+    ):
+        return expr
+
+    parts = [expr_type]
+    new_elements: list = []
+    try:
+        for element in (expr._head, *expr._elements):
+            component = _component(element, new_elements, definitions)
+            if component is None:
+                return expr
+            parts.append(component)
+    except RecursionError:
+        return expr
+    key = tuple(parts)
+
+    node = EXPRESSIONS.get(key)
+    if node is not None:
+        if node._cache is None:
+            node._cache = _structural_cache(expr._cache)
+        _keep_final_time(node, expr._cache, definitions)
+        return node
+
+    head, elements = new_elements[0], new_elements[1:]
+    if head is expr._head and all(
+        new is old for new, old in zip(elements, expr._elements)
+    ):
+        node = expr
+    else:
+        if expr_type is ListExpression:
+            node = ListExpression(*elements)
+        else:
+            node = Expression(head, *elements)
+    cache = expr._cache
+    node._cache = _structural_cache(cache)
+    _keep_final_time(node, cache, definitions)
+    if node.elements_properties is None:
+        node._build_elements_properties()
+    if expr_type is ListExpression:
+        # Lists built from their elements hold their Python value, and
+        # lists whose elements were set do not, which changes what
+        # to_python() returns. A shared node must not depend on which
+        # of them was seen first, so none holds its value.
+        node.value = None
+        node._is_literal = False
+    node._hash = hash(("Expression", head) + tuple(elements))
+    node.hash_consed = True
+    EXPRESSIONS.add(key, node)
+    return node
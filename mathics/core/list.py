@@ -4,13 +4,21 @@ Module containing ListExpression
 """
 
 import reprlib
-from typing import Any, Optional, Tuple
+from typing import Any, Optional, Sequence, Tuple
 
-from mathics.core.element import ElementsProperties
+import numpy
+
+from mathics.core.atoms import Integer, MachineReal
+from mathics.core.element import BaseElement, ElementsProperties
 from mathics.core.evaluation import Evaluation
-from mathics.core.expression import Expression
+from mathics.core.expression import Expression, ExpressionCache
+from mathics.core.keycomparable import GENERAL_EXPRESSION_ELT_ORDER
 from mathics.core.symbols import EvalMixin, Symbol, SymbolList
 
+# Lists of numbers built by Table[] with at least this many elements
+# are packed. See ``ListExpression.packed``.
+PACKED_ARRAY_MIN_LENGTH = 250
+
 
 class ListExpression(Expression):
     """
@@ -26,21 +34,50 @@ class ListExpression(Expression):
 
     - ``elements_properties`` -- properties of the collection of elements
     - ``literal_values`` -- if this is not ``None``, then it is a tuple of Python values and the expression is a literal.
+    - ``packed`` -- if this is not ``None``, then it is a NumPy array of
+      machine integers or reals holding the (possibly nested) list, and
+      ``elements`` must be empty.
+
+    A packed list only builds its elements, as ``Integer`` and
+    ``MachineReal`` atoms, the first time they are needed.
     """
 
     _is_literal: bool
     _sympy: Optional[Any]
+    packed: Optional[numpy.ndarray]
 
     def __init__(
         self,
         *elements,
         elements_properties: Optional[ElementsProperties] = None,
         literal_values: Optional[tuple] = None,
+        packed: Optional[numpy.ndarray] = None,
     ):
         self.options = None
         self.pattern_sequence = False
         self._head = SymbolList
         self._sympy = None
+        self.packed = packed
+
+        if packed is not None:
+            # ``_elements`` and ``value`` are set by __getattr__() when
+            # they are first used.
+            packed.flags.writeable = False
+            self._is_literal = True
+            self.elements_properties = (
+                elements_properties
+                if elements_properties is not None
+                else ElementsProperties(
+                    elements_fully_evaluated=True,
+                    is_flat=packed.ndim == 1,
+                    is_uniform=True,
+                )
+            )
+            self._sequences = None
+            # Numbers are neither symbols nor sequences.
+            self._cache = ExpressionCache(symbols={"System`List"}, sequences=[])
+            return
+
         self.value = None
 
         # For debugging:
@@ -79,6 +116,25 @@ class ListExpression(Expression):
         self._sequences = None
         self._cache = None
 
+    def __getattr__(self, name: str):
+        """
+        Build the elements and the value of a packed list, the first
+        time they are used.
+        """
+        packed = self.__dict__.get("packed")
+        if packed is not None:
+            if name == "_elements":
+                elements = unpack_elements(packed)
+                self._elements = elements
+                return elements
+            if name == "value":
+                value = packed_value(packed)
+                self.value = value
+                return value
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
     def __getitem__(self, index: int):
         """
         Allows ListExpression elements to accessed via [], e.g.
@@ -95,6 +151,19 @@ class ListExpression(Expression):
         """str() representation of ListExpression. May be longer than repr()"""
         return "{" + ",".join(str(e) for e in self.elements) + "}"
 
+    @property
+    def elements(self):
+        return self._elements
+
+    @elements.setter
+    def elements(self, values: Sequence[BaseElement]):
+        self.packed = None
+        self.value = None
+        self._is_literal = False
+        self._elements = tuple(values)
+        # Set to build self.elements_properties on next evaluation()
+        self.elements_properties = None
+
     # @timeit
     def evaluate_elements(self, evaluation: Evaluation) -> Expression:
         """
@@ -120,6 +189,23 @@ class ListExpression(Expression):
         new_list._build_elements_properties()
         return new_list
 
+    @property
+    def element_order(self) -> tuple:
+        """
+        Return a tuple value that is used in ordering elements
+        of an expression. See ``Expression.element_order``.
+        """
+        packed = self.packed
+        if packed is None:
+            return super().element_order
+        return (
+            GENERAL_EXPRESSION_ELT_ORDER,
+            SymbolList,
+            len(packed),
+            PackedElementsOrder(self),
+            1,
+        )
+
     @property
     def is_literal(self) -> bool:
         """
@@ -154,8 +240,43 @@ class ListExpression(Expression):
         assert self.elements_properties is not None
         if not self.elements_properties.elements_fully_evaluated:
             new = self.shallow_copy().evaluate_elements(evaluation)
-            return new, False
-        return self, False
+        else:
+            new = self
+        # As in Expression.rewrite_apply_eval_step(), record when the
+        # list was evaluated, so that it is not evaluated again while
+        # the definitions of its symbols do not change.
+        new._timestamp_cache(evaluation)
+        return new, False
+
+    def replace_slots(self, slots, evaluation) -> Expression:
+        if self.packed is not None:
+            return self
+        return super().replace_slots(slots, evaluation)
+
+    def replace_vars(self, vars, options=None, in_function=True) -> Expression:
+        if self.packed is not None:
+            return self
+        return super().replace_vars(vars, options, in_function)
+
+    def sameQ(self, other: BaseElement) -> bool:
+        """Mathics3 SameQ"""
+        packed = self.packed
+        if packed is None:
+            if isinstance(other, ListExpression) and other.packed is not None:
+                return other.sameQ(self)
+            return super().sameQ(other)
+        if self is other:
+            return True
+        if not isinstance(other, Expression) or other.head is not SymbolList:
+            return False
+        other_packed = getattr(other, "packed", None)
+        if other_packed is not None:
+            return (
+                packed.dtype.kind == other_packed.dtype.kind
+                and packed.shape == other_packed.shape
+                and bool(numpy.array_equal(packed, other_packed))
+            )
+        return super().sameQ(other)
 
     def set_head(self, head: Symbol):
         """
@@ -166,18 +287,184 @@ class ListExpression(Expression):
             raise TypeError("Attempt to modify the Head of a ListExpression")
 
     def shallow_copy(self) -> "ListExpression":
-        """
-        For an Expression this does something with its cache.
-        Here this does not need that complication.
-        """
-        return ListExpression(
+        if self.packed is not None:
+            return ListExpression(
+                packed=self.packed, elements_properties=self.elements_properties
+            )
+        expr = ListExpression(
             *self._elements, elements_properties=self.elements_properties
         )
+        # As in Expression.shallow_copy(), the copy shares the cache, so
+        # that a list stored as the value of a symbol is not evaluated
+        # again when nothing it depends on changed.
+        expr._cache = self._rebuild_cache()
+        return expr
 
     def copy(self, reevaluate=False) -> "Expression":
+        if self.packed is not None:
+            expr = ListExpression(
+                packed=self.packed, elements_properties=self.elements_properties
+            )
+            expr.original = self
+            return expr
         expr = ListExpression(self._head.copy(reevaluate))
         expr._elements = tuple(element.copy(reevaluate) for element in self._elements)
         expr.options = self.options
         expr.original = self
         expr._sequences = self._sequences
         return expr
+
+
+class PackedElementsOrder:
+    """
+    Stands for the elements of a packed list in its ``element_order``,
+    so that they are only built when the list is compared element by
+    element with another list of the same length.
+    """
+
+    __slots__ = ("expr",)
+
+    def __init__(self, expr: ListExpression):
+        self.expr = expr
+
+    def _compare(self, other) -> Optional[int]:
+        """
+        Compare with another packed list of the same type and shape,
+        without building the elements of either. Return None if
+        the lists can not be compared this way.
+        """
+        if not isinstance(other, PackedElementsOrder):
+            return None
+        packed, other_packed = self.expr.packed, other.expr.packed
+        if (
+            packed.dtype.kind != other_packed.dtype.kind
+            or packed.shape != other_packed.shape
+        ):
+            return None
+        packed, other_packed = packed.ravel(), other_packed.ravel()
+        different = numpy.flatnonzero(packed != other_packed)
+        if len(different) == 0:
+            return 0
+        index = different[0]
+        return -1 if packed[index] < other_packed[index] else 1
+
+    @staticmethod
+    def _elements(value) -> tuple:
+        if isinstance(value, PackedElementsOrder):
+            return value.expr.elements
+        return value
+
+    def __eq__(self, other) -> bool:
+        comparison = self._compare(other)
+        if comparison is not None:
+            return comparison == 0
+        return self.expr.elements == self._elements(other)
+
+    def __lt__(self, other) -> bool:
+        comparison = self._compare(other)
+        if comparison is not None:
+            return comparison < 0
+        return self.expr.elements < self._elements(other)
+
+    def __le__(self, other) -> bool:
+        comparison = self._compare(other)
+        if comparison is not None:
+            return comparison <= 0
+        return self.expr.elements <= self._elements(other)
+
+    def __gt__(self, other) -> bool:
+        comparison = self._compare(other)
+        if comparison is not None:
+            return comparison > 0
+        return self.expr.elements > self._elements(other)
+
+    def __ge__(self, other) -> bool:
+        comparison = self._compare(other)
+        if comparison is not None:
+            return comparison >= 0
+        return self.expr.elements >= self._elements(other)
+
+
+def pack_elements(elements: Sequence[BaseElement]) -> Optional[numpy.ndarray]:
+    """
+    Return a NumPy array with the values of `elements`, or None if they
+    can not be packed.
+
+    `elements` can be packed if they all are machine-sized Integers,
+    or all are MachineReals, or all are lists that can be packed into
+    arrays of the same shape and type.
+    """
+    if len(elements) == 0:
+        return None
+    first = elements[0]
+    if isinstance(first, ListExpression):
+        rows = []
+        for element in elements:
+            if not isinstance(element, ListExpression):
+                return None
+            row = element.packed
+            if row is None:
+                row = pack_elements(element.elements)
+                if row is None:
+                    return None
+            rows.append(row)
+        shape, dtype = rows[0].shape, rows[0].dtype
+        if any(row.shape != shape or row.dtype != dtype for row in rows):
+            return None
+        return numpy.stack(rows)
+
+    element_type = type(first)
+    if element_type is Integer:
+        dtype = numpy.int64
+    elif element_type is MachineReal:
+        dtype = numpy.float64
+    else:
+        return None
+    if any(type(element) is not element_type for element in elements):
+        return None
+    try:
+        return numpy.array([element.value for element in elements], dtype=dtype)
+    except OverflowError:
+        return None
+
+
+def unpack_elements(packed: numpy.ndarray) -> Tuple[BaseElement, ...]:
+    """Return the elements of the list packed in `packed`."""
+    if packed.ndim > 1:
+        return tuple(ListExpression(packed=row) for row in packed)
+    if packed.dtype.kind == "f":
+        return tuple(MachineReal(x) for x in packed.tolist())
+    return tuple(Integer(x) for x in packed.tolist())
+
+
+def packed_value(packed: numpy.ndarray) -> tuple:
+    """Return the Python value of the list packed in `packed`."""
+    if packed.ndim > 1:
+        return tuple(packed_value(row) for row in packed)
+    return tuple(packed.tolist())
+
+
+def to_packed_list(expr: BaseElement) -> BaseElement:
+    """
+    Return a packed version of `expr`, if it is a list that can be
+    packed. Otherwise, return `expr`.
+    """
+    if not isinstance(expr, ListExpression) or expr.packed is not None:
+        return expr
+    packed = pack_elements(expr.elements)
+    if packed is None:
+        return expr
+    return ListExpression(packed=packed)
+
+
+def from_packed_list(expr: BaseElement) -> BaseElement:
+    """
+    Return `expr`, with the packed lists it contains replaced by
+    ordinary ones.
+    """
+    if not isinstance(expr, ListExpression) or expr.packed is None:
+        return expr
+    return ListExpression(
+        *(from_packed_list(element) for element in expr.elements),
+        elements_properties=expr.elements_properties,
+    )
@@ -8,15 +8,23 @@ Builtin.
 
 import importlib
 import inspect
+import json
 import logging
 import os
 import os.path as osp
 import pkgutil
+import sys
 from glob import glob
 from types import ModuleType
 from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
-from mathics.core.convert.sympy import mathics_to_sympy, sympy_to_mathics
+from mathics import settings
+from mathics.core.convert.sympy import (
+    lazy_mathics_to_sympy_modules,
+    lazy_sympy_to_mathics_modules,
+    mathics_to_sympy,
+    sympy_to_mathics,
+)
 from mathics.core.parser.operators import calculate_operator_information
 from mathics.core.pattern import pattern_objects
 from mathics.core.symbols import Symbol
@@ -42,6 +50,18 @@ _builtins = {}
 #
 builtins_by_module: Dict[str, list] = {}
 
+# When builtins are loaded lazily, lazy_builtin_modules maps the name
+# of each symbol that gets a definition from a builtin module that is
+# not loaded at startup to the name of that module, e.g.
+# 'System`StringReverse' -> 'mathics.builtin.string.operations'.
+# lazy_module_symbols is the inverse map.
+# Both are empty if builtins are loaded at startup.
+lazy_builtin_modules: Dict[str, str] = {}
+lazy_module_symbols: Dict[str, List[str]] = {}
+
+# Bump this when the layout of the builtin modules manifest changes.
+BUILTIN_MODULES_MANIFEST_FORMAT = 2
+
 # Set operators strings, unary, binary, or ternary.
 # For example  "!, "!!", ^, "+", "-", ">=", "===", "<<", etc.
 display_operators_set: Set[str] = set()
@@ -131,10 +151,17 @@ def builtins_dict(builtins_by_module_dict):
 def definition_contribute(definitions):
     """
     Load the Definition objects associated to all the builtins
-    on `Definitions`
+    on `Definitions`.
+
+    When builtins are loaded lazily, the builtins of modules that are
+    not loaded at startup are left out. Instead, these modules are recorded
+    in `definitions`, which adds their definitions when one of their
+    symbols is first looked up.
     """
     for name, item in _builtins.items():
-        item.contribute(definitions)
+        if item.__module__ not in lazy_module_symbols:
+            item.contribute(definitions)
+    definitions.lazy_builtin_modules = dict(lazy_builtin_modules)
 
     from mathics.core.definitions import Definition
     from mathics.core.expression import ensure_context
@@ -146,8 +173,10 @@ def definition_contribute(definitions):
 
     calculate_operator_information()
     for operator in all_operator_names:
-        if not definitions.have_definition(ensure_context(operator)):
-            op = ensure_context(operator)
+        op = ensure_context(operator)
+        if op in definitions.lazy_builtin_modules:
+            continue
+        if not definitions.have_definition(op):
             definitions.builtin[op] = Definition(name=op)
 
 
@@ -194,9 +223,17 @@ def get_submodule_names(obj) -> list:
     return modpkgs
 
 
-def import_and_load_builtins():
+def import_and_load_builtins(lazy: Optional[bool] = None):
     """
     Imports Builtin modules in mathics.builtin and add rules, and definitions from that.
+
+    If `lazy` is True (by default, ``settings.LAZY_BUILTINS``), only the
+    modules that are needed from the start are imported. The others are
+    imported the first time one of their symbols is looked up. The symbols
+    of each module are read from the manifest in
+    ``settings.LAZY_BUILTINS_MANIFEST``. If the manifest is missing or out
+    of date, all the modules are imported, and the manifest is written for
+    the next time.
     """
     # TODO: Check if this is the expected behavior, or it the structures
     # must be cleaned.
@@ -208,6 +245,17 @@ def import_and_load_builtins():
     # Load render the routines
     importlib.import_module("mathics.format.render")
 
+    if lazy is None:
+        lazy = settings.LAZY_BUILTINS
+    if lazy:
+        manifest = read_builtin_modules_manifest(settings.LAZY_BUILTINS_MANIFEST)
+        if manifest is not None:
+            set_lazy_builtins_manifest(manifest)
+            for module_name in manifest["eager"]:
+                import_builtin_module(module_name, mathics3_builtins_modules)
+            add_builtins_from_builtin_modules(mathics3_builtins_modules)
+            return
+
     builtin_path = osp.join(
         osp.dirname(
             __file__,
@@ -235,6 +283,177 @@ def import_and_load_builtins():
 
     add_builtins_from_builtin_modules(mathics3_builtins_modules)
 
+    if lazy:
+        try:
+            write_builtin_modules_manifest(settings.LAZY_BUILTINS_MANIFEST)
+        except OSError:
+            # Not being able to write the manifest is not fatal:
+            # builtins are just loaded at startup next time, too.
+            pass
+
+
+def builtin_modules_manifest_key() -> dict:
+    """
+    Return the key that identifies a manifest of the builtin modules.
+
+    A manifest can only be reused if it was built by the same version of
+    Mathics3, running on the same Python version, with the same set of
+    enabled modules, and if no file under mathics.builtin changed since.
+    """
+    from mathics import __version__
+
+    builtin_path = osp.join(osp.dirname(__file__), "..", "builtin")
+    sources_time = 0.0
+    for root, _, files in os.walk(builtin_path):
+        for filename in files:
+            if filename.endswith(".py"):
+                try:
+                    sources_time = max(
+                        sources_time, os.stat(osp.join(root, filename)).st_mtime
+                    )
+                except OSError:
+                    pass
+
+    return {
+        "format": BUILTIN_MODULES_MANIFEST_FORMAT,
+        "mathics": __version__,
+        "python": [sys.implementation.name, *sys.version_info[:2]],
+        "enable_files_module": ENABLE_FILES_MODULE,
+        "sources_time": sources_time,
+    }
+
+
+def build_builtin_modules_manifest() -> dict:
+    """
+    Build the manifest used for loading builtin modules lazily,
+    from the modules imported by ``import_and_load_builtins``.
+
+    The manifest lists:
+
+    - "symbols": the names of the symbols that each module adds definitions for,
+    - "sympy": the sympy names that each module registers, and
+    - "eager": the modules that have to be loaded at startup, because
+      they register pattern objects or forms, which are used without
+      looking up their symbols.
+    """
+    from mathics.builtin.forms.base import FormBaseClass
+    from mathics.core.builtin import PatternObject, SympyObject
+    from mathics.core.definitions import Definitions
+
+    definitions = Definitions()
+    symbols: Dict[str, str] = {}
+    sympy_names: Dict[str, str] = {}
+    eager: List[str] = []
+    for module in mathics3_builtins_modules:
+        module_name = module.__name__
+        builtins = builtins_by_module.get(module_name, [])
+        if any(isinstance(b, (PatternObject, FormBaseClass)) for b in builtins):
+            eager.append(module_name)
+            continue
+
+        known_names = set(definitions.builtin)
+        for builtin in builtins:
+            builtin.contribute(definitions)
+            if isinstance(builtin, SympyObject):
+                for sympy_name in builtin.get_sympy_names():
+                    sympy_names[sympy_name] = module_name
+        for name in set(definitions.builtin) - known_names:
+            symbols[name] = module_name
+
+    # A module that uses a symbol as an option name creates an empty
+    # definition for it. The symbol still belongs to the module that
+    # defines a Builtin for it, whichever module was processed first.
+    for module in mathics3_builtins_modules:
+        module_name = module.__name__
+        for builtin in builtins_by_module.get(module_name, []):
+            name = builtin.get_name()
+            if module_name in eager:
+                symbols.pop(name, None)
+            else:
+                symbols[name] = module_name
+
+    return {
+        "key": builtin_modules_manifest_key(),
+        "symbols": symbols,
+        "sympy": sympy_names,
+        "eager": eager,
+    }
+
+
+def write_builtin_modules_manifest(filename: str) -> None:
+    """Build the manifest of the builtin modules, and write it to `filename`."""
+    manifest = build_builtin_modules_manifest()
+    directory = osp.dirname(osp.abspath(filename))
+    os.makedirs(directory, exist_ok=True)
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp_filename, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+    os.replace(tmp_filename, filename)
+
+
+def read_builtin_modules_manifest(filename: str) -> Optional[dict]:
+    """
+    Read the manifest of the builtin modules stored in `filename`.
+    Return None if the file does not exist, can not be read, or is
+    out of date.
+    """
+    try:
+        with open(filename, "r") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("key") != builtin_modules_manifest_key():
+        return None
+    return manifest
+
+
+def set_lazy_builtins_manifest(manifest: Optional[dict]):
+    """
+    Set up the maps used for loading builtin modules lazily
+    from `manifest`. If `manifest` is None, clear them, so that
+    Definitions get the definitions of all the imported builtins at startup.
+    """
+    lazy_builtin_modules.clear()
+    lazy_module_symbols.clear()
+    lazy_mathics_to_sympy_modules.clear()
+    lazy_sympy_to_mathics_modules.clear()
+    if manifest is None:
+        return
+
+    lazy_builtin_modules.update(manifest["symbols"])
+    for name, module_name in lazy_builtin_modules.items():
+        lazy_module_symbols.setdefault(module_name, []).append(name)
+    for name, module_name in lazy_builtin_modules.items():
+        if module_name not in builtins_by_module:
+            lazy_mathics_to_sympy_modules[name] = module_name
+    for sympy_name, module_name in manifest["sympy"].items():
+        if module_name not in builtins_by_module:
+            lazy_sympy_to_mathics_modules[sympy_name] = module_name
+
+
+def load_builtin_module(module_name: str) -> List["Builtin"]:
+    """
+    Return the list of Builtin instances defined in the builtin module
+    `module_name`, importing and registering the module first if
+    it was not imported yet.
+    """
+    builtins = builtins_by_module.get(module_name)
+    if builtins is not None:
+        return builtins
+
+    modules: List[ModuleType] = []
+    import_builtin_module(module_name, modules)
+    if not modules:
+        # The module could not be imported. Do not try again.
+        builtins_by_module[module_name] = []
+        return []
+
+    builtins_list: List[Tuple[str, "Builtin"]] = []
+    add_builtins_from_builtin_module(modules[0], builtins_list)
+    add_builtins(builtins_list)
+    mathics3_builtins_modules.append(modules[0])
+    return builtins_by_module[module_name]
+
 
 def import_builtin_module(import_name: str, modules: List[ModuleType]):
     """
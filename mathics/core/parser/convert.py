@@ -191,9 +191,15 @@ class Converter(GenericConverter):
         self.definitions = None
 
     def convert(self, node, definitions) -> BaseElement:
+        # Looking up a name can load a builtin module lazily, which
+        # converts the rules of its builtins. So restore the definitions
+        # of the outer conversion when done.
+        outer_definitions = self.definitions
         self.definitions = definitions
-        result = self.do_convert(node)
-        self.definitions = None
+        try:
+            result = self.do_convert(node)
+        finally:
+            self.definitions = outer_definitions
         return result
 
     def do_convert(self, node):
@@ -13,7 +13,6 @@ See also: mathics.core.rules and
 https://reference.wolfram.com/language/tutorial/PatternsAndTransformationRules.html
 """
 
-
 from abc import ABC
 from itertools import chain
 from typing import (
@@ -55,7 +54,7 @@ from mathics.core.systemsymbols import (
     SymbolRepeatedNull,
     SymbolSequence,
 )
-from mathics.core.util import permutations, subranges, subsets
+from mathics.core.util import group_items, permutations, subranges, subsets
 
 if TYPE_CHECKING:
     from mathics.core.builtin import PatternObject
@@ -293,6 +292,25 @@ class BasePattern(ABC):
         """
         raise NotImplementedError
 
+    def can_match_single(self, evaluation: Evaluation) -> bool:
+        """
+        Return True if the pattern always matches a single expression,
+        in at most one way, so that it can be matched with
+        ``match_single()`` instead of ``match()``.
+        """
+        return False
+
+    def match_single(
+        self, expression: BaseElement, vars_dict: dict, evaluation: Evaluation
+    ) -> Optional[dict]:
+        """
+        Match the pattern against `expression`, for patterns for which
+        ``can_match_single()`` is True. Return `vars_dict` extended with
+        the variables bound by the match, or None if the pattern does not
+        match. `vars_dict` is not modified.
+        """
+        raise NotImplementedError
+
     def does_match(self, expression: BaseElement, pattern_context: dict) -> bool:
         """returns True if `expression` matches self or we have
         reached the end of the matches, and False if it does not.
@@ -301,6 +319,9 @@ class BasePattern(ABC):
         vars_dict: Optional[dict] = pattern_context.setdefault("vars_dict", {})
         fully: bool = pattern_context.get("fully", True)
 
+        if self.can_match_single(evaluation):
+            return self.match_single(expression, vars_dict, evaluation) is not None
+
         # for sub_vars, rest in self.match(  # nopep8
         #    expression, vars, evaluation, fully=fully):
         #    return True
@@ -370,6 +391,7 @@ class AtomPattern(BasePattern):
         self.atom = expr
         if isinstance(expr, Symbol):
             self.match = self.match_symbol  # type: ignore[method-assign]
+            self.match_single = self.match_single_symbol  # type: ignore[method-assign]
             self.get_match_candidates = self.get_match_symbol_candidates  # type: ignore[method-assign]
 
     def __repr__(self):
@@ -385,6 +407,12 @@ class AtomPattern(BasePattern):
         if expression is self.atom:
             pattern_context["yield_func"](pattern_context["vars_dict"], None)
 
+    def match_single_symbol(
+        self, expression: BaseElement, vars_dict: dict, evaluation: Evaluation
+    ) -> Optional[dict]:
+        """Match against a symbol"""
+        return vars_dict if expression is self.atom else None
+
     def get_match_symbol_candidates(
         self, elements: tuple, pattern_context: dict
     ) -> tuple:
@@ -398,6 +426,16 @@ class AtomPattern(BasePattern):
             # yield vars, None
             pattern_context["yield_func"](pattern_context["vars_dict"], None)
 
+    def can_match_single(self, evaluation: Evaluation) -> bool:
+        return True
+
+    def match_single(
+        self, expression: BaseElement, vars_dict: dict, evaluation: Evaluation
+    ) -> Optional[dict]:
+        if isinstance(expression, Atom) and expression.sameQ(self.atom):
+            return vars_dict
+        return None
+
     def get_match_candidates(
         self, elements: Tuple[BaseElement], pattern_context: dict
     ) -> tuple:
@@ -453,6 +491,11 @@ class ExpressionPattern(BasePattern):
 
     attributes: Optional[int] = None
 
+    # Whether the pattern can be matched with ``match_single()``. This is
+    # found out on the first match, when the attributes of the head are
+    # known.
+    single: Optional[bool] = None
+
     def __init__(
         self,
         expr: Expression,
@@ -503,10 +546,12 @@ class ExpressionPattern(BasePattern):
                 yield_func(vars_dict, None)
             return
 
-        if self.attributes is None:
-            self.__set_pattern_attributes__(
-                self.head.get_attributes(evaluation.definitions)
-            )
+        if self.can_match_single(evaluation):
+            vars_dict = self.match_single(expression, vars_dict, evaluation)
+            if vars_dict is not None:
+                yield_func(vars_dict, None)
+            return
+
         assert self.attributes is not None
         attributes = self.attributes
 
@@ -538,6 +583,56 @@ class ExpressionPattern(BasePattern):
         if A_ONE_IDENTITY & attributes:
             match_expression_with_one_identity(self, expression, parms)
 
+    def can_match_single(self, evaluation: Evaluation) -> bool:
+        """
+        Return True if the pattern can be matched with ``match_single()``:
+        when its head is not Flat or Orderless, and the head and each
+        element are patterns that match a single expression, like
+        literals, `Blank[]`, `Blank[h]`, and named patterns or pattern
+        tests over these. Other patterns need the general matcher.
+        """
+        if self.single is None:
+            if self.attributes is None:
+                self.__set_pattern_attributes__(
+                    self.head.get_attributes(evaluation.definitions)
+                )
+            assert self.attributes is not None
+            self.single = self.isliteral or (
+                not (A_FLAT | A_ORDERLESS) & self.attributes
+                and self.head.can_match_single(evaluation)
+                and all(
+                    element.can_match_single(evaluation) for element in self.elements
+                )
+            )
+        return self.single
+
+    def match_single(
+        self, expression: BaseElement, vars_dict: dict, evaluation: Evaluation
+    ) -> Optional[dict]:
+        """
+        Match the expression by checking the head and the number of
+        elements, and then matching each element in turn.
+        """
+        from mathics.core.atoms.associations import Association
+
+        evaluation.check_stopped()
+        if self.isliteral:
+            return vars_dict if expression.sameQ(self.expr) else None
+
+        if not isinstance(expression, Expression):
+            if not isinstance(expression, Association):
+                return None
+            expression = expression.expr
+        elements = expression.elements
+        if len(elements) != len(self.elements):
+            return None
+        result = self.head.match_single(expression.get_head(), vars_dict, evaluation)
+        for element_pattern, element in zip(self.elements, elements):
+            if result is None:
+                return None
+            result = element_pattern.match_single(element, result, evaluation)
+        return result
+
     def _get_pre_choices(
         self, expression: Expression, yield_choice: Callable, pattern_context: dict
     ):
@@ -639,6 +734,15 @@ class ExpressionPattern(BasePattern):
             set_lengths = (match_count[0], None)
         else:
             set_lengths = match_count
+        set_lengths = restrict_lengths(
+            set_lengths,
+            len(candidates),
+            rest_elements,
+            vars_dict,
+            fully and not A_FLAT & attributes,
+        )
+        if set_lengths is None:
+            return
 
         # try_flattened is used later to decide whether wrapping of elements
         # into one operand may occur.
@@ -735,6 +839,40 @@ class ExpressionPattern(BasePattern):
         self.elements.sort(key=lambda e: e.pattern_precedence)
 
 
+def restrict_lengths(
+    lengths: Tuple[int, Optional[int]],
+    count: int,
+    rest_elements: tuple,
+    vars_dict: dict,
+    bounded: bool,
+) -> Optional[Tuple[int, int]]:
+    """
+    Restrict the `lengths` of the sequences an element can match, out of
+    `count` items, so that the elements in `rest_elements` get at least
+    as many items as they need. When `bounded` is True, all the items
+    must be matched, and the element must also leave no more items than
+    `rest_elements` can take.
+
+    Return None if no length is possible.
+    """
+    rest_min = 0
+    rest_max: Optional[int] = 0
+    for element in rest_elements:
+        element_min, element_max = element.get_match_count(vars_dict)
+        rest_min += element_min
+        if rest_max is not None:
+            rest_max = None if element_max is None else rest_max + element_max
+
+    shortest, longest = lengths
+    if longest is None or longest > count - rest_min:
+        longest = count - rest_min
+    if bounded and rest_max is not None and shortest < count - rest_max:
+        shortest = count - rest_max
+    if shortest > longest:
+        return None
+    return shortest, longest
+
+
 def match_expression_with_one_identity(
     self: ExpressionPattern,
     expression: BaseElement,
@@ -947,6 +1085,7 @@ def basic_match_expression(
                 {
                     "yield_choice": yield_choice,
                     "attributes": attributes,
+                    "evaluation": evaluation,
                     "vars_dict": head_vars,
                 },
             )
@@ -997,15 +1136,9 @@ def expression_pattern_match_element_orderless(
                 needed = existing.elements
             else:
                 needed = (existing,)
-            available = list(candidates)
-            for needed_element in needed:
-                if (
-                    needed_element in available
-                    and needed_element in element_candidates  # nopep8
-                ):
-                    available.remove(needed_element)
-                else:
-                    return set()
+            available = remove_items(candidates, needed, element_candidates)
+            if available is None:
+                return set()
             sets = [
                 (
                     needed,
@@ -1026,6 +1159,34 @@ def expression_pattern_match_element_orderless(
     return sets
 
 
+def remove_items(
+    items: Sequence[BaseElement],
+    removed: Sequence[BaseElement],
+    included: Union[tuple, set],
+) -> Optional[list]:
+    """
+    Return the list of `items` without the elements in `removed`, or
+    None if some element of `removed` is not among `items` and in
+    `included` as many times as it is removed.
+    """
+    counts: Dict[BaseElement, int] = {}
+    for element in removed:
+        counts[element] = counts.get(element, 0) + 1
+    for element in counts:
+        if element not in included:
+            return None
+    rest = []
+    for item in items:
+        count = counts.get(item, 0)
+        if count:
+            counts[item] = count - 1
+        else:
+            rest.append(item)
+    if any(counts.values()):
+        return None
+    return rest
+
+
 # TODO: adding the annotations for items
 # and items_rest as ``tuples`` produce failures in cython.
 # We should investigate what is the right type to pass here.
@@ -1139,10 +1300,14 @@ def get_pre_choices_orderless(
     the attribute Orderless.
 
     This case is more involved, since the pattern can include subpatterns.
-
+    When several patterns have the same name, as in ``f[x_, x_, y_]``,
+    the possible values of the name are chosen first, from the elements
+    of the expression that appear at least as many times as the name.
     """
     yield_choice: Callable = pattern_context["yield_choice"]
     vars_dict: dict = pattern_context["vars_dict"]
+    attributes: int = pattern_context["attributes"]
+    evaluation: Evaluation = pattern_context["evaluation"]
 
     patterns = pat.filter_elements("Pattern")
     # a dict with entries having patterns with the same name
@@ -1162,86 +1327,76 @@ def get_pre_choices_orderless(
                     groups[name] = [prev_pattern, pattern]
             prev_pattern = pattern
             prev_name = name
-    # prev_element = None
+
+    if not groups:
+        yield_choice(vars_dict)
+        return
 
     # count duplicate elements
-    expr_groups: Dict[BaseElement, int] = {}
-    for element in expression.elements:
-        expr_groups[element] = expr_groups.get(element, 0) + 1
+    expr_groups = group_items(expression.elements)
 
     def per_name(yield_name: Callable, groups: Tuple, vars_dict: dict):
         """
         Yields possible variable settings (dictionaries) for the
         remaining pattern groups
         """
-        # TODO: check why this condition is never reached in tests.
-        if groups:
-            # name, patterns = groups[0]
-
-            # match_count = [0, None]
-            # for pattern in patterns:
-            #     sub_match_count = pattern.get_match_count()
-            #     if sub_match_count[0] > match_count[0]:
-            #         match_count[0] = sub_match_count[0]
-            #     if match_count[1] is None or (
-            #         sub_match_count[1] is not None
-            #         and sub_match_count[1] < match_count[1]
-            #     ):
-            #         match_count[1] = sub_match_count[1]
-            # # possibilities = [{}]
-            # # sum = 0
-
-            # def per_expr(yield_expr, expr_groups, sum_int=0):
-            #     """
-            #     Yields possible values (sequence lists) for the current
-            #     variable (name) taking into account the
-            #     (expression, count)'s in expr_groups
-            #     """
-
-            #     if expr_groups:
-            #         expr, count = expr_groups.popitem()
-            #         max_per_pattern = count // len(patterns)
-            #         for per_pattern in range(max_per_pattern, -1, -1):
-            #             for next_expr in per_expr(  # nopep8
-            #                 expr_groups, sum_int + per_pattern
-            #             ):
-            #                 yield_expr([expr] * per_pattern + next_expr)
-            #     else:
-            #         if sum_int >= match_count[0]:
-            #             yield_expr([])
-            #         # Until we learn that the below is incorrect,
-            #         # we'll return basically no match.
-            #         yield None
-
-            # # for sequence in per_expr(expr_groups.items()):
-            # def yield_expr(sequence):
-            #     # FIXME: this call is wrong and needs a
-            #     # wrapper_function as the 1st parameter.
-            #     wrappings = pat.get_wrappings(
-            #         items=sequence,
-            #         max_count=match_count[1],
-            #         expression=expression,
-            #         attributes=attributes
-            #     )
-            #     for wrapping in wrappings:
-            #         1/0
-            #         # for next in per_name(groups[1:], vars_dict):
-
-            #         def yield_next(next_expr):
-            #             setting = next_expr.copy()
-            #             setting[name] = wrapping
-            #             yield_name(setting)
-
-            #         per_name(yield_next, groups[1:], vars_dict)
-
-            # per_expr(yield_expr, expr_groups)
-            pass
-        else:  # no groups left
+        if not groups:
             yield_name(vars_dict)
+            return
+
+        name, patterns = groups[0]
+        match_count = [0, None]
+        for pattern in patterns:
+            sub_match_count = pattern.get_match_count()
+            if sub_match_count[0] > match_count[0]:
+                match_count[0] = sub_match_count[0]
+            if match_count[1] is None or (
+                sub_match_count[1] is not None and sub_match_count[1] < match_count[1]
+            ):
+                match_count[1] = sub_match_count[1]
+
+        def per_expr(yield_expr: Callable, index: int, sequence: list):
+            """
+            Yields possible values (sequence lists) for the current
+            variable (name), taking each element at most as many times
+            as all the patterns with the name can take it.
+            """
+            if index == len(expr_groups):
+                if len(sequence) >= match_count[0]:
+                    yield_expr(sequence)
+                return
+            expr, count = expr_groups[index]
+            max_per_pattern = count // len(patterns)
+            if match_count[1] is not None:
+                max_per_pattern = min(max_per_pattern, match_count[1] - len(sequence))
+            for per_pattern in range(max_per_pattern, -1, -1):
+                per_expr(yield_expr, index + 1, sequence + [expr] * per_pattern)
+
+        def yield_expr(sequence: list):
+            def yield_wrapping(wrapping: BaseElement):
+                # The value must match the pattern, as it is not matched
+                # again when the name is found set.
+                if not patterns[0].does_match(
+                    wrapping, {"evaluation": evaluation, "vars_dict": vars_dict}
+                ):
+                    return
+                setting = vars_dict.copy()
+                setting[name] = wrapping
+                per_name(yield_name, groups[1:], setting)
+
+            pat.get_wrappings(
+                yield_func=yield_wrapping,
+                items=tuple(sequence),
+                pattern_context={
+                    "max_count": match_count[1],
+                    "expression": expression,
+                    "attributes": attributes,
+                    "include_flattened": 0 < len(sequence) < len(expression.elements),
+                },
+            )
+
+        per_expr(yield_expr, 0, [])
 
-    # for setting in per_name(groups.items(), vars):
-    # def yield_name(setting):
-    #    yield_func(setting)
     per_name(yield_choice, tuple(groups.items()), vars_dict)
 
 
@@ -0,0 +1,143 @@
+"""
+Cache of the results of pure builtin functions.
+
+Builtins like ``Expand``, ``Simplify`` or ``Integrate`` convert their
+arguments to SymPy and run a SymPy algorithm each time they are
+evaluated, even when the same arguments were seen a moment before. A
+builtin whose result depends only on its arguments, its options and
+``$Assumptions`` can set its class attribute ``cacheable`` to True, and
+the results of its evaluation rules are then kept in the cache of the
+``Definitions`` object.
+
+Results are looked up by the structure of the expression the rule is
+applied to, which includes the options given explicitly. A result is
+used only while the definitions of the symbols in that expression, and
+of ``$Assumptions``, have not changed since it was computed; a change of
+the default options of the builtin changes the definition of its
+symbol. A result is not kept if computing it issued a message or
+printed something, so that evaluating the expression again does it
+again.
+
+The cache keeps the results used most recently, up to
+``settings.RESULT_CACHE_SIZE`` of them.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from mathics import settings
+from mathics.core.atoms import PrecisionReal
+from mathics.core.element import BaseElement
+from mathics.core.expression import Expression
+from mathics.core.symbols import Atom, Symbol
+
+ASSUMPTIONS_NAME = "System`$Assumptions"
+
+
+def result_key(expr: BaseElement) -> Optional[Hashable]:
+    """
+    Return a key that is the same for two expressions only if they
+    have the same heads and atoms in the same places, or None if some
+    atom of `expr` can not be part of a key.
+
+    Unlike ``SameQ``, reals are only the same when they have the same
+    value and the same precision. A hash-consed subexpression is
+    represented by its id, so its elements are not traversed; see
+    mathics.core.hashcons.
+    """
+    if isinstance(expr, Symbol):
+        return expr.get_name()
+    if isinstance(expr, Expression):
+        if expr.hash_consed:
+            return ("HashCons", id(expr))
+        head = result_key(expr.head)
+        if head is None:
+            return None
+        key = [head]
+        for element in expr.elements:
+            element_key = result_key(element)
+            if element_key is None:
+                return None
+            key.append(element_key)
+        return tuple(key)
+    if isinstance(expr, PrecisionReal):
+        return ("PrecisionReal", expr.value, expr.value._prec)
+    if isinstance(expr, Atom):
+        key = (type(expr).__name__, expr.value)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    return None
+
+
+class ResultCache:
+    """
+    The results of the evaluation rules of cacheable builtins, and how
+    often they were found in the cache, for each builtin.
+    """
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        self.max_size = settings.RESULT_CACHE_SIZE if max_size is None else max_size
+        # Maps (rule function name, key) -> (result, time, symbols, expression)
+        self.entries: OrderedDict = OrderedDict()
+        # Maps builtin name -> [hits, misses]
+        self.counts: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self) -> None:
+        """Remove all the results, and reset the counts."""
+        self.entries.clear()
+        self.counts.clear()
+
+    def count(self, name: str, hit: bool) -> None:
+        counts = self.counts.get(name)
+        if counts is None:
+            counts = self.counts[name] = [0, 0]
+        counts[0 if hit else 1] += 1
+
+    def lookup(self, key: Tuple, definitions) -> Optional[BaseElement]:
+        """
+        Return the result stored under `key`, or None if there is none,
+        or if the definitions it depends on changed since it was stored.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        result, time, symbols, _ = entry
+        if definitions.is_uncertain_final_value(time, symbols):
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return result
+
+    def store(
+        self,
+        key: Tuple,
+        expression: BaseElement,
+        result: BaseElement,
+        time: int,
+        symbols,
+    ) -> None:
+        """
+        Store `result` under `key`, as computed at `time` from the
+        definitions of `symbols`. `expression` is kept with the result,
+        so that the ids of hash-consed nodes in `key` stay valid.
+        """
+        self.entries[key] = (result, time, symbols | {ASSUMPTIONS_NAME}, expression)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def statistics(self) -> Tuple[int, int, Dict[str, Tuple[int, int]]]:
+        """
+        Return the numbers of hits and of misses, and these numbers for
+        each builtin.
+        """
+        by_builtin = {name: tuple(counts) for name, counts in self.counts.items()}
+        hits = sum(counts[0] for counts in by_builtin.values())
+        misses = sum(counts[1] for counts in by_builtin.values())
+        return hits, misses, by_builtin
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Discrimination index over the rules stored in a ``Definition``.
+
+When an expression like ``F[1, x]`` is evaluated, the rules attached
+to ``F`` (its DownValues), and the rules attached to the symbols
+appearing as its elements (their UpValues), are tried one after the
+other until one of them matches. For symbols with many definitions,
+like ``f[1]=...; f[2]=...; ...`` memo tables or large rule libraries,
+most of these attempts are doomed from the start: the number of
+arguments does not fit, a literal argument is different, or the head
+of an argument is not the one the pattern asks for.
+
+``RuleDispatchIndex`` looks at the shape of the left-hand side of each
+rule once, and keys the rule on:
+
+* the name of the head of the pattern,
+* the number of arguments it accepts,
+* literal atoms in argument positions (``f[1]``, ``f["a", b]``), and
+* heads required in argument positions (``f[x_Integer]``, ``f[g[x_]]``).
+
+Looking up the rules for an expression then returns only the rules
+whose keys are compatible with it, in the same order they have in the
+``Definition``. Rules whose shape cannot be analyzed (for example,
+because their head is ``Orderless`` or ``Flat``) are always returned.
+So, the index never changes which rule is applied: it only saves
+calls to the pattern matcher that would fail anyway.
+"""
+
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from mathics.core.atoms import Integer, Rational, String
+from mathics.core.attributes import A_FLAT, A_ONE_IDENTITY, A_ORDERLESS
+from mathics.core.element import BaseElement
+from mathics.core.pattern import AtomPattern, BasePattern, ExpressionPattern
+from mathics.core.rules import BaseRule
+from mathics.core.symbols import Symbol
+
+# Rule lists with fewer rules than this are just scanned linearly:
+# building and consulting the index does not pay off for them.
+RULE_INDEX_MIN_RULES = 8
+
+# Attributes that change the way the elements of an expression are
+# matched against the elements of a pattern. Patterns whose head has
+# any of these are not indexed.
+A_UNINDEXABLE = A_FLAT | A_ONE_IDENTITY | A_ORDERLESS
+
+# Names of pattern objects that wrap the "real" pattern,
+# without changing its shape.
+WRAPPER_PATTERN_NAMES = (
+    "System`Condition",
+    "System`HoldPattern",
+    "System`Pattern",
+    "System`PatternTest",
+)
+
+# Kinds of argument specifications
+ARG_LITERAL = 0
+ARG_HEAD = 1
+
+ArgSpec = Optional[Tuple[int, object]]
+
+
+def literal_key(element: BaseElement) -> Optional[tuple]:
+    """
+    Return a hashable key for atoms that ``AtomPattern`` matches exactly,
+    or ``None`` if ``element`` is not such an atom.
+
+    Two elements with different keys never match the same literal pattern.
+    Inexact numbers are not keyed, because ``SameQ`` compares them up
+    to their precision.
+    """
+    if isinstance(element, Symbol):
+        return ("Symbol", element.name)
+    if isinstance(element, Integer):
+        return ("Integer", element.value)
+    if isinstance(element, String):
+        return ("String", element.value)
+    if isinstance(element, Rational):
+        return ("Rational", element.value)
+    return None
+
+
+def strip_pattern_wrappers(pattern: BasePattern) -> BasePattern:
+    """
+    Remove ``Condition``, ``HoldPattern``, ``Pattern`` and ``PatternTest``
+    wrappers around ``pattern``. The stripped pattern has to match
+    for the wrapped pattern to match.
+    """
+    while pattern.get_head_name() in WRAPPER_PATTERN_NAMES:
+        inner = getattr(pattern, "pattern", None)
+        if not isinstance(inner, BasePattern):
+            break
+        pattern = inner
+    return pattern
+
+
+class RuleSignature:
+    """
+    The shape of the left-hand side of a rule, as far as
+    ``RuleDispatchIndex`` is concerned.
+
+    ``min_count`` and ``max_count`` bound the number of arguments the
+    pattern accepts (``max_count`` is ``None`` if unbounded).
+    ``arg_specs`` holds, for the leading arguments that match exactly
+    one element, either ``None`` (anything goes) or a tuple
+    ``(ARG_LITERAL, key)`` / ``(ARG_HEAD, head_name)``.
+    """
+
+    __slots__ = ("head_name", "min_count", "max_count", "arg_specs")
+
+    def __init__(
+        self,
+        head_name: str,
+        min_count: int,
+        max_count: Optional[int],
+        arg_specs: Tuple[ArgSpec, ...],
+    ):
+        self.head_name = head_name
+        self.min_count = min_count
+        self.max_count = max_count
+        self.arg_specs = arg_specs
+
+    @property
+    def is_fixed_arity(self) -> bool:
+        return self.min_count == self.max_count
+
+    @property
+    def literal_keys(self) -> Optional[tuple]:
+        """
+        If the pattern is made of literal atoms only, return the tuple
+        of their keys. Otherwise, return None.
+        """
+        if not self.is_fixed_arity or len(self.arg_specs) != self.min_count:
+            return None
+        keys = []
+        for spec in self.arg_specs:
+            if spec is None or spec[0] != ARG_LITERAL:
+                return None
+            keys.append(spec[1])
+        return tuple(keys)
+
+    def accepts(self, elements: Sequence[BaseElement]) -> bool:
+        """
+        Check, cheaply and without calling the pattern matcher, if a
+        pattern with this signature could match an expression with
+        elements `elements`.
+        """
+        count = len(elements)
+        if count < self.min_count:
+            return False
+        if self.max_count is not None and count > self.max_count:
+            return False
+        for spec, element in zip(self.arg_specs, elements):
+            if spec is None:
+                continue
+            kind, value = spec
+            if kind == ARG_LITERAL:
+                if literal_key(element) != value:
+                    return False
+            elif element.get_head_name() != value:
+                return False
+        return True
+
+
+def compute_rule_signature(
+    rule: BaseRule, attributes_of: Callable[[str], int]
+) -> Optional[RuleSignature]:
+    """
+    Compute the signature of the left-hand side of `rule`.
+    `attributes_of` returns the attributes of a symbol given its name.
+
+    Return ``None`` if the rule can not be indexed.
+    """
+    pattern = strip_pattern_wrappers(rule.pattern)
+    if type(pattern) is not ExpressionPattern:
+        return None
+    head = pattern.head
+    if not isinstance(head, AtomPattern) or not isinstance(head.atom, Symbol):
+        return None
+    head_name = head.atom.name
+    attributes = pattern.attributes
+    if attributes is None:
+        attributes = attributes_of(head_name)
+    if attributes & A_UNINDEXABLE:
+        return None
+
+    min_count = 0
+    max_count: Optional[int] = 0
+    arg_specs: List[ArgSpec] = []
+    leading = True
+    for element in pattern.elements:
+        element_min, element_max = element.get_match_count()
+        min_count += element_min
+        if max_count is not None:
+            max_count = None if element_max is None else max_count + element_max
+        if leading and (element_min, element_max) == (1, 1):
+            arg_specs.append(compute_arg_spec(element, attributes_of))
+        else:
+            leading = False
+    return RuleSignature(head_name, min_count, max_count, tuple(arg_specs))
+
+
+def compute_arg_spec(
+    element: BasePattern, attributes_of: Callable[[str], int]
+) -> ArgSpec:
+    """
+    Compute the specification for an element of a pattern
+    that matches exactly one element of an expression.
+    """
+    element = strip_pattern_wrappers(element)
+    if isinstance(element, AtomPattern):
+        key = literal_key(element.atom)
+        return None if key is None else (ARG_LITERAL, key)
+    if type(element) is ExpressionPattern:
+        head = element.head
+        if isinstance(head, AtomPattern) and isinstance(head.atom, Symbol):
+            head_name = head.atom.name
+            attributes = element.attributes
+            if attributes is None:
+                attributes = attributes_of(head_name)
+            # With OneIdentity, g[x_, y_:0] also matches things whose
+            # head is not g.
+            if not attributes & A_ONE_IDENTITY:
+                return (ARG_HEAD, head_name)
+        return None
+    if element.get_head_name() == "System`Blank":
+        target_head = getattr(element, "target_head", None)
+        if target_head is not None:
+            return (ARG_HEAD, target_head.name)
+    return None
+
+
+class RuleDispatchIndex:
+    """
+    An index over a list of rules, which selects the rules that may
+    match a given expression. See the module docstring.
+
+    The index is a snapshot of ``rules``: it has to be rebuilt when
+    the list, or the attributes of the symbol owning it, change.
+    """
+
+    def __init__(
+        self,
+        rules: List[BaseRule],
+        attributes: int,
+        attributes_of: Callable[[str], int],
+        previous: Optional["RuleDispatchIndex"] = None,
+    ):
+        self.rules = rules
+        self.size = len(rules)
+        self.attributes = attributes
+        # Set when the list of rules is modified.
+        self.stale = False
+
+        # Signatures of the rules, keyed by id(). Each entry keeps a
+        # reference to its rule, so ids are not reused while the entry
+        # lives. When the index is rebuilt after adding or removing a
+        # rule, the signatures of the other rules are taken from here.
+        self.signatures: Dict[int, Tuple[BaseRule, Optional[RuleSignature]]] = {}
+        previous_signatures = (
+            previous.signatures
+            if previous is not None and previous.attributes == attributes
+            else {}
+        )
+
+        # Rules whose arguments are all literal atoms, keyed by
+        # (head name, literal keys).
+        self.literal_rules: Dict[Tuple[str, tuple], List[int]] = {}
+        # Other rules with a fixed number of arguments, keyed by
+        # (head name, number of arguments).
+        self.fixed_rules: Dict[Tuple[str, int], List[Tuple[int, RuleSignature]]] = {}
+        # Rules accepting a variable number of arguments, keyed by head name.
+        self.variable_rules: Dict[str, List[Tuple[int, RuleSignature]]] = {}
+        # Rules that could not be analyzed. These are always candidates.
+        self.other_rules: List[int] = []
+        # (head name, number of arguments) pairs having literal rules.
+        self.literal_arities = set()
+
+        for position, rule in enumerate(rules):
+            entry = previous_signatures.get(id(rule))
+            if entry is not None and entry[0] is rule:
+                signature = entry[1]
+            else:
+                signature = compute_rule_signature(rule, attributes_of)
+            self.signatures[id(rule)] = (rule, signature)
+            if signature is None:
+                self.other_rules.append(position)
+                continue
+            head_name = signature.head_name
+            if signature.is_fixed_arity:
+                keys = signature.literal_keys
+                if keys is not None:
+                    self.literal_rules.setdefault((head_name, keys), []).append(
+                        position
+                    )
+                    self.literal_arities.add((head_name, len(keys)))
+                else:
+                    self.fixed_rules.setdefault(
+                        (head_name, signature.min_count), []
+                    ).append((position, signature))
+            else:
+                self.variable_rules.setdefault(head_name, []).append(
+                    (position, signature)
+                )
+
+    def is_valid_for(self, rules: List[BaseRule], attributes: int) -> bool:
+        """Check if the index still describes `rules`."""
+        return (
+            not self.stale
+            and self.rules is rules
+            and self.size == len(rules)
+            and self.attributes == attributes
+        )
+
+    def candidates(self, expression: BaseElement) -> List[BaseRule]:
+        """
+        Return the rules that may match `expression`, in the order in
+        which they are stored.
+        """
+        head_name = expression.get_head_name()
+        elements = expression.get_elements()
+        count = len(elements)
+
+        positions: List[int] = []
+        if (head_name, count) in self.literal_arities:
+            keys = tuple(literal_key(element) for element in elements)
+            positions.extend(self.literal_rules.get((head_name, keys), ()))
+        for position, signature in self.fixed_rules.get((head_name, count), ()):
+            if signature.accepts(elements):
+                positions.append(position)
+        for position, signature in self.variable_rules.get(head_name, ()):
+            if signature.accepts(elements):
+                positions.append(position)
+
+        rules = self.rules
+        if not self.other_rules:
+            if len(positions) > 1:
+                positions.sort()
+            return [rules[position] for position in positions]
+        return [
+            rules[position] for position in sorted(chain(positions, self.other_rules))
+        ]
@@ -60,6 +60,7 @@ from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
 from mathics.core.keycomparable import PATTERN_SORT_KEY_CONDITIONAL, KeyComparable
 from mathics.core.pattern import BasePattern, StopGenerator
+from mathics.core.result_cache import result_key
 from mathics.core.symbols import SymbolTrue, strip_context
 
 
@@ -147,6 +148,9 @@ class BaseRule(KeyComparable, ABC):
         if return_list and max_list is not None and max_list <= 0:
             return []
 
+        if self.pattern.can_match_single(evaluation):
+            return self.apply_single(expression, evaluation, return_list)
+
         def yield_match(vars, rest):
             if rest is None:
                 rest = ([], [])
@@ -219,6 +223,42 @@ class BaseRule(KeyComparable, ABC):
         else:
             return None
 
+    def apply_single(
+        self, expression: BaseElement, evaluation: Evaluation, return_list: bool
+    ):
+        """
+        Apply the rule when its pattern can be matched with
+        ``match_single()``: there is at most one match, which takes the
+        whole expression, and no options are collected.
+        """
+        vars = self.pattern.match_single(expression, {}, evaluation)
+        if vars is None:
+            return [] if return_list else None
+        apply_fn = (
+            self.apply_function
+            if isinstance(self, FunctionApplyRule)
+            else self.apply_rule
+        )
+        try:
+            result = apply_fn(expression, vars, {}, evaluation)
+        except RuleApplicationFailed:
+            return [] if return_list else None
+
+        if isinstance(result, Expression):
+            if result.elements_properties is None:
+                result._build_elements_properties()
+            # Flatten out sequences (important for Rule itself!)
+            result = result.flatten_pattern_sequence(evaluation)
+        if return_list:
+            return [result]
+        if (
+            hasattr(expression, "location")
+            and hasattr(result, "location")
+            and expression.location is not None
+        ):
+            result.location = expression.location
+        return result
+
     def apply_rule(
         self, expression: BaseElement, vars: dict, options: dict, evaluation: Evaluation
     ):
@@ -327,6 +367,10 @@ class RewriteRule(BaseRule):
         self, expression: BaseElement, vars: dict, options: dict, evaluation: Evaluation
     ):
         new = self.replace.replace_vars(vars)
+        if isinstance(new, Expression) and new.hash_consed:
+            # The value of a pattern variable can be a node shared with
+            # other expressions, which must not get these options.
+            new = new.shallow_copy()
         new.options = options
 
         while new.has_form("System`Condition", 2):
@@ -440,6 +484,10 @@ class FunctionApplyRule(BaseRule):
 
     """
 
+    # Whether the results of the function are kept in the result
+    # cache of the definitions. See mathics.core.result_cache.
+    cacheable = False
+
     def __init__(
         self,
         name: str,
@@ -448,11 +496,13 @@ class FunctionApplyRule(BaseRule):
         check_options: Optional[Callable],
         evaluation: Optional[Evaluation] = None,
         attributes: Optional[int] = None,
+        cacheable: bool = False,
     ) -> None:
         super(FunctionApplyRule, self).__init__(pattern, attributes=attributes)
         self.name = name
         self.location = self.function = function
         self.check_options = check_options
+        self.cacheable = cacheable
 
     # If you update this, you must also update traced_apply_function
     # (that's in the same file TraceBuiltins is)
@@ -462,6 +512,20 @@ class FunctionApplyRule(BaseRule):
         if options and self.check_options:
             if not self.check_options(options, evaluation):
                 return None
+        cache_key = None
+        if self.cacheable:
+            # See mathics.core.result_cache
+            cache = evaluation.definitions.result_cache
+            if cache.max_size > 0:
+                cache_key = result_key(expression)
+            if cache_key is not None:
+                cache_key = (self.function.__qualname__, cache_key)
+                result = cache.lookup(cache_key, evaluation.definitions)
+                cache.count(self.name, result is not None)
+                if result is not None:
+                    return result
+                time = evaluation.definitions.now
+                out_state = (evaluation.message_count, len(evaluation.out))
         # The Python function implementing this builtin expects
         # argument names corresponding to the symbol names without
         # context marks.
@@ -479,6 +543,17 @@ class FunctionApplyRule(BaseRule):
         else:
             result = self.function(evaluation=evaluation, **vars_noctx) or expression
         evaluation.current_expression = prev_expression
+        if cache_key is not None and out_state == (
+            evaluation.message_count,
+            len(evaluation.out),
+        ):
+            cache.store(
+                cache_key,
+                expression,
+                result,
+                time,
+                expression._rebuild_cache().symbols,
+            )
         return result
 
     def __repr__(self) -> str:
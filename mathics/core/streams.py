@@ -3,6 +3,7 @@
 """
 File Stream Operations
 """
+
 import os
 import os.path as osp
 import sys
@@ -151,6 +152,9 @@ class Stream:
         self.io = io
         self.n = channel_num
         self.is_temporary_file = is_temporary_file
+        # The buffered reader used by Read[] on an input stream; see
+        # mathics.eval.files_io.read.StreamReader.
+        self.reader = None
 
         if mode not in ["r", "w", "a", "rb", "wb", "ab"]:
             raise ValueError("Can't handle mode {0}".format(mode))
@@ -175,9 +175,22 @@ class ExpressionPointer:
         try:
             while pos:
                 if i == 0:
-                    parent = parent._head
+                    child = parent._head
                 else:
-                    parent = parent.elements[i - 1]
+                    child = parent.elements[i - 1]
+                if isinstance(child, Expression):
+                    # Hash-consed subexpressions are shared with other
+                    # expressions, so the ones on the path are copied
+                    # before changing them.
+                    if child.hash_consed:
+                        child = child.shallow_copy()
+                    # Setting the child again also resets the cache and
+                    # the element properties of the parent.
+                    if i == 0:
+                        parent.set_head(child)
+                    else:
+                        parent.set_element(i - 1, child)
+                parent = child
                 i = pos.pop()
         except Exception:
             raise MessageException("Part", "span", pos)
@@ -433,32 +433,45 @@ class Symbol(Atom, NumericOperators, EvalMixin):
         Evaluates the symbol by applying the rules (ownvalues) in its definition,
         recursively.
         """
+        binding = evaluation.definitions.bindings.get(self.name)
+        if binding is not None:
+            # The symbol is bound temporarily, by Block, Table, etc.
+            result = binding.value
+            if result is not None and not result.sameQ(self):
+                return self.evaluate_value(result, evaluation)
+            return self
+
         rules = evaluation.definitions.get_ownvalues(self.name)
         for rule in rules:
             result = rule.apply(self, evaluation, fully=True)
             if result is not None and not result.sameQ(self):
-                if result.is_literal:
-                    return result
-
-                # We will be using $IterationLimit, not $RecursionLimit below
-                # to catch symbolic looping rewrite expansions.
-                # We do this to model Mathematica behavior more closely.
-                limit = (
-                    evaluation.definitions.get_config_value("$IterationLimit")
-                    or sys.maxsize
-                )
-                if limit is None:
-                    limit = sys.maxsize
-                if limit != sys.maxsize and evaluation.iteration_count > limit:
-                    evaluation.error("$IterationLimit", "itlim", limit)
-                    from mathics.core.systemsymbols import SymbolAborted
-
-                    return SymbolAborted
-                evaluation.iteration_count += 1
-
-                return result.evaluate(evaluation)
+                return self.evaluate_value(result, evaluation)
         return self
 
+    def evaluate_value(self, result, evaluation):
+        """
+        Evaluate `result`, the value the symbol was rewritten to.
+        """
+        if result.is_literal:
+            return result
+
+        # We will be using $IterationLimit, not $RecursionLimit below
+        # to catch symbolic looping rewrite expansions.
+        # We do this to model Mathematica behavior more closely.
+        limit = (
+            evaluation.definitions.get_config_value("$IterationLimit") or sys.maxsize
+        )
+        if limit is None:
+            limit = sys.maxsize
+        if limit != sys.maxsize and evaluation.iteration_count > limit:
+            evaluation.error("$IterationLimit", "itlim", limit)
+            from mathics.core.systemsymbols import SymbolAborted
+
+            return SymbolAborted
+        evaluation.iteration_count += 1
+
+        return result.evaluate(evaluation)
+
     def get_head(self) -> "Symbol":
         return Symbol("Symbol")
 
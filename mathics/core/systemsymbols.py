@@ -107,6 +107,7 @@ SymbolDisk = Symbol("System`Disk")
 SymbolDiskBox = Symbol("System`DiskBox")
 SymbolDispatch = Symbol("System`Dispatch")
 SymbolDivide = Symbol("System`Divide")
+SymbolDo = Symbol("System`Do")
 SymbolDot = Symbol("System`Dot")
 SymbolDownValues = Symbol("System`DownValues")
 SymbolDrop = Symbol("System`Drop")
@@ -186,6 +187,7 @@ SymbolInsetBox = Symbol("System`InsetBox")
 SymbolInteger = Symbol("System`Integer")
 SymbolIntegrate = Symbol("System`Integrate")
 SymbolInterpretationBox = Symbol("System`InterpretationBox")
+SymbolJoin = Symbol("System`Join")
 SymbolKey = Symbol("System`Key")
 SymbolKeyAbsent = Symbol("System`KeyAbsent")
 SymbolKhinchin = Symbol("System`Khinchin")
@@ -237,6 +239,7 @@ SymbolNorm = Symbol("System`Norm")
 SymbolNormal = Symbol("System`Normal")
 SymbolNot = Symbol("System`Not")
 SymbolNothing = Symbol("System`Nothing")
+SymbolNumber = Symbol("System`Number")
 SymbolNumberForm = Symbol("System`NumberForm")
 SymbolNumberQ = Symbol("System`NumberQ")
 SymbolNumberString = Symbol("System`NumberString")
@@ -356,6 +359,7 @@ SymbolSubscriptBox = Symbol("System`SubscriptBox")
 SymbolSubsetQ = Symbol("System`SubsetQ")
 SymbolSubsuperscriptBox = Symbol("System`SubsuperscriptBox")
 SymbolSubtract = Symbol("System`Subtract")
+SymbolSum = Symbol("System`Sum")
 SymbolSuperscriptBox = Symbol("System`SuperscriptBox")
 SymbolTable = Symbol("System`Table")
 SymbolTableForm = Symbol("System`TableForm")
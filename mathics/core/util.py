@@ -5,10 +5,10 @@ Miscellaneous mathics.core utility functions.
 
 import re
 import sys
-from itertools import chain
+from collections import deque
 from pathlib import PureWindowsPath
 from platform import python_implementation
-from typing import Optional
+from typing import Dict, List, Optional
 
 from mathics.core.atoms import MachineReal, NumericArray
 from mathics.core.symbols import Symbol
@@ -35,18 +35,61 @@ def canonic_filename(path: str) -> str:
 # FIXME: These functions are used pattern.py
 
 
+def group_items(items) -> List[List]:
+    """
+    Group the items that are the same (``sameQ``), as ``[item, count]``
+    pairs in the order in which the items first appear.
+    """
+    groups: List[List] = []
+    positions: Dict = {}
+    for item in items:
+        position = positions.get(item)
+        if position is not None and groups[position][0].sameQ(item):
+            groups[position][1] += 1
+            continue
+        if position is None:
+            positions[item] = len(groups)
+        groups.append([item, 1])
+    return groups
+
+
 def permutations(items):
+    """
+    Generate the distinct permutations of `items`, starting with `items`
+    in their order. Items that are the same (``sameQ``) are not swapped
+    with each other, so that each arrangement is generated once.
+    """
     if not items:
         yield []
-    # already_taken = set()
-    # first yield identical permutation without recursion
-    yield items
-    for index in range(len(items)):
-        item = items[index]
-        # if item not in already_taken:
-        for sub in permutations(items[:index] + items[index + 1 :]):
-            yield [item] + list(sub)
-            # already_taken.add(item)
+        return
+    # The items not placed yet. The permutations are built by
+    # backtracking, with a stack rather than recursion, so that
+    # expressions with many arguments do not reach the recursion limit.
+    rest = deque(items)
+    placed: list = []
+    # For each item placed: its position in `rest` when it was taken,
+    # and the items already tried at that place.
+    frames: list = []
+    index: int = 0
+    tried: list = []
+    while True:
+        while index < len(rest) and any(rest[index].sameQ(other) for other in tried):
+            index += 1
+        if index < len(rest):
+            item = rest[index]
+            del rest[index]
+            tried.append(item)
+            placed.append(item)
+            frames.append((index, tried))
+            index, tried = 0, []
+            if rest:
+                continue
+            yield list(placed)
+        if not frames:
+            return
+        index, tried = frames.pop()
+        rest.insert(index, placed.pop())
+        index += 1
 
 
 def strip_string_quotes(s: str) -> str:
@@ -58,32 +101,69 @@ def strip_string_quotes(s: str) -> str:
 
 
 def subsets(items, min: int, max: Optional[int], included=None, less_first=False):
-    if max is None:
-        max = len(items)
+    """
+    Generate the ways of choosing between `min` and `max` items from
+    `items`, only taking items in `included` if it is given, as pairs
+    ``(chosen, ([], not_chosen))``.
+
+    Items that are the same are counted together, and a choice is made
+    of how many of them to take, so that choices which only differ in
+    which of several equal items are taken are generated once. Lengths
+    that can not be reached with the items that can be taken are not
+    tried.
+    """
+    groups = group_items(items)
+    takeable = [
+        count if included is None or item in included else 0 for item, count in groups
+    ]
+    # available[index] is the number of items that can be taken from
+    # groups[index:].
+    available = [0] * (len(groups) + 1)
+    for index in range(len(groups) - 1, -1, -1):
+        available[index] = available[index + 1] + takeable[index]
+
+    if max is None or max > available[0]:
+        max = available[0]
     lengths = list(range(min, max + 1))
     if not less_first:
         lengths = list(reversed(lengths))
     if lengths and lengths[0] == 0:
         lengths = lengths[1:] + [0]
 
-    def decide(chosen, not_chosen, rest, count):
-        if count < 0 or len(rest) < count:
-            return
-        if count == 0:
-            yield chosen, list(chain(not_chosen, rest))
-        elif len(rest) == count:
-            if included is None or all(item in included for item in rest):
-                yield list(chain(chosen, rest)), not_chosen
-        elif rest:
-            item = rest[0]
-            if included is None or item in included:
-                for set in decide(chosen + [item], not_chosen, rest[1:], count - 1):
-                    yield set
-            for set in decide(chosen, not_chosen + [item], rest[1:], count):
-                yield set
+    def split(index, path):
+        # The items chosen and not chosen, when the numbers of items
+        # taken from groups[:index] are linked in `path`.
+        taken_counts = []
+        while path is not None:
+            taken, path = path
+            taken_counts.append(taken)
+        chosen: list = []
+        not_chosen: list = []
+        for (item, n), taken in zip(groups, reversed(taken_counts)):
+            chosen.extend([item] * taken)
+            not_chosen.extend([item] * (n - taken))
+        not_chosen.extend(item for item, n in groups[index:] for _ in range(n))
+        return chosen, not_chosen
+
+    def decide(length):
+        # Depth-first search of how many items to take from each group,
+        # trying the largest numbers first. The search uses a stack
+        # rather than recursion, so that expressions with many
+        # arguments do not reach the recursion limit.
+        stack = [(0, length, None)]
+        while stack:
+            index, count, path = stack.pop()
+            if count == 0:
+                yield split(index, path)
+                continue
+            if available[index] < count:
+                continue
+            most = takeable[index] if takeable[index] < count else count
+            for taken in range(most + 1):
+                stack.append((index + 1, count - taken, (taken, path)))
 
     for length in lengths:
-        for chosen, not_chosen in decide([], [], items, length):
+        for chosen, not_chosen in decide(length):
             yield chosen, ([], not_chosen)
 
 
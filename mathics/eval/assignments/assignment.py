@@ -1131,12 +1131,19 @@ def eval_assign_part(
         evaluation.message(op_name, "wrsym", lhs_symbol)
         return False
     try:
-        rule = defs.get_ownvalue(lhs_name)
+        value = defs.get_ownvalue(lhs_name)
     except ValueError:
         evaluation.message(op_name, "noval", lhs_symbol)
         return False
     indices = lhs.elements[1:]
-    return eval_Part([rule], indices, evaluation, rhs)
+    # A hash-consed value is shared with other expressions, so its parts
+    # are replaced in a copy, which then becomes the new value.
+    if isinstance(value, Expression) and value.hash_consed:
+        value = value.shallow_copy()
+    result = eval_Part([value], indices, evaluation, rhs)
+    if result is not False:
+        defs.set_ownvalue(lhs_name, value)
+    return result
 
 
 def eval_assign_random_state(
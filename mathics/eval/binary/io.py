@@ -6,7 +6,7 @@ import struct
 
 from mathics.core.list import ListExpression
 from mathics.core.streams import Stream
-from mathics.eval.files_io.read import SymbolEndOfFile
+from mathics.core.systemsymbols import SymbolEndOfFile
 
 
 def eval_BinaryReadList(
@@ -2,7 +2,10 @@
 mathics.distance.clusters evaluation functions and exception classes
 """
 
-from mathics.core.atoms import Integer, Real
+from fractions import Fraction
+from typing import Optional
+
+from mathics.core.atoms import Integer, Rational, Real
 
 
 class IllegalDataPoint(Exception):
@@ -34,7 +37,7 @@ def dist_repr(p) -> tuple:
 
 
 def to_real_distance(d):
-    if not isinstance(d, (Real, Integer)):
+    if not isinstance(d, (Real, Integer, Rational)):
         raise IllegalDistance(d)
 
     mpd = d.to_mpmath()
@@ -42,3 +45,20 @@ def to_real_distance(d):
         raise IllegalDistance(d)
 
     return mpd
+
+
+def to_exact_distance(d) -> Optional[Fraction]:
+    """
+    Return the distance `d` as a Fraction if it is an Integer or a
+    Rational, so that exact distances are compared exactly. Return None
+    if it is not exact.
+    """
+    if isinstance(d, Integer):
+        value = Fraction(d.value)
+    elif isinstance(d, Rational):
+        value = Fraction(int(d.value.p), int(d.value.q))
+    else:
+        return None
+    if value < 0:
+        raise IllegalDistance(d)
+    return value
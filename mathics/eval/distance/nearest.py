@@ -0,0 +1,167 @@
+"""
+Finding nearest points with a k-d tree.
+
+``Nearest`` computes the distance from the point given to each of the
+data points with the distance function, by evaluating it. For points
+given by machine reals, and the distance functions below, a k-d tree
+built once over the data points finds the nearest ones without
+computing all the distances.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy
+from scipy.spatial import cKDTree
+
+from mathics.core.atoms import Integer, MachineReal, Rational, Real
+from mathics.core.element import BaseElement
+from mathics.core.list import ListExpression
+
+# The distance functions a k-d tree can compute, as the ``p`` of the
+# Minkowski distance, and whether the distance is squared.
+KDTREE_DISTANCES = {
+    "System`ChessboardDistance": (numpy.inf, False),
+    "System`EuclideanDistance": (2, False),
+    "System`ManhattanDistance": (1, False),
+    "System`SquaredEuclideanDistance": (2, True),
+}
+
+# Radius queries are widened by this relative amount, so that points at
+# the radius are not missed because of rounding. Distances are then
+# compared exactly.
+RADIUS_SLACK = 1e-9
+
+
+def numeric_point(element: BaseElement) -> Optional[numpy.ndarray]:
+    """
+    Return the coordinates of `element`, a real number or a list of real
+    numbers, as an array. Return None for anything else.
+    """
+    if isinstance(element, (Integer, Rational, Real)):
+        value = element.round_to_float()
+        return None if value is None else numpy.array([value])
+    if not isinstance(element, ListExpression):
+        return None
+    if element.packed is not None:
+        return element.packed.astype(float) if element.packed.ndim == 1 else None
+    coordinates = []
+    for coordinate in element.elements:
+        if not isinstance(coordinate, (Integer, Rational, Real)):
+            return None
+        value = coordinate.round_to_float()
+        if value is None:
+            return None
+        coordinates.append(value)
+    return numpy.array(coordinates, dtype=float)
+
+
+def machine_point(element: BaseElement) -> Optional[numpy.ndarray]:
+    """
+    Return the coordinates of `element`, a machine real number or a list
+    of them, as an array. Return None for anything else: distances to
+    exact or arbitrary-precision points are not rounded to machine
+    numbers, which could change which of them are the nearest.
+    """
+    if isinstance(element, MachineReal):
+        return numpy.array([element.value])
+    if not isinstance(element, ListExpression):
+        return None
+    if element.packed is not None:
+        packed = element.packed
+        if packed.ndim != 1 or packed.dtype.kind != "f":
+            return None
+        return packed.astype(float)
+    if not all(isinstance(coordinate, MachineReal) for coordinate in element.elements):
+        return None
+    return numpy.array(
+        [coordinate.value for coordinate in element.elements], dtype=float
+    )
+
+
+def numeric_points(elements: Sequence[BaseElement]) -> Optional[numpy.ndarray]:
+    """
+    Return the coordinates of the points in `elements` as the rows of
+    an array, or None if some point is not given by machine reals, or
+    the points do not have the same dimension.
+    """
+    points = []
+    for element in elements:
+        point = machine_point(element)
+        if point is None or (points and point.shape != points[0].shape):
+            return None
+        points.append(point)
+    if not points:
+        return None
+    return numpy.array(points)
+
+
+class KDTreeIndex:
+    """A k-d tree over numeric points, to find the nearest ones."""
+
+    def __init__(self, points: numpy.ndarray, p: float, squared: bool):
+        self.points = points
+        self.p = p
+        self.squared = squared
+        self.tree = cKDTree(points)
+
+    def distances(self, x: numpy.ndarray, indices) -> numpy.ndarray:
+        """Return the distances from `x` to the points in `indices`."""
+        differences = numpy.abs(self.points[indices] - x)
+        if self.p == 1:
+            return differences.sum(axis=1)
+        if self.p == numpy.inf:
+            return differences.max(axis=1)
+        squares = (differences * differences).sum(axis=1)
+        return squares if self.squared else numpy.sqrt(squares)
+
+    def nearest(
+        self, x: numpy.ndarray, count: Optional[int], radius: Optional[float]
+    ) -> List[int]:
+        """
+        Return the indices of up to `count` points nearest to `x`, or of
+        all of them if `count` is None, leaving out points farther than
+        `radius`. Points at the same distance are sorted by index, as
+        ``Nearest`` does when it scans all the points.
+        """
+        size = len(self.points)
+        if radius is not None:
+            tree_radius = numpy.sqrt(radius) if self.squared else radius
+            indices = self.tree.query_ball_point(
+                x, tree_radius * (1 + RADIUS_SLACK), p=self.p
+            )
+        elif count is None or count >= size:
+            indices = range(size)
+        else:
+            # Points as far as the last of the nearest ones may be
+            # before it in index order.
+            distances, _ = self.tree.query(x, k=count, p=self.p)
+            farthest = numpy.max(distances)
+            indices = self.tree.query_ball_point(
+                x, farthest * (1 + RADIUS_SLACK), p=self.p
+            )
+        indices = numpy.fromiter(indices, dtype=numpy.intp)
+        distances = self.distances(x, indices)
+        if radius is not None:
+            within = distances <= radius
+            indices, distances = indices[within], distances[within]
+        order = numpy.lexsort((indices, distances))
+        if count is not None:
+            order = order[:count]
+        return indices[order].tolist()
+
+
+def build_kdtree_index(
+    elements: Sequence[BaseElement], distance_function: BaseElement
+) -> Optional[KDTreeIndex]:
+    """
+    Build a k-d tree over `elements` for `distance_function`. Return
+    None if the points are not numeric, or a k-d tree can not compute
+    the distance function.
+    """
+    distance = KDTREE_DISTANCES.get(distance_function.get_name())
+    if distance is None:
+        return None
+    points = numeric_points(elements)
+    if points is None:
+        return None
+    return KDTreeIndex(points, *distance)
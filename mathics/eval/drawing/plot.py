@@ -11,13 +11,18 @@ from enum import Enum
 from math import cos, isinf, isnan, pi, sqrt
 from typing import Callable, Iterable, List, Optional, Tuple, Union
 
+import numpy
+
 from mathics.builtin.graphics import Graphics
 from mathics.builtin.numeric import chop
 from mathics.builtin.options import filter_from_iterable, options_to_rules
-from mathics.builtin.scoping import dynamic_scoping
 from mathics.core.atoms import Integer, Integer0, Real
 from mathics.core.builtin import get_option
 from mathics.core.convert.expression import to_mathics_list
+from mathics.core.convert.lambdify import (
+    CompileError as LambdifyCompileError,
+    lambdify_compile,
+)
 from mathics.core.convert.python import from_python
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
@@ -37,6 +42,7 @@ from mathics.core.systemsymbols import (
     SymbolPolygon,
 )
 from mathics.eval.nevaluator import eval_N
+from mathics.eval.scoping import dynamic_scoping
 from mathics.timing import Timer
 
 ListPlotNames = (
@@ -50,6 +56,9 @@ ListPlotType = Enum("ListPlotType", ListPlotNames)
 SixTenths = Real(0.6)
 TwoTenths = Real(0.2)
 
+# Reals smaller than this are taken as 0, like chop() does.
+CHOP_DELTA = 1.0e-10
+
 
 try:
     from mathics.compile import CompileArg, CompileError, _compile, real_type
@@ -220,6 +229,86 @@ def compile_quiet_function(expr, arg_names, evaluation, expect_list: bool):
     return quiet_f
 
 
+def compile_vectorized_function(expr, arg_names, evaluation) -> Optional[Callable]:
+    """
+    Given an expression return a version that computes it at many points
+    in one call, with NumPy, or None if this is not possible.
+
+    The callable takes an array of values for each argument and returns
+    an array of floats, with NaN where the expression has no real
+    value. It returns None if the expression turns out not to be
+    computable with NumPy, for example because it has symbols other than
+    its arguments.
+
+    The expression is converted as it is, without evaluating it: this
+    way, the values that global symbols, and the plot variables, may
+    have do not change the function.
+    """
+    try:
+        function = lambdify_compile(evaluation, expr, arg_names, evaluate=False)
+    except LambdifyCompileError:
+        return None
+
+    def vectorized_f(*arrays):
+        try:
+            with numpy.errstate(all="ignore"):
+                values = numpy.asarray(function(*arrays))
+                if values.dtype.kind not in "biufc":
+                    # For instance, SymPy expressions in other symbols.
+                    return None
+                # Small values are chopped, as extract_pyreal() does.
+                if values.dtype.kind == "c":
+                    values = numpy.where(
+                        numpy.abs(values.imag) < CHOP_DELTA, values.real, numpy.nan
+                    )
+                values = numpy.array(
+                    numpy.broadcast_to(values, numpy.shape(arrays[0])), dtype=float
+                )
+                values[numpy.abs(values) < CHOP_DELTA] = 0.0
+        except Exception:
+            return None
+        values[~numpy.isfinite(values)] = numpy.nan
+        return values
+
+    return vectorized_f
+
+
+class SampledFunction:
+    """
+    A function of one real that computes its values in batches, with a
+    vectorized version of the function, if there is one. See
+    ``compile_vectorized_function()``.
+
+    ``sample()`` computes the values at many points at once, and calling
+    the function at one of those points gives back the value computed.
+    Other points, and every point if there is no vectorized version, are
+    computed one at a time.
+    """
+
+    def __init__(self, function: Callable, vectorized: Optional[Callable]):
+        self.function = function
+        self.vectorized = vectorized
+        self.values: dict = {}
+
+    def __call__(self, x_value):
+        try:
+            return self.values[x_value]
+        except KeyError:
+            return self.function(x_value)
+
+    def sample(self, x_values: list) -> None:
+        """Compute the values at all the points in `x_values`."""
+        if self.vectorized is None or not x_values:
+            return
+        values = self.vectorized(numpy.array(x_values, dtype=float))
+        if values is None:
+            # The function can not be vectorized after all.
+            self.vectorized = None
+            return
+        for x_value, value in zip(x_values, values.tolist()):
+            self.values[x_value] = None if isnan(value) else value
+
+
 def eval_ListPlot(
     # TODO: plot_groups should be a tuple only?
     plot_groups: Union[list, tuple],
@@ -539,6 +628,12 @@ def eval_Plot(plot_options, options: dict, evaluation: Evaluation) -> Expression
             # Tick mark values will be adjusted to be 10^n in GraphicsBox.
             f = Expression(SymbolLog10, f)
         compiled_fn = compile_quiet_function(f, [x_name], evaluation, expect_list)
+        if not expect_list:
+            compiled_fn = SampledFunction(
+                compiled_fn,
+                compile_vectorized_function(f, [x_name], evaluation),
+            )
+            compiled_fn.sample([start + i * d for i in range(num_plot_points)])
         for i in range(num_plot_points):
             x_value = start + i * d
             point = apply_fn(compiled_fn, x_value)
@@ -605,9 +700,11 @@ def eval_Plot(plot_options, options: dict, evaluation: Evaluation) -> Expression
             smooth = False
             while not smooth and recursion_count < max_recursion:
                 recursion_count += 1
-                smooth = True
-                i = 2
-                while i < len(line):
+                # Split the two segments around each point where the line
+                # turns too much. The new points of a pass are computed
+                # together.
+                split_segments = set()
+                for i in range(2, len(line)):
                     vec1 = (
                         xscale * (line[i - 1][0] - line[i - 2][0]),
                         yscale * (line[i - 1][1] - line[i - 2][1]),
@@ -624,26 +721,22 @@ def eval_Plot(plot_options, options: dict, evaluation: Evaluation) -> Expression
                     except ZeroDivisionError:
                         angle = 0.0
                     if abs(angle) < ang_thresh:
-                        smooth = False
-                        incr = 0
-
-                        x_value = 0.5 * (line_xvalues[i - 1] + line_xvalues[i])
-
-                        point = apply_fn(compiled_fn, x_value)
-                        if point is not None:
-                            line.insert(i, point)
-                            line_xvalues.insert(i, x_value)
-                            incr += 1
-
-                        x_value = 0.5 * (line_xvalues[i - 2] + line_xvalues[i - 1])
-                        point = apply_fn(compiled_fn, x_value)
-                        if point is not None:
-                            line.insert(i - 1, point)
-                            line_xvalues.insert(i - 1, x_value)
-                            incr += 1
-
-                        i += incr
-                    i += 1
+                        split_segments.update((i - 2, i - 1))
+                smooth = not split_segments
+
+                split_segments = sorted(split_segments)
+                new_xvalues = [
+                    0.5 * (line_xvalues[i] + line_xvalues[i + 1])
+                    for i in split_segments
+                ]
+                if not expect_list:
+                    compiled_fn.sample(new_xvalues)
+                # Insert from the end, so that indices stay valid.
+                for i, x_value in reversed(list(zip(split_segments, new_xvalues))):
+                    point = apply_fn(compiled_fn, x_value)
+                    if point is not None:
+                        line.insert(i + 1, point)
+                        line_xvalues.insert(i + 1, x_value)
 
         if exclusions == SymbolNone:  # Join all the Lines
             points = [[(xx, yy) for line in points for xx, yy in line]]
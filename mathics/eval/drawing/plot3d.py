@@ -7,9 +7,11 @@ That is done as another pass after M-expression evaluation finishes.
 """
 
 import itertools
-from math import cos, pi, sqrt
+from math import cos, isnan, pi, sqrt
 from typing import Callable
 
+import numpy
+
 from mathics.core.atoms import Integer1, Real, String
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
@@ -21,7 +23,10 @@ from mathics.core.systemsymbols import (
     SymbolFunction,
     SymbolSlot,
 )
-from mathics.eval.drawing.plot import compile_quiet_function
+from mathics.eval.drawing.plot import (
+    compile_quiet_function,
+    compile_vectorized_function,
+)
 from mathics.timing import Timer
 
 from .util import GraphicsGenerator
@@ -51,9 +56,9 @@ def compute_triangles(plot_options, evaluation):
     for _, f in enumerate(plot_options.functions):
         stored = {}
 
-        compiled_fn = compile_quiet_function(
-            f, [range[0].get_name() for range in plot_options.ranges], evaluation, False
-        )
+        arg_names = [range[0].get_name() for range in plot_options.ranges]
+        compiled_fn = compile_quiet_function(f, arg_names, evaluation, False)
+        vectorized_fn = compile_vectorized_function(f, arg_names, evaluation)
 
         def apply_fn(compiled_fn: Callable, x_value, y_value):
             try:
@@ -66,6 +71,19 @@ def compute_triangles(plot_options, evaluation):
                 stored[(x_value, y_value)] = value
                 return value
 
+        def sample(points):
+            """Compute and store the values at many points at once."""
+            nonlocal vectorized_fn
+            points = [point for point in points if point not in stored]
+            if vectorized_fn is None or not points:
+                return
+            values = vectorized_fn(*numpy.array(points, dtype=float).T)
+            if values is None:
+                vectorized_fn = None
+                return
+            for point, value in zip(points, values.tolist()):
+                stored[point] = None if isnan(value) else value
+
         triangles = []
 
         split_edges = set()  # subdivided edges
@@ -118,6 +136,16 @@ def compute_triangles(plot_options, evaluation):
         # linear (grid) sampling
         numx = plot_points[0] * 1.0
         numy = plot_points[1] * 1.0
+        sample(
+            [
+                (
+                    xstart + xi / numx * (xstop - xstart),
+                    ystart + yi / numy * (ystop - ystart),
+                )
+                for xi in range(plot_points[0] + 1)
+                for yi in range(plot_points[1] + 1)
+            ]
+        )
         for xi in range(plot_points[0]):
             for yi in range(plot_points[1]):
                 # Decide which way to break the square grid into triangles
@@ -177,6 +205,9 @@ def compute_triangles(plot_options, evaluation):
         ang_thresh = cos(20 * pi / 180)
         for depth in range(1, max_depth):
             needs_removal = set()
+            # The triangles are subdivided after all the pairs are
+            # checked, so that their new vertices are computed together.
+            subdivided = []
             lent = len(triangles)  # number of initial triangles
             for i1 in range(lent):
                 for i2 in range(lent):
@@ -245,10 +276,23 @@ def compute_triangles(plot_options, evaluation):
                                 if (x3, y3) > (x1, y1)
                                 else ((x3, y3), (x1, y1))
                             )
-                            triangle(x1, y1, x4, y4, x6, y6, depth=depth)
-                            triangle(x2, y2, x4, y4, x5, y5, depth=depth)
-                            triangle(x3, y3, x5, y5, x6, y6, depth=depth)
-                            triangle(x4, y4, x5, y5, x6, y6, depth=depth)
+                            subdivided.extend(
+                                (
+                                    (x1, y1, x4, y4, x6, y6),
+                                    (x2, y2, x4, y4, x5, y5),
+                                    (x3, y3, x5, y5, x6, y6),
+                                    (x4, y4, x5, y5, x6, y6),
+                                )
+                            )
+            sample(
+                [
+                    vertex
+                    for x1, y1, x2, y2, x3, y3 in subdivided
+                    for vertex in ((x1, y1), (x2, y2), (x3, y3))
+                ]
+            )
+            for vertices in subdivided:
+                triangle(*vertices, depth=depth)
             # remove subdivided triangles which have been divided
             triangles = [t for i, t in enumerate(triangles) if i not in needs_removal]
 
@@ -0,0 +1,282 @@
+"""
+Importing tables of separated fields, as in CSV and TSV files.
+
+The lines of a file are read one at a time, with Python's ``csv``
+module, so that when only the first rows of the data are asked for,
+the rest of the file is not read.
+
+Fields holding numbers are imported as numbers. When all the fields
+hold integers, or all hold reals, the type of the data is inferred from
+the whole table at once, and the data is returned as a packed list,
+without building an atom for each field.
+"""
+
+import csv
+import math
+import re
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy
+import sympy
+
+from mathics.core.atoms import Integer, MachineReal, PrecisionReal, String
+from mathics.core.element import BaseElement
+from mathics.core.evaluation import Evaluation
+from mathics.core.expression import Expression
+from mathics.core.list import ListExpression
+from mathics.core.number import MACHINE_DIGITS
+from mathics.core.symbols import SymbolTrue
+from mathics.core.systemsymbols import SymbolFailed, SymbolGrid, SymbolPart, SymbolRule
+from mathics.eval.encoding import to_python_encoding
+from mathics.eval.files_io.files import resolve_file
+
+INTEGER_FIELD = re.compile(r"[ \t]*[+-]?\d+[ \t]*")
+REAL_FIELD = re.compile(
+    r"[ \t]*[+-]?(?:\d+\.\d*|\.\d+|\d+(?=[eE]))(?:[eE][+-]?\d+)?[ \t]*"
+)
+
+# The characters of fields that NumPy can read as the numbers above.
+NUMBER_CHARACTERS = frozenset("0123456789+-.eE \t")
+
+
+def split_lines(lines: Iterable[str], separator: str) -> Iterator[List[str]]:
+    """
+    Split each line in `lines` into its fields. Fields separated by a
+    single character can be quoted, as in CSV files.
+    """
+    if len(separator) == 1:
+        return csv.reader(lines, delimiter=separator)
+    return (
+        line.rstrip("\r\n").split(separator) if line.strip("\r\n") else []
+        for line in lines
+    )
+
+
+def field_value(field: str) -> BaseElement:
+    """Return the number written in `field`, or else `field` as a String."""
+    if INTEGER_FIELD.fullmatch(field):
+        return Integer(int(field))
+    if REAL_FIELD.fullmatch(field):
+        value = float(field)
+        if math.isinf(value):
+            # The number is too large for a machine real.
+            mantissa = re.split("[eE]", field.strip())[0]
+            digits = len(re.sub(r"\D", "", mantissa).lstrip("0"))
+            return PrecisionReal(
+                sympy.Float(field.strip(), max(digits, MACHINE_DIGITS))
+            )
+        return MachineReal(value)
+    return String(field)
+
+
+def packed_array(rows: Sequence[List[str]]) -> Optional[numpy.ndarray]:
+    """
+    Return the array holding the numbers in `rows`, if the rows have the
+    same length, and their fields all are integers, or all are reals.
+    Otherwise, return None.
+
+    The fields are all read by NumPy at once, rather than matched one
+    by one with INTEGER_FIELD and REAL_FIELD.
+    """
+    width = len(rows[0])
+    if width == 0 or any(len(row) != width for row in rows):
+        return None
+    if not NUMBER_CHARACTERS.issuperset("".join(map("".join, rows))):
+        return None
+    try:
+        return numpy.array(rows, dtype=numpy.int64)
+    except (OverflowError, ValueError):
+        pass
+    # A field with an integer is imported as an Integer, so a table with
+    # reals and integers is not packed.
+    if any(
+        "." not in field and "e" not in field and "E" not in field
+        for row in rows
+        for field in row
+    ):
+        return None
+    try:
+        array = numpy.array(rows, dtype=numpy.float64)
+    except ValueError:
+        return None
+    # Fields too large for machine reals are read as infinities.
+    if not numpy.isfinite(array).all():
+        return None
+    return array
+
+
+def table_expression(rows: Sequence[List[str]], numeric: bool) -> ListExpression:
+    """
+    Return the fields in `rows` as a list of lists. When `numeric` is
+    True, fields holding numbers are converted to numbers.
+    """
+    if not rows:
+        return ListExpression()
+    if not numeric:
+        return ListExpression(
+            *(ListExpression(*(String(field) for field in row)) for row in rows)
+        )
+    packed = packed_array(rows)
+    if packed is not None:
+        return ListExpression(packed=packed)
+    return ListExpression(
+        *(ListExpression(*(field_value(field) for field in row)) for row in rows)
+    )
+
+
+def rows_needed(spec: BaseElement) -> Optional[int]:
+    """
+    Return how many rows must be read to take the parts in `spec` of the
+    data, or None if all the rows are needed.
+    """
+    if isinstance(spec, Integer):
+        return spec.value if spec.value > 0 else None
+    if spec.has_form("List", 1, None):
+        if all(
+            isinstance(element, Integer) and element.value > 0
+            for element in spec.elements
+        ):
+            return max(element.value for element in spec.elements)
+        return None
+    if spec.has_form("Span", 2, 3):
+        start, stop = spec.elements[:2]
+        step = spec.elements[2] if len(spec.elements) == 3 else Integer(1)
+        if (
+            isinstance(start, Integer)
+            and isinstance(stop, Integer)
+            and isinstance(step, Integer)
+            and start.value > 0
+            and stop.value > 0
+            and step.value > 0
+        ):
+            return max(start.value, stop.value)
+    return None
+
+
+def header_sizes(header_lines: BaseElement) -> Optional[Tuple[int, int]]:
+    """
+    Return the number of header rows and of header columns given by the
+    "HeaderLines" option, or None if it is not valid.
+    """
+    if isinstance(header_lines, Integer) and header_lines.value >= 0:
+        return header_lines.value, 0
+    if header_lines.has_form("List", 2) and all(
+        isinstance(element, Integer) and element.value >= 0
+        for element in header_lines.elements
+    ):
+        return header_lines.elements[0].value, header_lines.elements[1].value
+    return None
+
+
+def skipped_line_numbers(skipped_lines: BaseElement) -> Optional[Set[int]]:
+    """
+    Return the numbers of the lines given by the "SkippedLines" option,
+    or None if it is not valid.
+    """
+    if isinstance(skipped_lines, Integer) and skipped_lines.value >= 0:
+        return set(range(1, skipped_lines.value + 1))
+    if skipped_lines.has_form("List", None) and all(
+        isinstance(element, Integer) and element.value > 0
+        for element in skipped_lines.elements
+    ):
+        return {element.value for element in skipped_lines.elements}
+    if skipped_lines.has_form("Span", 2) and all(
+        isinstance(element, Integer) and element.value > 0
+        for element in skipped_lines.elements
+    ):
+        start, stop = skipped_lines.elements
+        return set(range(start.value, stop.value + 1))
+    return None
+
+
+def read_table(
+    path: str,
+    encoding: Optional[str],
+    separator: str,
+    header: Tuple[int, int],
+    skipped: Set[int],
+    count: Optional[int],
+) -> List[List[str]]:
+    """
+    Read the rows of fields of the file in `path`, leaving out the
+    `skipped` lines and then the `header` rows and columns. When `count`
+    is not None, read only the first `count` rows after the header.
+    """
+    header_rows, header_columns = header
+    with open(path, "r", encoding=encoding, newline="") as file:
+        lines = (
+            (line for number, line in enumerate(file, start=1) if number not in skipped)
+            if skipped
+            else file
+        )
+        stop = None if count is None else header_rows + count
+        rows = islice(split_lines(lines, separator), header_rows, stop)
+        if header_columns:
+            return [row[header_columns:] for row in rows]
+        return list(rows)
+
+
+def eval_ImportTable(
+    name: str,
+    path: String,
+    parts: Sequence[BaseElement],
+    options: dict,
+    evaluation: Evaluation,
+) -> BaseElement:
+    """
+    Import the table of the file in `path`, for the importer `name`.
+
+    When `parts` is empty, the result is a list of rules for the "Data"
+    and "Grid" elements. Otherwise, it is a rule for the parts of the
+    "Data" element given by `parts`, a row specification optionally
+    followed by column specifications. Only the rows needed for them
+    are read.
+    """
+    resolved_path, _ = resolve_file(path, "r", evaluation)
+    if resolved_path is None:
+        return SymbolFailed
+
+    separator = options["System`FieldSeparators"].evaluate(evaluation)
+    if not isinstance(separator, String):
+        evaluation.message(name, "fldsep", separator)
+        return SymbolFailed
+    header_lines = options["System`HeaderLines"].evaluate(evaluation)
+    header = header_sizes(header_lines)
+    if header is None:
+        evaluation.message(name, "hdrlns", header_lines)
+        return SymbolFailed
+    skipped_lines = options["System`SkippedLines"].evaluate(evaluation)
+    skipped = skipped_line_numbers(skipped_lines)
+    if skipped is None:
+        evaluation.message(name, "skplns", skipped_lines)
+        return SymbolFailed
+    numeric = options["System`Numeric"].evaluate(evaluation) is SymbolTrue
+    encoding = options["System`CharacterEncoding"].evaluate(evaluation)
+    encoding = (
+        to_python_encoding(encoding.value) if isinstance(encoding, String) else None
+    )
+
+    count = rows_needed(parts[0]) if parts else None
+    try:
+        rows = read_table(
+            resolved_path, encoding, separator.value, header, skipped, count
+        )
+    except (OSError, UnicodeDecodeError, csv.Error):
+        evaluation.message("General", "noopen", path)
+        return SymbolFailed
+    data = table_expression(rows, numeric)
+
+    if not parts:
+        return ListExpression(
+            Expression(SymbolRule, String("Data"), data),
+            Expression(SymbolRule, String("Grid"), Expression(SymbolGrid, data)),
+        )
+    # The rows read are all the rows the parts are taken from.
+    return ListExpression(
+        Expression(
+            SymbolRule,
+            String("Data"),
+            Expression(SymbolPart, data, *parts).evaluate(evaluation),
+        )
+    )
@@ -0,0 +1,59 @@
+"""
+Importing and exporting expressions in the Wolfram Exchange Format.
+
+See ``mathics.core.convert.wxf`` for the format.
+"""
+
+from mathics.core.atoms import String
+from mathics.core.convert.wxf import WXFError, from_wxf, to_wxf
+from mathics.core.element import BaseElement
+from mathics.core.evaluation import Evaluation
+from mathics.core.expression import Expression
+from mathics.core.list import ListExpression
+from mathics.core.symbols import SymbolNull
+from mathics.core.systemsymbols import SymbolFailed, SymbolRule
+from mathics.eval.files_io.files import resolve_file
+
+
+def eval_ImportWXF(name: str, path: String, evaluation: Evaluation) -> BaseElement:
+    """
+    Import the expression serialized in the file `path`, for the
+    importer `name`, as the "Expression" element.
+    """
+    resolved_path, _ = resolve_file(path, "rb", evaluation)
+    if resolved_path is None:
+        return SymbolFailed
+    try:
+        with open(resolved_path, "rb") as wxf_file:
+            data = wxf_file.read()
+    except OSError:
+        evaluation.message("General", "noopen", path)
+        return SymbolFailed
+    try:
+        expr = from_wxf(data)
+    except WXFError:
+        evaluation.message(name, "corrupt", path)
+        return SymbolFailed
+    return ListExpression(Expression(SymbolRule, String("Expression"), expr))
+
+
+def eval_ExportWXF(
+    name: str, path: String, expr: BaseElement, compress: bool, evaluation: Evaluation
+) -> BaseElement:
+    """
+    Write the serialization of `expr` to the file `path`, for the
+    exporter `name`.
+    """
+    try:
+        data = to_wxf(expr, compress=compress)
+    except WXFError:
+        evaluation.message(name, "nser", expr)
+        return SymbolFailed
+    resolved_path, _ = resolve_file(path, "wb", evaluation)
+    try:
+        with open(resolved_path, "wb") as wxf_file:
+            wxf_file.write(data)
+    except OSError:
+        evaluation.message("General", "noopen", path)
+        return SymbolFailed
+    return SymbolNull
@@ -4,10 +4,16 @@ File related evaluation functions.
 """
 
 import atexit
+import gc
+import io
 import os
+import os.path as osp
+import pickle
+import sys
 import tempfile
-from typing import Callable, Literal, Optional, Sequence
+from typing import Callable, Dict, List, Literal, Optional, Sequence, Tuple, Union
 
+import numpy
 from mathics_scanner.errors import (
     IncompleteSyntaxError,
     InvalidSyntaxError,
@@ -22,10 +28,14 @@ from mathics.core.atoms import Integer, String
 from mathics.core.builtin import MessageException
 from mathics.core.convert.expression import to_expression, to_mathics_list
 from mathics.core.convert.python import from_python
+from mathics.core.convert.wxf import WXFError, from_wxf, to_wxf
+from mathics.core.definitions import Definition
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import BaseElement, Expression
+from mathics.core.list import ListExpression
 from mathics.core.parser import MathicsFileLineFeeder, MathicsMultiLineFeeder
 from mathics.core.parser.util import parse_incrementally_by_line
+from mathics.core.pattern import BasePattern
 from mathics.core.streams import path_search, stream_manager
 from mathics.core.symbols import Symbol, SymbolNull
 from mathics.core.systemsymbols import (
@@ -34,17 +44,21 @@ from mathics.core.systemsymbols import (
     SymbolFailed,
     SymbolHold,
     SymbolHoldExpression,
+    SymbolNumber,
     SymbolPath,
     SymbolReal,
     SymbolWord,
 )
 from mathics.core.util import canonic_filename
 from mathics.eval.files_io.read import (
+    NUMBER_CHARACTERS,
     READ_TYPES,
+    REAL_CHARACTERS,
     Mathics3Open,
     close_stream,
-    read_from_stream,
     read_get_separators,
+    read_numbers,
+    stream_reader,
 )
 
 # Python representation of $InputFileName.  On Windows platforms, we
@@ -58,17 +72,22 @@ INPUT_VAR: str = ""
 DEFAULT_TRACE_FN: Literal[None] = None
 
 
-def create_temp_file_with_extension(data: str, file_extension: str) -> str:
+def create_temp_file_with_extension(
+    data: Union[str, bytes, bytearray], file_extension: str, binary: bool = False
+) -> str:
     """
     Writes data to a temporary file with a specific extension.
     The file is closed immediately so it can be read by other processes.
     It is automatically deleted when the program exits.
 
     Parameters:
-        data (str): The text content to write into the file.
+        data (str, bytes or bytearray): The content to write into the file.
         file_extension (str): The extension (e.g., 'json', 'html', 'md').
                               The file extension will have "." added to
                               the beginning.
+        binary (bool): Whether the file is written in binary mode. Bytes
+                       are always written in binary mode, and text in
+                       binary mode is encoded in UTF-8.
     Returns:
         str: The absolute file path to the created temporary file.
     """
@@ -77,9 +96,17 @@ def create_temp_file_with_extension(data: str, file_extension: str) -> str:
 
     # Create a secure temporary file with the desired extension.
     # delete=False prevents Python from destroying it the moment we close the handle.
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=file_extension, delete=False, encoding="utf-8"
-    ) as temp_file:
+    if binary or not isinstance(data, str):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        temp_file = tempfile.NamedTemporaryFile(
+            mode="wb", suffix=file_extension, delete=False
+        )
+    else:
+        temp_file = tempfile.NamedTemporaryFile(
+            mode="w", suffix=file_extension, delete=False, encoding="utf-8"
+        )
+    with temp_file:
         temp_file.write(data)
         temp_path = temp_file.name
 
@@ -161,6 +188,196 @@ def eval_Close(obj, evaluation: Evaluation):
     return name
 
 
+# Images of definitions written by DumpSave. Get reads an image
+# instead of the source file beside it, as long as the image is not
+# older than the source.
+MX_EXTENSION = ".mx"
+MX_FORMAT = 1
+MX_SOURCE_EXTENSIONS = (".m", ".wl")
+
+PICKLE_ERRORS = (pickle.PicklingError, AttributeError, TypeError)
+
+
+def mx_image_key() -> dict:
+    """
+    Return the key stored at the beginning of a definitions image.
+    Pickled definitions can only be read back by the same version of
+    Mathics3 running on the same Python version.
+    """
+    return {
+        "format": MX_FORMAT,
+        "mathics": mathics.__version__,
+        "python": (sys.implementation.name, tuple(sys.version_info[:2])),
+    }
+
+
+def choose_mx_image(
+    path: str, resolved_path: str
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the definitions image and the source file that `Get[path]`
+    should read, when `path` resolved to `resolved_path`. Either of
+    them can be None.
+
+    An image given explicitly is always read. Otherwise, an image is
+    preferred over a source file beside it unless the source is newer.
+    """
+    root, ext = osp.splitext(resolved_path)
+    ext = ext.lower()
+    if ext == MX_EXTENSION:
+        if path.lower().endswith(MX_EXTENSION):
+            if osp.isfile(resolved_path):
+                return resolved_path, None
+            return None, resolved_path
+        for source_ext in MX_SOURCE_EXTENSIONS:
+            source_path = root + source_ext
+            if osp.isfile(source_path):
+                if get_file_time(source_path) > get_file_time(resolved_path):
+                    return None, source_path
+                return resolved_path, source_path
+        return resolved_path, None
+    if ext in MX_SOURCE_EXTENSIONS:
+        mx_path = root + MX_EXTENSION
+        if osp.isfile(mx_path) and get_file_time(mx_path) >= get_file_time(
+            resolved_path
+        ):
+            return mx_path, resolved_path
+    return None, resolved_path
+
+
+class DefinitionsImagePickler(pickle.Pickler):
+    """
+    Pickler for the definitions written by DumpSave.
+
+    Expressions are written in WXF, which is much more compact than
+    their pickled objects, and patterns by their expressions, so that
+    they are built again when the image is read.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, BasePattern):
+            return BasePattern.create, (obj.expr, getattr(obj, "attributes", None))
+        if isinstance(obj, Expression):
+            try:
+                return from_wxf, (to_wxf(obj),)
+            except WXFError:
+                # Pickle the expression itself, for instance if it
+                # holds a Dispatch table.
+                pass
+        return NotImplemented
+
+
+def dump_definitions_image(user: Dict[str, Definition]) -> bytes:
+    """Return the image of the user definitions in `user`."""
+    image = io.BytesIO()
+    DefinitionsImagePickler(image, pickle.HIGHEST_PROTOCOL).dump(user)
+    return image.getvalue()
+
+
+def eval_DumpSave(
+    path: str, names: Sequence[str], contexts: Sequence[str], evaluation: Evaluation
+) -> Optional[List[str]]:
+    """
+    Write the user definitions of the symbols in `names`, and of all
+    the symbols in `contexts` and their subcontexts, to the image file
+    `path`.
+
+    Definitions that can not be pickled, like those holding compiled
+    functions, are left out with a message. Return the names of the
+    symbols whose definitions were written, or None if the file could
+    not be written.
+    """
+    definitions = evaluation.definitions
+    definitions.materialize_bindings()
+    selected = [name for name in names if name in definitions.user]
+    selected.extend(
+        name
+        for name in sorted(definitions.user)
+        if name not in selected and name.startswith(tuple(contexts))
+    )
+    user = {name: definitions.user[name] for name in selected}
+    try:
+        data = dump_definitions_image(user)
+    except PICKLE_ERRORS:
+        for name in selected:
+            try:
+                dump_definitions_image({name: user[name]})
+            except PICKLE_ERRORS:
+                evaluation.message("DumpSave", "nopick", Symbol(name))
+                del user[name]
+        data = dump_definitions_image(user)
+
+    directory = osp.dirname(osp.abspath(path))
+    try:
+        fd, tmp_filename = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    except OSError:
+        evaluation.message("DumpSave", "noopen", String(path))
+        return None
+    try:
+        with os.fdopen(fd, "wb") as mx_file:
+            # The key goes first, so that it can be checked
+            # without reading the whole image.
+            pickle.dump(mx_image_key(), mx_file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(list(contexts), mx_file, pickle.HIGHEST_PROTOCOL)
+            mx_file.write(data)
+        os.chmod(tmp_filename, 0o644)
+        os.replace(tmp_filename, path)
+    except BaseException:
+        if osp.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+    return list(user)
+
+
+def load_mx_image(path: str, evaluation: Evaluation) -> bool:
+    """
+    Add the definitions stored by DumpSave in the image file `path`,
+    and put the contexts saved in it on $ContextPath and $Packages,
+    as EndPackage does.
+
+    Return False, without changing the definitions, if the image can
+    not be read or was written by another version of Mathics3.
+    """
+    # Unpickling creates many objects that all survive, so collecting
+    # garbage meanwhile would only slow loading down.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, "rb") as mx_file:
+            if pickle.load(mx_file) != mx_image_key():
+                return False
+            contexts = pickle.load(mx_file)
+            user = pickle.load(mx_file)
+    except (
+        OSError,
+        EOFError,
+        ImportError,
+        AttributeError,
+        ValueError,
+        pickle.UnpicklingError,
+    ):
+        return False
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    definitions = evaluation.definitions
+    definitions.add_user_definitions(user)
+    contexts = [context for context in contexts if not context.endswith("`Private`")]
+    context_path = definitions.get_context_path()
+    new_contexts = [c for c in contexts if c not in context_path]
+    if new_contexts:
+        definitions.set_context_path(tuple(new_contexts) + tuple(context_path))
+    packages = definitions.get_package_names()
+    new_packages = [c for c in contexts if c not in packages]
+    if new_packages:
+        definitions.set_ownvalue(
+            "System`$Packages",
+            to_mathics_list(*new_packages, *packages, elements_conversion_fn=String),
+        )
+    return True
+
+
 def eval_Get(
     path: str,
     evaluation: Evaluation,
@@ -173,10 +390,22 @@ def eval_Get(
     """
     result = None
     if path_directories is None:
-        path_directories = tuple(streams.PATH_VAR)
+        # Search the same directories as Mathics3Open below.
+        path_directories = SymbolPath.evaluate(evaluation).to_python(
+            string_quotes=False
+        )
     resolved_path, _ = path_search(path, path_directories)
     if resolved_path is None:
         resolved_path = path
+    mx_path, source_path = choose_mx_image(path, resolved_path)
+    if mx_path is not None:
+        if load_mx_image(mx_path, evaluation):
+            return SymbolNull
+        if source_path is None:
+            evaluation.message("Get", "noload", path)
+            return SymbolFailed
+    if source_path is not None:
+        resolved_path = source_path
     definitions = evaluation.definitions
 
     # Wrap actual evaluation to handle setting $Input
@@ -284,41 +513,17 @@ def eval_Read(
 
     result = []
 
-    read_word = read_from_stream(
-        stream, word_separators + record_separators, token_words, evaluation.message
-    )
-    read_record = read_from_stream(
-        stream, record_separators, token_words, evaluation.message
-    )
-    read_number = read_from_stream(
-        stream,
-        word_separators + record_separators,
-        token_words,
-        evaluation.message,
-        ["+", "-", "."] + [str(i) for i in range(10)],
-    )
-    read_real = read_from_stream(
-        stream,
-        word_separators + record_separators,
-        token_words,
-        evaluation.message,
-        ["+", "-", ".", "e", "E", "^", "*"] + [str(i) for i in range(10)],
-    )
+    reader = stream_reader(stream)
+    word_separators = word_separators + record_separators
 
     for typ in types.elements:
         try:
             if typ is Symbol("Byte"):
-                tmp = stream.io.read(1)
-                if tmp == "":
-                    raise EOFError
-                result.append(ord(tmp))
+                result.append(ord(reader.read_character()))
             elif typ is Symbol("Character"):
-                tmp = stream.io.read(1)
-                if tmp == "":
-                    raise EOFError
-                result.append(tmp)
+                result.append(reader.read_character())
             elif typ in (SymbolExpression, SymbolHoldExpression):
-                tmp = next(read_record)
+                tmp = reader.read_word(record_separators, token_words)
                 assert isinstance(tmp, str)
                 while True:
                     try:
@@ -329,7 +534,7 @@ def eval_Read(
                         break
                     except (IncompleteSyntaxError, InvalidSyntaxError):
                         try:
-                            nextline = next(read_record)
+                            nextline = reader.read_word(record_separators, token_words)
                             assert isinstance(nextline, str)
                             tmp = tmp + "\n" + nextline
                         except EOFError:
@@ -351,8 +556,8 @@ def eval_Read(
                 #  TODO: Supposedly we can't get here
                 # what code should we put here?
 
-            elif typ is Symbol("Number"):
-                tmp = next(read_number)
+            elif typ is SymbolNumber:
+                tmp = reader.read_word(word_separators, token_words, NUMBER_CHARACTERS)
                 try:
                     tmp = int(tmp)
                 except ValueError:
@@ -366,7 +571,7 @@ def eval_Read(
                 result.append(tmp)
 
             elif typ is SymbolReal:
-                tmp = next(read_real)
+                tmp = reader.read_word(word_separators, token_words, REAL_CHARACTERS)
                 tmp = tmp.replace("*^", "E")
                 try:
                     tmp = float(tmp)
@@ -377,33 +582,36 @@ def eval_Read(
                     return SymbolFailed
                 result.append(tmp)
             elif typ is Symbol("Record"):
-                result.append(next(read_record))
+                result.append(reader.read_word(record_separators, token_words))
             elif typ is Symbol("String"):
-                tmp = stream.io.readline()
-                if len(tmp) == 0:
-                    raise EOFError
-                result.append(tmp.rstrip("\n"))
+                result.append(reader.read_line())
             elif typ is SymbolWord:
-                # next() for word tokens can return one or two words:
+                # read_word() for word tokens can return one or two words:
                 # the next word in the list and a following TokenWord
                 # match.  Therefore, test for this and do list-like
                 # appending here.
 
                 # THINK ABOUT: We might need to reconsider/refactor
                 # other cases to allow for multiple words as well. And
-                # for uniformity, we may want to redo the generators to
+                # for uniformity, we may want to redo the reader to
                 # always return *lists* instead instead of either a
                 # word or a list (which is always at most two words?)
-                words = next(read_word)
+                words = reader.read_word(word_separators, token_words)
                 if not isinstance(words, list):
                     words = [words]
                 result += words
 
         except EOFError:
-            return SymbolEndOfFile
+            result = SymbolEndOfFile
+            break
         except UnicodeDecodeError:
             evaluation.message(name, "ucdec")
 
+    if reader.decode_error:
+        # Undecodable characters were replaced when they were read.
+        reader.decode_error = False
+        evaluation.message("General", "ucdec")
+
     if isinstance(result, Symbol):
         return result
     if isinstance(result, list):
@@ -424,6 +632,54 @@ def eval_Read(
     return from_python(result)
 
 
+def eval_ReadList_numbers(
+    types: tuple, stream, evaluation: Evaluation, options: dict
+) -> Optional[ListExpression]:
+    """
+    Read the rest of `stream` at once for ReadList[], when the `types`
+    are all Number or all Real. The numbers are returned as a packed list
+    when they can be.
+
+    None is returned when the numbers can not be read at once, and
+    nothing is consumed. ReadList[] then reads them one at a time.
+    """
+    if not types or types[0] not in (SymbolNumber, SymbolReal):
+        return None
+    if any(typ is not types[0] for typ in types):
+        return None
+    separators = read_get_separators(options, evaluation)
+    if separators is None:
+        return None
+    record_separators, token_words, word_separators = separators
+    if token_words:
+        return None
+
+    reader = stream_reader(stream)
+    text = reader.read_rest()
+    if reader.decode_error:
+        return None
+    numbers = read_numbers(
+        text, word_separators + record_separators, types[0] is SymbolReal
+    )
+    if numbers is None:
+        return None
+    reader.skip_rest()
+
+    # A record left incomplete at the end of the stream is dropped.
+    width = len(types)
+    count = len(numbers) // width
+    if count == 0:
+        return ListExpression()
+    if isinstance(numbers, numpy.ndarray):
+        numbers = numbers[: count * width]
+        return ListExpression(
+            packed=numbers if width == 1 else numbers.reshape(count, width)
+        )
+    if width == 1:
+        return from_python(numbers)
+    return from_python([numbers[i : i + width] for i in range(0, count * width, width)])
+
+
 def resolve_file(name: String, mode: str, evaluation: Evaluation) -> Optional[str]:
     """Resolve 'name' using `path_search` and returned the resolved name as the first
     item of a tuple.
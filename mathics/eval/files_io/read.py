@@ -3,7 +3,11 @@ Functions to support Read[]
 """
 
 import io
-from typing import Callable, Optional, Tuple
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy
 
 from mathics.core.atoms import Integer, String
 from mathics.core.evaluation import Evaluation
@@ -13,7 +17,6 @@ from mathics.core.list import ListExpression
 from mathics.core.streams import Stream, path_search, stream_manager
 from mathics.core.symbols import Symbol
 from mathics.core.systemsymbols import (
-    SymbolEndOfFile,
     SymbolFailed,
     SymbolHoldExpression,
     SymbolInputStream,
@@ -24,6 +27,14 @@ from mathics.eval.encoding import to_python_encoding
 
 # TODO: Improve docs for these Read[] arguments.
 
+# The number of characters read from a stream at a time.
+CHUNK_SIZE = 1 << 16
+
+# The characters of the words read as numbers by Read[] for the types
+# Number and Real.
+NUMBER_CHARACTERS = "+-.0123456789"
+REAL_CHARACTERS = NUMBER_CHARACTERS + "eE^*"
+
 
 READ_TYPES = [
     Symbol(k)
@@ -364,66 +375,273 @@ def read_get_separators(
     return list(record_separators), list(token_words), list(word_separators)
 
 
-def read_from_stream(
-    stream, word_separators: list, token_words: list, msgfn: Callable, accepted=None
-):
+class TokenScanner(NamedTuple):
+    """
+    Compiled patterns for reading words that end at one of the
+    ``separators`` or ``token_words``, longest first.
+    """
+
+    skip: re.Pattern
+    word: re.Pattern
+    separators: Tuple[str, ...]
+    token_words: Tuple[str, ...]
+    margin: int
+
+
+@lru_cache(maxsize=64)
+def token_scanner(
+    separators: Tuple[str, ...],
+    token_words: Tuple[str, ...],
+    accepted: Optional[str],
+) -> TokenScanner:
     """
-    This is a generator that returns "words" from stream deliminated by
-    "word_separators" or "token_words".
+    Return the patterns that skip `separators`, and that match the
+    characters of a word up to one of `separators` or `token_words`. When
+    `accepted` is not None, the word also ends at the first character
+    not in `accepted`.
     """
-    while True:
-        word = ""
-        some_token_word_prefix = ""
+    separators = tuple(sorted({s for s in separators if s}, key=len, reverse=True))
+    token_words = tuple(sorted({t for t in token_words if t}, key=len, reverse=True))
+    stops = separators + token_words
+    single = "".join(stop for stop in stops if len(stop) == 1)
+    multiple = [stop for stop in stops if len(stop) > 1]
+    if accepted is not None:
+        chars = "".join(c for c in accepted if c not in single)
+        char = f"[{re.escape(chars)}]" if chars else "(?!)"
+    elif single:
+        char = f"[^{re.escape(single)}]"
+    else:
+        char = "."
+    if multiple:
+        char = f"(?:(?!{'|'.join(map(re.escape, multiple))}){char})"
+    skip = "|".join(map(re.escape, separators))
+    return TokenScanner(
+        skip=re.compile(f"(?:{skip})*" if skip else ""),
+        word=re.compile(f"{char}*", re.DOTALL),
+        separators=separators,
+        token_words=token_words,
+        margin=max(map(len, stops), default=1),
+    )
+
+
+class StreamReader:
+    """
+    Reads the text of an input stream for Read[] and its relatives,
+    a chunk at a time rather than a character at a time.
+
+    The characters read from the stream are kept in ``buffer``, and
+    those before ``position`` have been consumed. When the stream is
+    seekable, ``start`` is the position of the stream at the beginning
+    of the buffer, so that ``sync()`` can leave the stream just after
+    the characters consumed, for StreamPosition[] and the like.
+    """
+
+    def __init__(self, io):
+        self.io = io
+        self.buffer = ""
+        self.position = 0
+        self.seekable = io.seekable()
+        self.start = None
+        self.at_end = False
+        # Set when undecodable characters were replaced, so that a
+        # message can be given.
+        self.decode_error = False
+
+    def _read(self, size: int) -> str:
+        """
+        Read up to `size` characters from the stream, or up to the end
+        of the line if the stream is not seekable, as for the terminal.
+        """
+        text = self.io.read(size) if self.seekable else self.io.readline()
+        if isinstance(text, bytes):
+            # Binary streams are read a byte at a time.
+            text = text.decode("latin-1")
+        return text
+
+    def fill(self, size: Optional[int] = None):
+        """
+        Read more characters into the buffer, keeping the ones not
+        consumed, up to the end of the stream when `size` is negative.
+        Set ``at_end`` when there are no more characters.
+        """
+        pending = len(self.buffer) - self.position
+        if size is None:
+            size = max(CHUNK_SIZE, 2 * pending)
+        if self.seekable:
+            if pending:
+                # The pending characters are read again, to know the
+                # position of the stream where they start.
+                self.io.seek(self.start)
+                self.io.read(self.position)
+            self.start = self.io.tell()
         while True:
             try:
-                tmp = stream.io.read(1)
-            except UnicodeDecodeError:
-                tmp = " "  # ignore
-                msgfn("General", "ucdec")
-            except EOFError:
-                return SymbolEndOfFile
-
-            if tmp == "":
-                if word == "":
-                    pos = stream.io.tell()
-                    newchar = stream.io.read(1)
-                    if pos == stream.io.tell():
-                        raise EOFError
-                    else:
-                        if newchar:
-                            word = newchar
-                            continue
-                        else:
-                            yield word
-                            continue
-                yield word
+                if self.seekable:
+                    text = self._read(-1 if size < 0 else pending + size)
+                else:
+                    text = self.buffer[self.position :] + self._read(size)
                 break
-
-            if tmp in word_separators:
-                if word == "":
-                    continue
-                if stream.io.seekable():
-                    stream.io.seek(stream.io.tell() - 1)
-                word += some_token_word_prefix
-                some_token_word_prefix = ""
-                yield word
+            except UnicodeDecodeError:
+                if self.decode_error or not hasattr(self.io, "reconfigure"):
+                    raise
+                self.decode_error = True
+                self.io.reconfigure(errors="replace")
+                if self.seekable:
+                    self.io.seek(self.start)
+        if len(text) == pending or size < 0:
+            self.at_end = True
+        self.buffer = text
+        self.position = 0
+
+    def sync(self):
+        """
+        Leave the stream just after the characters consumed, and empty
+        the buffer.
+        """
+        if self.position == len(self.buffer):
+            self.buffer = ""
+            self.position = 0
+        elif self.seekable:
+            self.io.seek(self.start)
+            self.io.read(self.position)
+            self.buffer = ""
+            self.position = 0
+        self.at_end = False
+
+    def match(self, pattern: re.Pattern, margin: int) -> re.Match:
+        """
+        Match `pattern` at the position, reading more characters until
+        the match is followed by at least `margin` characters, or the
+        end of the stream is reached.
+        """
+        while True:
+            match = pattern.match(self.buffer, self.position)
+            if match.end() + margin <= len(self.buffer) or self.at_end:
+                return match
+            self.fill()
+
+    def read_character(self) -> str:
+        """Read a character. Raise EOFError at the end of the stream."""
+        if self.position == len(self.buffer) and not self.at_end:
+            self.fill()
+        if self.position == len(self.buffer):
+            raise EOFError
+        self.position += 1
+        return self.buffer[self.position - 1]
+
+    def read_line(self) -> str:
+        """
+        Read up to the end of the line, without the newline. Raise
+        EOFError at the end of the stream.
+        """
+        while True:
+            end = self.buffer.find("\n", self.position)
+            if end >= 0 or self.at_end:
                 break
+            self.fill()
+        if end < 0:
+            if self.position == len(self.buffer):
+                raise EOFError
+            end = len(self.buffer) - 1
+            line = self.buffer[self.position :]
+        else:
+            line = self.buffer[self.position : end]
+        self.position = end + 1
+        return line
+
+    def read_rest(self) -> str:
+        """Return the rest of the stream, without consuming it."""
+        if not self.at_end:
+            self.fill(-1)
+        return self.buffer[self.position :]
+
+    def skip_rest(self):
+        """Consume the rest of the stream."""
+        self.read_rest()
+        self.buffer = ""
+        self.position = 0
+
+    def read_word(
+        self,
+        separators: Sequence[str],
+        token_words: Sequence[str],
+        accepted: Optional[str] = None,
+    ) -> Union[str, List[str]]:
+        """
+        Skip `separators`, and read a word up to one of `separators`,
+        which is left in the stream, or one of `token_words`. When
+        `accepted` is not None, the word also ends at the first character
+        not in `accepted`, which is consumed.
+
+        If the word ends at a token word, return the word and the token
+        word as a list, or only the token word if the word is empty.
+        Raise EOFError at the end of the stream.
+        """
+        scanner = token_scanner(tuple(separators), tuple(token_words), accepted)
+        self.position = self.match(scanner.skip, scanner.margin).end()
+        match = self.match(scanner.word, scanner.margin)
+        word = match.group()
+        buffer, end = self.buffer, match.end()
+        self.position = end
+        if end == len(buffer):
+            if word:
+                return word
+            raise EOFError
+        for separator in scanner.separators:
+            if buffer.startswith(separator, end):
+                return word
+        if accepted is not None and buffer[end] not in accepted:
+            self.position += 1
+            return word
+        for token_word in scanner.token_words:
+            if buffer.startswith(token_word, end):
+                self.position += len(token_word)
+                return [word, token_word] if word else token_word
+        return word
+
+
+def read_numbers(
+    text: str, separators: Sequence[str], real: bool
+) -> Optional[Union[numpy.ndarray, list]]:
+    """
+    Return the numbers in `text` as Read[] reads them one at a time for
+    the type Real if `real` is True, or else for the type Number: as an
+    array when they all are integers or all are reals, and otherwise as
+    a list. Return None if some word between `separators` is not read
+    as a number in whole.
+    """
+    separators = sorted((s for s in separators if s), key=len, reverse=True)
+    if separators:
+        words = re.split("|".join(map(re.escape, separators)), text)
+    else:
+        words = [text]
+    words = [word for word in words if word]
+    characters = REAL_CHARACTERS if real else NUMBER_CHARACTERS
+    if not set(characters).issuperset("".join(words)):
+        return None
+    if real:
+        try:
+            return numpy.array(
+                [word.replace("*^", "E") for word in words], dtype=numpy.float64
+            )
+        except ValueError:
+            return None
+    try:
+        return numpy.array(words, dtype=numpy.int64)
+    except (OverflowError, ValueError):
+        pass
+    # Words without a point are read as Integers, so that integers and
+    # reals together are not put into an array.
+    try:
+        if all("." in word for word in words):
+            return numpy.array(words, dtype=numpy.float64)
+        return [float(word) if "." in word else int(word) for word in words]
+    except ValueError:
+        return None
 
-            if accepted is not None and tmp not in accepted:
-                word += some_token_word_prefix
-                some_token_word_prefix = ""
-                yield word
-                break
 
-            some_token_word_prefix += tmp
-            for token_word in token_words:
-                if token_word == some_token_word_prefix:
-                    if word:
-                        yield [word, token_word]
-                    else:
-                        yield token_word
-                    some_token_word_prefix = ""
-                    break
-            else:
-                word += some_token_word_prefix
-                some_token_word_prefix = ""
+def stream_reader(stream: Stream) -> StreamReader:
+    """Return the reader of `stream`, creating it on first use."""
+    if stream.reader is None or stream.reader.io is not stream.io:
+        stream.reader = StreamReader(stream.io)
+    return stream.reader
@@ -7,8 +7,8 @@ Following WMA, we use WMA's custom short name for a mime type.
 
 import mimetypes
 import os.path as osp
-from itertools import chain
-from typing import Dict, Final, Optional
+from itertools import chain, takewhile
+from typing import Dict, Final, Optional, Union
 
 from mathics.core.atoms import ByteArray, String
 from mathics.core.builtin import get_option
@@ -16,13 +16,14 @@ from mathics.core.convert.expression import to_expression
 from mathics.core.convert.python import from_python
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
-from mathics.core.list import ListExpression
+from mathics.core.list import ListExpression, to_packed_list
 from mathics.core.symbols import Symbol, SymbolNull, SymbolTrue, strip_context
 from mathics.core.systemsymbols import (
     SymbolByteArray,
     SymbolFailed,
     SymbolInputStream,
     SymbolNone,
+    SymbolPart,
     SymbolRule,
     SymbolStringToStream,
 )
@@ -58,6 +59,8 @@ FILE_EXTENSION_MAP: dict[str, str] = {
     "tif": "TIFF",
     "txt": "Text",
     "csv": "CSV",
+    "tsv": "TSV",
+    "wxf": "WXF",
     "svg": "SVG",
     "asy": "asy",
 }
@@ -159,6 +162,9 @@ def filetype_from_path(path: str, check_exists: bool = True) -> Optional[str]:
     file_extension = osp.splitext(path)[1].lower()
     if file_extension in (".m", ".wl"):
         return "WL"
+    # Likewise, libmagic only sees binary data in ".wxf" files.
+    if file_extension == ".wxf":
+        return "WXF"
 
     try:
         mime_content_type = from_file(path, mime=True)
@@ -257,13 +263,11 @@ def eval_Import_general(
     else:
         elements = [elements]
 
-    for el in elements:
-        if not isinstance(el, String):
-            evaluation.message("Import", "noelem", el)
-            evaluation.predetermined_out = current_predetermined_out
-            return SymbolFailed
-
-    elements = [el.value for el in elements]
+    # Element names can be followed by specifications of the parts of
+    # the element to import, as in {"Data", 1 ;; 10, 2}.
+    names = list(takewhile(lambda el: isinstance(el, String), elements))
+    parts = elements[len(names) :]
+    elements = [el.value for el in names]
 
     # Determine WMA version of the mime type.
     file_format = None
@@ -281,6 +285,16 @@ def eval_Import_general(
         evaluation.predetermined_out = current_predetermined_out
         return SymbolFailed
 
+    if parts:
+        wrong = [el for el in parts if isinstance(el, String)]
+        if wrong or not elements:
+            evaluation.message(
+                "Import", "noelem", (wrong or parts)[0], String(file_format)
+            )
+            evaluation.predetermined_out = current_predetermined_out
+            return SymbolFailed
+        elements.extend(parts)
+
     # Extract information about the loader used for this MIME type.
     # FIXME: turn into dataclass
     conditionals, import_function_symbol, posts, importer_options = IMPORTERS[
@@ -459,7 +473,7 @@ def perform_import(
     custom_options,
     evaluation,
     options,
-    data: Optional[str],
+    data: Optional[Union[str, bytes, bytearray]],
     elements: Optional[list] = None,
 ):
     """ This routine does the import. "import" here means reading a  \
@@ -481,11 +495,18 @@ def perform_import(
     about the member names or contents of tar file compared to the entire tar file.
     """
     current_predetermined_out = evaluation.predetermined_out
+    # Whether the import function took the parts of the element asked for.
+    selected = False
     if function_channels == ListExpression(String("FileNames")):
         joined_options = list(chain(stream_options, custom_options))
         if findfile is None:
+            is_binary = (
+                IMPORTERS[file_format][3].get("System`BinaryFormat") is SymbolTrue
+            )
             findfile = String(
-                create_temp_file_with_extension(data, file_format.lower())
+                create_temp_file_with_extension(
+                    data, file_format.lower(), binary=is_binary
+                )
             )
 
         # FIXME: Some import functions do not support element
@@ -512,6 +533,8 @@ def perform_import(
                 # Retry by retrieving the entire collection.
                 # Element selection is done afterwards.
                 tmp = import_collection_expression.evaluate(evaluation)
+            else:
+                selected = True
 
         if tmp in (SymbolFailed, SymbolNull):
             return SymbolFailed
@@ -558,8 +581,18 @@ def perform_import(
         evaluation.predetermined_out = current_predetermined_out
         return None
 
+    # Numeric data is packed.
+    result = {
+        a.get_string_value(): to_packed_list(b)
+        for a, b in (x.get_elements() for x in tmp)
+    }
+    parts = [el for el in elements or () if not isinstance(el, str)]
+    if parts and not selected and elements[0] in result:
+        result[elements[0]] = Expression(
+            SymbolPart, result[elements[0]], *parts
+        ).evaluate(evaluation)
     evaluation.predetermined_out = current_predetermined_out
-    return {a.get_string_value(): b for a, b in (x.get_elements() for x in tmp)}
+    return result
 
 
 def eval_Import_data_only(
@@ -2,9 +2,9 @@
 """
 Implementation of builtin optimizers.
 """
+
 from typing import Optional
 
-from mathics.builtin.scoping import dynamic_scoping
 from mathics.core.atoms import (
     Integer,
     Integer0,
@@ -32,6 +32,7 @@ from mathics.core.systemsymbols import (
     SymbolNone,
 )
 from mathics.eval.nevaluator import eval_N
+from mathics.eval.scoping import dynamic_scoping
 
 
 def find_minimum_newton1d(f, x0, x, opts, evaluation) -> (Number, bool):
@@ -0,0 +1,238 @@
+"""
+Evaluation of functions on packed lists.
+
+Listable numeric functions applied to packed lists are computed with
+NumPy over the whole array, instead of threading the function over the
+elements and evaluating each of the resulting expressions. When the
+result can not be computed in machine arithmetic (the arguments are
+not machine numbers, integers overflow, or a value is not a finite
+real number), ``None`` is returned, and the function is evaluated
+element by element as usual.
+"""
+
+from functools import reduce
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy
+
+from mathics.core.atoms import Integer, MachineReal
+from mathics.core.attributes import A_FLAT
+from mathics.core.element import BaseElement
+from mathics.core.expression import Expression
+from mathics.core.list import ListExpression, pack_elements
+from mathics.core.symbols import SymbolFalse, SymbolTrue
+
+# Integer results are kept only if they are smaller than this in
+# absolute value. See ``eval_packed_listable()``.
+MAX_PACKED_INTEGER = 2**62
+
+PackedArgument = Union[numpy.ndarray, int, float]
+
+
+def _positive(x):
+    return numpy.greater(x, 0)
+
+
+def _negative(x):
+    return numpy.less(x, 0)
+
+
+def _non_negative(x):
+    return numpy.greater_equal(x, 0)
+
+
+def _non_positive(x):
+    return numpy.less_equal(x, 0)
+
+
+# The Listable functions that are computed on packed lists. For each
+# function name, this gives the NumPy function, its number of
+# arguments, and whether it is computed on integers. Functions with no
+# fixed number of arguments are Flat, and are reduced over the
+# arguments. Functions not computed on integers, like ``Sin``, are left
+# unevaluated for exact arguments.
+PACKED_LISTABLE_FUNCTIONS: Dict[str, Tuple[Callable, Optional[int], bool]] = {
+    "System`Plus": (numpy.add, None, True),
+    "System`Times": (numpy.multiply, None, True),
+    "System`Power": (numpy.power, 2, True),
+    "System`Abs": (numpy.absolute, 1, True),
+    "System`Exp": (numpy.exp, 1, False),
+    "System`Log": (numpy.log, 1, False),
+    "System`Sin": (numpy.sin, 1, False),
+    "System`Cos": (numpy.cos, 1, False),
+    "System`Tan": (numpy.tan, 1, False),
+    "System`ArcSin": (numpy.arcsin, 1, False),
+    "System`ArcCos": (numpy.arccos, 1, False),
+    "System`ArcTan": (numpy.arctan, 1, False),
+    "System`Sinh": (numpy.sinh, 1, False),
+    "System`Cosh": (numpy.cosh, 1, False),
+    "System`Tanh": (numpy.tanh, 1, False),
+    "System`ArcSinh": (numpy.arcsinh, 1, False),
+    "System`ArcCosh": (numpy.arccosh, 1, False),
+    "System`ArcTanh": (numpy.arctanh, 1, False),
+    "System`Positive": (_positive, 1, True),
+    "System`Negative": (_negative, 1, True),
+    "System`NonNegative": (_non_negative, 1, True),
+    "System`NonPositive": (_non_positive, 1, True),
+}
+
+
+def get_packed_argument(element: BaseElement) -> Optional[PackedArgument]:
+    """
+    Return `element` as an array or a machine number, or None if it
+    is neither a list that can be packed nor a machine number.
+    """
+    if isinstance(element, ListExpression):
+        packed = element.packed
+        if packed is None:
+            packed = pack_elements(element.elements)
+        return packed
+    if type(element) is Integer:
+        value = element.value
+        return value if abs(value) < MAX_PACKED_INTEGER else None
+    if type(element) is MachineReal:
+        return element.value
+    return None
+
+
+def broadcast_packed_arguments(
+    args: Sequence[PackedArgument],
+) -> Optional[Sequence[PackedArgument]]:
+    """
+    Reshape the arrays in `args` so that NumPy combines them like
+    threading does: the arrays of lower rank are matched to the first
+    dimensions of the others, not to the last ones.
+
+    Return None if the dimensions do not match.
+    """
+    shape = max((arg.shape for arg in args if isinstance(arg, numpy.ndarray)), key=len)
+    rank = len(shape)
+    result = []
+    for arg in args:
+        if isinstance(arg, numpy.ndarray) and arg.ndim < rank:
+            if arg.shape != shape[: arg.ndim]:
+                return None
+            arg = arg.reshape(arg.shape + (1,) * (rank - arg.ndim))
+        elif isinstance(arg, numpy.ndarray) and arg.shape != shape:
+            return None
+        result.append(arg)
+    return result
+
+
+def is_integer_argument(arg: PackedArgument) -> bool:
+    if isinstance(arg, numpy.ndarray):
+        return arg.dtype.kind == "i"
+    return isinstance(arg, int)
+
+
+def eval_packed_listable(expr: Expression, attributes: int) -> Optional[BaseElement]:
+    """
+    Evaluate the Listable function `expr`, with at least one packed list
+    in its elements, over whole arrays. Return None if this is not
+    possible.
+    """
+    spec = PACKED_LISTABLE_FUNCTIONS.get(expr.get_head_name())
+    if spec is None:
+        return None
+    function, nargs, on_integers = spec
+
+    elements = expr.elements
+    if nargs is None:
+        if len(elements) < 2 or not A_FLAT & attributes:
+            return None
+    elif len(elements) != nargs:
+        return None
+
+    args = []
+    for element in elements:
+        arg = get_packed_argument(element)
+        if arg is None:
+            return None
+        args.append(arg)
+    args = broadcast_packed_arguments(args)
+    if args is None:
+        return None
+
+    integers = all(is_integer_argument(arg) for arg in args)
+    if integers and not on_integers:
+        return None
+
+    def apply(*values):
+        return function(*values) if nargs is not None else reduce(function, values)
+
+    with numpy.errstate(all="ignore"):
+        if function is numpy.power:
+            base, exponent = args
+            if integers:
+                # Negative exponents and 0^0 give rational or undefined values.
+                if numpy.any(numpy.less(exponent, 0)) or numpy.any(
+                    numpy.equal(base, 0) & numpy.equal(exponent, 0)
+                ):
+                    return None
+            elif numpy.any(numpy.equal(base, 0)):
+                # With reals, 0^0 is Indeterminate, and 0^x is an exact 0
+                # when the base is the integer 0.
+                return None
+        if integers and function in (numpy.add, numpy.multiply, numpy.power):
+            # Machine integers wrap around when they overflow, so compute
+            # first with reals to see how big the result is.
+            estimate = apply(*(numpy.asarray(arg, dtype=float) for arg in args))
+            if not numpy.all(numpy.abs(estimate) < MAX_PACKED_INTEGER):
+                return None
+        result = apply(*args)
+
+    if not isinstance(result, numpy.ndarray):
+        return None
+    if result.dtype.kind == "b":
+        return to_boolean_list(result)
+    if result.dtype.kind == "f" and not numpy.all(numpy.isfinite(result)):
+        return None
+    return ListExpression(packed=result)
+
+
+def eval_packed_min_max(
+    elements: Sequence[BaseElement], sense: int
+) -> Optional[BaseElement]:
+    """
+    Return the largest (`sense` = 1) or smallest (`sense` = -1) of the
+    numbers in `elements`, if they all are machine numbers or packed
+    lists, and at least one of them is a packed list. Otherwise, return
+    None.
+    """
+    candidates = []
+    has_packed = False
+    for element in elements:
+        if isinstance(element, ListExpression) and element.packed is not None:
+            packed = element.packed
+            if packed.size == 0:
+                continue
+            best = packed.max() if sense > 0 else packed.min()
+            candidates.append(
+                MachineReal(float(best))
+                if packed.dtype.kind == "f"
+                else Integer(int(best))
+            )
+            has_packed = True
+        elif type(element) in (Integer, MachineReal):
+            candidates.append(element)
+        else:
+            return None
+    if not has_packed or not candidates:
+        return None
+
+    best = candidates[0]
+    for candidate in candidates[1:]:
+        if (sense > 0 and candidate.value > best.value) or (
+            sense < 0 and candidate.value < best.value
+        ):
+            best = candidate
+    return best
+
+
+def to_boolean_list(result: numpy.ndarray) -> ListExpression:
+    """Convert an array of booleans into a list of True and False."""
+    if result.ndim > 1:
+        return ListExpression(*(to_boolean_list(row) for row in result))
+    return ListExpression(
+        *(SymbolTrue if value else SymbolFalse for value in result.tolist())
+    )
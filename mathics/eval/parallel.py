@@ -0,0 +1,446 @@
+"""
+Parallel evaluation on subkernels.
+
+A subkernel is a separate process running its own Mathics3 kernel, with
+its own ``Definitions``. Expressions are sent to subkernels, and their
+results sent back, through pipes, in their binary serialization (see
+``mathics.core.convert.wxf``). Expressions that can not be serialized,
+like those holding images, are pickled instead.
+
+Before expressions are evaluated on the subkernels, the user
+definitions changed in the master kernel since the last time are sent
+to them, encoded by ``Definitions.get_user_definitions()``.
+
+Messages and printed output produced by a subkernel are sent back with
+the result, and are shown by the master kernel.
+"""
+
+import multiprocessing
+import os
+import pickle
+import signal
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from mathics import settings
+from mathics.core.atoms import Integer
+from mathics.core.convert.wxf import WXFError, from_wxf, to_wxf
+from mathics.core.definitions import Definitions
+from mathics.core.element import BaseElement
+from mathics.core.evaluation import Evaluation
+from mathics.core.expression import Expression
+from mathics.core.interrupt import (
+    AbortInterrupt,
+    BreakInterrupt,
+    ContinueInterrupt,
+    ReturnInterrupt,
+    TimeoutInterrupt,
+    WLThrowInterrupt,
+)
+from mathics.core.list import ListExpression
+from mathics.core.symbols import Symbol, SymbolNull
+from mathics.core.systemsymbols import SymbolAborted, SymbolTable
+
+# The number of the kernel running in this process: 0 in the master
+# kernel, and 1, 2, ... in subkernels.
+kernel_id = 0
+
+# Definitions that belong to the session of each kernel, and are never
+# sent to subkernels.
+LOCAL_SYMBOLS = frozenset(("System`$Line", "System`In", "System`Out"))
+
+# Errors of pickle when an object can not be pickled.
+PICKLE_ERRORS = (pickle.PicklingError, AttributeError, TypeError)
+
+
+class SubKernelError(Exception):
+    """A subkernel could not be started, or did not evaluate an expression."""
+
+
+def split_evenly(items: Sequence, parts: int) -> List[Sequence]:
+    """
+    Split `items` into at most `parts` consecutive, non-empty slices,
+    whose lengths differ at most by one.
+    """
+    parts = max(1, min(parts, len(items)))
+    size, extra = divmod(len(items), parts)
+    slices = []
+    start = 0
+    for part in range(parts):
+        stop = start + size + (1 if part < extra else 0)
+        slices.append(items[start:stop])
+        start = stop
+    return slices
+
+
+def iterator_values(
+    iterator: BaseElement, evaluation: Evaluation
+) -> Optional[Tuple[Optional[Symbol], Sequence]]:
+    """
+    Find the values the iterator specification `iterator` of ``Table``,
+    ``Sum`` or ``Do`` runs over. Return its variable, or None if it has
+    none, and its values, or a range with as many steps if it has no
+    variable.
+
+    ``None`` is returned if the values can not be found, for example
+    when its bounds are symbolic.
+    """
+    if isinstance(iterator, Symbol):
+        iterator = iterator.evaluate(evaluation)
+    if isinstance(iterator, Integer):
+        iterator = ListExpression(iterator)
+    if not iterator.has_form("List", 1, 2, 3, 4):
+        return None
+    if len(iterator.elements) == 1:
+        count = iterator.elements[0].evaluate(evaluation)
+        if isinstance(count, Integer):
+            return None, range(max(count.value, 0))
+        variable, table = None, Expression(SymbolTable, SymbolNull, iterator)
+    else:
+        variable = iterator.elements[0]
+        if not isinstance(variable, Symbol):
+            return None
+        table = Expression(SymbolTable, variable, iterator)
+    # Messages about invalid iterators are given by the caller, or when
+    # the function is evaluated sequentially instead.
+    old_quiet_all = evaluation.quiet_all
+    evaluation.quiet_all = True
+    try:
+        values = table.evaluate(evaluation)
+    finally:
+        evaluation.quiet_all = old_quiet_all
+    if not isinstance(values, ListExpression):
+        return None
+    if variable is None:
+        return None, range(len(values.elements))
+    return variable, values.elements
+
+
+def split_iterator(
+    variable: Optional[Symbol], values: Sequence, parts: int
+) -> List[BaseElement]:
+    """
+    Split the iterator over `values` found by ``iterator_values()`` into
+    at most `parts` ones, which together run over the same values in
+    the same order.
+    """
+    if variable is None:
+        return [
+            ListExpression(Integer(len(counts)))
+            for counts in split_evenly(values, parts)
+        ]
+    return [
+        ListExpression(variable, ListExpression(*chunk))
+        for chunk in split_evenly(values, parts)
+    ]
+
+
+def encode_expression(expr: BaseElement):
+    """
+    Return the binary serialization of `expr`, to be sent through a
+    pipe, or `expr` itself if it can not be serialized.
+    """
+    try:
+        return to_wxf(expr)
+    except WXFError:
+        return expr
+
+
+def decode_expression(payload) -> BaseElement:
+    """Return the expression sent through a pipe as `payload`."""
+    if isinstance(payload, bytes):
+        return from_wxf(payload)
+    return payload
+
+
+def evaluate_in_subkernel(expr: BaseElement, definitions: Definitions) -> tuple:
+    """
+    Evaluate `expr` and return the response sent to the master kernel:
+    a status, the result, and the messages and printed output.
+    """
+    evaluation = Evaluation(definitions, catch_interrupt=False)
+    try:
+        return "ok", encode_expression(expr.evaluate(evaluation)), evaluation.out
+    except WLThrowInterrupt as throw:
+        return "throw", (throw.value, throw.tag), evaluation.out
+    except ReturnInterrupt as ret:
+        return "ok", ret.expr, evaluation.out
+    except (AbortInterrupt, BreakInterrupt, ContinueInterrupt, TimeoutInterrupt):
+        return "ok", SymbolAborted, evaluation.out
+    except Exception as exc:
+        return "error", f"{type(exc).__name__}: {exc}", evaluation.out
+
+
+def subkernel_main(connection, number: int) -> None:
+    """The loop of a subkernel process."""
+    from mathics.core.load_builtin import (
+        import_and_load_builtins,
+        mathics3_builtins_modules,
+    )
+
+    global kernel_id
+    kernel_id = number
+    # The master kernel stops subkernels when it is interrupted.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # When the process is forked, it gets the ends of the pipes used by
+    # the master kernel. Closing them lets subkernels see when the
+    # master kernel is gone.
+    for kernel in kernel_pool.kernels:
+        kernel.connection.close()
+        if kernel.id != number:
+            kernel.child_connection.close()
+    kernel_pool.kernels = []
+
+    if not mathics3_builtins_modules:
+        import_and_load_builtins()
+    definitions = Definitions(add_builtin=True)
+    while True:
+        try:
+            command, payload = connection.recv()
+        except EOFError:
+            break
+        if command == "close":
+            break
+        elif command == "reset":
+            definitions.reset_user_definitions()
+        elif command == "definitions":
+            encoded, removed = payload
+            definitions.update_user_definitions(encoded)
+            for name in removed:
+                definitions.reset_user_definition(name)
+        elif command == "evaluate":
+            response = evaluate_in_subkernel(decode_expression(payload), definitions)
+            try:
+                connection.send(response)
+            except PICKLE_ERRORS as exc:
+                connection.send(("error", f"{type(exc).__name__}: {exc}", []))
+
+
+class SubKernel:
+    """A subkernel process, and the pipe to it."""
+
+    def __init__(self, number: int):
+        context = multiprocessing.get_context()
+        self.id = number
+        self.connection, self.child_connection = context.Pipe()
+        self.process = context.Process(
+            target=subkernel_main,
+            args=(self.child_connection, number),
+            name=f"Mathics3 subkernel {number}",
+            daemon=True,
+        )
+        # The value of ``Definitions.now`` when user definitions were
+        # last sent, and the names of the symbols defined then.
+        self.distributed_at = -1
+        self.distributed_names: Set[str] = set()
+
+    def start(self) -> None:
+        self.process.start()
+        self.child_connection.close()
+
+    def send(self, command: str, payload=None) -> None:
+        try:
+            self.connection.send((command, payload))
+        except PICKLE_ERRORS as exc:
+            raise SubKernelError(f"{type(exc).__name__}: {exc}")
+        except OSError as exc:
+            raise SubKernelError(f"kernel {self.id} is not running: {exc}")
+
+    def receive(self) -> tuple:
+        try:
+            return self.connection.recv()
+        except (EOFError, OSError):
+            raise SubKernelError(f"kernel {self.id} stopped")
+
+    def close(self, wait: bool = True) -> None:
+        if wait:
+            try:
+                self.connection.send(("close", None))
+            except OSError:
+                pass
+            self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.connection.close()
+
+
+def encode_user_definitions(definitions: Definitions, names) -> str:
+    """
+    Encode the user definitions of `names`, leaving out those that can
+    not be pickled, like compiled functions.
+    """
+    try:
+        return definitions.get_user_definitions(names)
+    except PICKLE_ERRORS:
+        pass
+    picklable = []
+    for name in names:
+        try:
+            pickle.dumps(definitions.user.get(name), protocol=2)
+        except PICKLE_ERRORS:
+            continue
+        picklable.append(name)
+    return definitions.get_user_definitions(picklable)
+
+
+class KernelPool:
+    """The subkernels of this session."""
+
+    def __init__(self):
+        self.kernels: List[SubKernel] = []
+        self.definitions: Optional[Definitions] = None
+
+    def launch(self, count: Optional[int] = None) -> List[SubKernel]:
+        """
+        Start `count` subkernels, or, by default, as many as set in
+        ``settings.PARALLEL_KERNELS``.
+        """
+        if count is None:
+            count = settings.PARALLEL_KERNELS or os.cpu_count() or 1
+        first = max((kernel.id for kernel in self.kernels), default=0) + 1
+        new_kernels = [SubKernel(number) for number in range(first, first + count)]
+        # Subkernels are added before they start, so that a forked
+        # subkernel closes the pipes of all the others.
+        self.kernels.extend(new_kernels)
+        try:
+            for kernel in new_kernels:
+                kernel.start()
+        except (OSError, ImportError, ValueError) as exc:
+            self.close(new_kernels, wait=False)
+            raise SubKernelError(str(exc))
+        return new_kernels
+
+    def close(self, kernels: Optional[List[SubKernel]] = None, wait=True) -> None:
+        """Stop `kernels`, or all the subkernels."""
+        if kernels is None:
+            kernels = list(self.kernels)
+        for kernel in kernels:
+            if kernel in self.kernels:
+                self.kernels.remove(kernel)
+                kernel.close(wait=wait and kernel.process.is_alive())
+
+    def ensure_kernels(self) -> None:
+        if not self.kernels:
+            self.launch()
+
+    def distribute_definitions(
+        self, definitions: Definitions, names: Optional[Sequence[str]] = None
+    ) -> None:
+        """
+        Send the user definitions of `names` to all the subkernels. By
+        default, send those that changed since they were last sent,
+        and remove those that were removed.
+        """
+        if definitions is not self.definitions:
+            # Definitions sent by another session must not be used.
+            for kernel in self.kernels:
+                if kernel.distributed_at >= 0:
+                    kernel.send("reset")
+                kernel.distributed_at = -1
+                kernel.distributed_names = set()
+            self.definitions = definitions
+
+        if names is not None:
+            self._send_to_all(
+                ("definitions", (encode_user_definitions(definitions, names), ()))
+            )
+            return
+
+        user = definitions.user
+        current_names = {name for name in user if name not in LOCAL_SYMBOLS}
+        encoded: Dict[int, str] = {}
+        for kernel in self.kernels:
+            since = kernel.distributed_at
+            if since not in encoded:
+                encoded[since] = encode_user_definitions(
+                    definitions,
+                    [name for name in current_names if user[name].changed > since],
+                )
+            removed = kernel.distributed_names - current_names
+            kernel.send("definitions", (encoded[since], sorted(removed)))
+            kernel.distributed_at = definitions.now
+            kernel.distributed_names = current_names
+
+    def _send_to_all(self, message: tuple) -> None:
+        for kernel in self.kernels:
+            kernel.send(*message)
+
+    def evaluate(
+        self, exprs: Sequence[BaseElement], evaluation: Evaluation
+    ) -> List[BaseElement]:
+        """
+        Evaluate each of `exprs` on some subkernel, and return the
+        results in the same order.
+
+        Each subkernel is sent the next expression as soon as it is
+        done with the previous one, so subkernels stay busy even if
+        some expressions take longer than others.
+        """
+        self.ensure_kernels()
+        self.distribute_definitions(evaluation.definitions)
+        responses: list = [None] * len(exprs)
+        pending = deque(range(len(exprs)))
+        busy = {}
+
+        def send_next(kernel):
+            index = pending.popleft()
+            kernel.send("evaluate", encode_expression(exprs[index]))
+            busy[kernel.connection] = (kernel, index)
+
+        try:
+            for kernel in self.kernels:
+                if not pending:
+                    break
+                send_next(kernel)
+            while busy:
+                for connection in wait(list(busy)):
+                    kernel, index = busy.pop(connection)
+                    responses[index] = kernel.receive()
+                    if pending:
+                        send_next(kernel)
+        except BaseException:
+            # Subkernels that are still busy would send their results
+            # later, in reply to other expressions.
+            self.close(wait=False)
+            raise
+        return self._results(responses, evaluation)
+
+    def evaluate_everywhere(
+        self, expr: BaseElement, evaluation: Evaluation
+    ) -> List[BaseElement]:
+        """Evaluate `expr` on each subkernel, and return the results."""
+        self.ensure_kernels()
+        self.distribute_definitions(evaluation.definitions)
+        payload = encode_expression(expr)
+        try:
+            for kernel in self.kernels:
+                kernel.send("evaluate", payload)
+            responses = [kernel.receive() for kernel in self.kernels]
+        except BaseException:
+            self.close(wait=False)
+            raise
+        return self._results(responses, evaluation)
+
+    def _results(self, responses: list, evaluation: Evaluation) -> List[BaseElement]:
+        """
+        Show the messages and printed output of `responses`, and
+        return their results.
+        """
+        results = []
+        for status, value, out in responses:
+            for item in out:
+                if item.is_message and evaluation.quiet_all:
+                    continue
+                evaluation.out.append(item)
+                evaluation.output.out(item)
+            if status == "throw":
+                raise WLThrowInterrupt(*value)
+            if status == "error":
+                raise SubKernelError(value)
+            results.append(decode_expression(value))
+        return results
+
+
+kernel_pool = KernelPool()
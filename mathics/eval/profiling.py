@@ -0,0 +1,377 @@
+"""
+Profiling evaluation by Mathics3 functions and rules.
+
+Time is attributed to the stack of Mathics3 functions being evaluated:
+each ``Expression.evaluate()`` call is a frame, named by the head of
+the expression, so that user functions and builtins both appear in the
+stacks. For each function, the inclusive time, which includes the time
+spent in the functions it calls, and the exclusive time, which does
+not, are reported.
+
+There are two ways of collecting the data:
+
+* ``TracingProfiler`` wraps ``Expression.evaluate()`` and
+  ``BaseRule.apply()`` while it is active. Times are exact, and the
+  number of calls, and of pattern-match attempts and successes of each
+  rule, are counted, at the cost of slowing down evaluation.
+
+* ``SamplingProfiler`` leaves evaluation as it is, and instead looks
+  at the Python stack of the evaluating thread from a separate thread,
+  at regular intervals. Times are estimated from the number of samples
+  in which a function appears, and evaluation is not slowed down
+  beyond the time taken by the samples, so it can be left active.
+
+The stacks can be written in the "collapsed" format read by
+flamegraph tools, one line per stack, with the names of the frames
+separated by semicolons, followed by the time in microseconds.
+"""
+
+import sys
+import threading
+from collections import defaultdict
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from mathics.core.atoms import Integer, Real, String
+from mathics.core.element import BaseElement
+from mathics.core.expression import Expression
+from mathics.core.rules import BaseRule, FunctionApplyRule
+from mathics.core.symbols import strip_context
+from mathics.core.systemsymbols import SymbolAssociation, SymbolHoldPattern, SymbolRule
+
+# The profilers collecting data, the innermost last. A profiler started
+# while another is active, as by a nested EvaluationProfile, collects
+# data along with it.
+active_profilers: List["Profiler"] = []
+
+
+def frame_name(expression: BaseElement) -> str:
+    """The name of the frame for the evaluation of `expression`."""
+    return strip_context(expression.get_lookup_name())
+
+
+def association(items) -> Expression:
+    """Return the Association of the pairs of keys and values in `items`."""
+    return Expression(
+        SymbolAssociation,
+        *(Expression(SymbolRule, key, value) for key, value in items),
+    )
+
+
+class Profiler:
+    """
+    The statistics collected on the evaluation of functions and the
+    application of rules, and the methods to report them.
+    """
+
+    # The name of the statistic counting how often a function or a
+    # rule is seen, which is the number of calls or of samples.
+    count_name = "Calls"
+
+    def __init__(self):
+        # For each function name, [count, inclusive time, exclusive time]
+        self.functions: Dict[str, List] = defaultdict(lambda: [0, 0.0, 0.0])
+        # For each rule, by id, [rule, attempts, matches, time]
+        self.rules: Dict[int, List] = {}
+        # The exclusive time spent in each stack of function names.
+        self.stacks: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self.elapsed = 0.0
+
+    def start(self):
+        """Start collecting data."""
+        active_profilers.append(self)
+        self.start_time = perf_counter()
+
+    def stop(self):
+        """Stop collecting data."""
+        self.elapsed += perf_counter() - self.start_time
+        active_profilers.remove(self)
+
+    def flame_graph(self) -> str:
+        """
+        Return the stacks in the collapsed format of flamegraph tools,
+        with times in microseconds.
+        """
+        return "".join(
+            f"{';'.join(stack)} {round(time * 1e6)}\n"
+            for stack, time in sorted(self.stacks.items())
+            if round(time * 1e6) > 0
+        )
+
+    def rule_statistics(self) -> Dict[BaseElement, List]:
+        """
+        Return the statistics of the rules, by their left-hand side.
+        Rules with the same left-hand side are counted together.
+        """
+        statistics: Dict[BaseElement, List] = {}
+        for rule, *counts in self.rules.values():
+            lhs = Expression(SymbolHoldPattern, rule.pattern.expr)
+            total = statistics.setdefault(lhs, [0, 0, 0.0])
+            for index, count in enumerate(counts):
+                total[index] += count
+        return statistics
+
+    def rule_association(self, counts: List) -> Expression:
+        attempts, matches, time = counts
+        return association(
+            (
+                (String("Attempts"), Integer(attempts)),
+                (String("Matches"), Integer(matches)),
+                (String("Time"), Real(time)),
+            )
+        )
+
+    def to_association(self, result: BaseElement) -> Expression:
+        """
+        Return the statistics as an Association, along with `result`,
+        the result of the profiled evaluation.
+        """
+        functions = sorted(self.functions.items(), key=lambda item: -item[1][1])
+        rules = sorted(self.rule_statistics().items(), key=lambda item: -item[1][2])
+        return association(
+            (
+                (String("Result"), result),
+                (String("Time"), Real(self.elapsed)),
+                (
+                    String("Functions"),
+                    association(
+                        (
+                            String(name),
+                            association(
+                                (
+                                    (String(self.count_name), Integer(count)),
+                                    (String("InclusiveTime"), Real(inclusive)),
+                                    (String("ExclusiveTime"), Real(exclusive)),
+                                )
+                            ),
+                        )
+                        for name, (count, inclusive, exclusive) in functions
+                    ),
+                ),
+                (
+                    String("Rules"),
+                    association(
+                        (lhs, self.rule_association(counts)) for lhs, counts in rules
+                    ),
+                ),
+                (String("FlameGraph"), String(self.flame_graph())),
+            )
+        )
+
+    def summary(self, limit: int = 20) -> str:
+        """Return a table of the functions that took the most time."""
+        lines = [f"{'calls':>9} {'incl. ms':>10} {'excl. ms':>10}  function"]
+        functions = sorted(self.functions.items(), key=lambda item: -item[1][2])
+        for name, (count, inclusive, exclusive) in functions[:limit]:
+            lines.append(
+                f"{count:9d} {inclusive * 1000:10.1f} {exclusive * 1000:10.1f}  {name}"
+            )
+        return "\n".join(lines)
+
+
+class TracingProfiler(Profiler):
+    """
+    Profile evaluation by timing each call to ``Expression.evaluate()``
+    and ``BaseRule.apply()``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # The frames being evaluated, as [name, stack, start, child time]
+        self.frames: List[List] = []
+        # How many times each function and rule are in the frames, so
+        # that the time of recursive calls is counted once.
+        self.active_functions: Dict[str, int] = defaultdict(int)
+        self.active_rules: Dict[int, int] = defaultdict(int)
+
+    def start(self):
+        super().start()
+        # These are the methods of an outer TracingProfiler, if there is
+        # one, so that both profilers see the evaluation.
+        self.default_evaluate = Expression.evaluate
+        self.default_apply = BaseRule.apply
+        profiler = self
+
+        def profiled_evaluate(self, evaluation):
+            """``Expression.evaluate()`` while this profiler is active."""
+            return profiler.evaluate(self, evaluation)
+
+        def profiled_apply(self, expression, evaluation, *args, **kwargs):
+            """``BaseRule.apply()`` while this profiler is active."""
+            return profiler.apply(self, expression, evaluation, *args, **kwargs)
+
+        Expression.evaluate = profiled_evaluate  # type: ignore[method-assign]
+        BaseRule.apply = profiled_apply  # type: ignore[method-assign]
+
+    def stop(self):
+        Expression.evaluate = self.default_evaluate  # type: ignore[method-assign]
+        BaseRule.apply = self.default_apply  # type: ignore[method-assign]
+        super().stop()
+
+    def enter(self, name: str) -> List:
+        """Push a frame for the function `name`, and return it."""
+        frames = self.frames
+        stack = frames[-1][1] + (name,) if frames else (name,)
+        frame = [name, stack, perf_counter(), 0.0]
+        frames.append(frame)
+        self.active_functions[name] += 1
+        return frame
+
+    def leave(self, frame: List):
+        """Pop `frame`, adding the time spent in it."""
+        name, stack, start, child_time = frame
+        elapsed = perf_counter() - start
+        exclusive = elapsed - child_time
+        frames = self.frames
+        frames.pop()
+        if frames:
+            frames[-1][3] += elapsed
+        self.active_functions[name] -= 1
+        statistics = self.functions[name]
+        statistics[0] += 1
+        if not self.active_functions[name]:
+            statistics[1] += elapsed
+        statistics[2] += exclusive
+        self.stacks[stack] += exclusive
+
+    def evaluate(self, expression: Expression, evaluation):
+        frame = self.enter(frame_name(expression))
+        try:
+            return self.default_evaluate(expression, evaluation)
+        finally:
+            self.leave(frame)
+
+    def apply(self, rule: BaseRule, expression, evaluation, *args, **kwargs):
+        key = id(rule)
+        statistics = self.rules.get(key)
+        if statistics is None:
+            statistics = self.rules[key] = [rule, 0, 0, 0.0]
+        frame = None
+        name = builtin_name(rule)
+        if name is not None and not (self.frames and self.frames[-1][0] == name):
+            frame = self.enter(name)
+        self.active_rules[key] += 1
+        start = perf_counter()
+        result = None
+        try:
+            result = self.default_apply(rule, expression, evaluation, *args, **kwargs)
+            return result
+        finally:
+            self.active_rules[key] -= 1
+            statistics[1] += 1
+            # With return_list=True, the result is a list of the matches.
+            if result is not None and not (isinstance(result, list) and not result):
+                statistics[2] += 1
+            if not self.active_rules[key]:
+                statistics[3] += perf_counter() - start
+            if frame is not None:
+                self.leave(frame)
+
+
+def builtin_name(rule: BaseRule) -> Optional[str]:
+    """
+    The name of the frame for the application of `rule`, if it runs
+    the Python code of a builtin, or None.
+    """
+    if isinstance(rule, FunctionApplyRule):
+        return frame_name(rule.pattern.expr)
+    return None
+
+
+class SamplingProfiler(Profiler):
+    """
+    Profile the evaluation in a thread by sampling its Python stack at
+    regular intervals, from a separate thread.
+
+    The frames of ``Expression.evaluate()`` and ``BaseRule.apply()``
+    in the stack give the functions and the rules being evaluated.
+    Each sample is counted as the time elapsed since the previous one.
+    Pattern-match attempts can not be seen this way, and are reported
+    as 0. The sampling thread only runs when the evaluating thread lets
+    it, which CPython does every ``sys.getswitchinterval()`` seconds,
+    so samples are never closer than that.
+    """
+
+    count_name = "Samples"
+
+    def __init__(self, interval: float = 0.001, thread_id: Optional[int] = None):
+        super().__init__()
+        self.interval = interval
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.stopped = threading.Event()
+        self.sampler: Optional[threading.Thread] = None
+        # The number of frames of the evaluating thread when profiling
+        # started.
+        self.base = 0
+
+    def start(self):
+        super().start()
+        if self.thread_id == threading.get_ident():
+            self.base = len(evaluation_frames(sys._getframe()))
+        self.stopped.clear()
+        self.sampler = threading.Thread(target=self.run, daemon=True)
+        self.sampler.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.sampler is not None:
+            self.sampler.join()
+            self.sampler = None
+        super().stop()
+
+    def run(self):
+        last = perf_counter()
+        while not self.stopped.wait(self.interval):
+            now = perf_counter()
+            self.sample(now - last)
+            last = now
+
+    def sample(self, elapsed: float):
+        """Add the stack of the evaluating thread, taking `elapsed` seconds."""
+        frame = sys._current_frames().get(self.thread_id)
+        # Leave out the frames that were there when profiling started.
+        frames = evaluation_frames(frame)[self.base :]
+        stack = tuple(name for name, _ in frames if name is not None)
+        if not stack:
+            return
+        self.stacks[stack] += elapsed
+        for name in set(stack):
+            statistics = self.functions[name]
+            statistics[0] += 1
+            statistics[1] += elapsed
+        self.functions[stack[-1]][2] += elapsed
+        for key, rule in {id(rule): rule for _, rule in frames if rule}.items():
+            statistics = self.rules.get(key)
+            if statistics is None:
+                statistics = self.rules[key] = [rule, 0, 0, 0.0]
+            statistics[3] += elapsed
+
+
+def evaluation_frames(frame) -> List[Tuple[Optional[str], Optional[BaseRule]]]:
+    """
+    Return the frames of the evaluation in the Python stack ending in
+    `frame`, from the outermost, as pairs of the name of the function
+    evaluated, if the frame is one of the profile, and of the rule
+    applied, if any.
+
+    As with TracingProfiler, a builtin applied to an expression of the
+    same name is not a frame of its own.
+    """
+    frames: List[Tuple[Optional[str], Optional[BaseRule]]] = []
+    while frame is not None:
+        code_name = frame.f_code.co_name
+        if code_name == "evaluate" or code_name == "apply":
+            owner = frame.f_locals.get("self")
+            if isinstance(owner, Expression):
+                frames.append((frame_name(owner), None))
+            elif isinstance(owner, BaseRule):
+                frames.append((builtin_name(owner), owner))
+        frame = frame.f_back
+    frames.reverse()
+    last_name = None
+    for index, (name, rule) in enumerate(frames):
+        if rule is not None and name == last_name:
+            frames[index] = (None, rule)
+        elif name is not None:
+            last_name = name
+    return frames
@@ -16,22 +16,24 @@ def dynamic_scoping(func, vars, evaluation: Evaluation):
     """
     Changes temporarily the value of a set of symbols listed in vars,
     and evaluates func(evaluation)
+
+    The values are kept in bindings pushed on the definitions, which
+    are popped afterwards, so that the definitions of the symbols do not
+    have to be replaced unless they are looked at or changed.
     """
-    original_definitions = {}
-    for var_name, new_def in vars.items():
-        assert fully_qualified_symbol_name(var_name)
-        original_definitions[var_name] = evaluation.definitions.get_user_definition(
-            var_name
-        )
-        evaluation.definitions.reset_user_definition(var_name)
-        if new_def is not None:
-            new_def = new_def.evaluate(evaluation)
-            evaluation.definitions.set_ownvalue(var_name, new_def)
+    definitions = evaluation.definitions
+    bindings = []
     try:
+        for var_name, new_def in vars.items():
+            assert fully_qualified_symbol_name(var_name)
+            binding = definitions.push_binding(var_name)
+            bindings.append(binding)
+            if new_def is not None:
+                definitions.set_binding_value(binding, new_def.evaluate(evaluation))
         result = func(evaluation)
     finally:
-        for name, definition in original_definitions.items():
-            evaluation.definitions.add_user_definition(name, definition)
+        for binding in reversed(bindings):
+            definitions.pop_binding(binding)
     return result
 
 
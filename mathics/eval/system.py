@@ -0,0 +1,160 @@
+"""
+Evaluation functions for builtins in mathics.builtin.system.
+"""
+
+import gc
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pympler.asizeof import asizeof
+
+from mathics.core.convert.python import FromPythonOptions, from_python
+from mathics.core.definitions import Definition
+from mathics.core.element import BaseElement
+from mathics.core.evaluation import Evaluation
+from mathics.core.expression import Expression
+from mathics.core.rules import BaseRule, RewriteRule
+from mathics.core.symbols import strip_context
+
+# Python dictionaries are converted to associations.
+ASSOCIATION_OPTIONS = FromPythonOptions.from_dict({"use_associations": True})
+
+
+def eval_ClearSystemCache(
+    evaluation: Evaluation, numeric: bool = True, symbolic: bool = True
+) -> Dict[str, int]:
+    """
+    Clear the caches kept by Mathics3 and sympy of results that may
+    be used again, and collect the memory they used. Return the number
+    of entries removed from each cache.
+
+    The "numeric" caches are the numbers kept alive because they were
+    created recently and the caches of mpmath conversions. The
+    "symbolic" ones are the sympy cache, the cache of conversions from
+    sympy, the caches of symbol name lookups and the results of
+    cacheable builtins.
+    """
+    from mathics.core.atoms.intern import clear_recent_atoms, intern_tables_statistics
+
+    cleared: Dict[str, int] = {}
+    if numeric:
+        from mathics.core.convert.mpmath import from_mpmath
+        from mathics.eval.numbers.numbers import log_n_b
+
+        numbers = sum(intern_tables_statistics().values())
+        # Numbers are only released by the garbage collection below.
+        cleared["Numbers"] = 0
+        clear_recent_atoms()
+        cleared["MPMath"] = (
+            from_mpmath.cache_info().currsize + log_n_b.cache_info().currsize
+        )
+        from_mpmath.cache_clear()
+        log_n_b.cache_clear()
+
+    if symbolic:
+        from sympy.core.cache import (
+            CACHE as SYMPY_CACHE,
+            clear_cache as sympy_clear_cache,
+        )
+
+        from mathics.core.convert.op import (
+            ascii_op_to_unicode,
+            string_to_invertible_ascii,
+        )
+        from mathics.core.convert.sympy import from_sympy_cache
+
+        definitions = evaluation.definitions
+        cleared["SymPy"] = sum(
+            function.cache_info().currsize for function in SYMPY_CACHE
+        )
+        sympy_clear_cache()
+        cleared["SymPyConversions"] = len(from_sympy_cache)
+        from_sympy_cache.clear()
+        cleared["Operators"] = (
+            ascii_op_to_unicode.cache_info().currsize
+            + string_to_invertible_ascii.cache_info().currsize
+        )
+        ascii_op_to_unicode.cache_clear()
+        string_to_invertible_ascii.cache_clear()
+        cleared["Definitions"] = len(definitions.definitions_cache)
+        definitions.clear_cache()
+        cleared["Results"] = len(definitions.result_cache)
+        definitions.result_cache.clear()
+
+    gc.collect()
+    if numeric:
+        cleared["Numbers"] = max(numbers - sum(intern_tables_statistics().values()), 0)
+    return cleared
+
+
+def eval_SystemCacheStatistics(evaluation: Evaluation) -> BaseElement:
+    """
+    Return an association with the numbers of hits and misses of the
+    result cache of cacheable builtins, the number of results it keeps
+    and the most it can keep, and the hits and misses of each builtin.
+    """
+    cache = evaluation.definitions.result_cache
+    hits, misses, by_builtin = cache.statistics()
+    statistics = {
+        "Hits": hits,
+        "Misses": misses,
+        "Size": len(cache),
+        "MaxSize": cache.max_size,
+        "Builtins": {
+            strip_context(name): {"Hits": builtin_hits, "Misses": builtin_misses}
+            for name, (builtin_hits, builtin_misses) in sorted(by_builtin.items())
+        },
+    }
+    return from_python(statistics, ASSOCIATION_OPTIONS)
+
+
+def _rule_lists(definition: Definition) -> Iterator[List[BaseRule]]:
+    """Yield the lists of rules of `definition`"""
+    yield definition.ownvalues
+    yield definition.downvalues
+    yield definition.subvalues
+    yield definition.upvalues
+    yield definition.nvalues
+    yield definition.defaultvalues
+    yield definition.messages
+    yield from definition.formatvalues.values()
+
+
+def eval_Share(evaluation: Evaluation, names: Optional[Iterable[str]] = None) -> int:
+    """
+    Make the equal subexpressions in the right-hand sides of the user
+    definitions of the symbols in `names`, or of all the symbols, one
+    object, and return the number of bytes this saved.
+
+    Definitions include the values of In[n] and Out[n], so the
+    history is shared too. Subexpressions are shared by
+    mathics.core.hashcons.hash_cons(), so the same restrictions apply:
+    subexpressions holding atoms such as arbitrary-precision reals or
+    packed arrays are left as they are, and the shared nodes can not be
+    changed in place afterwards. The shared nodes can also be reached
+    from other sessions, so they are evaluated again the next time they
+    are used.
+    """
+    from mathics.core.hashcons import hash_cons
+
+    user = evaluation.definitions.user
+    if names is None:
+        definitions = list(user.values())
+    else:
+        definitions = [user[name] for name in names if name in user]
+
+    rules = [
+        rule
+        for definition in definitions
+        for rule_list in _rule_lists(definition)
+        for rule in rule_list
+        if isinstance(rule, RewriteRule) and isinstance(rule.replace, Expression)
+    ]
+    if not rules:
+        return 0
+
+    size_before = asizeof(*[rule.replace for rule in rules])
+    for rule in rules:
+        rule.replace = hash_cons(rule.replace)
+    size_after = asizeof(*[rule.replace for rule in rules])
+    gc.collect()
+    return size_before - size_after
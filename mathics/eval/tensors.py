@@ -68,6 +68,8 @@ def get_dimensions(expr, head=None):
     else:
         if head is not None and not expr.head.sameQ(head):
             return []
+        if isinstance(expr, ListExpression) and expr.packed is not None:
+            return list(expr.packed.shape)
         sub_dim = None
         sub = []
         for element in expr.elements:
@@ -171,6 +171,7 @@ class MathicsSession:
         catch_interrupt=False,
         form="InputForm",
         character_encoding: str | None = None,
+        builtin_filename: str | None = None,
     ):
         # FIXME: This import is needed because
         # the first time we call self.reset,
@@ -183,6 +184,7 @@ class MathicsSession:
             mathics.settings.SYSTEM_CHARACTER_ENCODING = character_encoding
         self.form = form
         self.last_result = None
+        self.builtin_filename = builtin_filename
         self.reset(add_builtin, catch_interrupt)
         self.shell = None
 
@@ -191,12 +193,16 @@ class MathicsSession:
         reset the definitions and the evaluation objects.
         """
         try:
-            self.definitions = Definitions(add_builtin)
+            self.definitions = Definitions(
+                add_builtin, builtin_filename=self.builtin_filename
+            )
         except KeyError:
             from mathics.core.load_builtin import import_and_load_builtins
 
             import_and_load_builtins()
-            self.definitions = Definitions(add_builtin)
+            self.definitions = Definitions(
+                add_builtin, builtin_filename=self.builtin_filename
+            )
 
         self.evaluation = Evaluation(
             definitions=self.definitions, catch_interrupt=catch_interrupt
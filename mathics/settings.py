@@ -9,7 +9,7 @@ import os
 import os.path as osp
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from mathics.core.util import canonic_filename
 
@@ -58,6 +58,48 @@ else:
     )
 USER_PACKAGE_DIR = osp.join(DATA_DIR, "Packages")
 
+# Snapshot of the builtin definitions, used to speed up startup.  If
+# this is None, builtin definitions are built from scratch each time.
+# See mathics.core.definitions.load_builtin_definitions.
+DEFAULT_BUILTIN_DEFINITIONS_CACHE = osp.join(DATA_DIR, "builtin_definitions.pcl")
+BUILTIN_DEFINITIONS_CACHE: Optional[str] = os.environ.get(
+    "MATHICS3_BUILTIN_DEFINITIONS_CACHE"
+)
+
+# If True, a builtin module is imported, and its Builtins added to the
+# definitions, the first time one of its symbols is looked up, instead
+# of at startup. Which module defines which symbol is read from the
+# manifest in LAZY_BUILTINS_MANIFEST, which is (re)built when missing
+# or out of date.  See mathics.core.load_builtin.import_and_load_builtins.
+LAZY_BUILTINS = os.environ.get("MATHICS3_LAZY_BUILTINS", "false").lower() == "true"
+LAZY_BUILTINS_MANIFEST = os.environ.get(
+    "MATHICS3_LAZY_BUILTINS_MANIFEST",
+    osp.join(DATA_DIR, "builtin_modules_manifest.json"),
+)
+
+# Number of compiled functions kept by the cache of Compile, Plot and
+# other functions that compile expressions with LLVM.  If
+# COMPILE_CACHE_DIR is set, the machine code of compiled functions is
+# also saved in that directory and reused by later sessions.  See
+# mathics.compile.cache.
+COMPILE_CACHE_SIZE = int(os.environ.get("MATHICS3_COMPILE_CACHE_SIZE", "256"))
+COMPILE_CACHE_DIR: Optional[str] = os.environ.get("MATHICS3_COMPILE_CACHE_DIR")
+
+# Number of results of builtins like Expand, Simplify or Integrate kept
+# so that they are not computed again for the same arguments. 0
+# disables the cache. See mathics.core.result_cache.
+RESULT_CACHE_SIZE = int(os.environ.get("MATHICS3_RESULT_CACHE_SIZE", "1024"))
+
+# If True, evaluated expressions with the same structure share a single
+# node, and SameQ compares these nodes by identity.
+# See mathics.core.hashcons.
+HASH_CONSING = os.environ.get("MATHICS3_HASH_CONSING", "false").lower() == "true"
+
+# Number of subkernels ParallelMap, ParallelTable and the other parallel
+# functions launch when none are running.  0 means one per CPU.  See
+# mathics.eval.parallel.
+PARALLEL_KERNELS = int(os.environ.get("MATHICS3_PARALLEL_KERNELS", "0"))
+
 # In contrast to ROOT_DIR, LOCAL_ROOT_DIR is used in building
 # LaTeX documentation. When Mathics3 is installed, we don't want LaTeX file documentation.tex
 # to get put in the installation directory, but instead we build documentation
@@ -121,13 +121,13 @@ def show_lru_cache_statistics():
     Print statistics from LRU caches (@lru_cache of functools)
     """
     from mathics.builtin.atomic.numbers import log_n_b
-    from mathics.core.atoms import Integer, Rational
+    from mathics.core.atoms.intern import intern_tables_statistics
     from mathics.core.builtin import MPMathFunction
     from mathics.core.convert.mpmath import from_mpmath
     from mathics.eval.arithmetic import run_mpmath
 
-    print(f"Integer             {len(Integer._integers)}")
-    print(f"Rational            {len(Rational._rationals)}")
+    for name, size in intern_tables_statistics().items():
+        print(f"{name:<19} {size}")
     print(f"run_mpmath         {run_mpmath.cache_info()}")
     print(f"log_n_b             {log_n_b.cache_info()}")
     print(f"from_mpmath         {from_mpmath.cache_info()}")
@@ -6,6 +6,7 @@ Tests here check the compatibility of
 the  default behavior of the different assignment operators
 with WMA.
 """
+
 # TODO: consider splitting this module into sub-modules.
 
 from test.helper import check_arg_counts, check_evaluation, session
@@ -435,6 +436,20 @@ def test_assign_list():
     check_evaluation("G[x_Real]=x^2; a={G[x]}; {x=1.; a, x=.; a}", "{{1.}, {G[x]}}")
 
 
+def test_assign_part_copies_value(monkeypatch):
+    """Setting a part of a hash-consed value does not change the values it is shared with."""
+    monkeypatch.setattr("mathics.settings.HASH_CONSING", True)
+    check_evaluation(
+        "ClearAll[x, y, a]; x = {{1, 2}, {3, 4}}; y = x; x[[1, 1]] = a; {x, y}",
+        "{{{a, 2}, {3, 4}}, {{1, 2}, {3, 4}}}",
+    )
+    check_evaluation(
+        "ClearAll[x, a]; x = {{1, 2}, {3, 4}}; x[[1, 1]] = a; a = 5; x",
+        "{{5, 2}, {3, 4}}",
+    )
+    check_evaluation("ClearAll[x, a]", "Null")
+
+
 def test_process_assign_other():
     # FIXME: beef up check_evaluation so it allows regexps in matching.
     # Then this code would be less fragile.
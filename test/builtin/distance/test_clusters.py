@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for mathics.builtins.distance.clusters
+"""
+
+from test.helper import check_evaluation
+
+import numpy
+import pytest
+
+from mathics.core.atoms import Integer, MachineReal, Rational
+from mathics.eval.distance.nearest import KDTreeIndex, numeric_points
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "str_expected", "fail_msg"),
+    [
+        ("Nearest[{1, 2, 3, 4}, 2.5, 2]", "{2, 3}", "ties are sorted by position"),
+        ("Nearest[{4, 3, 2, 1}, 2.5, 2]", "{3, 2}", "ties are sorted by position"),
+        ("Nearest[{1, 2, 3, 4}, 2.5, {All, 2.25}]", "{2, 3, 1, 4}", None),
+        (
+            "Nearest[{{0, 0}, {1, 0}, {0, 1}}, {0.9, 0.3}, 1, DistanceFunction -> ChessboardDistance]",
+            "{{1, 0}}",
+            None,
+        ),
+        ("Nearest[{{1, 2}, {3, 4}}, {{1, 2}, {3, 3}}]", "{{{1, 2}}, {{3, 4}}}", None),
+        ("Nearest[{1/3, 2/3}, 1/2]", "{1/3}", "exact distances are compared exactly"),
+        (
+            'Nearest[{1/3, 2/3}, 1/2] === Nearest[{1/3, 2/3}, 1/2, Method -> "Scan"]',
+            "True",
+            "exact points are not put in a k-d tree",
+        ),
+        ("Nearest[{1/3, 2/3}, 1/2, {All, 1/36}]", "{1/3, 2/3}", None),
+        ("Nearest[{1/3, 2/3}, 1/2, {All, 0.02}]", "{}", None),
+        ("Nearest[{}, 1]", "{}", None),
+        ("Nearest[{1, 2, 3}][2.2]", "{2}", None),
+        ("Nearest[{1, 2, 3}][2.2, 2]", "{2, 3}", None),
+        ("Nearest[{{0, 0}, {1, 1}} -> {a, b}][{0.9, 0.8}]", "{b}", None),
+        ("AtomQ[Nearest[{1, 2, 3}]]", "True", None),
+        ("Head[Nearest[{1, 2, 3}]]", "NearestFunction", None),
+    ],
+)
+def test_nearest(str_expr, str_expected, fail_msg):
+    check_evaluation(str_expr, str_expected, failure_message=fail_msg)
+
+
+@pytest.mark.parametrize(
+    "distance",
+    ["EuclideanDistance", "ManhattanDistance", "ChessboardDistance"],
+)
+def test_nearest_methods(distance):
+    """A k-d tree finds the same items as a scan of all the points."""
+    check_evaluation(
+        f"""
+        SeedRandom[42];
+        pts = RandomReal[4, {{60, 2}}];
+        Union @ Table[
+          With[{{q = RandomReal[4, 2], k = RandomInteger[{{1, 8}}]}},
+            Nearest[pts, q, k, DistanceFunction -> {distance}] ===
+            Nearest[pts, q, k, DistanceFunction -> {distance}, Method -> "Scan"] &&
+            Nearest[pts, q, {{All, 1}}, DistanceFunction -> {distance}] ===
+            Nearest[pts, q, {{All, 1}}, DistanceFunction -> {distance}, Method -> "Scan"]],
+          {{20}}]
+        """,
+        "{True}",
+    )
+    check_evaluation("Clear[pts]", "Null")
+
+
+def test_machine_points():
+    assert numeric_points([MachineReal(0.5), MachineReal(1.5)]).tolist() == [
+        [0.5],
+        [1.5],
+    ]
+    assert numeric_points([MachineReal(0.5), Rational(1, 3)]) is None
+    assert numeric_points([Integer(1), Integer(2)]) is None
+
+
+def test_kdtree_index():
+    points = numpy.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [2.0, 2.0]])
+    index = KDTreeIndex(points, 2, False)
+    assert index.nearest(numpy.array([0.0, 0.0]), 3, None) == [0, 1, 2]
+    assert index.nearest(numpy.array([0.5, 0.5]), 2, None) == [0, 1]
+    assert index.nearest(numpy.array([0.0, 0.0]), None, 1.0) == [0, 1, 2]
+    squared = KDTreeIndex(points, 2, True)
+    assert squared.nearest(numpy.array([0.0, 0.0]), None, 8.0) == [0, 1, 2, 3]
+    assert squared.nearest(numpy.array([0.0, 0.0]), None, 7.9) == [0, 1, 2]
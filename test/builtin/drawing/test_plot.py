@@ -5,11 +5,15 @@ Unit tests from mathics.builtin.drawing.plot
 
 from test.helper import check_evaluation, session
 
+import numpy
 import pytest
 
+import mathics.eval.drawing.plot as plot_module
+import mathics.eval.drawing.plot3d as plot3d_module
 from mathics.core.expression import Expression
 from mathics.core.symbols import Symbol
 from mathics.core.util import print_expression_tree
+from mathics.eval.drawing.plot import compile_vectorized_function
 
 
 def test__listplot():
@@ -252,6 +256,45 @@ def test_plot(str_expr, msgs, str_expected, fail_msg):
     )
 
 
+def test_vectorized_function():
+    """tests for mathics.eval.drawing.plot.compile_vectorized_function"""
+    f = compile_vectorized_function(
+        session.parse("Sqrt[x] + 1 / y"), ["Global`x", "Global`y"], session.evaluation
+    )
+    values = f(numpy.array([4.0, -1.0, 1.0]), numpy.array([1.0, 1.0, 0.0]))
+    assert values[0] == 3.0
+    assert numpy.isnan(values[1]) and numpy.isnan(values[2])
+
+    # constant functions give an array too
+    f = compile_vectorized_function(
+        session.parse("3"), ["Global`x"], session.evaluation
+    )
+    assert f(numpy.zeros(2)).tolist() == [3.0, 3.0]
+
+    # symbols other than the arguments can not be computed with NumPy
+    f = compile_vectorized_function(
+        session.parse("a x"), ["Global`x"], session.evaluation
+    )
+    assert f is None or f(numpy.zeros(2)) is None
+
+
+@pytest.mark.parametrize(
+    "str_expr",
+    [
+        "DensityPlot[Sqrt[x * y], {x, -1, 1}, {y, -1, 1}]",
+        "Plot3D[x ^ 2 y + 2, {x, -1, 1}, {y, -1, 1}, Mesh -> All]",
+        "Plot[1 / x, {x, -1, 1}, Mesh -> All]",
+        "Plot[Abs[x] + 1, {x, -1, 1}]",
+    ],
+)
+def test_vectorized_sampling(str_expr, monkeypatch):
+    """Sampling with NumPy gives the same points as evaluating each point."""
+    vectorized = str(session.evaluate(f"InputForm[{str_expr}]"))
+    for module in (plot_module, plot3d_module):
+        monkeypatch.setattr(module, "compile_vectorized_function", lambda *args: None)
+    assert str(session.evaluate(f"InputForm[{str_expr}]")) == vectorized
+
+
 #
 # NOTE: I think the following tests have been superseded by test_plot_detail.py which
 # does similar (actually, more stringent) tests much less laboriously. Keeping these
@@ -2,6 +2,7 @@
 """
 Unit tests from builtins/files_io/files.py
 """
+
 import os
 import os.path as osp
 import sys
@@ -57,6 +58,76 @@ def test_get_input():
     check_evaluation(f'Get["{script_path}"]', script_path, hold_expected=True)
 
 
+def test_dumpsave(tmp_path):
+    source = tmp_path / "DumpSaveTest.m"
+    source.write_text(
+        'BeginPackage["DumpSaveTest`"]\n'
+        'area::usage = "area of a shape";\n'
+        'square::usage = "a square shape";\n'
+        'Begin["`Private`"]\n'
+        "SetAttributes[join, Orderless];\n"
+        "area[square[a_]] := a ^ 2\n"
+        "join[x_Integer, y_] := {x, y}\n"
+        "End[]\n"
+        "EndPackage[]\n"
+    )
+    image = tmp_path / "DumpSaveTest.mx"
+    source_path = canonic_filename(str(source))
+    image_path = canonic_filename(str(image))
+
+    check_evaluation(f'Get["{source_path}"]', "Null")
+    check_evaluation(f'DumpSave["{image_path}", "DumpSaveTest`"]', '{"DumpSaveTest`"}')
+    check_evaluation(
+        'ClearAll["DumpSaveTest`*", "DumpSaveTest`Private`*"]; '
+        '$ContextPath = DeleteCases[$ContextPath, "DumpSaveTest`"]; '
+        '$Packages = DeleteCases[$Packages, "DumpSaveTest`"];',
+        "Null",
+    )
+
+    # A source file older than the image beside it is not read.
+    source.write_text('BeginPackage["DumpSaveTest`"]\nEndPackage[]\n')
+    os.utime(source, (0, 0))
+    check_evaluation(f'Get["{source_path}"]', "Null")
+    check_evaluation(
+        '{MemberQ[$ContextPath, "DumpSaveTest`"], MemberQ[$Packages, "DumpSaveTest`"]}',
+        "{True, True}",
+    )
+    check_evaluation(
+        "{area[square[3]], DumpSaveTest`Private`join[b, 1]}",
+        "{9, {1, b}}",
+    )
+
+    # Once the source is newer, it is read instead.
+    check_evaluation('ClearAll["DumpSaveTest`*", "DumpSaveTest`Private`*"]', "Null")
+    os.utime(source, (image.stat().st_mtime + 10,) * 2)
+    check_evaluation(f'Get["{source_path}"]; area[square[3]]', "area[square[3]]")
+
+    # An image can be read explicitly.
+    check_evaluation(f'Get["{image_path}"]; area[square[3]]', "9")
+    check_evaluation('ClearAll["DumpSaveTest`*", "DumpSaveTest`Private`*"]', "Null")
+
+    check_evaluation(
+        f'DumpSave["{image_path}", {{area, 1}}]',
+        "$Failed",
+        expected_messages=("1 is not a symbol or a valid context name.",),
+    )
+    check_evaluation(
+        f'h = Compile[{{x}}, x ^ 2]; DumpSave["{image_path}", {{h, area}}] // Length',
+        "2",
+        expected_messages=("The definitions of h can not be saved.",),
+    )
+    image.write_bytes(b"not an image")
+    check_evaluation(
+        f'Get["{image_path}"]',
+        "$Failed",
+        expected_messages=(
+            f"{image_path} is not a definitions image that can be read by this "
+            "version of Mathics3.",
+        ),
+    )
+    check_evaluation("Clear[h]", "Null")
+
+
 @pytest.mark.skipif(
     sys.platform in ("win32",), reason="$Path does not work on Windows?"
 )
@@ -2,10 +2,15 @@
 """
 Unit tests from builtins/files_io/files.py
 """
+
+import io
 from test.helper import check_evaluation, data_dir
 
 import pytest
 
+import mathics.eval.files_io.read as read_module
+from mathics.eval.files_io.read import StreamReader, read_numbers
+
 
 @pytest.mark.parametrize(
     ("str_expr", "msgs", "str_expected", "fail_msg"),
@@ -76,3 +81,71 @@ def test_read(str_expr, msgs, str_expected, fail_msg):
         failure_message=fail_msg,
         expected_messages=msgs,
     )
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "str_expected"),
+    [
+        ('ReadList[StringToStream["1 2 3"], Number]', "{1, 2, 3}"),
+        ('ReadList[StringToStream["1 2.5\n3"], Number]', "{1, 2.5, 3}"),
+        ('ReadList[StringToStream["1 2 3 4 5"], {Number, Number}]', "{{1, 2}, {3, 4}}"),
+        ('ReadList[StringToStream["1.5 2*^3 -4e2"], Real]', "{1.5, 2000., -400.}"),
+        (
+            'ReadList[StringToStream["99999999999999999999 1"], Number]',
+            "{99999999999999999999, 1}",
+        ),
+        (
+            'ReadList[StringToStream["123abc 4"], {Number, Word, Number}]',
+            "{{123, bc, 4}}",
+        ),
+        (
+            'ReadList[StringToStream["abcXYdefXYg"], Record, RecordSeparators -> {"XY"}]',
+            "{abc, def, g}",
+        ),
+        (
+            'ReadList[StringToStream["a(b) c"], Word, TokenWords -> {"(", ")"}]',
+            "{a, (, b, ), c}",
+        ),
+        (
+            'stream = StringToStream["Mathics3 is cool\nline two"]; '
+            "{Read[stream, Word], StreamPosition[stream], Read[stream, String], "
+            "Read[stream, Word], SetStreamPosition[stream, 3], Read[stream, Word], "
+            "Read[stream, Character], StreamPosition[stream], Read[stream, Record]}",
+            "{Mathics3, 8,  is cool, line, 3, hics3,  , 9, is cool}",
+        ),
+    ],
+)
+def test_read_list_types(str_expr, str_expected):
+    check_evaluation(str_expr, str_expected, hold_expected=True)
+
+
+def test_stream_reader_chunks(monkeypatch):
+    """Words, lines and positions do not depend on the size of the chunks read."""
+    monkeypatch.setattr(read_module, "CHUNK_SIZE", 2)
+    text = "alpha beta\r\ngamma\ndelta  epsilon"
+    stream = io.StringIO(text)
+    reader = StreamReader(stream)
+    separators = [" ", "\r\n", "\n"]
+    assert reader.read_word(separators, []) == "alpha"
+    assert reader.read_word(separators, ["t"]) == ["be", "t"]
+    assert reader.read_line() == "a\r"
+    assert reader.read_character() == "g"
+    reader.sync()
+    assert stream.tell() == text.index("gamma") + 1
+    assert reader.read_word(separators, []) == "amma"
+    assert reader.read_rest() == "\ndelta  epsilon"
+    assert reader.read_word(separators, []) == "delta"
+    assert reader.read_word(separators, []) == "epsilon"
+    with pytest.raises(EOFError):
+        reader.read_word(separators, [])
+
+
+def test_read_numbers():
+    assert read_numbers("1 2\n3", [" ", "\n"], False).dtype.kind == "i"
+    assert read_numbers("1.5 -.5", [" "], False).dtype.kind == "f"
+    assert read_numbers("1 1.5", [" "], False) == [1, 1.5]
+    assert read_numbers("1*^3 1e2", [" "], True).tolist() == [1000.0, 100.0]
+    # Words not read whole as numbers are left for Read[].
+    assert read_numbers("1 x", [" "], False) is None
+    assert read_numbers("1-2", [" "], False) is None
+    assert read_numbers("1e5", [" "], False) is None
@@ -138,13 +138,13 @@ if not (os.environ.get("CI", False) or sys.platform in ("win32",)):
         (
             'Import["ExampleData/numberdata.csv", "Data"]',
             None,
-            "{{0.88, 0.60, 0.94}, {0.76, 0.19, 0.51}, {0.97, 0.04, 0.26}, {0.33, 0.74, 0.79}, {0.42, 0.64, 0.56}}",
+            "{{0.88, 0.6, 0.94}, {0.76, 0.19, 0.51}, {0.97, 0.04, 0.26}, {0.33, 0.74, 0.79}, {0.42, 0.64, 0.56}}",
             None,
         ),
         (
             'Import["ExampleData/numberdata.csv"]',
             None,
-            "{{0.88, 0.60, 0.94}, {0.76, 0.19, 0.51}, {0.97, 0.04, 0.26}, {0.33, 0.74, 0.79}, {0.42, 0.64, 0.56}}",
+            "{{0.88, 0.6, 0.94}, {0.76, 0.19, 0.51}, {0.97, 0.04, 0.26}, {0.33, 0.74, 0.79}, {0.42, 0.64, 0.56}}",
             None,
         ),
         (
@@ -223,7 +223,7 @@ if not (os.environ.get("CI", False) or sys.platform in ("win32",)):
         (
             'ImportString[datastring, {"CSV", "Data"}]',
             None,
-            "{{0.88,  0.60,  0.94}, {.076,  0.19,  .51}, {0.97,  0.04,  .26}}",
+            "{{0.88, 0.6, 0.94}, {0.076, 0.19, 0.51}, {0.97, 0.04, 0.26}}",
             None,
         ),
         (
@@ -232,13 +232,10 @@ if not (os.environ.get("CI", False) or sys.platform in ("win32",)):
             "0.88, 0.60, 0.94\n.076, 0.19, .51\n0.97, 0.04, .26",
             None,
         ),
-        # FIXME: the below out is incorrect and does not match WMA,
-        # due to a lame homegrown implementation of
-        # CSV. The data below will change when we use Python's CSV library.
         (
             'ImportString[datastring, "CSV","FieldSeparators" -> "."]',
             None,
-            "{{0, 88, 0, 60, 0, 94}, {076, 0, 19, , 51}, {0, 97, 0, 04, , 26}}",
+            "{{0, 88, 0, 60, 0, 94}, {, 076, 0, 19, , 51}, {0, 97, 0, 04, , 26}}",
             None,
         ),
     ],
@@ -256,6 +253,106 @@ def test_Import(str_expr, msgs, str_expected, fail_msg):
     )
 
 
+@pytest.mark.parametrize(
+    ("str_expr", "msgs", "str_expected", "fail_msg"),
+    [
+        (
+            'Import["ExampleData/numberdata.csv", {"Data", 2 ;; 3}]',
+            None,
+            "{{0.76, 0.19, 0.51}, {0.97, 0.04, 0.26}}",
+            None,
+        ),
+        ('Import["ExampleData/numberdata.csv", {"Data", 2, 3}]', None, "0.51", None),
+        (
+            'Import["ExampleData/numberdata.csv", {"Data", -1}]',
+            None,
+            "{0.42, 0.64, 0.56}",
+            "parts from the end are taken after reading the whole file",
+        ),
+        (
+            'Import["ExampleData/numberdata.csv", {"CSV", "Data", {1, 3}, 1}]',
+            None,
+            "{0.88, 0.97}",
+            None,
+        ),
+        (
+            'Import["ExampleData/numberdata.csv", {"Data", 1, "x"}]',
+            ("The Import element x is not present when importing as CSV.",),
+            "$Failed",
+            None,
+        ),
+        (
+            'Developer`PackedArrayQ[Import["ExampleData/numberdata.csv"]]',
+            None,
+            "True",
+            None,
+        ),
+        (
+            'ImportString["x,y\\n1,2", "CSV", "HeaderLines" -> 1]',
+            None,
+            "{{1, 2}}",
+            None,
+        ),
+        (
+            'ImportString["x,y\\n1,2\\n3,4", "CSV", "HeaderLines" -> {1, 1}]',
+            None,
+            "{{2}, {4}}",
+            None,
+        ),
+        (
+            'ImportString["#\\n1,2\\n#\\n3,4", "CSV", "SkippedLines" -> {1, 3}]',
+            None,
+            "{{1, 2}, {3, 4}}",
+            None,
+        ),
+        (
+            'ImportString["1,2", "CSV", "HeaderLines" -> -1]',
+            (
+                "Value of option HeaderLines -> -1 should be a non-negative "
+                "integer or a pair of non-negative integers.",
+            ),
+            "$Failed",
+            None,
+        ),
+        (
+            'ImportString["1.5,2,\\"a,b\\",\\n\\n-3e2", "CSV"] // InputForm',
+            None,
+            '{{1.5, 2, "a,b", ""}, {}, {-300.}}',
+            "numbers are found field by field when the data is not packed",
+        ),
+        (
+            'ImportString["1,2", "CSV", "Numeric" -> False] // InputForm',
+            None,
+            '{{"1", "2"}}',
+            None,
+        ),
+        (
+            'ImportString["1e400,1.5", "CSV"] // InputForm',
+            None,
+            "{{1.`15.*^400, 1.5}}",
+            "reals too large for machine reals are not packed",
+        ),
+        (
+            'ImportString["1e400,a", "CSV"] // InputForm',
+            None,
+            '{{1.`15.*^400, "a"}}',
+            None,
+        ),
+        ('ImportString["a\\tb\\n1\\t2.5", "TSV"]', None, "{{a, b}, {1, 2.5}}", None),
+    ],
+)
+def test_import_table(str_expr, msgs, str_expected, fail_msg):
+    check_evaluation(
+        str_expr,
+        str_expected,
+        to_string_expr=True,
+        to_string_expected=True,
+        hold_expected=True,
+        failure_message=fail_msg,
+        expected_messages=msgs,
+    )
+
+
 @pytest.mark.parametrize(
     ("str_expr", "msgs", "str_expected", "fail_msg"),
     [
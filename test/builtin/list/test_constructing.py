@@ -68,6 +68,21 @@ def test_range(str_expr, str_expected, failure_message):
             "Table[i, {i, 1, 9, 0}]",
             "Table::iterb: Iterator does not have appropriate bounds.",
         ),
+        # Iterators with machine numbers are stepped in Python.
+        ("Table[i, {i, 10, 1, -3}]", "{10, 7, 4, 1}", None),
+        ("Table[i, {i, 3, 1}]", "{}", None),
+        ("Table[i, {i, 1., 3}]", "{1., 2., 3.}", None),
+        ("Table[i, {i, 2, 1, -0.25}]", "{2, 1.75, 1.5, 1.25, 1.}", None),
+        (
+            "Table[i, {i, 0, 0.3, 0.1}] // Length",
+            "4",
+            "The last value is kept when it is within the tolerance of LessEqual.",
+        ),
+        ("Table[i, {i, 10^20, 10^20 + 2}] - 10^20", "{0, 1, 2}", None),
+        ("Table[i, {i, 1, 2, 1/3}]", "{1, 4 / 3, 5 / 3, 2}", None),
+        ("Table[i, {i, a, a + 2}]", "{a, 1 + a, 2 + a}", None),
+        ("Sum[i^2, {i, 1, 10, 2}]", "165", None),
+        ("Product[i, {i, 1, 10, 3}]", "280", None),
     ],
 )
 def test_table(str_expr, str_expected, failure_message):
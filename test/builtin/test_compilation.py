@@ -62,6 +62,37 @@ from mathics.compile import has_llvmlite
             "0.5",
             None,
         ),
+        (
+            "cf = Compile[{{x, _Real, 1}}, Table[x[[i]] ^ 2, {i, Length[x]}]]; cf[{1, 2.5}]",
+            None,
+            "{1., 6.25}",
+            None,
+        ),
+        (
+            'cf[{"a"}]',
+            (
+                "Argument {a} at position 1 should be a rank 1 tensor of machine-size real numbers.",
+            ),
+            "CompiledFunction[{x}, Table[x[[i]] ^ 2, {i, Length[x]}], -CompiledCode-][{a}]",
+            None,
+        ),
+        (
+            "cf = Compile[{{x, _Real, 1}, {i, _Integer}}, x[[i]]]; cf[{1., 2.}, 3]",
+            (
+                "Could not complete external evaluation; proceeding with uncompiled evaluation.",
+                "Part 3 of {1., 2.} does not exist.",
+            ),
+            "{1., 2.}[[3]]",
+            None,
+        ),
+        (
+            "cf = Compile[{{n, _Integer}}, Module[{a = 1}, Do[a *= 2, {n}]; a]]; cf[70]",
+            (
+                "Could not complete external evaluation; proceeding with uncompiled evaluation.",
+            ),
+            "1180591620717411303424",
+            "Integer overflow falls back to uncompiled evaluation",
+        ),
         ("ClearAll[cf];", None, None, None),
     ],
 )
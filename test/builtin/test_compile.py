@@ -3,10 +3,12 @@ import itertools
 import math
 import random
 import sys
+import tempfile
 import unittest
 from test.helper import session
 
 import mpmath
+import numpy
 import pytest
 
 from mathics.builtin.compilation import CompiledCode
@@ -35,11 +37,17 @@ if has_llvmlite:
     from mathics.compile import (
         CompileArg,
         CompileError,
+        IRGenerator,
         _compile,
         bool_type,
         int_type,
         real_type,
     )
+    from mathics.compile.base import CompiledRuntimeError
+    from mathics.compile.cache import CompiledFunctionCache, CompiledModule
+    from mathics.compile.compile import compile_ir, create_execution_engine
+    from mathics.compile.runtime import CompiledTensorFunction
+    from mathics.compile.types import TensorType
 
 
 @pytest.mark.skipif(
@@ -89,6 +97,11 @@ class CompileTest(unittest.TestCase):
         if not has_llvmlite:
             self.skipTest("No llvmlite detected. Skipping all compile tests")
 
+    @staticmethod
+    def _compile_str(str_expr, args):
+        expr = session.evaluate(f"Hold[{str_expr}]").elements[0]
+        return _compile(expr, [CompileArg("Global`" + name, typ) for name, typ in args])
+
     def assertTypeEqual(self, a, b):
         self.assertEqual(type(a), type(b))
         self.assertEqual(a, b)
@@ -186,6 +199,24 @@ class ArithmeticTest(CompileTest):
     def test_times(self):
         self._test_binary_math("Times", lambda x, y: x * y)
 
+    def test_integer_overflow(self):
+        cfunc = self._compile_str("x + 1", [("x", int_type)])
+        self.assertTypeEqual(cfunc(2**62), 2**62 + 1)
+        with self.assertRaises(CompiledRuntimeError):
+            cfunc(2**63 - 1)
+        cfunc = self._compile_str("x - 1", [("x", int_type)])
+        with self.assertRaises(CompiledRuntimeError):
+            cfunc(-(2**63))
+        cfunc = self._compile_str("Abs[x]", [("x", int_type)])
+        with self.assertRaises(CompiledRuntimeError):
+            cfunc(-(2**63))
+        cfunc = self._compile_str(
+            "Module[{a = 1}, Do[a *= 2, {n}]; a]", [("n", int_type)]
+        )
+        self.assertTypeEqual(cfunc(62), 2**62)
+        with self.assertRaises(CompiledRuntimeError):
+            cfunc(63)
+
     def test_sin(self):
         self._test_unary_math("Sin", mpmath.sin)
 
@@ -567,3 +598,177 @@ class BitwiseTest(CompileTest):
     def test_bitnot(self):
         self._test_bitwise("BitNot", [0], -1)
         self._test_bitwise("BitNot", [13413], -13414)
+
+
+class LoopTest(CompileTest):
+    def test_do(self):
+        cfunc = self._compile_str(
+            "Module[{s = 0}, Do[s += i, {i, n}]; s]", [("n", int_type)]
+        )
+        self.assertTypeEqual(cfunc(10), 55)
+        self.assertTypeEqual(cfunc(0), 0)
+        cfunc = self._compile_str(
+            "Module[{s = 0}, Do[s += i j, {i, n}, {j, i, n, 2}]; s]", [("n", int_type)]
+        )
+        self.assertTypeEqual(
+            cfunc(5),
+            sum(i * j for i in range(1, 6) for j in range(i, 6, 2)),
+        )
+
+    def test_local_types(self):
+        # s starts as an integer and becomes a real
+        cfunc = self._compile_str(
+            "Module[{s = 0}, Do[s += x, {3}]; s]", [("x", real_type)]
+        )
+        self.assertTypeEqual(cfunc(0.5), 1.5)
+
+    def test_while(self):
+        cfunc = self._compile_str(
+            "Module[{k = 0, y = x}, While[y > 1, y = y / 2; k++]; k]",
+            [("x", real_type)],
+        )
+        self.assertTypeEqual(cfunc(1000.0), 10)
+
+    def test_for_break_continue(self):
+        cfunc = self._compile_str(
+            "Block[{i, s = 0}, For[i = 1, i <= n, i++, If[i > 5, Break[]]; If[i == 2, Continue[]]; s += i]; s]",
+            [("n", int_type)],
+        )
+        self.assertTypeEqual(cfunc(3), 4)
+        self.assertTypeEqual(cfunc(100), 13)
+
+    def test_return_from_loop(self):
+        cfunc = self._compile_str(
+            "Do[If[i^2 > x, Return[i]], {i, 100}]; -1", [("x", int_type)]
+        )
+        self.assertTypeEqual(cfunc(50), 8)
+        self.assertTypeEqual(cfunc(10**6), -1)
+
+    def test_sum(self):
+        cfunc = self._compile_str("Sum[i^2, {i, 0, 1, x}]", [("x", real_type)])
+        self.assertTypeEqual(cfunc(0.5), 1.25)
+        cfunc = self._compile_str("Sum[i, {i, n, 1, -1}]", [("n", int_type)])
+        self.assertTypeEqual(cfunc(4), 10)
+        self.assertTypeEqual(cfunc(-4), 0)
+
+
+class TensorTest(CompileTest):
+    def test_part(self):
+        vector = TensorType(real_type, 1)
+        matrix = TensorType(int_type, 2)
+        cfunc = self._compile_str("x[[i]]", [("x", vector), ("i", int_type)])
+        self.assertTypeEqual(cfunc([1.5, 2.5], 2), 2.5)
+        self.assertTypeEqual(cfunc([1.5, 2.5], -2), 1.5)
+        with self.assertRaises(CompiledRuntimeError):
+            cfunc([1.5, 2.5], 3)
+
+        cfunc = self._compile_str(
+            "m[[i, j]]", [("m", matrix), ("i", int_type), ("j", int_type)]
+        )
+        self.assertTypeEqual(cfunc([[1, 2], [3, 4]], 2, 1), 3)
+        cfunc = self._compile_str("m[[i]]", [("m", matrix), ("i", int_type)])
+        self.assertEqual(cfunc([[1, 2], [3, 4]], 2).tolist(), [3, 4])
+
+    def test_sum_and_length(self):
+        cfunc = self._compile_str(
+            "Sum[x[[i]] * i, {i, Length[x]}]", [("x", TensorType(int_type, 1))]
+        )
+        self.assertTypeEqual(cfunc([1, 2, 3]), 14)
+        cfunc = self._compile_str("Sum[v, {v, x}]", [("x", TensorType(real_type, 1))])
+        self.assertTypeEqual(cfunc(numpy.arange(4.0)), 6.0)
+
+    def test_table(self):
+        cfunc = self._compile_str("Table[i j, {i, n}, {j, 3}]", [("n", int_type)])
+        result = cfunc(2)
+        self.assertEqual(result.dtype, numpy.int64)
+        self.assertEqual(result.tolist(), [[1, 2, 3], [2, 4, 6]])
+        self.assertEqual(cfunc(0).shape, (0, 0))
+
+        cfunc = self._compile_str("Table[{i, i / 2}, {i, n}]", [("n", int_type)])
+        self.assertEqual(cfunc(2).tolist(), [[1.0, 0.5], [2.0, 1.0]])
+
+        # ragged tables are not tensors
+        cfunc = self._compile_str("Table[j, {i, n}, {j, i}]", [("n", int_type)])
+        with self.assertRaises(CompiledRuntimeError):
+            cfunc(3)
+
+    def test_allocation_failure(self):
+        cfunc = self._compile_str("Table[i, {i, n}]", [("n", int_type)])
+        with self.assertRaises(CompiledRuntimeError):
+            cfunc(2**40)
+        # the size of the table overflows
+        cfunc = self._compile_str("Table[i, {i, n}, {j, n}]", [("n", int_type)])
+        with self.assertRaises(CompiledRuntimeError):
+            cfunc(2**32)
+        self.assertEqual(cfunc(2).tolist(), [[1, 1], [2, 2]])
+
+    def test_set_part(self):
+        vector = TensorType(int_type, 1)
+        cfunc = self._compile_str(
+            "Module[{y = x}, y[[1]] = 10; y[[2]] += 1; {y[[1]], y[[2]], x[[1]]}]",
+            [("x", vector)],
+        )
+        x = numpy.array([1, 2])
+        self.assertEqual(cfunc(x).tolist(), [10, 3, 1])
+        # the argument is not changed
+        self.assertEqual(x.tolist(), [1, 2])
+
+
+class CacheTest(CompileTest):
+    def test_same_structure(self):
+        args = [("x", real_type)]
+        cfunc1 = self._compile_str("Sin[x] + x^2", args)
+        cfunc2 = self._compile_str("Sin[x] + x^2", args)
+        self.assertIs(cfunc1.compiled_module, cfunc2.compiled_module)
+        self.assertTypeEqual(cfunc2(0.0), 0.0)
+
+        cfunc3 = self._compile_str("Sin[x] + x^3", args)
+        self.assertIsNot(cfunc1.compiled_module, cfunc3.compiled_module)
+        cfunc4 = self._compile_str("Sin[x] + x^2", [("x", int_type)])
+        self.assertIsNot(cfunc1.compiled_module, cfunc4.compiled_module)
+        cfunc5 = self._compile_str("Sin[x] + x^2.", args)
+        self.assertIsNot(cfunc1.compiled_module, cfunc5.compiled_module)
+
+    @staticmethod
+    def _compile_into(cache, key, str_expr):
+        """Compile the function of x `str_expr` with the engine of `cache`."""
+        expr = session.evaluate(f"Hold[{str_expr}]").elements[0]
+        func_name = "mathics_" + key
+        ir_gen = IRGenerator(expr, [CompileArg("Global`x", int_type)], func_name)
+        llvm_ir, ret_type = ir_gen.generate_ir()
+        module = compile_ir(cache.engine, llvm_ir, func_name)
+        compiled = CompiledModule(cache.engine, module, func_name, ret_type, False)
+        cache.add(key, compiled)
+        return compiled
+
+    def test_eviction(self):
+        engine, _ = create_execution_engine()
+        cache = CompiledFunctionCache(engine, 2)
+        compiled = self._compile_into(cache, "a", "x + 1")
+        self._compile_into(cache, "b", "x + 2")
+        self.assertIs(cache.get("a"), compiled)
+        self._compile_into(cache, "c", "x + 3")
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        # functions still in use can be found after they are dropped
+        self._compile_into(cache, "d", "x + 4")
+        self.assertIs(cache.get("a"), compiled)
+        del compiled
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            engine, _ = create_execution_engine()
+            cache = CompiledFunctionCache(engine, 2, directory)
+            self._compile_into(cache, "a", "Table[i x, {i, 3}]")
+
+            # another engine loads the machine code instead of compiling
+            engine, _ = create_execution_engine()
+            cache = CompiledFunctionCache(engine, 2, directory)
+            compiled = cache.get("a")
+            self.assertEqual(compiled.ret_type, TensorType(int_type, 1))
+            args = [CompileArg("Global`x", int_type)]
+            cfunc = CompiledTensorFunction(compiled.func_ptr, args, compiled.ret_type)
+            self.assertEqual(cfunc(2).tolist(), [2, 4, 6])
+            self.assertIsNone(cache.get("b"))
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests from mathics.builtin.parallel.
+"""
+
+from test.helper import check_evaluation, session
+
+import pytest
+
+from mathics.eval.parallel import kernel_pool, split_evenly
+
+
+@pytest.fixture(scope="module", autouse=True)
+def kernels():
+    session.reset()
+    session.evaluate("CloseKernels[]; LaunchKernels[2];")
+    yield
+    session.evaluate("CloseKernels[]")
+
+
+def test_split_evenly():
+    assert split_evenly(list(range(7)), 3) == [[0, 1, 2], [3, 4], [5, 6]]
+    assert split_evenly(list(range(2)), 4) == [[0], [1]]
+    assert split_evenly([], 4) == [[]]
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "msgs", "str_expected", "fail_msg"),
+    [
+        ("ParallelMap[f, {}]", None, "{}", None),
+        ("ParallelMap[f, x]", None, "x", None),
+        ("ParallelMap[f, <|a -> 1|>] === <|a -> f[1]|>", None, "True", None),
+        ("ParallelTable[i, {i, 10, 1, -3}]", None, "{10, 7, 4, 1}", None),
+        ("ParallelTable[i, {0}]", None, "{}", None),
+        (
+            "ParallelTable[i, {i, x}]",
+            ("Iterator does not have appropriate bounds.",),
+            "ParallelTable[i, {i, x}]",
+            "invalid iterators are not sent to Table",
+        ),
+        (
+            "ParallelDo[i, {x}]",
+            ("Iterator does not have appropriate bounds.",),
+            "ParallelDo[i, {x}]",
+            None,
+        ),
+        ("ParallelSum[i, {i, x}]", None, "x (1 + x) / 2", None),
+        ("ParallelTable[x, {2.5}]", None, "{x, x, x}", None),
+        ("ParallelTable[x, {-1}]", None, "{}", None),
+        ("it = {i, 3}; ParallelTable[i, it]", None, "{1, 2, 3}", None),
+        (
+            "ParallelMap[1/# &, {0, 1}]",
+            ("Infinite expression 1 / 0 encountered.",),
+            "{ComplexInfinity, 1}",
+            None,
+        ),
+        (
+            "Catch[ParallelMap[If[# > 2, Throw[#], #] &, Range[5]]]",
+            None,
+            "3",
+            "Throw goes back to the master kernel",
+        ),
+        ("ParallelTable[Abort[], {2}]", None, "$Aborted", None),
+        (
+            "Developer`PackedArrayQ[ParallelEvaluate[RandomReal[1, {300, 2}]][[2]]]",
+            None,
+            "True",
+            "packed lists are sent as arrays",
+        ),
+        (
+            "AtomQ /@ ParallelEvaluate[Dispatch[{a -> b}]]",
+            None,
+            "{True, True}",
+            "expressions that can not be serialized are pickled",
+        ),
+    ],
+)
+def test_parallel(str_expr, msgs, str_expected, fail_msg):
+    check_evaluation(
+        str_expr,
+        str_expected,
+        to_string_expr=True,
+        to_string_expected=True,
+        hold_expected=True,
+        failure_message=fail_msg,
+        expected_messages=msgs,
+    )
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "str_expected", "fail_msg"),
+    [
+        ("h[x_] := x + 1; ParallelMap[h, {1, 2}]", "{2, 3}", None),
+        ("h[x_] := x + 2; ParallelMap[h, {1, 2}]", "{3, 4}", "changes are sent"),
+        ("Clear[h]; ParallelMap[h, {1, 2}]", "{h[1], h[2]}", "cleared"),
+        ("h[x_] := x; Remove[h]; ParallelMap[h, {1, 2}]", "{h[1], h[2]}", "removed"),
+        ("ParallelEvaluate[DownValues[Out]]", "{{}, {}}", "history is not sent"),
+        ("Module[{a = 3}, ParallelTable[a i, {i, 3}]]", "{3, 6, 9}", None),
+    ],
+)
+def test_definitions(str_expr, str_expected, fail_msg):
+    check_evaluation(
+        str_expr,
+        str_expected,
+        to_string_expr=True,
+        to_string_expected=True,
+        hold_expected=True,
+        failure_message=fail_msg,
+    )
+
+
+def test_new_session():
+    session.evaluate("ParallelEvaluate[z = 1]; z = 2")
+    check_evaluation("ParallelEvaluate[z]", "{2, 2}")
+    session.reset()
+    check_evaluation("ParallelEvaluate[z]", "{z, z}")
+    assert len(kernel_pool.kernels) == 2
@@ -2,6 +2,7 @@
 """
 Unit tests from mathics.builtin.scoping.
 """
+
 from test.helper import check_evaluation, session
 
 import pytest
@@ -64,6 +65,23 @@ def test_scoping(str_expr, msgs, str_expected, fail_msg):
     ("str_expr", "msgs", "str_expected", "fail_msg"),
     [
         ("Block[{i = 0}, With[{}, Module[{j = i}, Set[i, i+1]; j]]]", None, "0", None),
+        (
+            "x = 7; Block[{x}, {x, ValueQ[x], OwnValues[x]}]",
+            None,
+            "{7, False, {}}",
+            None,
+        ),
+        ("Block[{x = 1}, x = x + 1; x]", None, "2", None),
+        ("OwnValues[x] === {HoldPattern[x] :> 7}", None, "True", None),
+        ("Block[{x = 2}, Block[{x = 3}, x = 10; x] + x]", None, "12", None),
+        ("Block[{x = 2}, Block[{x}, x = 10]; x]", None, "2", None),
+        ("Block[{a = b, b = 2}, a]", None, "2", None),
+        ("Block[{x = x + 1}, x]", None, "8", None),
+        ("Table[i = i + 1; i, {i, 3}]", None, "{2, 3, 4}", None),
+        ("Table[Block[{i = i^2}, i], {i, 4}]", None, "{1, 4, 9, 16}", None),
+        ("f[] := y; Block[{y = 5}, f[]]", None, "5", None),
+        ("Block[{$RecursionLimit = 30}, $RecursionLimit]", None, "30", None),
+        ("ClearAll[x, f]; {i, x, y}", None, "{i, x, y}", None),
     ],
 )
 def test_scoping_constructs(str_expr, msgs, str_expected, fail_msg):
@@ -3,12 +3,12 @@
 Unit tests from mathics.builtin.system.
 """
 
-
-from test.helper import check_evaluation
+from test.helper import check_evaluation, session
 
 import pytest
 
 from mathics import settings
+from mathics.session import MathicsSession
 
 
 @pytest.mark.parametrize(
@@ -33,6 +33,18 @@ from mathics import settings
                 reason="In sandbox mode, $ProcessID returns $Failed",
             ),
         ),
+        (
+            'Keys[ClearSystemCache[]] === {"Numbers", "MPMath", "SymPy", '
+            '"SymPyConversions", "Operators", "Definitions", "Results"}',
+            "True",
+            "ClearSystemCache",
+        ),
+        (
+            'Keys[ClearSystemCache["Numeric"]] === {"Numbers", "MPMath"}',
+            "True",
+            "ClearSystemCache Numeric",
+        ),
+        ('ClearSystemCache["Symbolic"]; 1 + 2', "3", "ClearSystemCache Symbolic"),
         ("Head[$SessionID] == Integer", "True", "$SessionID"),
         ("Head[$SystemWordLength] == Integer", "True", "$SystemWordLength"),
     ],
@@ -78,3 +90,72 @@ def test_sandboxing_system_functions(str_expr):
         str_expected="$Failed",
         expected_messages=["Execution of external commands is disabled."],
     )
+
+
+def test_result_cache():
+    """Results of cacheable builtins are reused while they are valid."""
+    check_evaluation(None)
+    check_evaluation("ClearSystemCache[]; Expand[(x + 1) ^ 2]", "1 + 2 x + x ^ 2")
+    check_evaluation("Expand[(x + 1) ^ 2]", "1 + 2 x + x ^ 2")
+    check_evaluation(
+        'SystemCacheStatistics[]["Builtins"]["Expand"]',
+        "<|Hits -> 1, Misses -> 1|>",
+    )
+    # Options set for the builtin are taken into account.
+    check_evaluation(
+        "SetOptions[Expand, Modulus -> 2]; Expand[(x + 1) ^ 2]", "1 + x ^ 2"
+    )
+    check_evaluation(
+        "SetOptions[Expand, Modulus -> 0]; Expand[(x + 1) ^ 2]", "1 + 2 x + x ^ 2"
+    )
+    # So are changes of $Assumptions.
+    check_evaluation("ClearSystemCache[]; Integrate[x ^ 2, x]", "x ^ 3 / 3")
+    check_evaluation("Block[{$Assumptions = x > 0}, Integrate[x ^ 2, x]]", "x ^ 3 / 3")
+    check_evaluation(
+        'SystemCacheStatistics[]["Builtins"]["Integrate"]',
+        "<|Hits -> 0, Misses -> 2|>",
+    )
+    # Messages are issued each time.
+    for _ in range(2):
+        check_evaluation(
+            "Expand[x, Modulus -> a]",
+            "Expand[x, Modulus -> a]",
+            expected_messages=("Value of option Modulus -> a should be an integer.",),
+        )
+    check_evaluation('ClearSystemCache[]; SystemCacheStatistics[]["Size"]', "0")
+
+
+def test_share():
+    """Share stores the equal subexpressions of definitions as one object."""
+    check_evaluation(None)
+    # With hash consing, the values are shared when they are evaluated.
+    check_evaluation(
+        "f[n_] := f[n] = {Mod[n, 2], g[x, y]}; Do[f[k], {k, 10}]; Share[f] > 0",
+        "False" if settings.HASH_CONSING else "True",
+    )
+    check_evaluation("Share[f]", "0")
+    values = [
+        rule.replace
+        for rule in session.definitions.get_user_definition("Global`f").downvalues
+    ]
+    assert values[1] is values[3]
+    assert values[1].elements[1] is values[2].elements[1]
+    # Parts of the shared values are changed in copies.
+    check_evaluation(
+        "v = f[1]; v[[2, 1]] = z; {v, f[1], f[3]}",
+        "{{1, g[z, y]}, {1, g[x, y]}, {1, g[x, y]}}",
+    )
+    check_evaluation("ClearAll[f, v]", "Null")
+
+
+def test_share_sessions():
+    """Values shared in one session are evaluated again in another one."""
+    other = MathicsSession(character_encoding="ASCII")
+    other.evaluate("ClearAll[x, z]")
+    # The clock of the definitions of session gets ahead of the other one.
+    for i in range(20):
+        session.evaluate(f"ClearAll[w]; w = {i}")
+    check_evaluation("ClearAll[x, v]; v = Max[1, 1 + x]; Share[v]; v", "Max[1, 1 + x]")
+    assert other.evaluate("z = Max[1, 1 + x]; Share[z]; x = 2; z").value == 3
+    check_evaluation("x = 5; v", "6")
+    check_evaluation("ClearAll[v, w, x]", "Null")
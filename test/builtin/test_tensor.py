@@ -24,6 +24,12 @@ import pytest
         ("A", None, "{{1 / Sqrt[b], 0}, {a / Sqrt[b], Sqrt[b]}}", None),
         # Transpose
         ("Transpose[x]", None, "Transpose[x]", None),
+        (
+            "Transpose[{{{a, b}, {c, d}}, {{e, f}, {g, h}}}]",
+            None,
+            "{{{a, b}, {e, f}}, {{c, d}, {g, h}}}",
+            "symbolic 3D array",
+        ),
     ],
 )
 def test_tensor(str_expr, msgs, str_expected, fail_msg):
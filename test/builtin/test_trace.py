@@ -2,6 +2,7 @@
 """
 Unit tests for mathics.builtin.trace
 """
+
 from inspect import isfunction, ismethod
 from test.helper import evaluate, session
 from typing import Any, Callable, Optional
@@ -11,7 +12,9 @@ import pytest
 import mathics.eval.tracing
 from mathics import version_info
 from mathics.core.evaluation import Evaluation
+from mathics.core.expression import Expression
 from mathics.core.interrupt import AbortInterrupt
+from mathics.core.rules import BaseRule
 from mathics.eval.tracing import TraceEvent
 
 trace_evaluation_calls = 0
@@ -145,3 +148,89 @@ def test_skip_trivial_evaluation():
         # Just in case, restore everything back to what it was before running this test.
         session.evaluation.print_out = old_print_out
         session.reset()
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "str_expected"),
+    [
+        ('profile["Result"]', "144"),
+        ('profile["Functions"]["fib"]["Calls"]', "465"),
+        ('profile["Functions"]["Plus"]["Calls"]', "696"),
+        (
+            'Lookup[profile["Rules"][HoldPattern[fib[n_]]], {"Attempts", "Matches"}]',
+            "{232, 232}",
+        ),
+        (
+            'Lookup[profile["Rules"][HoldPattern[fib[1]]], {"Attempts", "Matches"}]',
+            "{465, 144}",
+        ),
+        (
+            'profile["Functions"]["fib"]["InclusiveTime"] >= '
+            'profile["Functions"]["fib"]["ExclusiveTime"] > 0',
+            "True",
+        ),
+        (
+            'Union[StringMatchQ[StringSplit[profile["FlameGraph"], "\\n"], '
+            'RegularExpression["fib(;fib)*(;Plus)? \\\\d+"]]]',
+            "{True}",
+        ),
+    ],
+)
+def test_EvaluationProfile(str_expr, str_expected):
+    evaluate(
+        "fib[0] = 0; fib[1] = 1; fib[n_] := fib[n - 1] + fib[n - 2]; "
+        "profile = EvaluationProfile[fib[12]];"
+    )
+    try:
+        assert evaluate(str_expr) == evaluate(str_expected)
+    finally:
+        evaluate("Clear[fib, profile]")
+
+
+def test_EvaluationProfile_sampling():
+    evaluate("fib[0] = 0; fib[1] = 1; fib[n_] := fib[n - 1] + fib[n - 2];")
+    try:
+        evaluate(
+            "profile = EvaluationProfile["
+            'fib[16], Method -> "Sampling", SamplingInterval -> 0.0005];'
+        )
+        assert evaluate('profile["Result"]').value == 987
+        assert evaluate('profile["Functions"]["fib"]["Samples"]').value > 0
+        # Stacks start at the profiled expression.
+        assert evaluate(
+            'Select[StringSplit[profile["FlameGraph"], "\\n"], '
+            '!StringStartsQ[#, "fib"] &] === {}'
+        ).to_python()
+    finally:
+        evaluate("Clear[fib, profile]")
+
+
+def test_EvaluationProfile_restores_evaluation():
+    """Evaluation is restored when the profiled evaluation is interrupted."""
+    default_evaluate = Expression.evaluate
+    default_apply = BaseRule.apply
+    assert evaluate("Catch[EvaluationProfile[Throw[1]]]").value == 1
+    assert Expression.evaluate is default_evaluate
+    assert BaseRule.apply is default_apply
+    assert evaluate('EvaluationProfile[1 + 1]["Result"]').value == 2
+
+
+def test_EvaluationProfile_nested():
+    """A profile inside another one is seen by both."""
+    evaluate("fib[0] = 0; fib[1] = 1; fib[n_] := fib[n - 1] + fib[n - 2];")
+    try:
+        evaluate("outer = EvaluationProfile[inner = EvaluationProfile[fib[10]]];")
+        assert evaluate('inner["Result"]').value == 55
+        assert evaluate('inner["Functions"]["fib"]["Calls"]').value == 177
+        assert evaluate('outer["Functions"]["fib"]["Calls"]').value == 177
+        assert evaluate('outer["Functions"]["EvaluationProfile"]["Calls"]').value == 1
+        evaluate(
+            "outer = EvaluationProfile["
+            'inner = EvaluationProfile[fib[10], Method -> "Sampling"]];'
+        )
+        assert evaluate('inner["Result"]').value == 55
+        assert evaluate('outer["Functions"]["fib"]["Calls"]').value == 177
+    finally:
+        evaluate("Clear[fib, inner, outer]")
+    assert Expression.evaluate is Expression.__dict__["evaluate"]
+    assert BaseRule.apply is BaseRule.__dict__["apply"]
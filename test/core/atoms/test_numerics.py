@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import gc
 
 import mathics.core.atoms as atoms
 import mathics.core.systemsymbols as system_symbols
@@ -14,6 +15,7 @@ from mathics.core.atoms import (
     RationalOneHalf,
     Real,
 )
+from mathics.core.atoms.intern import clear_recent_atoms
 from mathics.core.definitions import Definitions
 from mathics.core.evaluation import Evaluation
 from mathics.core.expression import Expression
@@ -195,3 +197,19 @@ def test_mixed_object_canonicalization():
         Complex(Rational(1, 0), Integer(0)), # 3
     )
     # fmt: on
+
+
+def test_unused_numbers_are_released():
+    """Numbers are interned only while something refers to them."""
+    value = 2**70 + 12345
+    integer = Integer(value)
+    assert Integer(value) is integer
+    assert Integer._integers.get(value) is integer
+
+    del integer
+    clear_recent_atoms()
+    gc.collect()
+    assert Integer._integers.get(value) is None
+    # Constants stay interned.
+    assert Integer(1) is Integer1
+    assert Integer(value).to_sympy() == value
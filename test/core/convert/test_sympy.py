@@ -123,3 +123,42 @@ def test_convert_sympy_singletons():
             res = val.to_sympy()
             print(res, "  <-  ")
             assert res is key
+
+
+def test_to_sympy_cache():
+    """
+    The SymPy form of an expression is kept, and dropped when the
+    elements of the expression change.
+    """
+    expr = Expression(SymbolPlus, Symbol_x, Expression(SymbolPower, Symbol_y, Integer2))
+    sympy_expr = expr.to_sympy()
+    assert expr.to_sympy() is sympy_expr
+    assert expr._cache.sympy is sympy_expr
+
+    copy = expr.copy()
+    assert copy.to_sympy() is sympy_expr
+    copy.elements = (Symbol_x, Symbol_a)
+    assert copy.to_sympy() == Symbol_x.to_sympy() + Symbol_a.to_sympy()
+    assert expr.to_sympy() is sympy_expr
+
+
+def test_from_sympy_cache():
+    """
+    Compound SymPy expressions are converted once, and numbers of
+    different precision are not confused.
+    """
+    sympy_x = Symbol_x.to_sympy()
+    sympy_expr = sympy_x**2 + 3 * sympy_x
+    result = from_sympy(sympy_expr)
+    assert result.sameQ(
+        Expression(
+            SymbolPlus,
+            Expression(SymbolTimes, Integer3, Symbol_x),
+            Expression(SymbolPower, Symbol_x, Integer2),
+        )
+    )
+    assert from_sympy(sympy_expr) is result
+
+    machine = from_sympy(sympy_x + SympyFloat(1.5))
+    precise = from_sympy(sympy_x + SympyFloat(1.5, 30))
+    assert machine.elements[0].get_precision() != precise.elements[0].get_precision()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the binary serialization of expressions.
+"""
+
+from test.helper import check_evaluation, session
+
+import numpy
+import pytest
+
+from mathics.core.atoms import Integer, MachineReal, NumericArray, String
+from mathics.core.convert.wxf import WXFError, from_wxf, to_wxf
+from mathics.core.expression import Expression
+from mathics.core.list import ListExpression
+from mathics.core.symbols import Symbol
+
+
+@pytest.mark.parametrize(
+    "str_expr",
+    [
+        'f[x, "text", 0, -1, 127, 128, -32769, 2^31, 2^63, -2^100]',
+        "{1.5, -0., 1.*^300, N[Pi, 40], N[10^-30, 25]}",
+        "{1/3, -7/2, 2 + 3 I, 1.5 - 2. I, 1/2 + N[Pi, 30] I}",
+        "Hold[Plus[1, 1], Global`x, a`b`c, System`Sin]",
+        "<|a -> 1, b :> x + 1, {1} -> <|c -> d|>|>",
+        "{ByteArray[{1, 2, 255}], {}, {{}, {1}}}",
+        '"αβ \U0001d49c"',
+    ],
+)
+def test_round_trip(str_expr):
+    expr = session.evaluate(f"Hold[{str_expr}]")
+    result = from_wxf(to_wxf(expr))
+    assert result.sameQ(expr), str_expr
+    assert from_wxf(to_wxf(expr, compress=True)).sameQ(expr), str_expr
+
+
+def test_encoding():
+    x = Symbol("Global`x")
+    assert to_wxf(Expression(Symbol("System`f"), x, Integer(1))) == (
+        b"8:f\x02s\x01fs\x08Global`xC\x01"
+    )
+    assert to_wxf(String("ab")) == b"8:S\x02ab"
+    assert to_wxf(MachineReal(1.0)) == b"8:r" + numpy.float64(1.0).tobytes()
+    assert to_wxf(Integer(300)) == b"8:j\x2c\x01"
+    # Lengths are varints.
+    assert to_wxf(String("a" * 200))[:5] == b"8:S\xc8\x01"
+
+
+def test_packed_lists():
+    packed = ListExpression(packed=numpy.arange(1000, dtype=numpy.int64))
+    data = to_wxf(packed)
+    assert data[:7] == b"8:\xc1\x03\x01\xe8\x07"
+    assert len(data) == 7 + 8 * 1000
+    result = from_wxf(data)
+    assert result.packed is not None and result.sameQ(packed)
+
+    # Long lists of machine numbers are written as arrays too.
+    unpacked = ListExpression(*(MachineReal(i / 2) for i in range(300)))
+    result = from_wxf(to_wxf(unpacked))
+    assert result.packed is not None and result.sameQ(unpacked)
+
+    # Arrays with other types of numbers, or no numbers, are unpacked.
+    for array in (
+        numpy.array([[1 + 2j, 3j]]),
+        numpy.array([2**64 - 1], dtype=numpy.uint64),
+        numpy.zeros((2, 0)),
+    ):
+        data = b"8:" + to_wxf(NumericArray(array))[2:].replace(b"\xc2", b"\xc1", 1)
+        result = from_wxf(data)
+        assert result.packed is None
+        values = numpy.array(result.to_python(), dtype=array.dtype)
+        assert values.shape == array.shape and numpy.array_equal(values, array)
+
+
+def test_numeric_arrays():
+    array = numpy.arange(6, dtype=numpy.float32).reshape(2, 3)
+    result = from_wxf(to_wxf(NumericArray(array)))
+    assert isinstance(result, NumericArray)
+    assert result.value.dtype == numpy.float32
+    assert numpy.array_equal(result.value, array)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"9:s\x01x", b"8:", b"8:f\x02s\x01f", b"8:S\x05ab", b"8:C\x01C\x02", b"8:Z"],
+)
+def test_invalid_data(data):
+    with pytest.raises(WXFError):
+        from_wxf(data)
+
+
+def test_unserializable():
+    with pytest.raises(WXFError):
+        to_wxf(session.evaluate("Dispatch[{a -> b}]"))
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "msgs", "str_expected", "fail_msg"),
+    [
+        (
+            "BinaryDeserialize[BinarySerialize[RandomReal[1, {100, 3}]]] // Developer`PackedArrayQ",
+            None,
+            "True",
+            "Packed lists stay packed",
+        ),
+        (
+            "BinaryDeserialize[ByteArray[{56, 58}]]",
+            ("The byte array ByteArray[<2>] is not a valid serialized expression.",),
+            "$Failed",
+            None,
+        ),
+        (
+            "BinarySerialize[Dispatch[{a -> b}]]",
+            ("Dispatch[<1>] can not be serialized.",),
+            "$Failed",
+            None,
+        ),
+        (
+            "Head[Compress[Dispatch[{a -> b}]]]",
+            None,
+            "String",
+            "Compress falls back to FullForm for atoms that can not be serialized",
+        ),
+        (
+            'Compress[Dispatch[{a -> b}], Method -> "WXF"]',
+            ("Dispatch[<1>] can not be serialized.",),
+            "$Failed",
+            None,
+        ),
+        (
+            "Compress[x, Method -> None]",
+            (
+                'Value of option Method -> None should be Automatic, "WXF" or "FullForm".',
+            ),
+            "$Failed",
+            None,
+        ),
+        (
+            'Uncompress["not compressed"]',
+            ("not compressed is not a compressed expression.",),
+            "$Failed",
+            None,
+        ),
+        (
+            "Uncompress[Compress[{1/3, N[Pi, 20], Range[1000]}]] === {1/3, N[Pi, 20], Range[1000]}",
+            None,
+            "True",
+            None,
+        ),
+        (
+            'ImportString[ExportString[f[1, "a", 2.5], "WXF"], "WXF"] === f[1, "a", 2.5]',
+            None,
+            "True",
+            None,
+        ),
+        ('ImportString[ByteArray[{56, 58, 67, 1}], "WXF"]', None, "1", None),
+        (
+            # Strings compressed by earlier versions hold the FullForm text.
+            'Uncompress["eJxLi67QUTCKBQAJHAIV"]',
+            None,
+            "f[x, 2]",
+            None,
+        ),
+    ],
+)
+def test_serialization_builtins(str_expr, msgs, str_expected, fail_msg):
+    check_evaluation(
+        str_expr,
+        str_expected,
+        failure_message=fail_msg,
+        expected_messages=msgs,
+        hold_expected=True,
+    )
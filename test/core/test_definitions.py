@@ -3,10 +3,19 @@
 Tests functions in mathics.core.definition
 """
 
+import pickle
+
 import pytest
 
-from mathics.core.definitions import get_tag_position
+import mathics.core.definitions as definitions_module
+from mathics.core.definitions import (
+    Definitions,
+    builtin_definitions_snapshot_key,
+    get_tag_position,
+)
+from mathics.core.load_builtin import import_and_load_builtins
 from mathics.core.parser import parse_builtin_rule
+from mathics.session import MathicsSession
 
 
 @pytest.mark.parametrize(
@@ -61,3 +70,114 @@ from mathics.core.parser import parse_builtin_rule
 def test_get_tag_position(pattern_str, tag, position):
     pattern = parse_builtin_rule(pattern_str)
     assert get_tag_position(pattern, f"System`{tag}") == position
+
+
+def test_builtin_definitions_snapshot(tmp_path, monkeypatch):
+    """Check that builtin definitions can be restored from a snapshot,
+    and that the snapshot is rebuilt when its key does not match."""
+    import_and_load_builtins()
+    builtin_filename = str(tmp_path / "builtin_definitions.pcl")
+
+    definitions = Definitions(add_builtin=True, builtin_filename=builtin_filename)
+    with open(builtin_filename, "rb") as builtin_file:
+        assert pickle.load(builtin_file) == builtin_definitions_snapshot_key()
+
+    def fail_to_build(definitions):
+        raise AssertionError("builtin definitions were rebuilt")
+
+    monkeypatch.setattr(
+        "mathics.core.load_builtin.definition_contribute", fail_to_build
+    )
+    session = MathicsSession(builtin_filename=builtin_filename)
+    assert set(session.definitions.builtin) == set(definitions.builtin)
+    assert session.definitions.now == definitions.now
+
+    # Builtins, autoloaded rules and Import formats work after restoring.
+    for str_expr, expected in (
+        ("Plus[1, 2]", "3"),
+        ("Element[3, Reals]", "System`True"),
+        ('MemberQ[$ImportFormats, "CSV"]', "System`True"),
+    ):
+        assert str(session.evaluate(str_expr)) == expected
+
+    # A snapshot built for a different key is not used.
+    monkeypatch.setattr(definitions_module, "BUILTIN_SNAPSHOT_FORMAT", -1)
+    with pytest.raises(AssertionError, match="rebuilt"):
+        Definitions(add_builtin=True, builtin_filename=builtin_filename)
+
+
+def test_uncertain_final_value():
+    """Check that a stored value is not evaluated again while only the
+    definitions of other symbols change."""
+    import_and_load_builtins()
+    session = MathicsSession()
+    definitions = session.definitions
+    session.evaluate("data = {f[1], g[2]}")
+    value = definitions.get_definition("Global`data").ownvalues[0].replace
+
+    session.evaluate("Do[x[i] = i, {i, 3}]")
+    assert not value.is_uncertain_final_definitions(definitions)
+    # The value was found final at the current time.
+    if value.hash_consed:
+        assert value.final_in[1] == definitions.now
+    else:
+        assert value._cache.time == definitions.now
+
+    session.evaluate("f[1] = 3")
+    assert value.is_uncertain_final_definitions(definitions)
+    assert str(session.evaluate("data")) == "{3,Global`g[2]}"
+    session.evaluate("ClearAll[f]")
+    assert str(session.evaluate("data")) == "{Global`f[1],Global`g[2]}"
+
+    definitions.reset_user_definitions()
+    assert definitions.changed_at["Global`x"] == definitions.now
+
+
+def test_bindings():
+    """Check that bindings leave the definitions alone until they are
+    looked at, and that they are restored afterwards."""
+    import_and_load_builtins()
+    session = MathicsSession()
+    definitions = session.definitions
+    session.evaluate("x = 7")
+    definition = definitions.get_user_definition("Global`x")
+
+    outer = definitions.push_binding("Global`x")
+    definitions.set_binding_value(outer, session.evaluate("1"))
+    inner = definitions.push_binding("Global`x", session.evaluate("2"))
+    assert str(session.evaluate("x + 1")) == "3"
+    assert definitions.user["Global`x"] is definition
+    definitions.pop_binding(inner)
+    assert str(session.evaluate("x + 1")) == "2"
+
+    # Changing the definition materializes the binding.
+    session.evaluate("x = x + 10")
+    assert outer.materialized
+    assert "Global`x" not in definitions.bindings
+    assert str(session.evaluate("x")) == "11"
+    definitions.pop_binding(outer)
+    assert definitions.user["Global`x"] is definition
+    assert str(session.evaluate("x")) == "7"
+
+
+def test_block_bindings(monkeypatch):
+    """Check that Block keeps the local values in bindings."""
+    import_and_load_builtins()
+    session = MathicsSession()
+    definitions = session.definitions
+    session.evaluate("x = 7")
+    definition = definitions.get_user_definition("Global`x")
+
+    bound = []
+    push_binding = Definitions.push_binding
+
+    def counting_push_binding(self, name, value=None):
+        bound.append(name)
+        return push_binding(self, name, value)
+
+    monkeypatch.setattr(Definitions, "push_binding", counting_push_binding)
+    assert str(session.evaluate("Block[{x = 1}, x + 1]")) == "2"
+    assert definitions.user["Global`x"] is definition
+    assert str(session.evaluate("Block[{y = 1}, y = y + 1; y]")) == "2"
+    assert bound == ["Global`x", "Global`y"]
+    assert str(session.evaluate("{x, y}")) == "{7,Global`y}"
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for mathics.core.hashcons
+"""
+
+from test.helper import session
+
+import pytest
+
+from mathics.core.atoms import Integer, PrecisionReal, String
+from mathics.core.expression import Expression
+from mathics.core.hashcons import hash_cons
+from mathics.core.list import ListExpression
+from mathics.core.symbols import Symbol
+from mathics.session import MathicsSession
+
+
+def test_same_structure_same_node():
+    f, x = Symbol("Global`f"), Symbol("Global`x")
+    first = hash_cons(
+        ListExpression(Expression(f, x, Integer(1)), String("s"), Integer(2))
+    )
+    second = hash_cons(
+        ListExpression(Expression(f, x, Integer(1)), String("s"), Integer(2))
+    )
+    assert first.hash_consed
+    assert first is second
+    assert first.elements[0] is hash_cons(Expression(f, x, Integer(1)))
+    assert hash(first) == hash(
+        ListExpression(Expression(f, x, Integer(1)), String("s"), Integer(2))
+    )
+    assert first.sameQ(second)
+    assert not first.sameQ(hash_cons(ListExpression(Integer(2))))
+
+    with pytest.raises(TypeError):
+        first.set_element(0, x)
+
+
+def test_not_hash_consed():
+    f = Symbol("Global`f")
+    expr = Expression(f, PrecisionReal(1))
+    assert hash_cons(expr) is expr
+    assert not expr.hash_consed
+    expr = Expression(f, Expression(f, PrecisionReal(1)))
+    assert not hash_cons(expr).hash_consed
+
+
+def test_evaluation(monkeypatch):
+    monkeypatch.setattr("mathics.settings.HASH_CONSING", True)
+    session.evaluate("ClearAll[m, n]")
+    m = session.evaluate("m = Table[a[i] + b[j], {i, 3}, {j, 3}]")
+    n = session.evaluate("n = Table[a[i] + b[j], {i, 3}, {j, 3}]")
+    assert m is n
+    assert m.elements[0].elements[0] is n.elements[0].elements[0]
+    assert session.evaluate("m === n; Union[Flatten[{m, n}]] // Length").value == 9
+    assert session.evaluate(
+        "m[[1, 1]] = c; {m[[1, 1]] === c, n[[1, 1]] === a[1] + b[1]}"
+    ).sameQ(session.evaluate("{True, True}"))
+    session.evaluate("ClearAll[m, n]")
+
+
+def test_sessions(monkeypatch):
+    """A node evaluated in one session is evaluated again in another one."""
+    monkeypatch.setattr("mathics.settings.HASH_CONSING", True)
+    other = MathicsSession(character_encoding="ASCII")
+    for current in (session, other):
+        current.evaluate("ClearAll[x, z]; z = Max[1, 1 + x]; z")
+    # The clock of the definitions of session gets ahead of the other one.
+    for i in range(20):
+        session.evaluate(f"ClearAll[w]; w = {i}")
+    session.evaluate("z")
+    assert other.evaluate("x = 2; z").value == 3
+    assert session.evaluate("x = 5; z").value == 6
+    session.evaluate("ClearAll[w, x, z]")
+
+
+def test_rule_options(monkeypatch):
+    """The options of a rule are not set on the shared nodes it returns."""
+    monkeypatch.setattr("mathics.settings.HASH_CONSING", True)
+    session.evaluate(
+        "ClearAll[h, v]; Options[h] = {a -> 1}; h[x_, OptionsPattern[]] := x"
+    )
+    assert str(session.evaluate("v = q[1]; h[v, a -> 2]")) == "Global`q[1]"
+    node = session.evaluate("q[1]")
+    assert node.hash_consed
+    assert not node.options
+    session.evaluate("ClearAll[h, v]")
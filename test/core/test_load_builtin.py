@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Tests functions in mathics.core.load_builtin
+"""
+
+import json
+
+import mathics.core.load_builtin as load_builtin
+from mathics.core.definitions import Definitions
+from mathics.core.load_builtin import (
+    build_builtin_modules_manifest,
+    import_and_load_builtins,
+    read_builtin_modules_manifest,
+    set_lazy_builtins_manifest,
+    write_builtin_modules_manifest,
+)
+from mathics.core.symbols import SymbolTrue
+from mathics.session import MathicsSession
+
+
+def test_builtin_modules_manifest(tmp_path):
+    """Check that the manifest is read back, unless it is out of date."""
+    import_and_load_builtins()
+    manifest_filename = str(tmp_path / "builtin_modules_manifest.json")
+    write_builtin_modules_manifest(manifest_filename)
+
+    manifest = read_builtin_modules_manifest(manifest_filename)
+    assert manifest is not None
+    assert (
+        manifest["symbols"]["System`EditDistance"]
+        == "mathics.builtin.distance.stringdata"
+    )
+    assert "mathics.builtin.patterns.basic" in manifest["eager"]
+    assert "System`Blank" not in manifest["symbols"]
+    # Symbols belong to the module of their Builtin, not to the modules
+    # that use them as option names.
+    assert (
+        manifest["symbols"]["System`Trace"] == "mathics.builtin.symbolic_history.stack"
+    )
+
+    manifest["key"]["format"] = -1
+    with open(manifest_filename, "w") as manifest_file:
+        json.dump(manifest, manifest_file)
+    assert read_builtin_modules_manifest(manifest_filename) is None
+
+
+def test_lazy_builtins():
+    """Check that builtin definitions are added when their symbols are looked up."""
+    import_and_load_builtins()
+    set_lazy_builtins_manifest(build_builtin_modules_manifest())
+    try:
+        session = MathicsSession()
+        definitions = session.definitions
+        assert "System`EditDistance" not in definitions.builtin
+        assert "System`EditDistance" in definitions.get_builtin_names()
+
+        assert str(session.evaluate('EditDistance["kitten", "sitting"]')) == "3"
+        assert "System`EditDistance" in definitions.builtin
+        assert "System`EditDistance" not in definitions.lazy_builtin_modules
+        # Every symbol of the module gets its definition at the same time.
+        module_name = load_builtin.lazy_builtin_modules["System`EditDistance"]
+        for name in load_builtin.lazy_module_symbols[module_name]:
+            assert name in definitions.builtin
+
+        assert str(session.evaluate("Sin[Pi / 2]")) == "1"
+        # Autoloaded files add messages to Integers, which gets a user
+        # definition with the attributes of its builtin definition.
+        assert session.evaluate("Attributes[Integers] === {Protected}") is SymbolTrue
+        assert session.evaluate("Attributes[$Context] === {Protected}") is SymbolTrue
+        assert str(session.evaluate("f[x_] := x ^ 2; f[3]")) == "9"
+    finally:
+        set_lazy_builtins_manifest(None)
+
+    # Without a manifest, all the definitions are added at startup.
+    assert "System`EditDistance" in Definitions(add_builtin=True).builtin
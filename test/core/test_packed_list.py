@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for packed lists, ListExpressions backed by a NumPy array.
+"""
+
+from test.helper import check_evaluation
+
+import numpy
+import pytest
+
+from mathics.core.atoms import Integer, MachineReal, String
+from mathics.core.list import (
+    ListExpression,
+    from_packed_list,
+    pack_elements,
+    to_packed_list,
+)
+
+
+def test_packed_elements_are_built_lazily():
+    packed_list = ListExpression(packed=numpy.arange(1, 4))
+    assert "_elements" not in packed_list.__dict__
+    assert packed_list.is_literal
+    assert packed_list.value == (1, 2, 3)
+    assert "_elements" not in packed_list.__dict__
+
+    assert packed_list.elements == (Integer(1), Integer(2), Integer(3))
+    assert packed_list.packed is not None
+
+    matrix = ListExpression(packed=numpy.array([[1.5, 2.0], [3.0, 4.0]]))
+    assert matrix.value == ((1.5, 2.0), (3.0, 4.0))
+    row = matrix.elements[0]
+    assert isinstance(row, ListExpression) and row.packed is not None
+    assert row.elements == (MachineReal(1.5), MachineReal(2.0))
+
+
+def test_pack_elements():
+    assert pack_elements((Integer(1), Integer(2))).dtype == numpy.int64
+    assert pack_elements((MachineReal(1.0), MachineReal(2.0))).dtype == numpy.float64
+    rows = (
+        ListExpression(Integer(1), Integer(2)),
+        ListExpression(packed=numpy.array([3, 4])),
+    )
+    assert pack_elements(rows).shape == (2, 2)
+
+    # Mixed types, big integers, ragged or non-numeric lists are not packed.
+    for elements in (
+        (),
+        (Integer(1), MachineReal(2.0)),
+        (Integer(1), Integer(2**70)),
+        (String("a"),),
+        (ListExpression(Integer(1)), ListExpression(Integer(1), Integer(2))),
+    ):
+        assert pack_elements(elements) is None
+
+
+def test_pack_and_unpack():
+    unpacked = ListExpression(Integer(1), Integer(2))
+    packed = to_packed_list(unpacked)
+    assert packed.packed is not None
+    assert packed.sameQ(unpacked) and unpacked.sameQ(packed)
+    assert not packed.sameQ(ListExpression(MachineReal(1.0), MachineReal(2.0)))
+    assert from_packed_list(packed).packed is None
+    string = String("a")
+    assert to_packed_list(string) is string
+
+    # Changing the elements of a packed list unpacks it.
+    packed.elements = (Integer(3),)
+    assert packed.packed is None
+    assert packed.elements == (Integer(3),)
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "str_expected"),
+    [
+        ("Developer`PackedArrayQ[Range[1000]]", "True"),
+        ("Developer`PackedArrayQ[Range[0, 2, 1/2]]", "False"),
+        ("Developer`PackedArrayQ[Table[i^2, {i, 300}]]", "True"),
+        ("Developer`PackedArrayQ[Table[i^2, {i, 3}]]", "False"),
+        (
+            "Developer`PackedArrayQ[Table[i + j, {i, 300}, {j, 300}], Integer, 2]",
+            "True",
+        ),
+        ("Developer`PackedArrayQ[RandomInteger[10, {3, 4}], Integer, 2]", "True"),
+        ("Developer`PackedArrayQ[RandomReal[1, 5], Real, 1]", "True"),
+        ("Developer`PackedArrayQ[ConstantArray[0, {2, 2}]]", "True"),
+        ("ConstantArray[2^80, 2]", "{2^80, 2^80}"),
+        ("ConstantArray[1, {2, 0}]", "{{}, {}}"),
+        ("Range[2^62, 2^62 + 2]", "{2^62, 2^62 + 1, 2^62 + 2}"),
+        ("Length[Range[10^5]]", "100000"),
+        ("Dimensions[RandomReal[1, {4, 5}]]", "{4, 5}"),
+        ("Total[Range[100]]", "5050"),
+        ("Module[{v = Range[3]}, v[[2]] = 5; v]", "{1, 5, 3}"),
+        (
+            "Sort[{Range[3], a, Range[2], {1, 1, 1}}]",
+            "{a, {1, 2}, {1, 1, 1}, {1, 2, 3}}",
+        ),
+    ],
+)
+def test_packed_arrays_evaluation(str_expr, str_expected):
+    check_evaluation(str_expr, str_expected)
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "str_expected"),
+    [
+        ("Developer`PackedArrayQ[Range[300] + 1]", "True"),
+        ("Developer`PackedArrayQ[Sin[RandomReal[1, {3, 4}]], Real, 2]", "True"),
+        ("Range[5] + Range[5]", "{2, 4, 6, 8, 10}"),
+        ("Range[3] ^ 2", "{1, 4, 9}"),
+        ("Range[3] * 2.5", "{2.5, 5., 7.5}"),
+        ("Abs[Range[-2, 2]]", "{2, 1, 0, 1, 2}"),
+        ("Positive[Range[-1, 1]]", "{False, False, True}"),
+        ("Max[Range[10], 3.5]", "10"),
+        ("Min[Range[10], 3.5, -2]", "-2"),
+        (
+            "Developer`ToPackedArray[{{1, 2}, {3, 4}}] + Range[10, 20, 10]",
+            "{{11, 12}, {23, 24}}",
+        ),
+        # Exact results are not computed with machine numbers.
+        ("Range[3] ^ -1", "{1, 1 / 2, 1 / 3}"),
+        ("Sin[Range[2]]", "{Sin[1], Sin[2]}"),
+        ("2 ^ Range[62, 64]", "{2 ^ 62, 2 ^ 63, 2 ^ 64}"),
+        ("Developer`PackedArrayQ[2 ^ Range[62, 64]]", "False"),
+        ("Range[3] + a", "{1 + a, 2 + a, 3 + a}"),
+        ("Developer`ToPackedArray[{0, 1, 4}] ^ 0.5", "{0, 1., 2.}"),
+    ],
+)
+def test_packed_listable_evaluation(str_expr, str_expected):
+    check_evaluation(str_expr, str_expected)
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "str_expected", "msgs"),
+    [
+        (
+            "Developer`ToPackedArray[{0., 1., 2.}] ^ 0",
+            "{Indeterminate, 1., 1.}",
+            ("Indeterminate expression 0. ^ 0 encountered.",),
+        ),
+        (
+            "Developer`ToPackedArray[{0, 1, 2}] ^ 0.",
+            "{Indeterminate, 1., 1.}",
+            ("Indeterminate expression 0 ^ 0. encountered.",),
+        ),
+    ],
+)
+def test_packed_power_of_zero(str_expr, str_expected, msgs):
+    """Powers of 0 with real arguments are computed by threading."""
+    check_evaluation(str_expr, str_expected, expected_messages=msgs)
@@ -9,7 +9,9 @@ from test.helper import session
 
 import pytest
 
+from mathics.core.atoms import Integer
 from mathics.core.pattern import BasePattern
+from mathics.core.util import permutations, subsets
 
 
 @pytest.mark.parametrize(
@@ -154,3 +156,102 @@ def test_pattern_sort_key(str_expr1, str_expr2, dir, msg):
         assert expr1_key < expr2_key, msg or "'{expr1}'<='{expr2}'"
     else:
         assert expr1_key > expr2_key, msg or "'{expr1}'>='{expr2}'"
+
+
+@pytest.mark.parametrize(
+    ("str_pattern", "single"),
+    [
+        ("f[x_, y_Integer]", True),
+        ("f[{a_, b_}, c_?NumberQ]", True),
+        ("f[x_, x_]", True),
+        ("h_[x_]", True),
+        ("f[Verbatim[_], HoldPattern[x_]]", True),
+        ("f[x__]", False),
+        ("f[x_ /; x > 0]", False),
+        ("f[x_ | y_]", False),
+        ("f[x_:0]", False),
+        ("f[x_, OptionsPattern[]]", False),
+        ("Plus[x_, y_]", False),
+        ("Times[x_, g[y_]]", False),
+    ],
+)
+def test_can_match_single(str_pattern, single):
+    pattern = BasePattern.create(
+        session.evaluate(f"Hold[{str_pattern}]").elements[0],
+        evaluation=session.evaluation,
+    )
+    assert pattern.can_match_single(session.evaluation) is single
+
+
+@pytest.mark.parametrize(
+    ("str_pattern", "str_expr", "str_bindings"),
+    [
+        ("f[x_, y_Integer]", "f[a, 2]", "{x -> a, y -> 2}"),
+        ("f[x_, y_Integer]", "f[a, b]", None),
+        ("f[x_, y_Integer]", "f[a, 2, 3]", None),
+        ("f[{a_, b_}, c_?NumberQ]", "f[{1, 2}, 3]", "{a -> 1, b -> 2, c -> 3}"),
+        ("f[{a_, b_}, c_?NumberQ]", "f[{1, 2}, x]", None),
+        ("f[x_, x_]", "f[a, a]", "{x -> a}"),
+        ("f[x_, x_]", "f[a, b]", None),
+        ("h_[x_]", "g[1]", "{h -> g, x -> 1}"),
+        ("f[x_?EvenQ]", "f[2]", "{x -> 2}"),
+        ("f[x_?EvenQ]", "f[3]", None),
+        ("f[_]", "f[Sequence[]]", None),
+    ],
+)
+def test_match_single(str_pattern, str_expr, str_bindings):
+    evaluation = session.evaluation
+    pattern = BasePattern.create(
+        session.evaluate(f"Hold[{str_pattern}]").elements[0], evaluation=evaluation
+    )
+    expr = session.evaluate(f"Hold[{str_expr}]").elements[0]
+    assert pattern.can_match_single(evaluation)
+    vars_dict = pattern.match_single(expr, {}, evaluation)
+    if str_bindings is None:
+        assert vars_dict is None
+        return
+    expected = {
+        rule.elements[0].get_name().replace("Global`", ""): rule.elements[1]
+        for rule in session.evaluate(f"Hold[{str_bindings}]").elements[0].elements
+    }
+    assert {
+        name.replace("Global`", ""): value for name, value in vars_dict.items()
+    } == expected
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "str_expected"),
+    [
+        ("MatchQ[o[a, a], o[x_, x_]]", "True"),
+        ("MatchQ[o[a, b], o[x_, x_]]", "False"),
+        ("ReplaceList[o[a, a, b], o[x_, x_, y___] -> {x, y}]", "{{a, b}}"),
+        ("ReplaceList[o[a, a, b, b], o[x__, x__] -> {x}]", "{{a, b}, {b, a}}"),
+        ("ReplaceList[o[a, b], o[x__] -> {x}]", "{{a, b}, {b, a}}"),
+        ("ReplaceList[o[a, a], o[x_, y_] -> {x, y}]", "{{a, a}}"),
+        (
+            "ReplaceList[1 + a + 2 b, c_?NumberQ + rest___ -> {c, rest}]",
+            "{{1, a, 2 b}, {1, 2 b, a}, {1, a + 2 b}}",
+        ),
+        ("MatchQ[Plus @@ Array[x, 100], x[a_] + x[b_] + c_Integer]", "False"),
+        ("MatchQ[Times @@ Array[x, 100], c_?NumberQ * rest___]", "False"),
+        ("MatchQ[3 Times @@ Array[x, 100], c_?NumberQ * rest___]", "True"),
+    ],
+)
+def test_orderless_match(str_expr, str_expected):
+    session.evaluate("SetAttributes[o, Orderless]")
+    assert session.evaluate(str_expr) == session.evaluate(str_expected)
+    session.evaluate("ClearAll[o]")
+
+
+def test_subsets():
+    """Equal items are counted together rather than chosen one by one."""
+    items = [Integer(1), Integer(1), Integer(2)]
+    assert [
+        (tuple(taken), tuple(rest)) for taken, (_, rest) in subsets(items, 1, 2)
+    ] == [
+        ((Integer(1), Integer(1)), (Integer(2),)),
+        ((Integer(1), Integer(2)), (Integer(1),)),
+        ((Integer(1),), (Integer(1), Integer(2))),
+        ((Integer(2),), (Integer(1), Integer(1))),
+    ]
+    assert len(list(permutations(items))) == 3
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for mathics.core.rule_index
+"""
+
+from test.helper import check_evaluation, session
+
+import pytest
+
+from mathics.core.rule_index import RULE_INDEX_MIN_RULES, RuleDispatchIndex
+
+# Enough definitions to make sure that the dispatch index is used.
+MANY_RULES = "".join(f"g[{i}] = {i}; " for i in range(2 * RULE_INDEX_MIN_RULES))
+
+
+@pytest.mark.parametrize(
+    ("str_expr", "str_expected", "msg"),
+    [
+        (None, None, None),
+        (
+            MANY_RULES
+            + (
+                "g[x_Integer] := int; g[x_Real] := real; g[{x_}] := list; "
+                'g[x_, y__] := seq; g[h[x_]] := h; g["s"] := str; '
+                "g[a] := a; g[1/2] := half; g[x_] := other; "
+                '{g[3], g[100], g[1.], g[{1}], g[1, 2, 3], g[h[1]], g["s"], '
+                "g[a], g[1/2], g[b], g[]}"
+            ),
+            "{3, int, real, list, seq, h, str, a, half, other, g[]}",
+            "Literal, head and arity-keyed rules",
+        ),
+        ("g[3] = three; g[3]", "three", "Replacing an indexed rule"),
+        ("g[3] =.; g[3]", "int", "Removing an indexed rule"),
+        (
+            "g[n_ /; n < 0, 0] := neg; {g[-1, 0], g[1, 0]}",
+            "{neg, seq}",
+            "Conditional rules",
+        ),
+        ("g[2000.]", "real", "Rules with patterns test the head"),
+        (None, None, None),
+        (
+            MANY_RULES + "SetAttributes[g, Orderless]; g[a_, 1] := one; g[1, b]",
+            "one",
+            "Orderless rules are not indexed",
+        ),
+        (None, None, None),
+        (
+            MANY_RULES
+            + "h /: k[h, 1] := up; "
+            + "".join(f"h /: k[h, x_, {i}] := {i}; " for i in range(10))
+            + "{k[h, 1], k[h, 0, 5], k[h, 0, 20]}",
+            "{up, 5, k[h, 0, 20]}",
+            "UpValues",
+        ),
+        (None, None, None),
+    ],
+)
+def test_rule_dispatch(str_expr, str_expected, msg):
+    check_evaluation(str_expr, str_expected, failure_message=msg)
+
+
+def test_index_candidates():
+    """Check that only plausible rules are returned by the index"""
+    session.evaluate(MANY_RULES + "g[x_String] := s; g[x_, y_] := 2")
+    definitions = session.definitions
+    definition = definitions.get_definition("Global`g")
+    index = RuleDispatchIndex(
+        definition.downvalues,
+        definition.attributes,
+        definitions.get_existing_attributes,
+    )
+
+    candidates = index.candidates(session.evaluate("Hold[g[3]]").elements[0])
+    assert [str(rule.replace) for rule in candidates] == ["3"]
+
+    candidates = index.candidates(session.evaluate('Hold[g["x"]]').elements[0])
+    assert [str(rule.replace) for rule in candidates] == ["Global`s"]
+
+    candidates = index.candidates(session.evaluate("Hold[g[a, b]]").elements[0])
+    assert [str(rule.replace) for rule in candidates] == ["2"]
+    session.evaluate("ClearAll[g]")